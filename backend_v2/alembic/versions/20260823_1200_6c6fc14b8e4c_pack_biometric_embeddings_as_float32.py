@@ -0,0 +1,124 @@
+"""pack_biometric_embeddings_as_float32
+
+Revision ID: 6c6fc14b8e4c
+Revises: 4f8c1a6e92b7
+Create Date: 2026-08-23 12:00:00.000000
+
+Replaces ``biometric_embeddings.embedding_values`` (``DOUBLE
+PRECISION[]``) with ``embedding_packed``: one ``bytea`` of
+little-endian float32 components, ``4 * embedding_dimension`` bytes
+long. See ``app/modules/face_recognition/models.py``'s "Packed float32
+storage" and ``app/modules/face_recognition/embedding_codec.py`` for
+the format; like every migration here, this file re-states the format
+inline rather than importing application code.
+
+Upgrade, in order:
+
+1. add ``embedding_packed`` as nullable;
+2. backfill it set-based in SQL — ``float4send`` yields each component
+   as big-endian float32, so its four bytes are reversed before
+   ``string_agg`` concatenates them in ordinal order;
+3. make it ``NOT NULL``;
+4. drop ``embedding_values`` (PostgreSQL drops its array-length check
+   constraint with it);
+5. add ``octet_length(embedding_packed) = 4 * embedding_dimension`` —
+   the same "stored length matches the declared dimension" invariant
+   the array check enforced.
+
+``downgrade()`` restores the array column and its check constraint.
+PostgreSQL has no SQL-callable float32-from-bytes function, so that
+backfill decodes in Python, in primary-key-ordered batches. Values come
+back float32-rounded — the one thing a round trip through this
+revision cannot undo.
+"""
+
+import struct
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "6c6fc14b8e4c"
+down_revision: str | None = "4f8c1a6e92b7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_TABLE = "biometric_embeddings"
+_PACKED_CHECK = "ck_biometric_embeddings_embedding_packed_length_matches_dim"
+_DOWNGRADE_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column(_TABLE, sa.Column("embedding_packed", postgresql.BYTEA(), nullable=True))
+    op.execute(
+        """
+        UPDATE biometric_embeddings AS e
+        SET embedding_packed = (
+            SELECT string_agg(
+                substring(b FROM 4 FOR 1) || substring(b FROM 3 FOR 1)
+                    || substring(b FROM 2 FOR 1) || substring(b FROM 1 FOR 1),
+                ''::bytea
+                ORDER BY ordinal
+            )
+            FROM unnest(e.embedding_values) WITH ORDINALITY AS component(value, ordinal)
+            CROSS JOIN LATERAL (SELECT float4send(component.value::real) AS b) AS encoded
+        )
+        """
+    )
+    op.alter_column(_TABLE, "embedding_packed", nullable=False)
+    op.drop_column(_TABLE, "embedding_values")
+    op.create_check_constraint(
+        op.f(_PACKED_CHECK),
+        _TABLE,
+        "octet_length(embedding_packed) = 4 * embedding_dimension",
+    )
+
+
+def downgrade() -> None:
+    op.add_column(
+        _TABLE,
+        sa.Column(
+            "embedding_values", postgresql.ARRAY(postgresql.DOUBLE_PRECISION()), nullable=True
+        ),
+    )
+
+    bind = op.get_bind()
+    select_batch = sa.text(
+        "SELECT id, embedding_packed FROM biometric_embeddings "
+        "WHERE id > :after ORDER BY id LIMIT :limit"
+    )
+    update_row = sa.text(
+        "UPDATE biometric_embeddings SET embedding_values = :embedding_values WHERE id = :id"
+    ).bindparams(
+        sa.bindparam("embedding_values", type_=postgresql.ARRAY(postgresql.DOUBLE_PRECISION())),
+        sa.bindparam("id", type_=postgresql.UUID(as_uuid=True)),
+    )
+    after = "00000000-0000-0000-0000-000000000000"
+    while True:
+        rows = bind.execute(select_batch, {"after": after, "limit": _DOWNGRADE_BATCH_SIZE}).all()
+        if not rows:
+            break
+        bind.execute(
+            update_row,
+            [
+                {
+                    "id": row.id,
+                    "embedding_values": list(
+                        struct.unpack(f"<{len(row.embedding_packed) // 4}f", row.embedding_packed)
+                    ),
+                }
+                for row in rows
+            ],
+        )
+        after = str(rows[-1].id)
+
+    op.alter_column(_TABLE, "embedding_values", nullable=False)
+    op.drop_constraint(op.f(_PACKED_CHECK), _TABLE, type_="check")
+    op.drop_column(_TABLE, "embedding_packed")
+    op.create_check_constraint(
+        "ck_biometric_embeddings_embedding_values_length_matches_dimension",
+        _TABLE,
+        "array_length(embedding_values, 1) = embedding_dimension",
+    )
@@ -0,0 +1,166 @@
+"""create_biometric_processing_jobs
+
+Revision ID: b7d3e95a0c21
+Revises: 6c6fc14b8e4c
+Create Date: 2026-08-30 12:00:00.000000
+
+Adds ``biometric_processing_jobs``, the durable queue drained by the
+standalone processing worker (``scripts/processing_worker.py``). See
+``app/modules/face_recognition/models.py``'s "Processing jobs" and
+``app/modules/face_recognition/processing_jobs.py`` for the design.
+Purely additive: no existing table, column, or constraint is touched.
+
+The table holds scheduling state and a safe reason code only — no
+image, embedding, path, or raw-error column. Two indexes carry the
+queue itself: ``(status, available_at)`` for the ``FOR UPDATE SKIP
+LOCKED`` claim scan, and a partial unique index allowing at most one
+open (``queued``/``running``) job per sample.
+
+``downgrade()`` drops the table and its enum type, landing back at
+``6c6fc14b8e4c`` exactly.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "b7d3e95a0c21"
+down_revision: str | None = "6c6fc14b8e4c"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_job_status = postgresql.ENUM(
+    "queued",
+    "running",
+    "succeeded",
+    "failed",
+    "cancelled",
+    name="biometric_processing_job_status",
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    _job_status.create(bind, checkfirst=True)
+
+    op.create_table(
+        "biometric_processing_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("biometric_sample_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("requested_by_user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("batch_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("request_id", sa.String(length=128), nullable=True),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "queued",
+                "running",
+                "succeeded",
+                "failed",
+                "cancelled",
+                name="biometric_processing_job_status",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("attempt_count", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("locked_by", sa.String(length=255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_reason_code", sa.String(length=64), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_biometric_processing_jobs"),
+        sa.ForeignKeyConstraint(
+            ["biometric_sample_id"],
+            ["biometric_samples.id"],
+            name=op.f("fk_biometric_processing_jobs_biometric_sample_id_biometric_samples"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["requested_by_user_id"],
+            ["users.id"],
+            name="fk_biometric_processing_jobs_requested_by_user_id_users",
+            ondelete="RESTRICT",
+        ),
+        sa.CheckConstraint(
+            "attempt_count >= 0",
+            name="ck_biometric_processing_jobs_attempt_count_non_negative",
+        ),
+        sa.CheckConstraint(
+            "max_attempts > 0",
+            name="ck_biometric_processing_jobs_max_attempts_positive",
+        ),
+        sa.CheckConstraint(
+            "(status = 'running') = (lease_expires_at IS NOT NULL)",
+            name="ck_biometric_processing_jobs_lease_matches_status",
+        ),
+    )
+    op.create_index(
+        "ix_biometric_processing_jobs_biometric_sample_id",
+        "biometric_processing_jobs",
+        ["biometric_sample_id"],
+    )
+    op.create_index(
+        "ix_biometric_processing_jobs_requested_by_user_id",
+        "biometric_processing_jobs",
+        ["requested_by_user_id"],
+    )
+    op.create_index(
+        "ix_biometric_processing_jobs_batch_id",
+        "biometric_processing_jobs",
+        ["batch_id"],
+    )
+    op.create_index(
+        "ix_biometric_processing_jobs_status_available_at",
+        "biometric_processing_jobs",
+        ["status", "available_at"],
+    )
+    op.create_index(
+        "uq_biometric_processing_jobs_sample_open",
+        "biometric_processing_jobs",
+        ["biometric_sample_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "uq_biometric_processing_jobs_sample_open",
+        table_name="biometric_processing_jobs",
+    )
+    op.drop_index(
+        "ix_biometric_processing_jobs_status_available_at",
+        table_name="biometric_processing_jobs",
+    )
+    op.drop_index("ix_biometric_processing_jobs_batch_id", table_name="biometric_processing_jobs")
+    op.drop_index(
+        "ix_biometric_processing_jobs_requested_by_user_id",
+        table_name="biometric_processing_jobs",
+    )
+    op.drop_index(
+        "ix_biometric_processing_jobs_biometric_sample_id",
+        table_name="biometric_processing_jobs",
+    )
+    op.drop_table("biometric_processing_jobs")
+    _job_status.drop(op.get_bind(), checkfirst=True)
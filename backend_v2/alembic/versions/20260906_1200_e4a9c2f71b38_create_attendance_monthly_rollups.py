@@ -0,0 +1,254 @@
+"""create_attendance_monthly_rollups
+
+Revision ID: e4a9c2f71b38
+Revises: b7d3e95a0c21
+Create Date: 2026-09-06 12:00:00.000000
+
+Adds ``attendance_monthly_rollups`` — present/absent/total counts per
+(student, classroom, subject, month) — and the triggers on
+``attendance_records`` that keep it current. See
+``app/modules/attendance/models.py`` (``AttendanceMonthlyRollup``) and
+``app/modules/attendance/rollups.py`` for how it is read.
+
+The triggers are ``AFTER ... FOR EACH STATEMENT`` with transition
+tables: one statement's inserted, updated and deleted rows are folded
+into net per-month deltas and applied with one upsert, in key order, in
+the writer's own transaction. They see every writer — the bulk-save and
+submission upserts, recognition marks, single-row ``create``/``update``
+and the ``ON DELETE CASCADE`` of a student, classroom or subject — so no
+code path can forget to maintain the rollup, and concurrent writers only
+ever add deltas, never overwrite each other's counts. A key that only
+loses rows is updated, never inserted: if its rollup row is already gone,
+the same cascade removed it. ``TRUNCATE attendance_records`` empties the
+rollup too.
+
+Existing attendance rows are rolled up at upgrade time, under a lock
+that blocks attendance writes for the duration of the backfill. Purely
+additive otherwise: no existing table, column, or constraint changes.
+
+``downgrade()`` drops the triggers, their functions and the table,
+landing back at ``b7d3e95a0c21`` exactly.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "e4a9c2f71b38"
+down_revision: str | None = "b7d3e95a0c21"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_DELTA_COLUMNS = "d(student_profile_id, classroom_id, subject_id, month, present, absent)"
+_DELTAS = (
+    "unnest(students, classrooms, subjects, months, present_deltas, absent_deltas) AS "
+    + _DELTA_COLUMNS
+)
+_KEY_MATCHES = (
+    "r.student_profile_id = d.student_profile_id AND r.classroom_id = d.classroom_id "
+    "AND r.subject_id = d.subject_id AND r.month = d.month"
+)
+
+_CREATE_APPLY_FUNCTION = f"""
+CREATE FUNCTION attendance_monthly_rollups_apply(
+    students uuid[],
+    classrooms uuid[],
+    subjects uuid[],
+    months date[],
+    present_deltas integer[],
+    absent_deltas integer[]
+) RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    -- Keys that only gained rows: insert, or add to the existing row.
+    INSERT INTO attendance_monthly_rollups AS r (
+        student_profile_id, classroom_id, subject_id, month,
+        present_count, absent_count, total_count
+    )
+    SELECT d.student_profile_id, d.classroom_id, d.subject_id, d.month,
+           d.present, d.absent, d.present + d.absent
+    FROM {_DELTAS}
+    WHERE d.present >= 0 AND d.absent >= 0
+    ORDER BY d.student_profile_id, d.classroom_id, d.subject_id, d.month
+    ON CONFLICT (student_profile_id, classroom_id, subject_id, month) DO UPDATE SET
+        present_count = r.present_count + EXCLUDED.present_count,
+        absent_count = r.absent_count + EXCLUDED.absent_count,
+        total_count = r.total_count + EXCLUDED.total_count;
+
+    -- Keys that lost rows. No rollup row means a cascading delete of the
+    -- student, classroom or subject has already removed it.
+    UPDATE attendance_monthly_rollups AS r SET
+        present_count = r.present_count + d.present,
+        absent_count = r.absent_count + d.absent,
+        total_count = r.total_count + d.present + d.absent
+    FROM {_DELTAS}
+    WHERE (d.present < 0 OR d.absent < 0) AND {_KEY_MATCHES};
+
+    DELETE FROM attendance_monthly_rollups AS r
+    USING {_DELTAS}
+    WHERE (d.present < 0 OR d.absent < 0) AND {_KEY_MATCHES} AND r.total_count = 0;
+END;
+$$
+"""
+
+
+def _deltas_from(changes: str) -> str:
+    """Fold ``changes`` (key, date, status, sign) into the per-month delta arrays."""
+    return f"""
+        SELECT array_agg(student_profile_id), array_agg(classroom_id),
+               array_agg(subject_id), array_agg(month),
+               array_agg(present), array_agg(absent)
+        INTO students, classrooms, subjects, months, present_deltas, absent_deltas
+        FROM (
+            SELECT student_profile_id, classroom_id, subject_id,
+                   date_trunc('month', attendance_date)::date AS month,
+                   coalesce(sum(sign) FILTER (WHERE status = 'present'), 0)::integer AS present,
+                   coalesce(sum(sign) FILTER (WHERE status = 'absent'), 0)::integer AS absent
+            FROM ({changes}) AS changes
+            GROUP BY 1, 2, 3, 4
+        ) AS deltas
+        WHERE present <> 0 OR absent <> 0;"""
+
+
+_NEW_ROWS = (
+    "SELECT student_profile_id, classroom_id, subject_id, attendance_date, status, 1 AS sign "
+    "FROM new_rows"
+)
+_OLD_ROWS = (
+    "SELECT student_profile_id, classroom_id, subject_id, attendance_date, status, -1 AS sign "
+    "FROM old_rows"
+)
+
+_CREATE_TRIGGER_FUNCTION = f"""
+CREATE FUNCTION attendance_records_maintain_rollups() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    students uuid[];
+    classrooms uuid[];
+    subjects uuid[];
+    months date[];
+    present_deltas integer[];
+    absent_deltas integer[];
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM attendance_monthly_rollups;
+        RETURN NULL;
+    ELSIF TG_OP = 'INSERT' THEN{_deltas_from(_NEW_ROWS)}
+    ELSIF TG_OP = 'DELETE' THEN{_deltas_from(_OLD_ROWS)}
+    ELSE{_deltas_from(f"{_NEW_ROWS} UNION ALL {_OLD_ROWS}")}
+    END IF;
+    IF students IS NOT NULL THEN
+        PERFORM attendance_monthly_rollups_apply(
+            students, classrooms, subjects, months, present_deltas, absent_deltas
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+_TRIGGERS = (
+    ("trg_attendance_records_rollups_insert", "INSERT", "REFERENCING NEW TABLE AS new_rows"),
+    (
+        "trg_attendance_records_rollups_update",
+        "UPDATE",
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    ),
+    ("trg_attendance_records_rollups_delete", "DELETE", "REFERENCING OLD TABLE AS old_rows"),
+    ("trg_attendance_records_rollups_truncate", "TRUNCATE", ""),
+)
+
+_BACKFILL = """
+INSERT INTO attendance_monthly_rollups (
+    student_profile_id, classroom_id, subject_id, month,
+    present_count, absent_count, total_count
+)
+SELECT student_profile_id, classroom_id, subject_id,
+       date_trunc('month', attendance_date)::date,
+       count(*) FILTER (WHERE status = 'present'),
+       count(*) FILTER (WHERE status = 'absent'),
+       count(*)
+FROM attendance_records
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def upgrade() -> None:
+    op.execute("LOCK TABLE attendance_records IN SHARE ROW EXCLUSIVE MODE")
+    op.create_table(
+        "attendance_monthly_rollups",
+        sa.Column("student_profile_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("classroom_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("subject_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("present_count", sa.Integer(), nullable=False),
+        sa.Column("absent_count", sa.Integer(), nullable=False),
+        sa.Column("total_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "student_profile_id",
+            "classroom_id",
+            "subject_id",
+            "month",
+            name="pk_attendance_monthly_rollups",
+        ),
+        sa.ForeignKeyConstraint(
+            ["student_profile_id"],
+            ["student_profiles.id"],
+            name=op.f("fk_attendance_monthly_rollups_student_profile_id_student_profiles"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["classroom_id"],
+            ["classrooms.id"],
+            name="fk_attendance_monthly_rollups_classroom_id_classrooms",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["subject_id"],
+            ["subjects.id"],
+            name="fk_attendance_monthly_rollups_subject_id_subjects",
+            ondelete="CASCADE",
+        ),
+        sa.CheckConstraint(
+            "present_count >= 0 AND absent_count >= 0",
+            name="ck_attendance_monthly_rollups_counts_non_negative",
+        ),
+        sa.CheckConstraint(
+            "total_count = present_count + absent_count",
+            name="ck_attendance_monthly_rollups_total_matches",
+        ),
+        sa.CheckConstraint(
+            "EXTRACT(DAY FROM month) = 1",
+            name="ck_attendance_monthly_rollups_month_first_day",
+        ),
+    )
+    op.create_index(
+        "ix_attendance_monthly_rollups_classroom_subject_month",
+        "attendance_monthly_rollups",
+        ["classroom_id", "subject_id", "month"],
+    )
+    op.execute(_CREATE_APPLY_FUNCTION)
+    op.execute(_CREATE_TRIGGER_FUNCTION)
+    for name, event, referencing in _TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON attendance_records {referencing} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION attendance_records_maintain_rollups()"
+        )
+    op.execute(_BACKFILL)
+
+
+def downgrade() -> None:
+    for name, _event, _referencing in reversed(_TRIGGERS):
+        op.execute(f"DROP TRIGGER {name} ON attendance_records")
+    op.execute("DROP FUNCTION attendance_records_maintain_rollups()")
+    op.execute(
+        "DROP FUNCTION attendance_monthly_rollups_apply("
+        "uuid[], uuid[], uuid[], date[], integer[], integer[])"
+    )
+    op.drop_index(
+        "ix_attendance_monthly_rollups_classroom_subject_month",
+        table_name="attendance_monthly_rollups",
+    )
+    op.drop_table("attendance_monthly_rollups")
@@ -5,7 +5,9 @@
   ``SELECT 1`` against PostgreSQL and returns a sanitized HTTP 503 if
   that fails. This directly replaces the legacy app's shallow health
   check, which reported ``{"status": "ok"}`` even with MongoDB
-  unreachable (docs/AUDIT.md §2.2).
+  unreachable (docs/AUDIT.md §2.2). With ``FACE_PRELOAD_MODELS`` it also
+  answers 503 until the recognition models are loaded and warmed (see
+  app/modules/face_recognition/warmup.py).
 
 Both endpoints are mounted unversioned (not under ``API_V1_PREFIX``) —
 see app/api/router.py and app/main.py.
@@ -18,6 +20,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 
 from app.db.session import require_database_ready
+from app.modules.face_recognition.warmup import require_face_models_ready
 from app.schemas.health import LivenessResponse, ReadinessResponse
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -41,9 +44,17 @@ async def liveness() -> LivenessResponse:
         "Confirms required infrastructure is reachable by running a real "
         "`SELECT 1` against PostgreSQL. Returns HTTP 503 with the "
         "standard sanitized error envelope — never a raw database "
-        "exception — if that check fails."
+        "exception — if that check fails. When startup model preloading "
+        "is enabled, also returns 503 until the face-recognition models "
+        "are loaded and warmed."
     ),
-    responses={503: {"description": "Database is unavailable."}},
+    responses={503: {"description": "Database is unavailable, or the models are not ready yet."}},
 )
-async def readiness(_: Annotated[None, Depends(require_database_ready)]) -> ReadinessResponse:
-    return ReadinessResponse(status="ready", checks={"database": "ready"})
+async def readiness(
+    _: Annotated[None, Depends(require_database_ready)],
+    face_models: Annotated[str | None, Depends(require_face_models_ready)],
+) -> ReadinessResponse:
+    checks = {"database": "ready"}
+    if face_models is not None:
+        checks["face_models"] = face_models
+    return ReadinessResponse(status="ready", checks=checks)
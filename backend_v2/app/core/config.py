@@ -200,11 +200,26 @@ class Settings(BaseSettings):
     # YuNet's own published default input size (docs/adr/0005); conservative
     # and swappable per-model in Stage 3.
     FACE_DETECTOR_INPUT_SIZE_PX: int = 320
+    # Single-face detection (enrollment samples, match probes) on a
+    # reduced-resolution copy whose longer side is at most this many
+    # times FACE_DETECTOR_INPUT_SIZE_PX; boxes/landmarks are mapped back
+    # and alignment still reads the full-resolution image. 0 (the
+    # default) detects at full resolution — see
+    # app/modules/face_recognition/detection_scaling.py.
+    FACE_DETECTOR_WORKING_SIZE_FACTOR: int = 0
     # Placeholder pending the Stage 2/3 embedding-model decision (ADR 0005
     # explicitly defers the exact embedder pending an unresolved upstream
     # licensing question) — MUST be overridden to match whatever model is
     # actually vendored later; validated as a structural sanity bound only.
     FACE_EMBEDDING_DIMENSION: int = 128
+    # Version stamped on every stored embedding, next to the embedder
+    # adapter's own model identifier. Bump it whenever the embedder's
+    # weights (FACE_EMBEDDER_MODEL_PATH) change: matching only compares
+    # embeddings of the current version, and `python -m
+    # scripts.reembed_samples` re-embeds older ones — see
+    # app/modules/face_recognition/reembedding.py. "v1" is what every
+    # embedding stored before this setting existed carries.
+    FACE_EMBEDDING_MODEL_VERSION: str = "v1"
     # Cosine-similarity semantics only (higher = more similar), never a
     # distance metric — see app/modules/face_recognition/domain.py.
     #
@@ -244,7 +259,68 @@ class Settings(BaseSettings):
     # PROVISIONAL structural default (Stage 3), not a calibrated value —
     # see the FACE_MATCH_THRESHOLD note directly above.
     FACE_MATCH_AMBIGUOUS_MARGIN: float = 0.05
+    # Which CosineSimilarityFaceMatcher engine backs get_matcher(...):
+    # "vectorized" packs the candidate gallery into one float32 matrix and
+    # scores it with a single matrix-vector product; "python" is the
+    # original per-candidate reference loop. Both return identical
+    # MatchResult decisions — see
+    # app/modules/face_recognition/providers/similarity_matcher.py.
+    FACE_MATCHER_ENGINE: Literal["python", "vectorized"] = "vectorized"
+    # In-process LRU of packed candidate galleries, keyed by candidate
+    # scope (the exact set of student IDs a probe is matched against).
+    # 0 disables the cache. Entries are dropped after every committed
+    # embedding/sample lifecycle change in this process; the TTL bounds
+    # how long a change committed by *another* process can go unseen —
+    # see app/modules/face_recognition/gallery_cache.py. Only used by the
+    # "vectorized" engine.
+    FACE_GALLERY_CACHE_MAX_ENTRIES: int = 64
+    FACE_GALLERY_CACHE_TTL_SECONDS: int = 60
+    # Embeddings keyed by image SHA-256 plus detector/embedder model
+    # checksums, alignment version and detection settings, so a retried
+    # enrollment sample skips inference (probes are never cached). An
+    # in-process LRU (0 disables) and an optional disk tier under
+    # BIOMETRIC_STORAGE_ROOT shared by every process (0, the default,
+    # disables it). Entries are purged when their sample is retired or
+    # deleted; the TTL bounds how long a memory entry survives a deletion
+    # committed by *another* process — see
+    # app/modules/face_recognition/embedding_cache.py.
+    FACE_EMBEDDING_CACHE_MAX_ENTRIES: int = 1024
+    FACE_EMBEDDING_CACHE_TTL_SECONDS: int = 600
+    FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES: int = 0
+    # Group-photo recognition attendance (one classroom photo, many faces):
+    # the most faces one photo may yield (never above the 200-row
+    # attendance batch cap), and the square tile edge used to re-detect
+    # at native resolution in photos larger than one tile, so small
+    # back-row faces are still found — see
+    # app/modules/face_recognition/tiling.py.
+    FACE_GROUP_MAX_FACES: int = 80
+    FACE_GROUP_TILE_SIZE_PX: int = 960
+    # Batch recognition attendance (several single-face photos for one
+    # classroom/subject/date in one request): the most images one request
+    # may carry, never above the 200-row attendance batch cap.
+    FACE_ATTENDANCE_BATCH_MAX_IMAGES: int = 40
+    # Quality floors checked on the aligned face before embedding; a face
+    # below any of them is rejected (FACE_IMAGE_QUALITY_TOO_LOW) so the
+    # photo can be retaken. Variance of the Laplacian, mean and standard
+    # deviation of the grey level (0-255), and eye-to-eye distance in
+    # original-image pixels. 0 disables a check; all are off by default
+    # — see app/modules/face_recognition/quality.py.
+    FACE_QUALITY_MIN_SHARPNESS: float = 0.0
+    FACE_QUALITY_MIN_BRIGHTNESS: float = 0.0
+    FACE_QUALITY_MIN_CONTRAST: float = 0.0
+    FACE_QUALITY_MIN_INTER_OCULAR_PX: float = 0.0
     FACE_INFERENCE_DEVICE: Literal["cpu", "cuda"] = "cpu"
+    # Most detector/embedder instances one process runs inference on at
+    # once (app/modules/face_recognition/provider_pool.py). Instances are
+    # created only under concurrent load, each with its own copy of its
+    # model; 1 serializes all inference in the process, as before.
+    FACE_PROVIDER_POOL_SIZE: int = 1
+    # Load and warm every detector/embedder instance (all
+    # FACE_PROVIDER_POOL_SIZE of each) during API startup instead of on
+    # first use; GET /health/ready answers 503 until that has finished.
+    # Ignored when FACE_RECOGNITION_PROVIDER=none.
+    # See app/modules/face_recognition/warmup.py.
+    FACE_PRELOAD_MODELS: bool = False
     # Deliberately a relative, non-web-root path by default (validated
     # below); a real deployment should override this to an absolute path
     # outside anything served statically. See docs/BIOMETRIC_DATA_POLICY.md.
@@ -273,6 +349,26 @@ class Settings(BaseSettings):
     # process — a bounded, on-demand batch, never an always-running
     # worker (Stage 3 brief §8).
     FACE_PROCESSING_BATCH_LIMIT: int = 20
+    # Worker processes for that batch's decode -> detect -> align -> embed
+    # work (app/modules/face_recognition/processing_pool.py). 0 keeps it
+    # in-process on one worker thread; each worker loads its own copy of
+    # both models, so size this against memory as well as cores.
+    FACE_PROCESSING_WORKERS: int = 0
+    # Durable processing queue (app/modules/face_recognition/processing_jobs.py),
+    # drained by `python -m scripts.processing_worker`: attempts per job
+    # before its sample is marked failed, the first retry delay (doubled
+    # per attempt), how long a claimed job stays locked to one worker
+    # before another may take it over, and the idle poll interval.
+    FACE_PROCESSING_JOB_MAX_ATTEMPTS: int = 5
+    FACE_PROCESSING_JOB_RETRY_BASE_SECONDS: int = 30
+    FACE_PROCESSING_JOB_LEASE_SECONDS: int = 600
+    FACE_PROCESSING_WORKER_POLL_SECONDS: float = 5.0
+    # Re-embedding after a FACE_EMBEDDING_MODEL_VERSION change
+    # (`python -m scripts.reembed_samples`): samples per batch, and the
+    # pause between batches that leaves CPU and database time to online
+    # recognition.
+    FACE_REEMBED_BATCH_SIZE: int = 50
+    FACE_REEMBED_PAUSE_SECONDS: float = 1.0
 
     # --- Face recognition (Phase 5 Stage 2: enrollment/ingestion bounds) -------
     # Still provider-neutral: nothing below names, loads, or downloads a
@@ -432,6 +528,13 @@ class Settings(BaseSettings):
             raise ValueError("FACE_DETECTOR_INPUT_SIZE_PX must be between 32 and 4096 pixels.")
         return value
 
+    @field_validator("FACE_DETECTOR_WORKING_SIZE_FACTOR")
+    @classmethod
+    def _validate_face_detector_working_size_factor(cls, value: int) -> int:
+        if not (0 <= value <= 16):
+            raise ValueError("FACE_DETECTOR_WORKING_SIZE_FACTOR must be between 0 and 16.")
+        return value
+
     @field_validator("FACE_EMBEDDING_DIMENSION")
     @classmethod
     def _validate_face_embedding_dimension(cls, value: int) -> int:
@@ -439,6 +542,14 @@ class Settings(BaseSettings):
             raise ValueError("FACE_EMBEDDING_DIMENSION must be between 8 and 4096.")
         return value
 
+    @field_validator("FACE_EMBEDDING_MODEL_VERSION")
+    @classmethod
+    def _validate_face_embedding_model_version(cls, value: str) -> str:
+        normalized = value.strip()
+        if not (1 <= len(normalized) <= 64):
+            raise ValueError("FACE_EMBEDDING_MODEL_VERSION must be 1 to 64 characters.")
+        return normalized
+
     @field_validator("FACE_MATCH_THRESHOLD")
     @classmethod
     def _validate_face_match_threshold(cls, value: float) -> float:
@@ -479,6 +590,146 @@ class Settings(BaseSettings):
             raise ValueError("FACE_PROCESSING_BATCH_LIMIT must be between 1 and 500.")
         return value
 
+    @field_validator("FACE_PROVIDER_POOL_SIZE")
+    @classmethod
+    def _validate_face_provider_pool_size(cls, value: int) -> int:
+        if not (1 <= value <= 32):
+            raise ValueError("FACE_PROVIDER_POOL_SIZE must be between 1 and 32.")
+        return value
+
+    @field_validator("FACE_PROCESSING_WORKERS")
+    @classmethod
+    def _validate_face_processing_workers(cls, value: int) -> int:
+        if not (0 <= value <= 64):
+            raise ValueError("FACE_PROCESSING_WORKERS must be between 0 and 64.")
+        return value
+
+    @field_validator("FACE_PROCESSING_JOB_MAX_ATTEMPTS")
+    @classmethod
+    def _validate_face_processing_job_max_attempts(cls, value: int) -> int:
+        if not (1 <= value <= 20):
+            raise ValueError("FACE_PROCESSING_JOB_MAX_ATTEMPTS must be between 1 and 20.")
+        return value
+
+    @field_validator("FACE_PROCESSING_JOB_RETRY_BASE_SECONDS")
+    @classmethod
+    def _validate_face_processing_job_retry_base_seconds(cls, value: int) -> int:
+        if not (1 <= value <= 3600):
+            raise ValueError("FACE_PROCESSING_JOB_RETRY_BASE_SECONDS must be between 1 and 3600.")
+        return value
+
+    @field_validator("FACE_PROCESSING_JOB_LEASE_SECONDS")
+    @classmethod
+    def _validate_face_processing_job_lease_seconds(cls, value: int) -> int:
+        if not (30 <= value <= 86400):
+            raise ValueError("FACE_PROCESSING_JOB_LEASE_SECONDS must be between 30 and 86400.")
+        return value
+
+    @field_validator("FACE_PROCESSING_WORKER_POLL_SECONDS")
+    @classmethod
+    def _validate_face_processing_worker_poll_seconds(cls, value: float) -> float:
+        if not (0.1 <= value <= 300):
+            raise ValueError("FACE_PROCESSING_WORKER_POLL_SECONDS must be between 0.1 and 300.")
+        return value
+
+    @field_validator("FACE_REEMBED_BATCH_SIZE")
+    @classmethod
+    def _validate_face_reembed_batch_size(cls, value: int) -> int:
+        if not (1 <= value <= 1000):
+            raise ValueError("FACE_REEMBED_BATCH_SIZE must be between 1 and 1000.")
+        return value
+
+    @field_validator("FACE_REEMBED_PAUSE_SECONDS")
+    @classmethod
+    def _validate_face_reembed_pause_seconds(cls, value: float) -> float:
+        if not (0 <= value <= 3600):
+            raise ValueError("FACE_REEMBED_PAUSE_SECONDS must be between 0 and 3600.")
+        return value
+
+    @field_validator("FACE_GALLERY_CACHE_MAX_ENTRIES")
+    @classmethod
+    def _validate_face_gallery_cache_max_entries(cls, value: int) -> int:
+        if not (0 <= value <= 4096):
+            raise ValueError("FACE_GALLERY_CACHE_MAX_ENTRIES must be between 0 and 4096.")
+        return value
+
+    @field_validator("FACE_GALLERY_CACHE_TTL_SECONDS")
+    @classmethod
+    def _validate_face_gallery_cache_ttl_seconds(cls, value: int) -> int:
+        if not (1 <= value <= 3600):
+            raise ValueError("FACE_GALLERY_CACHE_TTL_SECONDS must be between 1 and 3600.")
+        return value
+
+    @field_validator("FACE_EMBEDDING_CACHE_MAX_ENTRIES")
+    @classmethod
+    def _validate_face_embedding_cache_max_entries(cls, value: int) -> int:
+        if not (0 <= value <= 65536):
+            raise ValueError("FACE_EMBEDDING_CACHE_MAX_ENTRIES must be between 0 and 65536.")
+        return value
+
+    @field_validator("FACE_EMBEDDING_CACHE_TTL_SECONDS")
+    @classmethod
+    def _validate_face_embedding_cache_ttl_seconds(cls, value: int) -> int:
+        if not (1 <= value <= 86400):
+            raise ValueError("FACE_EMBEDDING_CACHE_TTL_SECONDS must be between 1 and 86400.")
+        return value
+
+    @field_validator("FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES")
+    @classmethod
+    def _validate_face_embedding_cache_disk_max_entries(cls, value: int) -> int:
+        if not (0 <= value <= 1_000_000):
+            raise ValueError("FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES must be between 0 and 1000000.")
+        return value
+
+    @field_validator("FACE_GROUP_MAX_FACES")
+    @classmethod
+    def _validate_face_group_max_faces(cls, value: int) -> int:
+        if not (1 <= value <= 200):
+            raise ValueError("FACE_GROUP_MAX_FACES must be between 1 and 200.")
+        return value
+
+    @field_validator("FACE_ATTENDANCE_BATCH_MAX_IMAGES")
+    @classmethod
+    def _validate_face_attendance_batch_max_images(cls, value: int) -> int:
+        if not (1 <= value <= 200):
+            raise ValueError("FACE_ATTENDANCE_BATCH_MAX_IMAGES must be between 1 and 200.")
+        return value
+
+    @field_validator("FACE_QUALITY_MIN_SHARPNESS")
+    @classmethod
+    def _validate_face_quality_min_sharpness(cls, value: float) -> float:
+        if not (0.0 <= value <= 1_000_000.0):
+            raise ValueError("FACE_QUALITY_MIN_SHARPNESS must be between 0 and 1000000.")
+        return value
+
+    @field_validator("FACE_QUALITY_MIN_BRIGHTNESS")
+    @classmethod
+    def _validate_face_quality_min_brightness(cls, value: float) -> float:
+        if not (0.0 <= value <= 255.0):
+            raise ValueError("FACE_QUALITY_MIN_BRIGHTNESS must be between 0 and 255.")
+        return value
+
+    @field_validator("FACE_QUALITY_MIN_CONTRAST")
+    @classmethod
+    def _validate_face_quality_min_contrast(cls, value: float) -> float:
+        if not (0.0 <= value <= 128.0):
+            raise ValueError("FACE_QUALITY_MIN_CONTRAST must be between 0 and 128.")
+        return value
+
+    @field_validator("FACE_QUALITY_MIN_INTER_OCULAR_PX")
+    @classmethod
+    def _validate_face_quality_min_inter_ocular_px(cls, value: float) -> float:
+        if not (0.0 <= value <= 10_000.0):
+            raise ValueError("FACE_QUALITY_MIN_INTER_OCULAR_PX must be between 0 and 10000.")
+        return value
+
+    @field_validator("FACE_GROUP_TILE_SIZE_PX")
+    @classmethod
+    def _validate_face_group_tile_size_px(cls, value: int) -> int:
+        if not (320 <= value <= 4096):
+            raise ValueError("FACE_GROUP_TILE_SIZE_PX must be between 320 and 4096 pixels.")
+        return value
+
     @field_validator("MAX_ENROLLMENT_IMAGE_BYTES")
     @classmethod
     def _validate_max_enrollment_image_bytes(cls, value: int) -> int:
@@ -104,6 +104,20 @@ class DatabaseUnavailableError(AppError):
         super().__init__("The database is temporarily unavailable.")
 
 
+class InvalidPaginationCursorError(AppError):
+    """Raised for a ``cursor`` query parameter this API did not issue.
+
+    Also raised when a ``cursor`` is combined with a non-zero ``offset`` —
+    a cursor already says where the page starts.
+    """
+
+    code = "INVALID_PAGINATION_CURSOR"
+    status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def __init__(self, message: str = "The pagination cursor is invalid.") -> None:
+        super().__init__(message)
+
+
 async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
     return _error_response(
         request,
@@ -7,7 +7,9 @@ already registered here. Phase 4 Stage 1 adds attendance core and the
 audit trail (``app.modules.attendance``). Phase 5 Stage 2 adds biometric
 enrollment/sample models (``app.modules.biometric_enrollment``). Phase 5
 Stage 3 adds the persisted embedding model; Stage 4 adds the safe recognition
-attendance-attempt lifecycle model. Detection/alignment/matching remain
+attendance-attempt lifecycle model; the processing-job queue adds
+``BiometricProcessingJob``; the attendance rollups add
+``AttendanceMonthlyRollup``. Detection/alignment/matching remain
 stateless. Every model must be
 imported somewhere before ``Base.metadata``/``alembic/env.py``'s
 ``target_metadata`` is used, or Alembic autogenerate silently sees an
@@ -27,6 +29,7 @@ from app.modules.announcements.models import (
     AnnouncementClassroom,
 )
 from app.modules.attendance.models import (
+    AttendanceMonthlyRollup,
     AttendanceRecord,
     AttendanceStatus,
     AuditLog,
@@ -40,7 +43,12 @@ from app.modules.biometric_enrollment.models import (
     RecognitionProcessingState,
     SampleStatus,
 )
-from app.modules.face_recognition.models import BiometricEmbedding, RecognitionAttendanceAttempt
+from app.modules.face_recognition.models import (
+    BiometricEmbedding,
+    BiometricProcessingJob,
+    ProcessingJobStatus,
+    RecognitionAttendanceAttempt,
+)
 from app.modules.profiles.models import StudentProfile, TeacherProfile
 from app.modules.users.models import User
 
@@ -48,16 +56,19 @@ __all__ = [
     "Announcement",
     "AnnouncementAudience",
     "AnnouncementClassroom",
+    "AttendanceMonthlyRollup",
     "AttendanceRecord",
     "AttendanceStatus",
     "AuditLog",
     "AuditOutcome",
     "BiometricEmbedding",
     "BiometricEnrollment",
+    "BiometricProcessingJob",
     "BiometricSample",
     "Classroom",
     "DayOfWeek",
     "EnrollmentStatus",
+    "ProcessingJobStatus",
     "RecognitionAttendanceAttempt",
     "RecognitionProcessingState",
     "RefreshSession",
@@ -10,6 +10,7 @@ role-scoped reads, and bounded bulk imports under ``/api/v1``.
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
@@ -20,11 +21,13 @@ from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from app.api.router import api_router
 from app.api.routes import health
-from app.core.config import get_settings
+from app.core.config import FaceRecognitionProvider, get_settings
 from app.core.exceptions import EXCEPTION_HANDLERS
 from app.core.logging import configure_logging
 from app.core.middleware import LoginRateLimitMiddleware, RequestIDMiddleware
 from app.db.session import dispose_all_engines
+from app.modules.face_recognition.processing_pool import shutdown_processing_pool
+from app.modules.face_recognition.warmup import ModelWarmup, run_model_warmup
 from app.schemas.health import RootResponse
 
 logger = structlog.get_logger(__name__)
@@ -39,10 +42,25 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         app_env=settings.APP_ENV.value,
         app_version=settings.APP_VERSION,
     )
+    # Opt-in: load and warm the recognition models in the background while
+    # /health/ready reports not-ready — see app/modules/face_recognition/warmup.py.
+    app.state.face_model_warmup = None
+    warmup_task: asyncio.Task[None] | None = None
+    if (
+        settings.FACE_PRELOAD_MODELS
+        and settings.FACE_RECOGNITION_PROVIDER is not FaceRecognitionProvider.NONE
+    ):
+        app.state.face_model_warmup = ModelWarmup()
+        warmup_task = asyncio.create_task(run_model_warmup(settings, app.state.face_model_warmup))
     try:
         yield
     finally:
+        if warmup_task is not None:
+            warmup_task.cancel()
         await dispose_all_engines()
+        # Blocks until the enrollment-processing workers (if any were
+        # started) exit; off the loop so shutdown stays responsive.
+        await asyncio.to_thread(shutdown_processing_pool)
         logger.info("shutdown", app_name=settings.APP_NAME)
 
 
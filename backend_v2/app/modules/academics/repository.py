@@ -12,6 +12,7 @@ from __future__ import annotations
 
 import builtins
 import uuid
+from collections.abc import Collection
 from datetime import time
 
 from sqlalchemy import and_, func, select
@@ -79,6 +80,14 @@ class ClassroomRepository:
     async def get_by_id(self, classroom_id: uuid.UUID) -> Classroom | None:
         return await self._session.get(Classroom, classroom_id)
 
+    async def get_by_ids(self, classroom_ids: Collection[uuid.UUID]) -> dict[uuid.UUID, Classroom]:
+        """The existing classrooms among ``classroom_ids``, keyed by ID, in one query."""
+        if not classroom_ids:
+            return {}
+        stmt = select(Classroom).where(Classroom.id.in_(classroom_ids))
+        result = await self._session.execute(stmt)
+        return {classroom.id: classroom for classroom in result.scalars().all()}
+
     async def get_by_code(self, code: str) -> Classroom | None:
         """Look up by code. ``code`` must already be normalized by the caller."""
         stmt = select(Classroom).where(Classroom.code == code)
@@ -184,6 +193,14 @@ class SubjectRepository:
     async def get_by_id(self, subject_id: uuid.UUID) -> Subject | None:
         return await self._session.get(Subject, subject_id)
 
+    async def get_by_ids(self, subject_ids: Collection[uuid.UUID]) -> dict[uuid.UUID, Subject]:
+        """The existing subjects among ``subject_ids``, keyed by ID, in one query."""
+        if not subject_ids:
+            return {}
+        stmt = select(Subject).where(Subject.id.in_(subject_ids))
+        result = await self._session.execute(stmt)
+        return {subject.id: subject for subject in result.scalars().all()}
+
     async def get_by_code(self, code: str) -> Subject | None:
         """Look up by code. ``code`` must already be normalized by the caller."""
         stmt = select(Subject).where(Subject.code == code)
@@ -23,11 +23,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db_session
 from app.modules.attendance.errors import AuditLogNotFoundError
 from app.modules.attendance.models import AuditOutcome
-from app.modules.attendance.repository import AuditLogRepository
+from app.modules.attendance.repository import AuditLogListCursor, AuditLogRepository
 from app.modules.attendance.schemas import AuditLogRead
 from app.modules.auth.dependencies import require_roles
 from app.modules.users.models import User, UserRole
-from app.schemas.pagination import Page
+from app.schemas.pagination import CursorPage, reject_offset_with_cursor
 
 router = APIRouter(prefix="/audit-logs", tags=["audit logs"])
 
@@ -35,7 +35,7 @@ AdminUser = Annotated[User, Depends(require_roles(UserRole.ADMIN))]
 Session = Annotated[AsyncSession, Depends(get_db_session)]
 
 
-@router.get("", response_model=Page[AuditLogRead])
+@router.get("", response_model=CursorPage[AuditLogRead])
 async def list_audit_logs(
     _admin: AdminUser,
     session: Session,
@@ -49,12 +49,19 @@ async def list_audit_logs(
     date_to: date | None = None,
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
     offset: Annotated[int, Query(ge=0)] = 0,
-) -> Page[AuditLogRead]:
+    cursor: Annotated[str | None, Query(max_length=512)] = None,
+    include_total: bool = True,
+) -> CursorPage[AuditLogRead]:
     """Deterministically ordered (newest first), bounded, filtered audit-log list.
 
     Admin-only — a teacher or student caller receives 403 from the
     ``require_roles`` dependency before this function body ever runs.
+    Pages by ``offset`` or by the previous page's ``next_cursor``, which
+    stays as cheap at page 500 as at page 1; ``include_total=false``
+    skips the count over the whole filter.
     """
+    reject_offset_with_cursor(cursor, offset)
+    after = AuditLogListCursor.decode(cursor) if cursor is not None else None
     repository = AuditLogRepository(session)
     rows = await repository.list(
         actor_user_id=actor_user_id,
@@ -65,24 +72,33 @@ async def list_audit_logs(
         subject_id=subject_id,
         date_from=date_from,
         date_to=date_to,
-        limit=limit,
+        limit=limit + 1,
         offset=offset,
+        after=after,
     )
-    total = await repository.count(
-        actor_user_id=actor_user_id,
-        action=action,
-        outcome=outcome,
-        entity_type=entity_type,
-        classroom_id=classroom_id,
-        subject_id=subject_id,
-        date_from=date_from,
-        date_to=date_to,
+    total = (
+        await repository.count(
+            actor_user_id=actor_user_id,
+            action=action,
+            outcome=outcome,
+            entity_type=entity_type,
+            classroom_id=classroom_id,
+            subject_id=subject_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        if include_total
+        else None
+    )
+    next_cursor = (
+        AuditLogListCursor.after_record(rows[limit - 1]).encode() if len(rows) > limit else None
     )
-    return Page[AuditLogRead](
-        items=[AuditLogRead.model_validate(row) for row in rows],
+    return CursorPage[AuditLogRead](
+        items=[AuditLogRead.model_validate(row) for row in rows[:limit]],
         total=total,
         limit=limit,
         offset=offset,
+        next_cursor=next_cursor,
     )
 
 
@@ -1,13 +1,15 @@
-"""In-memory attendance CSV generation, with formula-injection protection.
+"""Streaming attendance CSV generation, with formula-injection protection.
 
 Phase 4 Stage 3. Kept as a small, focused helper module (not folded into
 ``router.py``) so the CSV-building logic — column order, cell escaping,
 filename construction — is independently readable and testable without
 needing a running FastAPI app or database.
 
-Never writes a temporary file: the whole document is built in a single
-in-memory ``io.StringIO`` buffer and returned as a ``str``, which the
-router encodes to UTF-8 bytes for the HTTP response body.
+Never writes a temporary file and never holds the whole document:
+``iter_attendance_csv`` renders one chunk of rows at a time into a small
+``io.StringIO`` buffer and yields it as UTF-8 bytes, which the router
+sends as a streamed HTTP response body. Memory stays at one chunk however
+many rows an export covers.
 """
 
 from __future__ import annotations
@@ -15,6 +17,7 @@ from __future__ import annotations
 import csv
 import io
 import re
+from collections.abc import AsyncIterable, AsyncIterator
 
 from app.modules.academics.models import Classroom, Subject
 from app.modules.attendance.repository import AttendanceExportRow
@@ -67,38 +70,51 @@ def safe_filename_component(value: str, *, fallback: str) -> str:
     return _UNSAFE_FILENAME_CHARS.sub("_", value) or fallback
 
 
-def build_attendance_csv(
-    *, classroom: Classroom, subject: Subject, rows: list[AttendanceExportRow]
-) -> str:
-    """Build the full CSV document (header + data rows) as an in-memory string.
-
-    Always UTF-8-safe (plain ``str``, encoded by the router). Always
-    includes the header row, even when ``rows`` is empty — a valid CSV
-    with zero data rows, per the Stage 3 brief's "empty result returns
-    headers" requirement. ``classroom_code``/``subject_code`` come from
-    the already-authorized ``Classroom``/``Subject`` (constant for every
-    row in a single export, since ``classroom_id``/``subject_id`` are
-    required, exact-scope filters), never re-derived per row.
-    """
+def _csv_chunk(rows: list[list[str]] | tuple[tuple[str, ...], ...]) -> bytes:
     buffer = io.StringIO()
-    writer = csv.writer(buffer, lineterminator="\n")
-    writer.writerow(CSV_COLUMNS)
-    for row in rows:
-        writer.writerow(
-            [
-                row.attendance_date.isoformat(),
-                classroom.code,
-                subject.code,
-                str(row.student_profile_id),
-                safe_csv_text_cell(row.student_roll_number),
-                row.status.value,
-                safe_csv_text_cell(row.remarks),
-                str(row.marked_by_user_id),
-                row.created_at.isoformat(),
-                row.updated_at.isoformat(),
-            ]
-        )
-    return buffer.getvalue()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _csv_row(*, classroom: Classroom, subject: Subject, row: AttendanceExportRow) -> list[str]:
+    return [
+        row.attendance_date.isoformat(),
+        classroom.code,
+        subject.code,
+        str(row.student_profile_id),
+        safe_csv_text_cell(row.student_roll_number),
+        row.status.value,
+        safe_csv_text_cell(row.remarks),
+        str(row.marked_by_user_id),
+        row.created_at.isoformat(),
+        row.updated_at.isoformat(),
+    ]
+
+
+async def iter_attendance_csv(
+    *,
+    classroom: Classroom,
+    subject: Subject,
+    chunks: AsyncIterable[list[AttendanceExportRow]],
+) -> AsyncIterator[bytes]:
+    """Yield the CSV document (header, then data rows) as UTF-8 byte chunks.
+
+    The header row is yielded before ``chunks`` is first pulled, so a
+    client gets its first byte before the export query has run; each
+    following item is one chunk of rows rendered and encoded on its own.
+    Always includes the header row, even when there are no rows — a valid
+    CSV with zero data rows, per the Stage 3 brief's "empty result
+    returns headers" requirement. ``classroom_code``/``subject_code`` come
+    from the already-authorized ``Classroom``/``Subject`` (constant for
+    every row in a single export, since ``classroom_id``/``subject_id``
+    are required, exact-scope filters), never re-derived per row.
+    """
+    yield _csv_chunk((CSV_COLUMNS,))
+    async for rows in chunks:
+        if rows:
+            yield _csv_chunk(
+                [_csv_row(classroom=classroom, subject=subject, row=row) for row in rows]
+            )
 
 
 def build_export_filename(*, classroom: Classroom, subject: Subject) -> str:
@@ -118,9 +134,9 @@ def build_export_filename(*, classroom: Classroom, subject: Subject) -> str:
 
 __all__ = [
     "CSV_COLUMNS",
-    "build_attendance_csv",
     "build_export_filename",
     "escape_csv_formula_cell",
+    "iter_attendance_csv",
     "safe_csv_text_cell",
     "safe_filename_component",
 ]
@@ -109,6 +109,21 @@ class AttendanceDuplicateStudentInBatchError(AppError):
         super().__init__("The batch contains a duplicate student_profile_id.")
 
 
+class AttendanceDuplicateScopeInSubmissionError(AppError):
+    """Defense-in-depth backstop behind ``MultiScopeAttendanceRequest``.
+
+    Raised only when ``AttendanceService.bulk_save_scopes`` is reached
+    with the same (classroom, subject) scope twice — the schema already
+    rejects that at request-parsing time.
+    """
+
+    code = "ATTENDANCE_DUPLICATE_SCOPE_IN_SUBMISSION"
+    status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def __init__(self) -> None:
+        super().__init__("The submission contains a duplicate classroom/subject scope.")
+
+
 class AttendanceRoleNotPermittedError(AppError):
     """Defense-in-depth backstop behind the router's future ``require_roles``.
 
@@ -57,6 +57,16 @@ for full rationale; summarized here at the point of use):
   cookie, or stack trace (Phase 4 brief, instruction D). The column is
   named ``event_metadata`` rather than ``metadata``, since ``metadata`` is
   reserved by SQLAlchemy's ``DeclarativeBase``.
+- **``AttendanceMonthlyRollup`` is derived data**, one row per
+  (student, classroom, subject, month) with at least one attendance row,
+  holding that month's present/absent/total counts. The application
+  never writes it: statement-level triggers on ``attendance_records``
+  (created by migration ``e4a9c2f71b38``) apply each statement's net
+  change in the writer's own transaction, whichever code path wrote —
+  the bulk-save and submission upserts, recognition marks, or a
+  cascading delete. Stats and report aggregates read it for whole
+  months (``app.modules.attendance.rollups``), and
+  ``scripts/check_attendance_rollups.py`` verifies or rebuilds it.
 """
 
 from __future__ import annotations
@@ -230,7 +240,64 @@ class AuditLog(Base):
         )
 
 
+class AttendanceMonthlyRollup(Base):
+    """Present/absent/total counts of one student's attendance rows in one
+    classroom/subject/month.
+
+    Maintained only by the ``attendance_records`` triggers — see this
+    module's docstring. ``month`` is the first day of the month; a row
+    whose counts reach zero is deleted rather than kept.
+    """
+
+    __tablename__ = "attendance_monthly_rollups"
+
+    student_profile_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("student_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    classroom_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("classrooms.id", ondelete="CASCADE"), primary_key=True
+    )
+    subject_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("subjects.id", ondelete="CASCADE"), primary_key=True
+    )
+    month: Mapped[date] = mapped_column(Date(), primary_key=True)
+    present_count: Mapped[int] = mapped_column(sa.Integer(), nullable=False)
+    absent_count: Mapped[int] = mapped_column(sa.Integer(), nullable=False)
+    total_count: Mapped[int] = mapped_column(sa.Integer(), nullable=False)
+
+    __table_args__ = (
+        sa.CheckConstraint(
+            "present_count >= 0 AND absent_count >= 0",
+            name="counts_non_negative",
+        ),
+        sa.CheckConstraint(
+            "total_count = present_count + absent_count",
+            name="total_matches",
+        ),
+        sa.CheckConstraint(
+            "EXTRACT(DAY FROM month) = 1",
+            name="month_first_day",
+        ),
+        sa.Index(
+            "ix_attendance_monthly_rollups_classroom_subject_month",
+            "classroom_id",
+            "subject_id",
+            "month",
+        ),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return (
+            f"AttendanceMonthlyRollup(student_profile_id={self.student_profile_id!r}, "
+            f"classroom_id={self.classroom_id!r}, subject_id={self.subject_id!r}, "
+            f"month={self.month!r}, total_count={self.total_count!r})"
+        )
+
+
 __all__ = [
+    "AttendanceMonthlyRollup",
     "AttendanceRecord",
     "AttendanceStatus",
     "AuditLog",
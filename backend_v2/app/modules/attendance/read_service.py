@@ -46,6 +46,7 @@ source for no stated benefit.
 from __future__ import annotations
 
 import uuid
+from collections.abc import AsyncIterator
 from datetime import date
 
 import structlog
@@ -68,9 +69,10 @@ from app.modules.attendance.errors import (
     AttendanceRoleNotPermittedError,
     AttendanceScopeNotFoundError,
 )
-from app.modules.attendance.models import AttendanceStatus
+from app.modules.attendance.models import AttendanceRecord, AttendanceStatus
 from app.modules.attendance.repository import (
     AttendanceExportRow,
+    AttendanceListCursor,
     AttendanceRepository,
     AuditLogRepository,
 )
@@ -90,7 +92,7 @@ from app.modules.profiles.errors import StudentProfileNotFoundError
 from app.modules.profiles.models import StudentProfile
 from app.modules.profiles.repository import StudentProfileRepository, TeacherProfileRepository
 from app.modules.users.models import User, UserRole
-from app.schemas.pagination import Page
+from app.schemas.pagination import CursorPage, reject_offset_with_cursor
 
 logger = structlog.get_logger(__name__)
 
@@ -100,6 +102,10 @@ ACTION_ATTENDANCE_READ_ROSTER = "attendance.read_roster"
 ACTION_ATTENDANCE_READ_STATS = "attendance.read_stats"
 ACTION_ATTENDANCE_EXPORT = "attendance.export"
 
+# Rows fetched per round trip while streaming a CSV export: large enough
+# that fetch overhead is negligible, small enough that memory stays flat.
+EXPORT_FETCH_CHUNK_ROWS = 1000
+
 _ENTITY_TYPE_ATTENDANCE_SCOPE = "attendance_scope"
 
 # Safe, non-identifying reason codes recorded server-side only, in the
@@ -118,6 +124,22 @@ def _validate_date_range(date_from: date | None, date_to: date | None) -> None:
         raise AttendanceInvalidDateRangeError()
 
 
+def _detail_page(
+    rows: list[AttendanceRecord], *, limit: int, offset: int, total: int | None
+) -> CursorPage[AttendanceRecordRead]:
+    """``rows`` holds up to ``limit + 1`` rows; the extra one only signals a next page."""
+    next_cursor = (
+        AttendanceListCursor.after_record(rows[limit - 1]).encode() if len(rows) > limit else None
+    )
+    return CursorPage[AttendanceRecordRead](
+        items=[AttendanceRecordRead.model_validate(row) for row in rows[:limit]],
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor,
+    )
+
+
 class AttendanceReadService:
     """Read-scope authorization plus detail/daily/stats/export/self-service queries."""
 
@@ -310,9 +332,21 @@ class AttendanceReadService:
         status: AttendanceStatus | None,
         limit: int,
         offset: int,
+        cursor: str | None,
+        include_total: bool,
         request_id: str | None,
-    ) -> Page[AttendanceRecordRead]:
+    ) -> CursorPage[AttendanceRecordRead]:
+        """One page by ``offset`` or, with ``cursor``, by keyset.
+
+        Every page carries ``next_cursor`` when more rows follow, so a
+        client can switch to keyset paging from any offset page. The
+        cursor is decoded before authorization so a malformed one fails
+        without touching the database; ``total`` is only counted when
+        ``include_total`` asks for it.
+        """
         _validate_date_range(date_from, date_to)
+        reject_offset_with_cursor(cursor, offset)
+        after = AttendanceListCursor.decode(cursor) if cursor is not None else None
         await self.authorize_scope(
             current_user,
             classroom_id=classroom_id,
@@ -327,23 +361,23 @@ class AttendanceReadService:
             date_from=date_from,
             date_to=date_to,
             status=status,
-            limit=limit,
+            limit=limit + 1,
             offset=offset,
+            after=after,
         )
-        total = await self._attendance.count(
-            classroom_id=classroom_id,
-            subject_id=subject_id,
-            student_profile_id=student_profile_id,
-            date_from=date_from,
-            date_to=date_to,
-            status=status,
-        )
-        return Page[AttendanceRecordRead](
-            items=[AttendanceRecordRead.model_validate(row) for row in rows],
-            total=total,
-            limit=limit,
-            offset=offset,
+        total = (
+            await self._attendance.count(
+                classroom_id=classroom_id,
+                subject_id=subject_id,
+                student_profile_id=student_profile_id,
+                date_from=date_from,
+                date_to=date_to,
+                status=status,
+            )
+            if include_total
+            else None
         )
+        return _detail_page(rows, limit=limit, offset=offset, total=total)
 
     # --- daily ----------------------------------------------------------
 
@@ -486,14 +520,17 @@ class AttendanceReadService:
         date_to: date | None,
         status: AttendanceStatus | None,
         request_id: str | None,
-    ) -> tuple[Classroom, Subject, list[AttendanceExportRow]]:
-        """Authorize, then return ``(classroom, subject, rows)`` for CSV building.
-
-        Returning the already-authorized ``Classroom``/``Subject``
-        (rather than just the rows) lets the router's CSV builder use
-        their ``code`` values directly, without a second lookup or a
-        per-row join (see ``app.modules.attendance.repository.
-        AttendanceExportRow``'s docstring).
+    ) -> tuple[Classroom, Subject, AsyncIterator[list[AttendanceExportRow]]]:
+        """Authorize, then return ``(classroom, subject, row_chunks)`` for CSV building.
+
+        Authorization (and its blocked audit) happens here, before the
+        router commits to a response; ``row_chunks`` is lazy and runs the
+        export query only as the streamed response pulls it, in chunks of
+        ``EXPORT_FETCH_CHUNK_ROWS``. Returning the already-authorized
+        ``Classroom``/``Subject`` (rather than just the rows) lets the
+        router's CSV builder use their ``code`` values directly, without a
+        second lookup or a per-row join (see ``app.modules.attendance.
+        repository.AttendanceExportRow``'s docstring).
         """
         _validate_date_range(date_from, date_to)
         classroom, subject = await self.authorize_scope(
@@ -503,15 +540,16 @@ class AttendanceReadService:
             request_id=request_id,
             action=ACTION_ATTENDANCE_EXPORT,
         )
-        rows = await self._attendance.list_for_export(
+        row_chunks = self._attendance.stream_for_export(
             classroom_id=classroom_id,
             subject_id=subject_id,
             student_profile_id=student_profile_id,
             date_from=date_from,
             date_to=date_to,
             status=status,
+            chunk_size=EXPORT_FETCH_CHUNK_ROWS,
         )
-        return classroom, subject, rows
+        return classroom, subject, row_chunks
 
     # --- student self-service ------------------------------------------
 
@@ -543,9 +581,16 @@ class AttendanceReadService:
         status: AttendanceStatus | None,
         limit: int,
         offset: int,
-    ) -> Page[AttendanceRecordRead]:
-        """The caller's own attendance only. ``student_profile_id`` is never accepted."""
+        cursor: str | None,
+        include_total: bool,
+    ) -> CursorPage[AttendanceRecordRead]:
+        """The caller's own attendance only. ``student_profile_id`` is never accepted.
+
+        Paged like ``get_detail``.
+        """
         _validate_date_range(date_from, date_to)
+        reject_offset_with_cursor(cursor, offset)
+        after = AttendanceListCursor.decode(cursor) if cursor is not None else None
         profile = await self._resolve_own_student_profile(current_user)
         rows = await self._attendance.list(
             classroom_id=classroom_id,
@@ -554,23 +599,23 @@ class AttendanceReadService:
             date_from=date_from,
             date_to=date_to,
             status=status,
-            limit=limit,
+            limit=limit + 1,
             offset=offset,
+            after=after,
         )
-        total = await self._attendance.count(
-            classroom_id=classroom_id,
-            subject_id=subject_id,
-            student_profile_id=profile.id,
-            date_from=date_from,
-            date_to=date_to,
-            status=status,
-        )
-        return Page[AttendanceRecordRead](
-            items=[AttendanceRecordRead.model_validate(row) for row in rows],
-            total=total,
-            limit=limit,
-            offset=offset,
+        total = (
+            await self._attendance.count(
+                classroom_id=classroom_id,
+                subject_id=subject_id,
+                student_profile_id=profile.id,
+                date_from=date_from,
+                date_to=date_to,
+                status=status,
+            )
+            if include_total
+            else None
         )
+        return _detail_page(rows, limit=limit, offset=offset, total=total)
 
     async def get_self_stats(
         self,
@@ -20,30 +20,90 @@ all support it uniformly), an exact daily-scope listing
 (``aggregate_by_student``/``aggregate_by_classroom``, each a single
 ``GROUP BY`` query using the same ``FILTER (WHERE ...)`` technique as
 ``aggregate_counts`` — never an in-Python scan), and a CSV-export query
-(``list_for_export``) that joins ``StudentProfile`` for ``roll_number``
+(``stream_for_export``) that joins ``StudentProfile`` for ``roll_number``
 only (classroom/subject codes are already known to the caller from the
-exact-scope authorization check and are not re-joined per row). Every
+exact-scope authorization check and are not re-joined per row);
+``stream_for_export`` reads it in chunks over a server-side cursor. Every
 new query method returns a typed ``dataclass``, never a raw SQLAlchemy
 ``Row``, per the Stage 3 brief's "no raw SQLAlchemy Row objects passed
 directly to routers" instruction — enforced here at the repository
 boundary so no caller (service or router) ever receives one.
+
+``AttendanceRepository.upsert_many`` is the bulk-save write path: one
+``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` for a whole batch.
+``create``/``update`` remain the single-row primitives.
+
+A multi-scope submission (many classroom/subject scopes, one date) goes
+through ``stage_marks`` (``COPY`` into a temporary table),
+``first_invalid_staged_student`` and ``merge_staged`` (one
+``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` for every scope), with
+one ``AuditLogRepository.create_many`` for its audit rows.
+
+The aggregates (``aggregate_counts``/``aggregate_by_student``/
+``aggregate_by_classroom``) sum ``attendance_counts_source``, which reads
+``attendance_monthly_rollups`` for whole months and raw rows only for the
+partial months at the edges — see ``app.modules.attendance.rollups``.
+``AttendanceRollupRepository`` checks and rebuilds that rollup; the
+triggers that maintain it need nothing from this module.
+
+``AttendanceRepository.list`` and ``AuditLogRepository.list`` page by
+offset or, given ``after`` (an ``AttendanceListCursor`` /
+``AuditLogListCursor``), by keyset: rows strictly after that sort key, so
+a deep page costs the same as the first. The cursors round-trip through
+the opaque tokens of ``app.schemas.pagination``.
 """
 
 from __future__ import annotations
 
 import builtins
+import typing
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    Boolean,
+    CursorResult,
+    Date,
+    Integer,
+    Select,
+    Text,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    literal,
+    literal_column,
+    not_,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import Insert, insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import Subquery, TableClause
+from sqlalchemy.types import TypeEngine
 
+from app.core.exceptions import InvalidPaginationCursorError
 from app.modules.attendance.errors import AttendanceRecordAlreadyExistsError
-from app.modules.attendance.models import AttendanceRecord, AttendanceStatus, AuditLog, AuditOutcome
+from app.modules.attendance.models import (
+    AttendanceMonthlyRollup,
+    AttendanceRecord,
+    AttendanceStatus,
+    AuditLog,
+    AuditOutcome,
+)
 from app.modules.profiles.models import StudentProfile
+from app.schemas.pagination import decode_cursor, encode_cursor
 
 _ATTENDANCE_UNIQUE_CONSTRAINT = "uq_attendance_records_student_classroom_subject_date"
 
@@ -89,6 +149,139 @@ class AttendanceExportRow:
     updated_at: datetime
 
 
+@dataclass(frozen=True)
+class AttendanceMark:
+    """One student's mark in an ``AttendanceRepository.upsert_many`` batch."""
+
+    student_profile_id: uuid.UUID
+    status: AttendanceStatus
+    remarks: str | None
+
+
+@dataclass(frozen=True)
+class AttendanceUpsertResult:
+    """The row ``upsert_many`` wrote for one mark, and whether it created it."""
+
+    record: AttendanceRecord
+    created: bool
+
+
+@dataclass(frozen=True)
+class ScopedAttendanceMark:
+    """One row of a multi-scope submission, for ``stage_marks``."""
+
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    student_profile_id: uuid.UUID
+    status: AttendanceStatus
+    remarks: str | None
+
+
+@dataclass(frozen=True)
+class StagedStudentProblem:
+    """The first staged row (by position) whose student fails validation.
+
+    ``student_found``/``student_active`` say which check failed first; a
+    row with both true has a student from a different classroom.
+    """
+
+    position: int
+    student_found: bool
+    student_active: bool
+
+
+@dataclass(frozen=True)
+class ScopeUpsertCounts:
+    """How many rows ``merge_staged`` created and updated in one scope."""
+
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    created_count: int
+    updated_count: int
+
+
+@dataclass(frozen=True)
+class AttendanceListCursor:
+    """The sort key of the last row of an ``AttendanceRepository.list`` page."""
+
+    attendance_date: date
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    student_profile_id: uuid.UUID
+    id: uuid.UUID
+
+    @classmethod
+    def after_record(cls, record: AttendanceRecord) -> AttendanceListCursor:
+        return cls(
+            attendance_date=record.attendance_date,
+            classroom_id=record.classroom_id,
+            subject_id=record.subject_id,
+            student_profile_id=record.student_profile_id,
+            id=record.id,
+        )
+
+    def encode(self) -> str:
+        return encode_cursor(
+            [
+                self.attendance_date.isoformat(),
+                str(self.classroom_id),
+                str(self.subject_id),
+                str(self.student_profile_id),
+                str(self.id),
+            ]
+        )
+
+    @classmethod
+    def decode(cls, token: str) -> AttendanceListCursor:
+        values = decode_cursor(token, size=5)
+        try:
+            return cls(
+                attendance_date=date.fromisoformat(values[0]),
+                classroom_id=uuid.UUID(values[1]),
+                subject_id=uuid.UUID(values[2]),
+                student_profile_id=uuid.UUID(values[3]),
+                id=uuid.UUID(values[4]),
+            )
+        except ValueError as exc:
+            raise InvalidPaginationCursorError() from exc
+
+
+@dataclass(frozen=True)
+class AuditLogListCursor:
+    """The sort key of the last row of an ``AuditLogRepository.list`` page."""
+
+    created_at: datetime
+    id: uuid.UUID
+
+    @classmethod
+    def after_record(cls, record: AuditLog) -> AuditLogListCursor:
+        return cls(created_at=record.created_at, id=record.id)
+
+    def encode(self) -> str:
+        return encode_cursor([self.created_at.isoformat(), str(self.id)])
+
+    @classmethod
+    def decode(cls, token: str) -> AuditLogListCursor:
+        values = decode_cursor(token, size=2)
+        try:
+            created_at = datetime.fromisoformat(values[0])
+            record_id = uuid.UUID(values[1])
+        except ValueError as exc:
+            raise InvalidPaginationCursorError() from exc
+        if created_at.tzinfo is None:
+            raise InvalidPaginationCursorError()
+        return cls(created_at=created_at, id=record_id)
+
+
+@dataclass(frozen=True)
+class ScopeAuditEntry:
+    """One scope's success audit row, for ``AuditLogRepository.create_many``."""
+
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    event_metadata: dict[str, object]
+
+
 def _matches_constraint(exc: IntegrityError, constraint_name: str) -> bool:
     """Best-effort extraction of the violated constraint's name.
 
@@ -109,6 +302,41 @@ def _matches_constraint(exc: IntegrityError, constraint_name: str) -> bool:
     return constraint_name in str(exc.orig)
 
 
+def _upsert_on_unique_key(stmt: Insert) -> Insert:
+    """``ON CONFLICT (student, classroom, subject, date) DO UPDATE`` the mark.
+
+    Re-stamps ``status``/``remarks``/``marked_by_user_id`` and bumps
+    ``updated_at`` only if one of them actually changed — what the ORM's
+    ``onupdate`` does for ``update``, which issues no UPDATE otherwise.
+    """
+    excluded = stmt.excluded
+    changed = or_(
+        AttendanceRecord.status.is_distinct_from(excluded.status),
+        AttendanceRecord.remarks.is_distinct_from(excluded.remarks),
+        AttendanceRecord.marked_by_user_id.is_distinct_from(excluded.marked_by_user_id),
+    )
+    return stmt.on_conflict_do_update(
+        constraint=_ATTENDANCE_UNIQUE_CONSTRAINT,
+        set_={
+            "status": excluded.status,
+            "remarks": excluded.remarks,
+            "marked_by_user_id": excluded.marked_by_user_id,
+            "updated_at": case((changed, func.now()), else_=AttendanceRecord.updated_at),
+        },
+    )
+
+
+# Columns of the temporary table ``stage_marks`` creates, in COPY order.
+_STAGING_COLUMNS: tuple[tuple[str, TypeEngine[Any]], ...] = (
+    ("position", Integer()),
+    ("classroom_id", PGUUID(as_uuid=True)),
+    ("subject_id", PGUUID(as_uuid=True)),
+    ("student_profile_id", PGUUID(as_uuid=True)),
+    ("status", Text()),
+    ("remarks", Text()),
+)
+
+
 class AttendanceRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -133,8 +361,8 @@ class AttendanceRepository:
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
+    @staticmethod
     def _apply_filters(
-        self,
         stmt: Any,
         *,
         classroom_id: uuid.UUID | None,
@@ -169,8 +397,14 @@ class AttendanceRepository:
         status: AttendanceStatus | None = None,
         limit: int = 50,
         offset: int = 0,
+        after: AttendanceListCursor | None = None,
     ) -> builtins.list[AttendanceRecord]:
-        """Deterministically ordered, filtered, paginated attendance rows."""
+        """Deterministically ordered, filtered, paginated attendance rows.
+
+        With ``after``, only rows that sort after it. The redundant
+        ``attendance_date >=`` bound lets the scope and date indexes start
+        at the cursor; the row comparison settles ties within that date.
+        """
         stmt = select(AttendanceRecord)
         stmt = self._apply_filters(
             stmt,
@@ -181,17 +415,32 @@ class AttendanceRepository:
             date_to=date_to,
             status=status,
         )
-        stmt = (
-            stmt.order_by(
-                AttendanceRecord.attendance_date,
-                AttendanceRecord.classroom_id,
-                AttendanceRecord.subject_id,
-                AttendanceRecord.student_profile_id,
-                AttendanceRecord.id,
-            )
-            .limit(limit)
-            .offset(offset)
+        sort_key = (
+            AttendanceRecord.attendance_date,
+            AttendanceRecord.classroom_id,
+            AttendanceRecord.subject_id,
+            AttendanceRecord.student_profile_id,
+            AttendanceRecord.id,
         )
+        if after is not None:
+            after_key = (
+                after.attendance_date,
+                after.classroom_id,
+                after.subject_id,
+                after.student_profile_id,
+                after.id,
+            )
+            stmt = stmt.where(
+                AttendanceRecord.attendance_date >= after.attendance_date,
+                tuple_(*sort_key)
+                > tuple_(
+                    *(
+                        literal(value, column.type)
+                        for column, value in zip(sort_key, after_key, strict=True)
+                    )
+                ),
+            )
+        stmt = stmt.order_by(*sort_key).limit(limit).offset(offset)
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
@@ -257,21 +506,11 @@ class AttendanceRepository:
     ) -> tuple[int, int, int]:
         """Return ``(total, present_count, absent_count)`` for the given filters.
 
-        Uses a single-pass query with ``FILTER (WHERE ...)`` aggregates
-        (PostgreSQL / SQLAlchemy ``FunctionElement.filter``) rather than
-        three separate queries or fetching every row into Python.
+        One query summing ``attendance_counts_source`` — monthly rollups
+        for whole months, raw rows only for partial months at the edges —
+        rather than re-counting every raw row in the range.
         """
-        stmt = select(
-            func.count().label("total"),
-            func.count()
-            .filter(AttendanceRecord.status == AttendanceStatus.PRESENT)
-            .label("present_count"),
-            func.count()
-            .filter(AttendanceRecord.status == AttendanceStatus.ABSENT)
-            .label("absent_count"),
-        ).select_from(AttendanceRecord)
-        stmt = self._apply_filters(
-            stmt,
+        source = attendance_counts_source(
             classroom_id=classroom_id,
             subject_id=subject_id,
             student_profile_id=student_profile_id,
@@ -279,7 +518,7 @@ class AttendanceRepository:
             date_to=date_to,
             status=status,
         )
-        row = (await self._session.execute(stmt)).one()
+        row = (await self._session.execute(select(*_summed_counts(source)))).one()
         return int(row.total), int(row.present_count), int(row.absent_count)
 
     async def aggregate_by_student(
@@ -294,22 +533,12 @@ class AttendanceRepository:
     ) -> builtins.list[StudentAttendanceAggregate]:
         """Per-student ``(total, present, absent)`` counts, one ``GROUP BY`` query.
 
-        Deterministically ordered by ``student_profile_id``. Same
-        ``FILTER (WHERE ...)`` aggregation technique as
-        ``aggregate_counts`` — no in-Python scan over individual rows.
+        Deterministically ordered by ``student_profile_id``. Sums the
+        same ``attendance_counts_source`` as ``aggregate_counts`` — no
+        in-Python scan over individual rows. Students with no matching
+        rows are left out, as before.
         """
-        stmt = select(
-            AttendanceRecord.student_profile_id,
-            func.count().label("total"),
-            func.count()
-            .filter(AttendanceRecord.status == AttendanceStatus.PRESENT)
-            .label("present_count"),
-            func.count()
-            .filter(AttendanceRecord.status == AttendanceStatus.ABSENT)
-            .label("absent_count"),
-        ).select_from(AttendanceRecord)
-        stmt = self._apply_filters(
-            stmt,
+        source = attendance_counts_source(
             classroom_id=classroom_id,
             subject_id=subject_id,
             student_profile_id=student_profile_id,
@@ -317,8 +546,11 @@ class AttendanceRepository:
             date_to=date_to,
             status=status,
         )
-        stmt = stmt.group_by(AttendanceRecord.student_profile_id).order_by(
-            AttendanceRecord.student_profile_id
+        stmt = (
+            select(source.c.student_profile_id, *_summed_counts(source))
+            .group_by(source.c.student_profile_id)
+            .having(func.sum(source.c.total_count) > 0)
+            .order_by(source.c.student_profile_id)
         )
         rows = (await self._session.execute(stmt)).all()
         return [
@@ -343,21 +575,10 @@ class AttendanceRepository:
     ) -> builtins.list[ClassroomAttendanceAggregate]:
         """Per-classroom ``(total, present, absent)`` counts, one ``GROUP BY`` query.
 
-        Deterministically ordered by ``classroom_id``. Same aggregation
+        Deterministically ordered by ``classroom_id``. Same source and
         technique as ``aggregate_counts``/``aggregate_by_student``.
         """
-        stmt = select(
-            AttendanceRecord.classroom_id,
-            func.count().label("total"),
-            func.count()
-            .filter(AttendanceRecord.status == AttendanceStatus.PRESENT)
-            .label("present_count"),
-            func.count()
-            .filter(AttendanceRecord.status == AttendanceStatus.ABSENT)
-            .label("absent_count"),
-        ).select_from(AttendanceRecord)
-        stmt = self._apply_filters(
-            stmt,
+        source = attendance_counts_source(
             classroom_id=classroom_id,
             subject_id=subject_id,
             student_profile_id=student_profile_id,
@@ -365,7 +586,12 @@ class AttendanceRepository:
             date_to=date_to,
             status=status,
         )
-        stmt = stmt.group_by(AttendanceRecord.classroom_id).order_by(AttendanceRecord.classroom_id)
+        stmt = (
+            select(source.c.classroom_id, *_summed_counts(source))
+            .group_by(source.c.classroom_id)
+            .having(func.sum(source.c.total_count) > 0)
+            .order_by(source.c.classroom_id)
+        )
         rows = (await self._session.execute(stmt)).all()
         return [
             ClassroomAttendanceAggregate(
@@ -377,7 +603,7 @@ class AttendanceRepository:
             for row in rows
         ]
 
-    async def list_for_export(
+    async def stream_for_export(
         self,
         *,
         classroom_id: uuid.UUID | None = None,
@@ -386,9 +612,13 @@ class AttendanceRepository:
         date_from: date | None = None,
         date_to: date | None = None,
         status: AttendanceStatus | None = None,
-    ) -> builtins.list[AttendanceExportRow]:
-        """CSV-export rows: attendance fields plus the student's roll number.
+        chunk_size: int,
+    ) -> AsyncIterator[builtins.list[AttendanceExportRow]]:
+        """CSV-export rows, in chunks of up to ``chunk_size``.
 
+        Read over a server-side cursor (``AsyncSession.stream`` with
+        ``yield_per``), so only one chunk is held at a time however many
+        rows match; the query runs when the first chunk is requested.
         Joins ``StudentProfile`` for ``roll_number`` only —
         ``classroom_code``/``subject_code`` are constant for a single
         export request (exact-scope filters) and are attached by the
@@ -423,21 +653,25 @@ class AttendanceRepository:
             AttendanceRecord.attendance_date,
             AttendanceRecord.student_profile_id,
             AttendanceRecord.id,
-        )
-        rows = (await self._session.execute(stmt)).all()
-        return [
-            AttendanceExportRow(
-                attendance_date=row.attendance_date,
-                student_profile_id=row.student_profile_id,
-                student_roll_number=row.roll_number,
-                status=row.status,
-                remarks=row.remarks,
-                marked_by_user_id=row.marked_by_user_id,
-                created_at=row.created_at,
-                updated_at=row.updated_at,
-            )
-            for row in rows
-        ]
+        ).execution_options(yield_per=chunk_size)
+        result = await self._session.stream(stmt)
+        try:
+            async for rows in result.partitions():
+                yield [
+                    AttendanceExportRow(
+                        attendance_date=row.attendance_date,
+                        student_profile_id=row.student_profile_id,
+                        student_roll_number=row.roll_number,
+                        status=row.status,
+                        remarks=row.remarks,
+                        marked_by_user_id=row.marked_by_user_id,
+                        created_at=row.created_at,
+                        updated_at=row.updated_at,
+                    )
+                    for row in rows
+                ]
+        finally:
+            await result.close()
 
     async def create(
         self,
@@ -501,6 +735,452 @@ class AttendanceRepository:
         await self._session.refresh(record)
         return record
 
+    async def upsert_many(
+        self,
+        *,
+        classroom_id: uuid.UUID,
+        subject_id: uuid.UUID,
+        attendance_date: date,
+        marks: Sequence[AttendanceMark],
+        marked_by_user_id: uuid.UUID,
+    ) -> builtins.list[AttendanceUpsertResult]:
+        """Create or update one row per mark in a single statement.
+
+        ``INSERT ... ON CONFLICT (student, classroom, subject, date) DO
+        UPDATE ... RETURNING``: PostgreSQL resolves every row's
+        create-vs-update itself, so a batch costs one round trip however
+        large it is, instead of a lookup plus a write per student. Each
+        returned row reports ``xmax = 0`` — true only for a tuple this
+        statement inserted — as ``created``.
+
+        Matches ``create``/``update`` row for row (see
+        ``_upsert_on_unique_key``). The returned entities replace any
+        stale copy in the identity map.
+
+        Results are in ``marks`` order. ``marks`` must not repeat a
+        student — PostgreSQL rejects a statement that would update the
+        same row twice; the service validates that before calling this.
+        """
+        if not marks:
+            return []
+        insert_stmt = insert(AttendanceRecord).values(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "student_profile_id": mark.student_profile_id,
+                    "classroom_id": classroom_id,
+                    "subject_id": subject_id,
+                    "attendance_date": attendance_date,
+                    "status": mark.status,
+                    "remarks": mark.remarks,
+                    "marked_by_user_id": marked_by_user_id,
+                }
+                for mark in marks
+            ]
+        )
+        stmt: Any = (
+            _upsert_on_unique_key(insert_stmt)
+            .returning(AttendanceRecord, literal_column("xmax = 0", Boolean).label("created"))
+            .execution_options(populate_existing=True)
+        )
+        result = await self._session.execute(stmt)
+        by_student = {
+            record.student_profile_id: AttendanceUpsertResult(record=record, created=created)
+            for record, created in result.all()
+        }
+        return [by_student[mark.student_profile_id] for mark in marks]
+
+    async def stage_marks(self, marks: Sequence[ScopedAttendanceMark]) -> TableClause:
+        """``COPY`` ``marks`` into a new temporary table and return it.
+
+        The table lives until the current transaction ends (``ON COMMIT
+        DROP``). Rows keep their ``position`` in ``marks``, so later
+        checks can report the first offending row in request order. The
+        binary ``COPY`` protocol streams tens of thousands of rows in one
+        round trip, far cheaper than a parameterized ``INSERT``.
+        """
+        name = f"attendance_staging_{uuid.uuid4().hex}"
+        await self._session.execute(
+            text(
+                f"CREATE TEMPORARY TABLE {name} ("
+                "position integer NOT NULL, classroom_id uuid NOT NULL, "
+                "subject_id uuid NOT NULL, student_profile_id uuid NOT NULL, "
+                "status text NOT NULL, remarks text) ON COMMIT DROP"
+            )
+        )
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection: Any = raw_connection.driver_connection
+        await driver_connection.copy_records_to_table(
+            name,
+            records=[
+                (
+                    position,
+                    mark.classroom_id,
+                    mark.subject_id,
+                    mark.student_profile_id,
+                    mark.status.value,
+                    mark.remarks,
+                )
+                for position, mark in enumerate(marks)
+            ],
+            columns=[column_name for column_name, _ in _STAGING_COLUMNS],
+        )
+        return table(name, *(column(column_name, type_) for column_name, type_ in _STAGING_COLUMNS))
+
+    async def first_invalid_staged_student(
+        self, staging: TableClause
+    ) -> StagedStudentProblem | None:
+        """The first staged row whose student is missing, inactive, or not
+        in that row's classroom — one join, however many rows."""
+        stmt = (
+            select(staging.c.position, StudentProfile.id, StudentProfile.is_active)
+            .select_from(
+                staging.outerjoin(StudentProfile, StudentProfile.id == staging.c.student_profile_id)
+            )
+            .where(
+                or_(
+                    StudentProfile.id.is_(None),
+                    StudentProfile.is_active.is_(False),
+                    StudentProfile.classroom_id.is_distinct_from(staging.c.classroom_id),
+                )
+            )
+            .order_by(staging.c.position)
+            .limit(1)
+        )
+        row = (await self._session.execute(stmt)).first()
+        if row is None:
+            return None
+        position, student_profile_id, is_active = row
+        return StagedStudentProblem(
+            position=position,
+            student_found=student_profile_id is not None,
+            student_active=bool(is_active),
+        )
+
+    async def merge_staged(
+        self,
+        staging: TableClause,
+        *,
+        attendance_date: date,
+        marked_by_user_id: uuid.UUID,
+    ) -> builtins.list[ScopeUpsertCounts]:
+        """Create or update every staged row in one statement.
+
+        ``INSERT ... SELECT`` from the staging table with the same
+        ``ON CONFLICT`` rule as ``upsert_many``, wrapped in a CTE so only
+        per-scope created/updated counts (from ``xmax = 0``) come back,
+        not one row per mark. Rows are inserted in unique-key order so
+        two overlapping submissions lock rows in the same order and
+        cannot deadlock each other. Scopes are returned in no particular
+        order; one with no staged rows is absent.
+        """
+        source = select(
+            func.gen_random_uuid(),
+            staging.c.student_profile_id,
+            staging.c.classroom_id,
+            staging.c.subject_id,
+            literal(attendance_date, Date),
+            cast(staging.c.status, AttendanceRecord.status.type),
+            staging.c.remarks,
+            literal(marked_by_user_id, PGUUID(as_uuid=True)),
+        ).order_by(
+            staging.c.student_profile_id,
+            staging.c.classroom_id,
+            staging.c.subject_id,
+        )
+        insert_stmt = insert(AttendanceRecord).from_select(
+            [
+                "id",
+                "student_profile_id",
+                "classroom_id",
+                "subject_id",
+                "attendance_date",
+                "status",
+                "remarks",
+                "marked_by_user_id",
+            ],
+            source,
+        )
+        merged = (
+            _upsert_on_unique_key(insert_stmt)
+            .returning(
+                AttendanceRecord.classroom_id,
+                AttendanceRecord.subject_id,
+                literal_column("xmax = 0", Boolean).label("created"),
+            )
+            .cte("merged")
+        )
+        stmt = select(
+            merged.c.classroom_id,
+            merged.c.subject_id,
+            func.count().filter(merged.c.created),
+            func.count().filter(not_(merged.c.created)),
+        ).group_by(merged.c.classroom_id, merged.c.subject_id)
+        result = await self._session.execute(stmt)
+        return [
+            ScopeUpsertCounts(
+                classroom_id=classroom_id,
+                subject_id=subject_id,
+                created_count=int(created_count),
+                updated_count=int(updated_count),
+            )
+            for classroom_id, subject_id, created_count, updated_count in result.all()
+        ]
+
+
+def _first_of_next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def whole_month_window(
+    date_from: date | None, date_to: date | None
+) -> tuple[date | None, date | None] | None:
+    """The months ``[date_from, date_to]`` covers completely.
+
+    Returns ``(first_month, end_month)`` — months ``m`` with
+    ``first_month <= m < end_month`` — where ``None`` means unbounded on
+    that side, or ``None`` when not even one month is covered whole.
+    """
+    first_month = None
+    if date_from is not None:
+        first_month = date_from if date_from.day == 1 else _first_of_next_month(date_from)
+    end_month = None
+    if date_to is not None:
+        end_month = _first_of_next_month(date_to)
+        if end_month - timedelta(days=1) != date_to:
+            end_month = date_to.replace(day=1)
+    if first_month is not None and end_month is not None and first_month >= end_month:
+        return None
+    return first_month, end_month
+
+
+def attendance_counts_source(
+    *,
+    classroom_id: uuid.UUID | None = None,
+    subject_id: uuid.UUID | None = None,
+    student_profile_id: uuid.UUID | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: AttendanceStatus | None = None,
+) -> Subquery:
+    """Rows of ``(student_profile_id, classroom_id, subject_id, total_count,
+    present_count, absent_count)`` whose sums are the filtered counts.
+
+    Months the date range covers whole (``whole_month_window``) come from
+    ``attendance_monthly_rollups``, one row per student/classroom/subject/
+    month; the partial months at either edge come from
+    ``attendance_records``, one row per record. A ``status`` filter keeps
+    only that status's count of a rollup row.
+    """
+    window = whole_month_window(date_from, date_to)
+    parts: builtins.list[Select[Any]] = []
+
+    if window != (None, None):
+        raw = select(
+            AttendanceRecord.student_profile_id,
+            AttendanceRecord.classroom_id,
+            AttendanceRecord.subject_id,
+            literal(1).label("total_count"),
+            case((AttendanceRecord.status == AttendanceStatus.PRESENT, 1), else_=0).label(
+                "present_count"
+            ),
+            case((AttendanceRecord.status == AttendanceStatus.ABSENT, 1), else_=0).label(
+                "absent_count"
+            ),
+        )
+        raw = AttendanceRepository._apply_filters(
+            raw,
+            classroom_id=classroom_id,
+            subject_id=subject_id,
+            student_profile_id=student_profile_id,
+            date_from=date_from,
+            date_to=date_to,
+            status=status,
+        )
+        if window is not None:
+            first_month, end_month = window
+            in_window = []
+            if first_month is not None:
+                in_window.append(AttendanceRecord.attendance_date >= first_month)
+            if end_month is not None:
+                in_window.append(AttendanceRecord.attendance_date < end_month)
+            raw = raw.where(not_(and_(*in_window)))
+        parts.append(raw)
+
+    if window is not None:
+        first_month, end_month = window
+        rollup = AttendanceMonthlyRollup
+        counts: tuple[Any, Any, Any] = (
+            rollup.total_count,
+            rollup.present_count,
+            rollup.absent_count,
+        )
+        if status is AttendanceStatus.PRESENT:
+            counts = (rollup.present_count, rollup.present_count, literal(0))
+        elif status is AttendanceStatus.ABSENT:
+            counts = (rollup.absent_count, literal(0), rollup.absent_count)
+        rolled = select(
+            rollup.student_profile_id,
+            rollup.classroom_id,
+            rollup.subject_id,
+            counts[0].label("total_count"),
+            counts[1].label("present_count"),
+            counts[2].label("absent_count"),
+        )
+        if classroom_id is not None:
+            rolled = rolled.where(rollup.classroom_id == classroom_id)
+        if subject_id is not None:
+            rolled = rolled.where(rollup.subject_id == subject_id)
+        if student_profile_id is not None:
+            rolled = rolled.where(rollup.student_profile_id == student_profile_id)
+        if first_month is not None:
+            rolled = rolled.where(rollup.month >= first_month)
+        if end_month is not None:
+            rolled = rolled.where(rollup.month < end_month)
+        parts.append(rolled)
+
+    if len(parts) == 1:
+        return parts[0].subquery("attendance_counts")
+    return union_all(*parts).subquery("attendance_counts")
+
+
+def _summed_counts(source: Subquery) -> tuple[Any, Any, Any]:
+    """``total``/``present_count``/``absent_count`` sums over ``attendance_counts_source``."""
+    return (
+        func.coalesce(func.sum(source.c.total_count), 0).label("total"),
+        func.coalesce(func.sum(source.c.present_count), 0).label("present_count"),
+        func.coalesce(func.sum(source.c.absent_count), 0).label("absent_count"),
+    )
+
+
+@dataclass(frozen=True)
+class RollupDrift:
+    """One rollup key whose stored counts differ from a recount of raw rows.
+
+    ``expected_*`` are the recount and ``stored_*`` the rollup row; a side
+    with no row for the key reads as zero.
+    """
+
+    student_profile_id: uuid.UUID
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    month: date
+    expected_present: int
+    expected_absent: int
+    stored_present: int
+    stored_absent: int
+
+
+def _monthly_recount() -> Select[Any]:
+    """``attendance_monthly_rollups`` as raw rows say it should be."""
+    month = cast(func.date_trunc(literal_column("'month'"), AttendanceRecord.attendance_date), Date)
+    return select(
+        AttendanceRecord.student_profile_id,
+        AttendanceRecord.classroom_id,
+        AttendanceRecord.subject_id,
+        month.label("month"),
+        func.count()
+        .filter(AttendanceRecord.status == AttendanceStatus.PRESENT)
+        .label("present_count"),
+        func.count()
+        .filter(AttendanceRecord.status == AttendanceStatus.ABSENT)
+        .label("absent_count"),
+        func.count().label("total_count"),
+    ).group_by(
+        AttendanceRecord.student_profile_id,
+        AttendanceRecord.classroom_id,
+        AttendanceRecord.subject_id,
+        month,
+    )
+
+
+class AttendanceRollupRepository:
+    """Consistency check and rebuild of ``attendance_monthly_rollups``.
+
+    Day-to-day maintenance is the ``attendance_records`` triggers' job
+    (see ``AttendanceMonthlyRollup``); nothing here runs on a request
+    path.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def find_drift(self, *, limit: int) -> tuple[int, builtins.list[RollupDrift]]:
+        """Count the keys whose rollup disagrees with raw rows, and return
+        the first ``limit`` of them in key order.
+
+        One ``FULL JOIN`` of a fresh recount against the rollup, read in a
+        single snapshot, so it is safe to run while attendance is written.
+        """
+        expected = _monthly_recount().subquery("expected")
+        stored = AttendanceMonthlyRollup
+        keys = [
+            func.coalesce(expected.c[name], getattr(stored, name)).label(name)
+            for name in ("student_profile_id", "classroom_id", "subject_id", "month")
+        ]
+        stmt = (
+            select(
+                *keys,
+                func.coalesce(expected.c.present_count, 0).label("expected_present"),
+                func.coalesce(expected.c.absent_count, 0).label("expected_absent"),
+                func.coalesce(stored.present_count, 0).label("stored_present"),
+                func.coalesce(stored.absent_count, 0).label("stored_absent"),
+                func.count().over().label("drifted"),
+            )
+            .select_from(
+                expected.join(
+                    stored,
+                    and_(
+                        stored.student_profile_id == expected.c.student_profile_id,
+                        stored.classroom_id == expected.c.classroom_id,
+                        stored.subject_id == expected.c.subject_id,
+                        stored.month == expected.c.month,
+                    ),
+                    full=True,
+                )
+            )
+            .where(
+                or_(
+                    expected.c.present_count.is_distinct_from(stored.present_count),
+                    expected.c.absent_count.is_distinct_from(stored.absent_count),
+                )
+            )
+            .order_by(*keys)
+            .limit(limit)
+        )
+        rows = (await self._session.execute(stmt)).all()
+        drifts = [
+            RollupDrift(
+                student_profile_id=row.student_profile_id,
+                classroom_id=row.classroom_id,
+                subject_id=row.subject_id,
+                month=row.month,
+                expected_present=int(row.expected_present),
+                expected_absent=int(row.expected_absent),
+                stored_present=int(row.stored_present),
+                stored_absent=int(row.stored_absent),
+            )
+            for row in rows
+        ]
+        return (int(rows[0].drifted) if rows else 0), drifts
+
+    async def rebuild(self) -> int:
+        """Replace every rollup row with a recount; returns the rows written.
+
+        Takes ``SHARE`` on ``attendance_records`` first, so attendance
+        writes wait until the caller commits and none is half-counted.
+        """
+        await self._session.execute(text("LOCK TABLE attendance_records IN SHARE MODE"))
+        await self._session.execute(delete(AttendanceMonthlyRollup))
+        recount = _monthly_recount()
+        result = await self._session.execute(
+            insert(AttendanceMonthlyRollup).from_select(
+                [column.name for column in recount.selected_columns], recount
+            )
+        )
+        return typing.cast("CursorResult[Any]", result).rowcount
+
 
 class AuditLogRepository:
     """Append-only audit-log data access.
@@ -559,7 +1239,14 @@ class AuditLogRepository:
         date_to: date | None = None,
         limit: int = 50,
         offset: int = 0,
+        after: AuditLogListCursor | None = None,
     ) -> builtins.list[AuditLog]:
+        """Newest first, ``id`` breaking ties; with ``after``, only older rows.
+
+        The sort mixes directions, so ``after`` is spelled out rather than
+        a row comparison; its leading ``created_at <=`` bound is what the
+        ``created_at`` index starts from.
+        """
         stmt = select(AuditLog)
         stmt = self._apply_filters(
             stmt,
@@ -572,6 +1259,11 @@ class AuditLogRepository:
             date_from=date_from,
             date_to=date_to,
         )
+        if after is not None:
+            stmt = stmt.where(
+                AuditLog.created_at <= after.created_at,
+                or_(AuditLog.created_at < after.created_at, AuditLog.id > after.id),
+            )
         stmt = stmt.order_by(AuditLog.created_at.desc(), AuditLog.id).limit(limit).offset(offset)
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
@@ -631,3 +1323,35 @@ class AuditLogRepository:
         await self._session.flush()
         await self._session.refresh(log)
         return log
+
+    async def create_many(
+        self,
+        *,
+        actor_user_id: uuid.UUID,
+        action: str,
+        outcome: AuditOutcome,
+        entity_type: str,
+        request_id: str | None,
+        entries: Sequence[ScopeAuditEntry],
+    ) -> None:
+        """Append one audit-log row per classroom/subject entry.
+
+        Flushed together, so SQLAlchemy sends them as one multi-row
+        ``INSERT``; the rows are not refreshed or returned.
+        """
+        self._session.add_all(
+            [
+                AuditLog(
+                    actor_user_id=actor_user_id,
+                    action=action,
+                    outcome=outcome,
+                    entity_type=entity_type,
+                    classroom_id=entry.classroom_id,
+                    subject_id=entry.subject_id,
+                    request_id=request_id,
+                    event_metadata=entry.event_metadata,
+                )
+                for entry in entries
+            ]
+        )
+        await self._session.flush()
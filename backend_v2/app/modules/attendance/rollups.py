@@ -0,0 +1,85 @@
+"""Monthly attendance rollups: how aggregates read them, and the service
+that checks and rebuilds them.
+
+``attendance_monthly_rollups`` (``AttendanceMonthlyRollup``) holds each
+student's present/absent/total counts per classroom, subject and month,
+kept current by triggers on ``attendance_records`` — see
+``app.modules.attendance.models``. Re-counting a year of raw rows for
+every stats or report request costs time in proportion to the year; the
+rollup costs about twelve rows per student and subject a year.
+
+**Reading.** ``attendance_counts_source`` (in
+``app.modules.attendance.repository``) builds the one row source every
+stats and report aggregate sums over (``AttendanceRepository.aggregate_*``,
+``ReportsRepository.aggregate_summary``/``aggregate_active_roster``).
+``whole_month_window`` splits the requested date range into the months
+it covers completely, read from the rollup, and the partial months at
+either edge, read from raw rows; an open-ended bound reaches every month
+on that side. A ``status`` filter picks that status's count from the
+rollup. Callers group and sum the source exactly as they used to count
+raw rows, so results are unchanged.
+
+**Checking.** ``AttendanceRollupService.check`` recounts every month from
+raw rows in one statement and reports the keys whose rollup differs;
+``rebuild`` replaces the whole rollup from raw rows while attendance
+writes wait. Run them with ``python -m scripts.check_attendance_rollups``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.transaction import service_transaction
+from app.modules.attendance.repository import AttendanceRollupRepository, RollupDrift
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_DRIFT_SAMPLE_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class RollupCheckResult:
+    """How many rollup keys disagree with raw rows, with the first few."""
+
+    drifted: int
+    samples: list[RollupDrift]
+
+
+@dataclass(frozen=True)
+class RollupRebuildResult:
+    rows_written: int
+    check: RollupCheckResult
+
+
+class AttendanceRollupService:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._rollups = AttendanceRollupRepository(session)
+
+    async def check(self, *, sample_limit: int = DEFAULT_DRIFT_SAMPLE_LIMIT) -> RollupCheckResult:
+        """Compare every rollup row with a recount of raw rows."""
+        async with service_transaction(self._session):
+            drifted, samples = await self._rollups.find_drift(limit=sample_limit)
+        logger.info("attendance_rollups_checked", drifted=drifted)
+        return RollupCheckResult(drifted=drifted, samples=samples)
+
+    async def rebuild(
+        self, *, sample_limit: int = DEFAULT_DRIFT_SAMPLE_LIMIT
+    ) -> RollupRebuildResult:
+        """Recompute the whole rollup from raw rows, then check it."""
+        async with service_transaction(self._session):
+            rows_written = await self._rollups.rebuild()
+        logger.info("attendance_rollups_rebuilt", rows_written=rows_written)
+        return RollupRebuildResult(
+            rows_written=rows_written, check=await self.check(sample_limit=sample_limit)
+        )
+
+
+__all__ = [
+    "AttendanceRollupService",
+    "RollupCheckResult",
+    "RollupRebuildResult",
+]
@@ -16,11 +16,12 @@ import uuid
 from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db_session
-from app.modules.attendance.csv_export import build_attendance_csv, build_export_filename
+from app.modules.attendance.csv_export import build_export_filename, iter_attendance_csv
 from app.modules.attendance.models import AttendanceStatus
 from app.modules.attendance.read_service import AttendanceReadService
 from app.modules.attendance.schemas import (
@@ -31,12 +32,14 @@ from app.modules.attendance.schemas import (
     AttendanceStatsResponse,
     BulkAttendanceRequest,
     DailyAttendanceResponse,
+    MultiScopeAttendanceRequest,
+    MultiScopeAttendanceResult,
     StudentSelfStatsResponse,
 )
 from app.modules.attendance.service import AttendanceService
 from app.modules.auth.dependencies import require_roles
 from app.modules.users.models import User, UserRole
-from app.schemas.pagination import Page
+from app.schemas.pagination import CursorPage
 
 router = APIRouter(prefix="/attendance", tags=["attendance"])
 
@@ -46,6 +49,7 @@ Session = Annotated[AsyncSession, Depends(get_db_session)]
 
 _LimitQuery = Annotated[int, Query(ge=1, le=100)]
 _OffsetQuery = Annotated[int, Query(ge=0)]
+_CursorQuery = Annotated[str | None, Query(max_length=512)]
 
 
 def _request_id(request: Request) -> str | None:
@@ -73,6 +77,27 @@ async def bulk_save_attendance(
     )
 
 
+@router.post(
+    "/submissions", response_model=MultiScopeAttendanceResult, status_code=status.HTTP_200_OK
+)
+async def save_attendance_submission(
+    payload: MultiScopeAttendanceRequest,
+    current_user: AdminOrTeacher,
+    session: Session,
+    request: Request,
+) -> MultiScopeAttendanceResult:
+    """Create/update one date's records for many classroom/subject scopes.
+
+    All or nothing, like ``/bulk``: every scope must be authorized for the
+    caller and every record valid, or nothing is written.
+    """
+    return await AttendanceService(session).bulk_save_scopes(
+        current_user=current_user,
+        payload=payload,
+        request_id=_request_id(request),
+    )
+
+
 @router.get("/roster", response_model=list[AttendanceRosterStudentRead])
 async def get_attendance_roster(
     current_user: AdminOrTeacher,
@@ -90,7 +115,7 @@ async def get_attendance_roster(
     )
 
 
-@router.get("/detail", response_model=Page[AttendanceRecordRead])
+@router.get("/detail", response_model=CursorPage[AttendanceRecordRead])
 async def get_attendance_detail(
     current_user: AdminOrTeacher,
     session: Session,
@@ -103,7 +128,9 @@ async def get_attendance_detail(
     status_filter: Annotated[AttendanceStatus | None, Query(alias="status")] = None,
     limit: _LimitQuery = 50,
     offset: _OffsetQuery = 0,
-) -> Page[AttendanceRecordRead]:
+    cursor: _CursorQuery = None,
+    include_total: bool = True,
+) -> CursorPage[AttendanceRecordRead]:
     """Bounded, filtered, deterministically ordered attendance detail.
 
     ``classroom_id``/``subject_id`` are required — a teacher's assignment
@@ -113,6 +140,10 @@ async def get_attendance_detail(
     .authorize_scope``). An unrelated or inactive teacher scope is
     concealed as the same 404 used by ``bulk_save``, with an independent
     blocked-audit row.
+
+    Pages by ``offset`` or by the ``next_cursor`` of the previous page,
+    whose cost does not grow with depth; ``include_total=false`` skips
+    the count.
     """
     return await AttendanceReadService(session).get_detail(
         current_user,
@@ -124,6 +155,8 @@ async def get_attendance_detail(
         status=status_filter,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        include_total=include_total,
         request_id=_request_id(request),
     )
 
@@ -194,16 +227,20 @@ async def export_attendance_csv(
     date_from: date | None = None,
     date_to: date | None = None,
     status_filter: Annotated[AttendanceStatus | None, Query(alias="status")] = None,
-) -> Response:
-    """In-memory CSV export — same authorization as ``GET /attendance/detail``.
+) -> StreamingResponse:
+    """Streamed CSV export — same authorization as ``GET /attendance/detail``.
 
-    Never writes a temporary file (see
-    ``app.modules.attendance.csv_export``). The filename is built
+    Authorization runs before the response starts, so a denied export is
+    still a normal JSON error. The body is then streamed: the header row
+    goes out at once and rows follow in chunks read over a server-side
+    cursor, so memory stays flat however many rows match. Never writes a
+    temporary file (see ``app.modules.attendance.csv_export``). The
+    request's database session stays open until the stream ends. The filename is built
     exclusively from the already-authorized classroom/subject codes —
     never from client input. An empty result still returns a valid CSV
     containing only the header row.
     """
-    classroom, subject, rows = await AttendanceReadService(session).export(
+    classroom, subject, row_chunks = await AttendanceReadService(session).export(
         current_user,
         classroom_id=classroom_id,
         subject_id=subject_id,
@@ -213,16 +250,15 @@ async def export_attendance_csv(
         status=status_filter,
         request_id=_request_id(request),
     )
-    csv_body = build_attendance_csv(classroom=classroom, subject=subject, rows=rows)
     filename = build_export_filename(classroom=classroom, subject=subject)
-    return Response(
-        content=csv_body.encode("utf-8"),
+    return StreamingResponse(
+        iter_attendance_csv(classroom=classroom, subject=subject, chunks=row_chunks),
         media_type="text/csv; charset=utf-8",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
-@router.get("/me/detail", response_model=Page[AttendanceRecordRead])
+@router.get("/me/detail", response_model=CursorPage[AttendanceRecordRead])
 async def get_my_attendance_detail(
     current_user: StudentUser,
     session: Session,
@@ -233,8 +269,13 @@ async def get_my_attendance_detail(
     status_filter: Annotated[AttendanceStatus | None, Query(alias="status")] = None,
     limit: _LimitQuery = 50,
     offset: _OffsetQuery = 0,
-) -> Page[AttendanceRecordRead]:
-    """The caller's own attendance only. No ``student_profile_id`` parameter exists."""
+    cursor: _CursorQuery = None,
+    include_total: bool = True,
+) -> CursorPage[AttendanceRecordRead]:
+    """The caller's own attendance only. No ``student_profile_id`` parameter exists.
+
+    Paged like ``GET /attendance/detail``.
+    """
     return await AttendanceReadService(session).get_self_detail(
         current_user,
         classroom_id=classroom_id,
@@ -244,6 +285,8 @@ async def get_my_attendance_detail(
         status=status_filter,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
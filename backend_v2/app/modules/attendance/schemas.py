@@ -27,6 +27,14 @@ from app.modules.attendance.models import AttendanceStatus, AuditOutcome
 # job.
 MAX_BULK_ATTENDANCE_ROWS = 200
 
+# Bounds for one school-wide submission (``MultiScopeAttendanceRequest``):
+# a whole day's registers for a large school — e.g. 40 classrooms times
+# 8 subjects, each at most ``MAX_BULK_ATTENDANCE_ROWS`` — in one request.
+# The rows are staged with ``COPY`` and merged in one statement, so the
+# cost is dominated by parsing the JSON body, not by the row count.
+MAX_ATTENDANCE_SCOPES_PER_SUBMISSION = 500
+MAX_ATTENDANCE_ROWS_PER_SUBMISSION = 50_000
+
 
 class _StrictRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -77,6 +85,69 @@ class BulkAttendanceRequest(_StrictRequest):
         return self
 
 
+class AttendanceScopeRecordsIn(_StrictRequest):
+    """One classroom/subject's records within a multi-scope submission."""
+
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    records: list[BulkAttendanceRecordIn] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BULK_ATTENDANCE_ROWS,
+        description=(
+            "Same rules as ``BulkAttendanceRequest.records``: non-empty, at most "
+            f"{MAX_BULK_ATTENDANCE_ROWS} records, no duplicate student_profile_id."
+        ),
+    )
+
+    @model_validator(mode="after")
+    def _reject_duplicate_students(self) -> AttendanceScopeRecordsIn:
+        seen: set[uuid.UUID] = set()
+        for record in self.records:
+            if record.student_profile_id in seen:
+                raise ValueError(
+                    "records must not contain duplicate student_profile_id values "
+                    f"({record.student_profile_id})."
+                )
+            seen.add(record.student_profile_id)
+        return self
+
+
+class MultiScopeAttendanceRequest(_StrictRequest):
+    """One date's attendance for many classroom/subject scopes at once."""
+
+    attendance_date: date
+    scopes: list[AttendanceScopeRecordsIn] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_ATTENDANCE_SCOPES_PER_SUBMISSION,
+        description=(
+            f"At most {MAX_ATTENDANCE_SCOPES_PER_SUBMISSION} scopes and "
+            f"{MAX_ATTENDANCE_ROWS_PER_SUBMISSION} records in total; each "
+            "(classroom_id, subject_id) pair at most once."
+        ),
+    )
+
+    @model_validator(mode="after")
+    def _check_scopes(self) -> MultiScopeAttendanceRequest:
+        seen: set[tuple[uuid.UUID, uuid.UUID]] = set()
+        for scope in self.scopes:
+            key = (scope.classroom_id, scope.subject_id)
+            if key in seen:
+                raise ValueError(
+                    "scopes must not repeat a (classroom_id, subject_id) pair "
+                    f"({scope.classroom_id}, {scope.subject_id})."
+                )
+            seen.add(key)
+        total = sum(len(scope.records) for scope in self.scopes)
+        if total > MAX_ATTENDANCE_ROWS_PER_SUBMISSION:
+            raise ValueError(
+                f"a submission must not contain more than "
+                f"{MAX_ATTENDANCE_ROWS_PER_SUBMISSION} records in total ({total})."
+            )
+        return self
+
+
 class AttendanceRecordRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -119,6 +190,33 @@ class AttendanceBulkSaveResult(BaseModel):
     record_ids: list[uuid.UUID]
 
 
+class AttendanceScopeSaveResult(BaseModel):
+    """One scope's counts within a ``MultiScopeAttendanceResult``."""
+
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    created_count: int
+    updated_count: int
+    total_count: int
+
+
+class MultiScopeAttendanceResult(BaseModel):
+    """The typed result of ``AttendanceService.bulk_save_scopes``.
+
+    Counts only, per scope in request order — unlike
+    ``AttendanceBulkSaveResult`` no record IDs, which for a whole school
+    would be tens of thousands of them. ``submission_id`` is also recorded
+    on each scope's success audit row, tying the rows together.
+    """
+
+    submission_id: uuid.UUID
+    attendance_date: date
+    created_count: int
+    updated_count: int
+    total_count: int
+    scopes: list[AttendanceScopeSaveResult]
+
+
 class AuditLogRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
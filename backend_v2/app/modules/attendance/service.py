@@ -8,12 +8,14 @@ Two distinct transaction boundaries are used, deliberately never mixed:
 
 1. **The main batch transaction** (``app.db.transaction.service_transaction``,
    bound to ``self._session`` — the caller's request-scoped session).
-   Reference/authorization checks, the student-by-student upsert loop, and
+   Reference/authorization checks, the batch upsert, and
    the *success* audit-log write all happen inside this one boundary. Any
    exception anywhere in it — an invalid row, a repository/integrity
    error, or a failure while writing the success audit row — rolls back
    every attendance write made so far in this call, per the Stage 2
-   brief's instruction A/B.
+   brief's instruction A/B. ``bulk_save_in_transaction`` is the same
+   work inside a transaction its caller already owns, for a caller that
+   must commit attendance together with its own rows.
 
 2. **The blocked-audit transaction** (``BlockedAuditWriter``, its own
    brand-new ``AsyncSession`` from a factory bound to the caller session's
@@ -27,16 +29,24 @@ Two distinct transaction boundaries are used, deliberately never mixed:
    early partial-commit that undermines the "one invalid row rolls back
    the whole batch" guarantee. A fully independent session/transaction
    sidesteps both problems.
+
+``bulk_save_scopes`` is the school-wide form of ``bulk_save``: one date,
+many classroom/subject scopes, one main transaction, authorized in one
+pass and written through a ``COPY``-staged temporary table and a single
+merge statement — see its docstring.
 """
 
 from __future__ import annotations
 
 import uuid
+from collections.abc import Sequence
 from datetime import date
+from typing import NoReturn
 
 import structlog
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.core.exceptions import AppError
 from app.db.transaction import service_transaction
 from app.modules.academics.errors import (
     ClassroomNotFoundError,
@@ -51,6 +61,7 @@ from app.modules.academics.repository import (
 )
 from app.modules.attendance.errors import (
     AttendanceBatchTooLargeError,
+    AttendanceDuplicateScopeInSubmissionError,
     AttendanceDuplicateStudentInBatchError,
     AttendanceInactiveStudentError,
     AttendanceRoleNotPermittedError,
@@ -59,12 +70,24 @@ from app.modules.attendance.errors import (
     AttendanceStudentNotInClassroomError,
 )
 from app.modules.attendance.models import AuditLog, AuditOutcome
-from app.modules.attendance.repository import AttendanceRepository, AuditLogRepository
+from app.modules.attendance.repository import (
+    AttendanceMark,
+    AttendanceRepository,
+    AuditLogRepository,
+    ScopeAuditEntry,
+    ScopedAttendanceMark,
+    StagedStudentProblem,
+)
 from app.modules.attendance.schemas import (
+    MAX_ATTENDANCE_ROWS_PER_SUBMISSION,
+    MAX_ATTENDANCE_SCOPES_PER_SUBMISSION,
     MAX_BULK_ATTENDANCE_ROWS,
     AttendanceBulkSaveResult,
+    AttendanceScopeSaveResult,
     BulkAttendanceRecordIn,
     BulkAttendanceRequest,
+    MultiScopeAttendanceRequest,
+    MultiScopeAttendanceResult,
 )
 from app.modules.profiles.repository import StudentProfileRepository, TeacherProfileRepository
 from app.modules.users.models import User, UserRole
@@ -197,64 +220,84 @@ class AttendanceService:
         On any exception, the entire batch (every attendance write made
         so far in this call, and the success-audit write) is rolled back.
         """
+        async with service_transaction(self._session):
+            return await self.bulk_save_in_transaction(
+                current_user=current_user, payload=payload, request_id=request_id
+            )
+
+    async def bulk_save_in_transaction(
+        self,
+        *,
+        current_user: User,
+        payload: BulkAttendanceRequest,
+        request_id: str | None = None,
+    ) -> AttendanceBulkSaveResult:
+        """``bulk_save`` inside a transaction the caller already owns.
+
+        Same checks, writes, success audit and errors, but nothing is
+        committed here: the caller's own ``service_transaction`` commits
+        these writes together with its own, or rolls all of them back.
+        Used by recognition attendance to persist a batch's attempts and
+        its attendance marks atomically. The blocked-audit row for a
+        denied teacher is still written independently.
+        """
         self._validate_batch_shape(payload)
         if current_user.role not in (UserRole.ADMIN, UserRole.TEACHER):
             raise AttendanceRoleNotPermittedError()
 
-        async with service_transaction(self._session):
-            classroom = await self._classrooms.get_by_id(payload.classroom_id)
-            subject = await self._subjects.get_by_id(payload.subject_id)
+        classroom = await self._classrooms.get_by_id(payload.classroom_id)
+        subject = await self._subjects.get_by_id(payload.subject_id)
 
-            if current_user.role is UserRole.ADMIN:
-                if classroom is None:
-                    raise ClassroomNotFoundError()
-                if subject is None:
-                    raise SubjectNotFoundError()
-            else:
-                await self._authorize_teacher_scope(
-                    current_user,
-                    classroom=classroom,
-                    subject=subject,
-                    classroom_id=payload.classroom_id,
-                    subject_id=payload.subject_id,
-                    request_id=request_id,
-                )
-
-            # Authorization above guarantees both are non-None by this
-            # point (admin: checked directly; teacher: scope check only
-            # returns normally when both were resolved). Checked
-            # explicitly (not via ``assert``, which ``python -O`` can
-            # strip) since this is a genuine invariant, not a client
-            # input to validate.
-            if classroom is None or subject is None:  # pragma: no cover - invariant
-                raise RuntimeError(
-                    "attendance authorization invariant violated: "
-                    "classroom/subject resolved as None after authorization succeeded"
-                )
-            if not classroom.is_active or not subject.is_active:
-                raise InactiveAcademicReferenceError()
-
-            await self._validate_students(classroom_id=classroom.id, records=payload.records)
-
-            created_count, updated_count, record_ids = await self._write_attendance_records(
+        if current_user.role is UserRole.ADMIN:
+            if classroom is None:
+                raise ClassroomNotFoundError()
+            if subject is None:
+                raise SubjectNotFoundError()
+        else:
+            await self._authorize_teacher_scope(
+                current_user,
                 classroom=classroom,
                 subject=subject,
-                attendance_date=payload.attendance_date,
-                records=payload.records,
-                marked_by_user_id=current_user.id,
+                classroom_id=payload.classroom_id,
+                subject_id=payload.subject_id,
+                request_id=request_id,
             )
 
-            await self._write_success_audit(
-                current_user=current_user,
-                classroom_id=classroom.id,
-                subject_id=subject.id,
-                attendance_date=payload.attendance_date,
-                created_count=created_count,
-                updated_count=updated_count,
-                total_count=len(payload.records),
-                record_ids=record_ids,
-                request_id=request_id,
+        # Authorization above guarantees both are non-None by this
+        # point (admin: checked directly; teacher: scope check only
+        # returns normally when both were resolved). Checked
+        # explicitly (not via ``assert``, which ``python -O`` can
+        # strip) since this is a genuine invariant, not a client
+        # input to validate.
+        if classroom is None or subject is None:  # pragma: no cover - invariant
+            raise RuntimeError(
+                "attendance authorization invariant violated: "
+                "classroom/subject resolved as None after authorization succeeded"
             )
+        if not classroom.is_active or not subject.is_active:
+            raise InactiveAcademicReferenceError()
+
+        await self._validate_students(classroom_id=classroom.id, records=payload.records)
+
+        created_count, updated_count, record_ids = await self._write_attendance_records(
+            classroom=classroom,
+            subject=subject,
+            attendance_date=payload.attendance_date,
+            records=payload.records,
+            marked_by_user_id=current_user.id,
+        )
+
+        await self._write_success_audit(
+            current_user=current_user,
+            classroom_id=classroom.id,
+            subject_id=subject.id,
+            attendance_date=payload.attendance_date,
+            created_count=created_count,
+            updated_count=updated_count,
+            total_count=len(payload.records),
+            record_ids=record_ids,
+            request_id=request_id,
+        )
 
         return AttendanceBulkSaveResult(
             classroom_id=classroom.id,
@@ -266,6 +309,121 @@ class AttendanceService:
             record_ids=record_ids,
         )
 
+    async def bulk_save_scopes(
+        self,
+        *,
+        current_user: User,
+        payload: MultiScopeAttendanceRequest,
+        request_id: str | None = None,
+    ) -> MultiScopeAttendanceResult:
+        """Create/update one date's records for many scopes as one transaction.
+
+        The school-wide counterpart of ``bulk_save``: the same rules and
+        errors (plus ``AttendanceDuplicateScopeInSubmissionError``), all
+        or nothing — one invalid scope or row rolls back every scope. What
+        changes is that the number of round trips no longer grows with
+        the number of scopes or rows:
+
+        1. Every scope is authorized in one pass: classrooms and subjects
+           are loaded with one query each, a teacher's active assignments
+           with one more. A teacher denied any scope gets the concealed
+           ``AttendanceScopeNotFoundError`` after one blocked audit row,
+           for the first such scope.
+        2. All rows are ``COPY``-ed into a temporary table
+           (``AttendanceRepository.stage_marks``) and every student is
+           validated with one join against it; the first invalid row in
+           request order raises the error ``bulk_save`` would raise.
+        3. One ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` merges every
+           row (``merge_staged``) and returns per-scope counts.
+        4. One success audit row per scope, as ``bulk_save`` writes for
+           its one scope, inserted together. Each carries the
+           submission's ``submission_id`` instead of record IDs.
+        """
+        submission_id = uuid.uuid4()
+        async with service_transaction(self._session):
+            self._validate_submission_shape(payload)
+            if current_user.role not in (UserRole.ADMIN, UserRole.TEACHER):
+                raise AttendanceRoleNotPermittedError()
+            await self._authorize_scopes(
+                current_user,
+                scopes=[(scope.classroom_id, scope.subject_id) for scope in payload.scopes],
+                request_id=request_id,
+            )
+
+            staging = await self._attendance.stage_marks(
+                [
+                    ScopedAttendanceMark(
+                        classroom_id=scope.classroom_id,
+                        subject_id=scope.subject_id,
+                        student_profile_id=record.student_profile_id,
+                        status=record.status,
+                        remarks=record.remarks,
+                    )
+                    for scope in payload.scopes
+                    for record in scope.records
+                ]
+            )
+            problem = await self._attendance.first_invalid_staged_student(staging)
+            if problem is not None:
+                raise _student_validation_error(problem)
+            counts = {
+                (scope_counts.classroom_id, scope_counts.subject_id): scope_counts
+                for scope_counts in await self._attendance.merge_staged(
+                    staging,
+                    attendance_date=payload.attendance_date,
+                    marked_by_user_id=current_user.id,
+                )
+            }
+
+            results = [
+                AttendanceScopeSaveResult(
+                    classroom_id=scope.classroom_id,
+                    subject_id=scope.subject_id,
+                    created_count=counts[(scope.classroom_id, scope.subject_id)].created_count,
+                    updated_count=counts[(scope.classroom_id, scope.subject_id)].updated_count,
+                    total_count=len(scope.records),
+                )
+                for scope in payload.scopes
+            ]
+            await self._audit_logs.create_many(
+                actor_user_id=current_user.id,
+                action=ACTION_ATTENDANCE_BULK_MARK,
+                outcome=AuditOutcome.SUCCESS,
+                entity_type=_ENTITY_TYPE_ATTENDANCE_BATCH,
+                request_id=request_id,
+                entries=[
+                    ScopeAuditEntry(
+                        classroom_id=result.classroom_id,
+                        subject_id=result.subject_id,
+                        event_metadata={
+                            "attendance_date": payload.attendance_date.isoformat(),
+                            "created_count": result.created_count,
+                            "updated_count": result.updated_count,
+                            "total_count": result.total_count,
+                            "submission_id": str(submission_id),
+                            "submission_scope_count": len(results),
+                        },
+                    )
+                    for result in results
+                ],
+            )
+
+        logger.info(
+            "attendance_submission_saved",
+            submission_id=str(submission_id),
+            scope_count=len(results),
+            total_count=sum(result.total_count for result in results),
+            request_id=request_id,
+        )
+        return MultiScopeAttendanceResult(
+            submission_id=submission_id,
+            attendance_date=payload.attendance_date,
+            created_count=sum(result.created_count for result in results),
+            updated_count=sum(result.updated_count for result in results),
+            total_count=sum(result.total_count for result in results),
+            scopes=results,
+        )
+
     # --- batch-shape validation (defense in depth) ----------------------
 
     def _validate_batch_shape(self, payload: BulkAttendanceRequest) -> None:
@@ -279,13 +437,24 @@ class AttendanceService:
         trust actor, role, ownership, or marked_by values from request
         data" — extended here to batch shape as well).
         """
-        if len(payload.records) > MAX_BULK_ATTENDANCE_ROWS:
+        _validate_records_shape(payload.records)
+
+    def _validate_submission_shape(self, payload: MultiScopeAttendanceRequest) -> None:
+        """``_validate_batch_shape`` for every scope, plus the submission's
+        own caps and its no-repeated-scope rule."""
+        total = sum(len(scope.records) for scope in payload.scopes)
+        if (
+            len(payload.scopes) > MAX_ATTENDANCE_SCOPES_PER_SUBMISSION
+            or total > MAX_ATTENDANCE_ROWS_PER_SUBMISSION
+        ):
             raise AttendanceBatchTooLargeError()
-        seen: set[uuid.UUID] = set()
-        for record in payload.records:
-            if record.student_profile_id in seen:
-                raise AttendanceDuplicateStudentInBatchError()
-            seen.add(record.student_profile_id)
+        seen: set[tuple[uuid.UUID, uuid.UUID]] = set()
+        for scope in payload.scopes:
+            key = (scope.classroom_id, scope.subject_id)
+            if key in seen:
+                raise AttendanceDuplicateScopeInSubmissionError()
+            seen.add(key)
+            _validate_records_shape(scope.records)
 
     # --- authorization ---------------------------------------------------
 
@@ -327,7 +496,24 @@ class AttendanceService:
 
         if assigned:
             return
+        await self._deny_teacher_scope(
+            current_user,
+            classroom_id=classroom_id,
+            subject_id=subject_id,
+            request_id=request_id,
+            reason_code=reason_code,
+        )
 
+    async def _deny_teacher_scope(
+        self,
+        current_user: User,
+        *,
+        classroom_id: uuid.UUID,
+        subject_id: uuid.UUID,
+        request_id: str | None,
+        reason_code: str,
+    ) -> NoReturn:
+        """Persist the blocked audit row, then raise the concealed 404."""
         try:
             await self._blocked_audit_writer.write(
                 actor_user_id=current_user.id,
@@ -364,6 +550,55 @@ class AttendanceService:
             )
         raise AttendanceScopeNotFoundError()
 
+    async def _authorize_scopes(
+        self,
+        current_user: User,
+        *,
+        scopes: Sequence[tuple[uuid.UUID, uuid.UUID]],
+        request_id: str | None,
+    ) -> None:
+        """``bulk_save_in_transaction``'s reference and scope checks for
+        every ``(classroom_id, subject_id)`` in ``scopes``, in three
+        queries at most, raising for the first failing scope in order."""
+        classrooms = await self._classrooms.get_by_ids({scope[0] for scope in scopes})
+        subjects = await self._subjects.get_by_ids({scope[1] for scope in scopes})
+
+        if current_user.role is UserRole.ADMIN:
+            for classroom_id, subject_id in scopes:
+                if classroom_id not in classrooms:
+                    raise ClassroomNotFoundError()
+                if subject_id not in subjects:
+                    raise SubjectNotFoundError()
+        else:
+            teacher_profile = await self._teachers.get_by_user_id(current_user.id)
+            profile_active = teacher_profile is not None and teacher_profile.is_active
+            assigned: set[tuple[uuid.UUID, uuid.UUID]] = set()
+            if teacher_profile is not None and profile_active:
+                assigned = {
+                    (assignment.classroom_id, assignment.subject_id)
+                    for assignment in await self._assignments.list_by_teacher(teacher_profile.id)
+                }
+            for classroom_id, subject_id in scopes:
+                if not profile_active:
+                    reason_code = _REASON_TEACHER_PROFILE_INACTIVE_OR_MISSING
+                elif classroom_id not in classrooms or subject_id not in subjects:
+                    reason_code = _REASON_CLASSROOM_OR_SUBJECT_NOT_FOUND
+                elif (classroom_id, subject_id) not in assigned:
+                    reason_code = _REASON_ASSIGNMENT_INACTIVE_OR_MISSING
+                else:
+                    continue
+                await self._deny_teacher_scope(
+                    current_user,
+                    classroom_id=classroom_id,
+                    subject_id=subject_id,
+                    request_id=request_id,
+                    reason_code=reason_code,
+                )
+
+        for classroom_id, subject_id in scopes:
+            if not classrooms[classroom_id].is_active or not subjects[subject_id].is_active:
+                raise InactiveAcademicReferenceError()
+
     # --- student validation -----------------------------------------------
 
     async def _validate_students(
@@ -371,12 +606,17 @@ class AttendanceService:
     ) -> None:
         """Every record's student must exist, be active, and be in ``classroom_id``.
 
-        Raises on the first invalid record encountered. Runs entirely
-        before any attendance row is written, so an invalid record never
-        leaves a partial batch to roll back — it simply never starts.
+        Raises on the first invalid record, in record order, exactly as
+        checking them one by one would — but all profiles are loaded with
+        a single ``IN`` query. Runs entirely before any attendance row is
+        written, so an invalid record never leaves a partial batch to roll
+        back — it simply never starts.
         """
+        profiles = await self._students.get_by_ids(
+            {record.student_profile_id for record in records}
+        )
         for record in records:
-            profile = await self._students.get_by_id(record.student_profile_id)
+            profile = profiles.get(record.student_profile_id)
             if profile is None:
                 raise AttendanceStudentNotFoundError()
             if not profile.is_active:
@@ -397,48 +637,32 @@ class AttendanceService:
     ) -> tuple[int, int, list[uuid.UUID]]:
         """Create missing rows, update existing ones. Never trusts ``marked_by``.
 
+        One ``AttendanceRepository.upsert_many`` statement for the whole
+        batch; the created/updated split comes back from PostgreSQL, and
+        ``record_ids`` stay in request order.
+
         ``marked_by_user_id`` always comes from the authenticated caller
         (the parameter above) — no field on ``BulkAttendanceRecordIn``
         carries an actor/marked-by value at all, so there is nothing from
         client input to accidentally trust here.
         """
-        created_count = 0
-        updated_count = 0
-        record_ids: list[uuid.UUID] = []
-
-        for record in records:
-            student_profile_id = record.student_profile_id
-            status = record.status
-            remarks = record.remarks
-
-            existing = await self._attendance.get_by_unique_key(
-                student_profile_id=student_profile_id,
-                classroom_id=classroom.id,
-                subject_id=subject.id,
-                attendance_date=attendance_date,
-            )
-            if existing is None:
-                saved = await self._attendance.create(
-                    student_profile_id=student_profile_id,
-                    classroom_id=classroom.id,
-                    subject_id=subject.id,
-                    attendance_date=attendance_date,
-                    status=status,
-                    remarks=remarks,
-                    marked_by_user_id=marked_by_user_id,
-                )
-                created_count += 1
-            else:
-                saved = await self._attendance.update(
-                    existing,
-                    status=status,
-                    remarks=remarks,
-                    marked_by_user_id=marked_by_user_id,
+        results = await self._attendance.upsert_many(
+            classroom_id=classroom.id,
+            subject_id=subject.id,
+            attendance_date=attendance_date,
+            marks=[
+                AttendanceMark(
+                    student_profile_id=record.student_profile_id,
+                    status=record.status,
+                    remarks=record.remarks,
                 )
-                updated_count += 1
-            record_ids.append(saved.id)
-
-        return created_count, updated_count, record_ids
+                for record in records
+            ],
+            marked_by_user_id=marked_by_user_id,
+        )
+        created_count = sum(1 for result in results if result.created)
+        record_ids = [result.record.id for result in results]
+        return created_count, len(results) - created_count, record_ids
 
     async def _write_success_audit(
         self,
@@ -483,6 +707,25 @@ class AttendanceService:
         )
 
 
+def _validate_records_shape(records: Sequence[BulkAttendanceRecordIn]) -> None:
+    if len(records) > MAX_BULK_ATTENDANCE_ROWS:
+        raise AttendanceBatchTooLargeError()
+    seen: set[uuid.UUID] = set()
+    for record in records:
+        if record.student_profile_id in seen:
+            raise AttendanceDuplicateStudentInBatchError()
+        seen.add(record.student_profile_id)
+
+
+def _student_validation_error(problem: StagedStudentProblem) -> AppError:
+    """The error ``_validate_students`` raises for the same failing record."""
+    if not problem.student_found:
+        return AttendanceStudentNotFoundError()
+    if not problem.student_active:
+        return AttendanceInactiveStudentError()
+    return AttendanceStudentNotInClassroomError()
+
+
 __all__ = [
     "ACTION_ATTENDANCE_BULK_MARK",
     "AttendanceService",
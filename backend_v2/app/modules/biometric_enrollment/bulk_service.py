@@ -37,6 +37,12 @@ summary):
    and consistent with docs/BIOMETRIC_DATA_POLICY.md's explicit
    statement that a database transaction cannot make filesystem changes
    atomic — reconciliation covers any resulting drift.
+
+Once the batch audit is written, every enrolled sample is queued for
+recognition processing in one more transaction (see
+app.modules.face_recognition.processing_jobs). Queueing is best-effort
+like that audit: the enrollment is already committed, and the
+processing worker queues any pending sample left without a job.
 """
 
 from __future__ import annotations
@@ -80,6 +86,7 @@ from app.modules.biometric_enrollment.zip_security import (
     stream_member_to_path,
     validate_archive,
 )
+from app.modules.face_recognition.repository import BiometricProcessingJobRepository
 from app.modules.profiles.repository import StudentProfileRepository
 from app.modules.users.models import User
 
@@ -133,6 +140,7 @@ class BulkEnrollmentService:
         self._enrollments = BiometricEnrollmentRepository(session)
         self._samples = BiometricSampleRepository(session)
         self._audit_logs = AuditLogRepository(session)
+        self._processing_jobs = BiometricProcessingJobRepository(session)
 
     async def enroll_from_zip(
         self,
@@ -354,7 +362,7 @@ class BulkEnrollmentService:
         request_id: str | None,
     ) -> BulkEnrollmentResult:
         row_results: list[BulkEnrollmentRowResult] = []
-        enrolled_count = 0
+        enrolled_sample_ids: list[uuid.UUID] = []
         infra_failure = False
 
         for item in prepared:
@@ -399,7 +407,7 @@ class BulkEnrollmentService:
                 )
                 continue
 
-            enrolled_count += 1
+            enrolled_sample_ids.append(sample_id)
             row_results.append(
                 BulkEnrollmentRowResult(
                     row_number=item.manifest_row.row_number,
@@ -411,6 +419,7 @@ class BulkEnrollmentService:
             )
 
         success = not infra_failure
+        enrolled_count = len(enrolled_sample_ids)
         await self._write_batch_audit(
             actor_user_id=actor_user_id,
             action=ACTION_BULK_ENROLLMENT_COMPLETED,
@@ -419,12 +428,16 @@ class BulkEnrollmentService:
             enrolled_count=enrolled_count,
             request_id=request_id,
         )
+        processing_batch_id = await self._enqueue_processing(
+            enrolled_sample_ids, actor_user_id=actor_user_id, request_id=request_id
+        )
         return BulkEnrollmentResult(
             success=success,
             total_rows=len(prepared),
             enrolled_count=enrolled_count,
             failed_count=len(prepared) - enrolled_count,
             rows=row_results,
+            processing_batch_id=processing_batch_id,
         )
 
     async def _execute_one_row(self, item: _PreparedRow, *, actor_user_id: uuid.UUID) -> uuid.UUID:
@@ -540,6 +553,36 @@ class BulkEnrollmentService:
             await self._session.rollback()
             logger.error("bulk_enrollment_audit_write_failed", exc_type=type(exc).__name__)
 
+    async def _enqueue_processing(
+        self,
+        sample_ids: list[uuid.UUID],
+        *,
+        actor_user_id: uuid.UUID,
+        request_id: str | None,
+    ) -> uuid.UUID | None:
+        if not sample_ids:
+            return None
+        batch_id = uuid.uuid4()
+        try:
+            async with service_transaction(self._session):
+                await self._processing_jobs.enqueue(
+                    [(sample_id, actor_user_id) for sample_id in sample_ids],
+                    max_attempts=self._settings.FACE_PROCESSING_JOB_MAX_ATTEMPTS,
+                    batch_id=batch_id,
+                    request_id=request_id,
+                )
+        except Exception as exc:
+            # Intentionally swallowed, like `_write_batch_audit`: the
+            # enrollment itself is committed, and the processing worker
+            # queues any pending sample that has no job.
+            logger.error(
+                "bulk_enrollment_processing_enqueue_failed",
+                sample_count=len(sample_ids),
+                exc_type=type(exc).__name__,
+            )
+            return None
+        return batch_id
+
     async def _compensate_promoted_file_after_activation_failure(
         self, key: str, sample_id: uuid.UUID
     ) -> None:
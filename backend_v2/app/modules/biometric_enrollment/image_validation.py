@@ -26,6 +26,11 @@ match-probe API, and vice versa, so each public entry point in its own
 module translates the same private signal into its own domain errors.
 Nothing about Stage 2's own public behavior below (``validate_image_file``,
 ``ValidatedImage``, the ``Enrollment*`` errors raised) has changed.
+
+A probe is also decoded for detection straight after it is validated,
+so ``_validate_and_decode_bgr_bytes`` returns the pixels of the same
+full decode the checks needed, instead of leaving the caller to decode
+the upload a second time.
 """
 
 from __future__ import annotations
@@ -159,6 +164,53 @@ def _validate_decoded_bytes(
     never a bare Pillow/stdlib exception — so this function has no
     opinion about which domain is calling it.
     """
+    content, _ = _check_and_decode(
+        data,
+        max_pixels=max_pixels,
+        max_dimension=max_dimension,
+        declared_content_type=declared_content_type,
+        want_bgr=False,
+    )
+    return content
+
+
+def _validate_and_decode_bgr_bytes(
+    data: bytes,
+    *,
+    max_pixels: int,
+    max_dimension: int,
+    declared_content_type: str | None,
+) -> tuple[ValidatedImageContent, bytes]:
+    """``_validate_decoded_bytes`` plus the image's pixels in BGR order,
+    from the same full decode.
+
+    The pixels are packed ``(height, width, 3)`` ``uint8`` rows — the
+    ``ImageFrame`` convention in
+    ``app.modules.face_recognition.image_codec``, BGR because OpenCV's
+    detector reads them next — so a caller can wrap them without another
+    copy. Every check, and the order they run in,
+    is exactly ``_validate_decoded_bytes``'s; the pixels only exist once
+    all of them have passed.
+    """
+    content, bgr_pixels = _check_and_decode(
+        data,
+        max_pixels=max_pixels,
+        max_dimension=max_dimension,
+        declared_content_type=declared_content_type,
+        want_bgr=True,
+    )
+    assert bgr_pixels is not None
+    return content, bgr_pixels
+
+
+def _check_and_decode(
+    data: bytes,
+    *,
+    max_pixels: int,
+    max_dimension: int,
+    declared_content_type: str | None,
+    want_bgr: bool,
+) -> tuple[ValidatedImageContent, bytes | None]:
     if not data:
         raise _ImageContentRejected("empty")
 
@@ -166,38 +218,39 @@ def _validate_decoded_bytes(
     # own process-wide decompression-bomb policy; we never replace that global
     # threshold.  The application's request-specific limits are enforced from
     # the declared dimensions before any full pixel-plane decode occurs.
+    # ``verify()`` then checks the encoded stream on the same (not yet
+    # loaded) object — it reads chunk structure and checksums, not pixels.
     try:
-        with Image.open(BytesIO(data)) as header_probe:
-            declared_width, declared_height = header_probe.size
+        with Image.open(BytesIO(data)) as probe:
+            declared_width, declared_height = probe.size
+            if declared_width <= 0 or declared_height <= 0:
+                raise _ImageContentRejected("dimensions_invalid")
+            if declared_width > max_dimension or declared_height > max_dimension:
+                raise _ImageContentRejected("too_large")
+            if declared_width * declared_height > max_pixels:
+                raise _ImageContentRejected("too_large")
+            probe.verify()
     except Image.DecompressionBombError as exc:
         raise _ImageContentRejected("too_large") from exc
     except (UnidentifiedImageError, OSError, ValueError) as exc:
         raise _ImageContentRejected("decode") from exc
 
-    if declared_width <= 0 or declared_height <= 0:
-        raise _ImageContentRejected("dimensions_invalid")
-    if declared_width > max_dimension or declared_height > max_dimension:
-        raise _ImageContentRejected("too_large")
-    if declared_width * declared_height > max_pixels:
-        raise _ImageContentRejected("too_large")
-
-    # Verify the encoded stream, then reopen and force a complete decode.
-    # Pillow's own global bomb guard remains active and unchanged throughout;
-    # application-specific limits are rechecked below against the decoded
-    # image metadata so each concurrent request is governed only by its own
+    # ``verify()`` leaves the Image object unusable for further reads
+    # (Pillow's documented contract), so a fresh open is required. This is
+    # the one full pixel-plane decode: Pillow's own global bomb guard
+    # remains active and unchanged throughout, and application-specific
+    # limits are rechecked below against the decoded image metadata so each
+    # concurrent request is governed only by its own
     # ``max_pixels``/``max_dimension`` values.
     try:
-        with Image.open(BytesIO(data)) as probe:
-            probe.verify()
+        image = Image.open(BytesIO(data))
     except Image.DecompressionBombError as exc:
         raise _ImageContentRejected("too_large") from exc
     except (UnidentifiedImageError, OSError, ValueError) as exc:
         raise _ImageContentRejected("decode") from exc
 
-    # ``verify()`` leaves the Image object unusable for further reads
-    # (Pillow's documented contract), so a fresh open is required.
-    try:
-        with Image.open(BytesIO(data)) as image:
+    with image:
+        try:
             image_format = image.format
             width, height = image.size
             is_animated = bool(getattr(image, "is_animated", False)) or (
@@ -206,40 +259,55 @@ def _validate_decoded_bytes(
             # Force full pixel-plane decode now (not just header parsing) so a
             # truncated body fails here rather than on first later use.
             image.load()
-    except Image.DecompressionBombError as exc:
-        raise _ImageContentRejected("too_large") from exc
-    except (UnidentifiedImageError, OSError, ValueError) as exc:
-        raise _ImageContentRejected("decode") from exc
-
-    if image_format not in _ALLOWED_FORMATS:
-        raise _ImageContentRejected("format", allowed_formats=frozenset(_ALLOWED_FORMATS.values()))
-
-    if width <= 0 or height <= 0:
-        raise _ImageContentRejected("dimensions_invalid")
-
-    if width > max_dimension or height > max_dimension:
-        raise _ImageContentRejected("too_large")
-    if width * height > max_pixels:
-        raise _ImageContentRejected("too_large")
-
-    if is_animated:
-        raise _ImageContentRejected("animated")
-
-    content_type = _ALLOWED_FORMATS[image_format]
-
-    normalized_declared = (declared_content_type or "").split(";", 1)[0].strip().lower()
-    if (
-        normalized_declared
-        and normalized_declared in _RECOGNIZED_DECLARED_TYPES
-        and _RECOGNIZED_DECLARED_TYPES[normalized_declared] != image_format
-    ):
-        raise _ImageContentRejected("mime_mismatch")
+        except Image.DecompressionBombError as exc:
+            raise _ImageContentRejected("too_large") from exc
+        except (UnidentifiedImageError, OSError, ValueError) as exc:
+            raise _ImageContentRejected("decode") from exc
+
+        if image_format not in _ALLOWED_FORMATS:
+            raise _ImageContentRejected(
+                "format", allowed_formats=frozenset(_ALLOWED_FORMATS.values())
+            )
 
-    return ValidatedImageContent(
-        content_type=content_type,
-        image_format=image_format,
-        width_px=width,
-        height_px=height,
+        if width <= 0 or height <= 0:
+            raise _ImageContentRejected("dimensions_invalid")
+
+        if width > max_dimension or height > max_dimension:
+            raise _ImageContentRejected("too_large")
+        if width * height > max_pixels:
+            raise _ImageContentRejected("too_large")
+
+        if is_animated:
+            raise _ImageContentRejected("animated")
+
+        normalized_declared = (declared_content_type or "").split(";", 1)[0].strip().lower()
+        if (
+            normalized_declared
+            and normalized_declared in _RECOGNIZED_DECLARED_TYPES
+            and _RECOGNIZED_DECLARED_TYPES[normalized_declared] != image_format
+        ):
+            raise _ImageContentRejected("mime_mismatch")
+
+        bgr_pixels: bytes | None = None
+        if want_bgr:
+            # The decoded plane is already RGB for most JPEGs, so only
+            # other modes (L, P, RGBA, CMYK...) pay for a conversion.
+            # Pillow packs BGR as cheaply as RGB, so ``tobytes`` is then
+            # the single copy out of Pillow.
+            try:
+                rgb_image = image if image.mode == "RGB" else image.convert("RGB")
+                bgr_pixels = rgb_image.tobytes("raw", "BGR")
+            except (OSError, ValueError) as exc:
+                raise _ImageContentRejected("decode") from exc
+
+    return (
+        ValidatedImageContent(
+            content_type=_ALLOWED_FORMATS[image_format],
+            image_format=image_format,
+            width_px=width,
+            height_px=height,
+        ),
+        bgr_pixels,
     )
 
 
@@ -5,6 +5,13 @@ single-aggregate data access; callers own the transaction boundary (only
 ``flush()``/``refresh()`` here, never ``commit()``); no ORM relationship
 is lazy-loaded under asyncpg (every read is an explicit ``select`` or a
 plain ``session.get()`` by primary key).
+
+Every method that changes a sample's ``status`` or ``processing_state``
+also flags the session so cached matching galleries are dropped once
+the caller commits — see
+``app.modules.face_recognition.gallery_cache``. Every method that
+retires or deletes a sample also purges its cached embeddings on
+commit — see ``app.modules.face_recognition.embedding_cache``.
 """
 
 from __future__ import annotations
@@ -23,6 +30,8 @@ from app.modules.biometric_enrollment.models import (
     RecognitionProcessingState,
     SampleStatus,
 )
+from app.modules.face_recognition.embedding_cache import purge_after_commit
+from app.modules.face_recognition.gallery_cache import invalidate_after_commit
 
 
 class BiometricEnrollmentRepository:
@@ -92,7 +101,13 @@ class BiometricSampleRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def get_by_id(self, sample_id: uuid.UUID) -> BiometricSample | None:
+    async def get_by_id(
+        self, sample_id: uuid.UUID, *, for_update: bool = False
+    ) -> BiometricSample | None:
+        if for_update:
+            return await self._session.get(
+                BiometricSample, sample_id, with_for_update=True, populate_existing=True
+            )
         return await self._session.get(BiometricSample, sample_id)
 
     async def get_active_for_enrollment(self, enrollment_id: uuid.UUID) -> BiometricSample | None:
@@ -194,16 +209,20 @@ class BiometricSampleRepository:
     ) -> BiometricSample:
         sample.status = SampleStatus.ACTIVE
         sample.promoted_at = promoted_at
+        invalidate_after_commit(self._session)
         await self._session.flush()
         return sample
 
     async def mark_replacement_pending(self, sample: BiometricSample) -> BiometricSample:
         sample.status = SampleStatus.REPLACEMENT_PENDING
+        invalidate_after_commit(self._session)
         await self._session.flush()
         return sample
 
     async def mark_deletion_pending(self, sample: BiometricSample) -> BiometricSample:
         sample.status = SampleStatus.DELETION_PENDING
+        invalidate_after_commit(self._session)
+        purge_after_commit(self._session, sample.sha256_hash)
         await self._session.flush()
         return sample
 
@@ -212,6 +231,8 @@ class BiometricSampleRepository:
     ) -> BiometricSample:
         sample.status = SampleStatus.QUARANTINED
         sample.quarantined_at = quarantined_at
+        invalidate_after_commit(self._session)
+        purge_after_commit(self._session, sample.sha256_hash)
         await self._session.flush()
         return sample
 
@@ -220,6 +241,8 @@ class BiometricSampleRepository:
     ) -> BiometricSample:
         sample.status = SampleStatus.DELETED
         sample.deleted_at = deleted_at
+        invalidate_after_commit(self._session)
+        purge_after_commit(self._session, sample.sha256_hash)
         await self._session.flush()
         return sample
 
@@ -231,6 +254,7 @@ class BiometricSampleRepository:
         DB history is otherwise preserved (soft ``DELETED`` state, not a
         row deletion).
         """
+        purge_after_commit(self._session, sample.sha256_hash)
         await self._session.delete(sample)
         await self._session.flush()
 
@@ -291,6 +315,7 @@ class BiometricSampleRepository:
         sample.processing_state = RecognitionProcessingState.PROCESSED
         sample.processing_completed_at = completed_at
         sample.processing_failure_reason_code = None
+        invalidate_after_commit(self._session)
         await self._session.flush()
         return sample
 
@@ -300,5 +325,6 @@ class BiometricSampleRepository:
         sample.processing_state = RecognitionProcessingState.PROCESSING_FAILED
         sample.processing_completed_at = completed_at
         sample.processing_failure_reason_code = reason_code
+        invalidate_after_commit(self._session)
         await self._session.flush()
         return sample
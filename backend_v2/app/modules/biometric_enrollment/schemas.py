@@ -124,6 +124,12 @@ class BulkEnrollmentResult(BaseModel):
       ``enrolled_count`` can be greater than zero alongside
       ``success=False`` — see the "known risks" section of
       docs/HANDOVER_PHASE_5_STAGE_2.md.
+
+    ``processing_batch_id`` is set when the enrolled samples were queued
+    for recognition processing; poll
+    ``GET /face-recognition/processing-jobs/summary?batch_id=...`` for
+    progress. ``None`` when nothing was enrolled, or when queueing failed
+    (the processing worker then queues those samples itself).
     """
 
     success: bool
@@ -131,6 +137,7 @@ class BulkEnrollmentResult(BaseModel):
     enrolled_count: int = Field(..., ge=0)
     failed_count: int = Field(..., ge=0)
     rows: list[BulkEnrollmentRowResult]
+    processing_batch_id: uuid.UUID | None = None
 
 
 # --- reconciliation -----------------------------------------------------------
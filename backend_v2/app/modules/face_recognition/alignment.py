@@ -58,9 +58,13 @@ implicit):**
   2-point eye-only similarity transform would be.
 - **RGB/BGR handling:** alignment is color-format-agnostic. The output
   ``NormalizedFaceInput.color_format`` is always set to match the input
-  ``DecodedImage.color_format`` exactly — no implicit conversion. (The
+  image's ``color_format`` exactly — no implicit conversion. (The
   Stage 3 embedder adapter, which needs RGB specifically, converts at
-  its own boundary via ``app.modules.face_recognition.image_codec.to_rgb``.)
+  its own boundary via ``ImageFrame.rgb_pixels``.) Decoded images are
+  BGR (see ``app.modules.face_recognition.image_codec``), so chips
+  usually are too.
+- **Input:** an ``ImageFrame`` is warped straight from its array; a
+  ``DecodedImage`` is wrapped as one without copying first.
 - **Normalization:** pixel values are NOT rescaled/mean-subtracted here
   — the output remains ``uint8`` in ``[0, 255]``, matching
   ``NormalizedFaceInput``'s own contract (opaque ``bytes``). Any
@@ -87,13 +91,19 @@ from app.modules.face_recognition.errors import (
     FaceLandmarksUnavailableError,
 )
 from app.modules.face_recognition.image_codec import (
-    decoded_image_to_ndarray,
+    ImageFrame,
+    as_frame,
     ndarray_to_normalized_face_input,
 )
 
 #: Fixed output chip size — see module docstring, "Output dimensions".
 ALIGNED_FACE_SIZE_PX = 150
 
+#: Identifies ``align_face``'s exact output for a given input. Part of every
+#: ``embedding_cache`` key, so bump it whenever a change here (reference
+#: points, chip size, warp flags) would change a chip's pixels.
+ALIGNMENT_VERSION = "5pt-similarity-150px-v1"
+
 #: YuNet's own published 5-point landmark order — see
 #: ``app.modules.face_recognition.providers.yunet_detector``.
 _EXPECTED_LANDMARK_COUNT = 5
@@ -115,7 +125,7 @@ _REFERENCE_POINTS = np.array(
 )
 
 
-def align_face(image: DecodedImage, face: DetectedFace) -> NormalizedFaceInput:
+def align_face(image: DecodedImage | ImageFrame, face: DetectedFace) -> NormalizedFaceInput:
     """Crop, align, and normalize ``face`` (detected within ``image``).
 
     Raises ``FaceLandmarksUnavailableError`` if ``face.landmarks`` is
@@ -143,10 +153,10 @@ def align_face(image: DecodedImage, face: DetectedFace) -> NormalizedFaceInput:
     if transform is None:
         raise FaceAlignmentFailedError()
 
+    frame = as_frame(image)
     try:
-        source_array = decoded_image_to_ndarray(image)
         aligned = cv2.warpAffine(
-            source_array,
+            frame.pixels,
             transform,
             (ALIGNED_FACE_SIZE_PX, ALIGNED_FACE_SIZE_PX),
             flags=cv2.INTER_LINEAR,
@@ -163,6 +173,4 @@ def align_face(image: DecodedImage, face: DetectedFace) -> NormalizedFaceInput:
         # than silently trusting OpenCV's behavior across versions.
         raise FaceAlignmentFailedError()
 
-    return ndarray_to_normalized_face_input(
-        np.ascontiguousarray(aligned), color_format=image.color_format
-    )
+    return ndarray_to_normalized_face_input(aligned, color_format=frame.color_format)
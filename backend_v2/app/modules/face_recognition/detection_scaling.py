@@ -0,0 +1,139 @@
+"""Reduced-resolution face detection for large single-face images.
+
+Enrollment samples and match probes may be up to
+``Settings.MAX_ENROLLMENT_IMAGE_DIMENSION_PX`` (6000 px) on a side.
+Run at full resolution, YuNet's cost grows with the pixel count, and
+every new image size makes the adapter call ``setInputSize`` and
+re-plan the network. Neither buys anything for a photo of one face
+that fills much of the frame.
+
+With ``Settings.FACE_DETECTOR_WORKING_SIZE_FACTOR`` set to ``N >= 1``,
+the detector instead sees a *detection image* whose longer side is at
+most ``N * FACE_DETECTOR_INPUT_SIZE_PX``, downsampled (``cv2.INTER_AREA``)
+from the full-resolution buffer the caller has already decoded. The
+file is never decoded a second time: alignment needs that full decode
+regardless, so resampling it is all the detection image costs, whatever
+the format.
+
+Every upload of the same aspect ratio maps to the same detection-image
+size (a 6000x4000 and a 4500x3000 photo both become 640x427 at factor
+2 and the default 320 px input size), and ``YuNetFaceDetector`` calls ``setInputSize``
+only when the size it is handed differs from the last one. A stream of
+phone photos at assorted resolutions therefore re-plans the network
+once per aspect ratio rather than once per resolution.
+
+The detections are then scaled back into the full image's pixel space —
+boxes and landmarks — and ``alignment.align_face`` warps from the
+full-resolution buffer, exactly as before. Only *where* the face is
+comes from the small image; every pixel of the 150x150 chip the
+embedder sees still comes from the original. Landmark positions are as
+precise as the working resolution allows, scaled up: at a 640 px
+working size a 6000 px photo's landmarks are placed to within roughly
+ten full-resolution pixels, which the least-squares similarity fit in
+``alignment`` averages over five points.
+
+A face must still be at least YuNet's minimum size *in the detection
+image*, so a factor that is too small loses faces that are a small
+fraction of the frame. The mode is off (``0``) by default. The group
+photo path never uses it — ``tiling.detect_faces_tiled`` exists to keep
+small, far-away faces at native resolution.
+
+Images whose longer side is already within the working size are
+detected as they are; no detection image is built.
+"""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+from app.core.config import Settings
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DetectedFace,
+    FacialLandmark,
+    ImageDimensions,
+)
+from app.modules.face_recognition.image_codec import ImageFrame
+from app.modules.face_recognition.protocols import FaceDetector
+
+
+def working_dimensions(
+    dimensions: ImageDimensions, *, settings: Settings
+) -> ImageDimensions | None:
+    """The detection-image size for an image of ``dimensions``, or ``None``
+    when the mode is off or the image already fits."""
+    factor = settings.FACE_DETECTOR_WORKING_SIZE_FACTOR
+    if factor == 0:
+        return None
+    max_side_px = factor * settings.FACE_DETECTOR_INPUT_SIZE_PX
+    width, height = dimensions.width_px, dimensions.height_px
+    longer = max(width, height)
+    if longer <= max_side_px:
+        return None
+    scale = max_side_px / longer
+    return ImageDimensions(
+        width_px=max(1, round(width * scale)), height_px=max(1, round(height * scale))
+    )
+
+
+def build_detection_image(image: ImageFrame, *, settings: Settings) -> ImageFrame | None:
+    """The reduced-resolution image to detect on, or ``None`` to detect on
+    ``image`` itself."""
+    target = working_dimensions(image.dimensions, settings=settings)
+    if target is None:
+        return None
+
+    resized = cv2.resize(
+        image.pixels, (target.width_px, target.height_px), interpolation=cv2.INTER_AREA
+    )
+    return ImageFrame(resized, color_format=image.color_format)
+
+
+def detect_faces(
+    detector: FaceDetector, image: ImageFrame, *, detection_image: ImageFrame | None
+) -> list[DetectedFace]:
+    """``detector.detect`` on ``detection_image`` when given, with every
+    result mapped back into ``image``'s pixel space; otherwise on
+    ``image`` directly."""
+    if detection_image is None:
+        return list(detector.detect(image))
+    return [
+        scale_detected_face(face, to=image.dimensions) for face in detector.detect(detection_image)
+    ]
+
+
+def scale_detected_face(face: DetectedFace, *, to: ImageDimensions) -> DetectedFace:
+    """``face`` expressed in an image of size ``to`` showing the same scene.
+
+    Box edges scale directly; landmark points are mapped pixel centre to
+    pixel centre, the convention ``INTER_AREA`` resamples with. Results
+    are clamped into the target image the same way ``YuNetFaceDetector``
+    clamps its own output.
+    """
+    source = face.source_image_dimensions
+    scale_x = to.width_px / source.width_px
+    scale_y = to.height_px / source.height_px
+
+    box = face.bounding_box
+    x0 = min(round(box.x_px * scale_x), to.width_px - 1)
+    y0 = min(round(box.y_px * scale_y), to.height_px - 1)
+    x1 = min(max(round(box.right_px * scale_x), x0 + 1), to.width_px)
+    y1 = min(max(round(box.bottom_px * scale_y), y0 + 1), to.height_px)
+
+    landmarks = None
+    if face.landmarks is not None:
+        landmarks = tuple(
+            FacialLandmark(
+                x_px=float(np.clip((point.x_px + 0.5) * scale_x - 0.5, 0.0, to.width_px - 1)),
+                y_px=float(np.clip((point.y_px + 0.5) * scale_y - 0.5, 0.0, to.height_px - 1)),
+            )
+            for point in face.landmarks
+        )
+
+    return DetectedFace(
+        bounding_box=BoundingBox(x_px=x0, y_px=y0, width_px=x1 - x0, height_px=y1 - y0),
+        source_image_dimensions=to,
+        confidence=face.confidence,
+        landmarks=landmarks,
+    )
@@ -291,6 +291,25 @@ class CandidateEmbedding(BaseModel):
     embedding: EmbeddingVector
 
 
+class EmbeddingModel(BaseModel):
+    """Which model produced an embedding: the embedder adapter's
+    ``provider_name`` and ``model_identifier`` plus the deployer's
+    ``Settings.FACE_EMBEDDING_MODEL_VERSION``.
+
+    Stored on every ``BiometricEmbedding`` row. Two embeddings are only
+    ever compared when all three agree — vectors from different models
+    live in different spaces, so their cosine similarity means nothing.
+    The configured one comes from
+    ``app.modules.face_recognition.provider_factory.current_embedding_model``.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    provider_name: str = Field(min_length=1, max_length=100)
+    model_identifier: str = Field(min_length=1, max_length=255)
+    model_version: str = Field(min_length=1, max_length=64)
+
+
 class MatchStatus(StrEnum):
     """The three, mutually exclusive shapes a ``MatchResult`` can take."""
 
@@ -0,0 +1,504 @@
+"""Content-addressed cache of face embeddings, so identical bytes skip inference.
+
+A retry after a transient database failure and a re-process after
+``PROCESSING_FAILED`` both ran the full decode -> detect -> align ->
+embed pipeline again on exactly the sample bytes they had already
+embedded. The pipeline is deterministic for
+fixed bytes, models and configuration, so its result can be looked up
+instead.
+
+**Key.** ``EmbeddingCacheKey`` is the image's SHA-256 plus everything
+else that decides the embedding: the detector and embedder model
+checksums, ``alignment.ALIGNMENT_VERSION``, and the detection settings
+(``FACE_DETECTOR_INPUT_SIZE_PX``/``FACE_DETECTOR_WORKING_SIZE_FACTOR``,
+which move the landmarks alignment starts from) plus the
+``FACE_QUALITY_MIN_*`` floors, so raising a floor re-checks images
+cached under the old ones. A model checksum is the
+configured ``FACE_*_MODEL_SHA256`` when set (the adapters verify the
+file against it before loading), otherwise the file's own SHA-256
+from ``model_artifacts.cached_sha256``. With no model path configured there is
+no model identity to key on, and ``embedding_cache_key`` returns
+``None``: nothing is cached.
+
+**What is cached.** Successful embeddings only. A failure (no face, two
+faces, a provider error) is recomputed every time, so a transient
+provider failure can never stick.
+
+**Tiers.** An in-process LRU of up to
+``Settings.FACE_EMBEDDING_CACHE_MAX_ENTRIES`` entries and, when
+``Settings.FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES > 0``, a disk tier
+shared by every process using the same ``BIOMETRIC_STORAGE_ROOT``
+(the API and the processing workers)::
+
+    embedding_cache/<image sha256>/<variant digest>.bin   float64 values
+
+Directories are ``0o700`` like the storage zones, files are written to a
+temporary name and ``os.replace``d into place, and a file that fails to
+parse is deleted and treated as a miss. When the tier grows past its
+bound, the least recently used files (by mtime, refreshed on every hit)
+are removed down to 90% of it.
+
+**Enrollment samples only.** Only ``SampleProcessingService`` reads
+and fills the cache, so every entry belongs to a ``BiometricSample``
+and is purged with it (below). Match and recognition probe images are
+never linked to a sample, so nothing could ever purge their entries;
+they are always embedded afresh and never cached.
+
+**Never exposed.** No route reads this module. A hit also requires
+presenting the exact bytes the embedding came from.
+
+**Filled only for live samples.** Inference never writes to the cache.
+``SampleProcessingService`` stores a new embedding from its success
+transaction, after locking the sample's row and confirming it is still
+``ACTIVE``: the disk entry is written there and then, and the memory
+entry is recorded with ``fill_after_commit`` and added by an
+``after_commit`` listener (a rollback discards it). Retiring or deleting
+a sample updates that row, so it waits for the lock and its purge
+(below) always lands after the fill. An embedding computed for a sample
+deleted mid-inference is therefore never cached. A rolled-back success
+transaction may leave a disk entry behind, but only for a sample that
+was live when it was written; its own deletion purges it like any other.
+
+**Purge on deletion.** Every ``BiometricSampleRepository`` method that
+retires or deletes a sample calls ``purge_after_commit`` with its
+``sha256_hash``. As with ``gallery_cache.invalidate_after_commit``, that
+only records the hash on the session; both tiers drop every entry for
+it from an ``after_commit`` listener, and a rollback discards the
+request. The memory tier is cleared in the listener itself; the disk
+entries are removed on a single background thread, so a slow
+filesystem never blocks the event loop the commit ran on. Until that
+removal finishes this process treats the image's disk entries as misses
+and writes none for it. Each purge also bumps ``EmbeddingCache.generation``,
+and every fill carries the generation it read, the way
+``gallery_cache.GalleryCache.put`` does: a fill (or a disk hit being
+copied into memory) that started before a purge is refused.
+
+**Other processes.** A purge removes the shared disk entries, but it
+cannot reach the memory tier of another process (an API worker, or
+``scripts/processing_worker.py``). Memory entries therefore expire
+``Settings.FACE_EMBEDDING_CACHE_TTL_SECONDS`` after they were stored, so
+an embedding of a sample deleted elsewhere is gone from every process
+within that TTL.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import Settings, get_settings
+from app.modules.face_recognition.alignment import ALIGNMENT_VERSION
+from app.modules.face_recognition.domain import EmbeddingVector
+from app.modules.face_recognition.model_artifacts import cached_sha256
+from app.modules.face_recognition.quality import quality_settings_key
+
+logger = structlog.get_logger(__name__)
+
+DISK_ZONE = "embedding_cache"
+
+_SESSION_INFO_KEY = "face_recognition.embedding_cache.purge_on_commit"
+_SESSION_INFO_FILLS_KEY = "face_recognition.embedding_cache.fill_on_commit"
+_SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+_ENTRY_SUFFIX = ".bin"
+_DISK_PRUNE_TARGET = 0.9
+
+
+@dataclass(frozen=True, slots=True)
+class EmbeddingCacheKey:
+    image_sha256: str
+    detector_checksum: str
+    embedder_checksum: str
+    alignment_version: str
+    detection_settings: str
+
+    def variant_digest(self) -> str:
+        """Everything but the image hash, as one file-name-safe digest."""
+        parts = (
+            self.detector_checksum,
+            self.embedder_checksum,
+            self.alignment_version,
+            self.detection_settings,
+        )
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _model_checksum(path: str | None, configured_sha256: str | None) -> str | None:
+    path = (path or "").strip()
+    if not path:
+        return None
+    if configured_sha256:
+        return configured_sha256.strip().lower()
+    try:
+        return cached_sha256(Path(path))
+    except OSError:
+        return None
+
+
+def embedding_cache_key(image_sha256: str, *, settings: Settings) -> EmbeddingCacheKey | None:
+    """The cache key for ``image_sha256`` under ``settings``, or ``None``
+    when caching is disabled or the models cannot be identified."""
+    if (
+        settings.FACE_EMBEDDING_CACHE_MAX_ENTRIES <= 0
+        and settings.FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES <= 0
+    ):
+        return None
+    if not _SHA256_PATTERN.fullmatch(image_sha256):
+        return None
+    detector = _model_checksum(
+        settings.FACE_DETECTOR_MODEL_PATH, settings.FACE_DETECTOR_MODEL_SHA256
+    )
+    embedder = _model_checksum(
+        settings.FACE_EMBEDDER_MODEL_PATH, settings.FACE_EMBEDDER_MODEL_SHA256
+    )
+    if detector is None or embedder is None:
+        return None
+    return EmbeddingCacheKey(
+        image_sha256=image_sha256,
+        detector_checksum=detector,
+        embedder_checksum=embedder,
+        alignment_version=ALIGNMENT_VERSION,
+        detection_settings=(
+            f"{settings.FACE_DETECTOR_INPUT_SIZE_PX}:{settings.FACE_DETECTOR_WORKING_SIZE_FACTOR}"
+            f":{quality_settings_key(settings)}"
+        ),
+    )
+
+
+class EmbeddingCache:
+    """Thread-safe memory LRU plus optional disk tier of ``EmbeddingVector``s.
+
+    Bounds, TTL and the disk root are passed per call (from ``Settings``),
+    as in ``gallery_cache.GalleryCache``.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[EmbeddingCacheKey, EmbeddingVector] = OrderedDict()
+        # When each memory entry was stored, oldest first (``_entries`` is
+        # in LRU order instead), so expired entries are dropped from the front.
+        self._stored_at: OrderedDict[EmbeddingCacheKey, float] = OrderedDict()
+        self._generation = 0
+        # Disk roots this process has used, so a purge reaches them even if
+        # they are not the current settings' root; and each root's entry
+        # count (``None`` until first counted).
+        self._disk_counts: dict[Path, int | None] = {}
+        # Images whose disk entries are queued for removal.
+        self._purging: Counter[str] = Counter()
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: EmbeddingCacheKey, *, settings: Settings) -> EmbeddingVector | None:
+        with self._lock:
+            self._drop_expired(ttl_seconds=settings.FACE_EMBEDDING_CACHE_TTL_SECONDS)
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                return embedding
+            generation = self._generation
+        if settings.FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES <= 0 or self._is_purging(key):
+            return None
+        embedding = self._read_disk(_disk_root(settings), key)
+        if embedding is not None:
+            self.put_memory(key, embedding, settings=settings, generation=generation)
+        return embedding
+
+    def put(
+        self,
+        key: EmbeddingCacheKey,
+        embedding: EmbeddingVector,
+        *,
+        settings: Settings,
+        generation: int,
+    ) -> None:
+        """Store ``embedding`` in both tiers unless a purge ran since
+        ``generation`` was read."""
+        self.put_memory(key, embedding, settings=settings, generation=generation)
+        self.put_disk(key, embedding, settings=settings, generation=generation)
+
+    def put_memory(
+        self,
+        key: EmbeddingCacheKey,
+        embedding: EmbeddingVector,
+        *,
+        settings: Settings,
+        generation: int,
+    ) -> bool:
+        """Store ``embedding`` in the memory tier unless a purge ran since
+        ``generation`` was read (or the tier is disabled); returns whether
+        it was stored."""
+        max_entries = settings.FACE_EMBEDDING_CACHE_MAX_ENTRIES
+        if max_entries <= 0:
+            return False
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._drop_expired(ttl_seconds=settings.FACE_EMBEDDING_CACHE_TTL_SECONDS)
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            self._stored_at.pop(key, None)
+            self._stored_at[key] = self._clock()
+            while len(self._entries) > max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                del self._stored_at[evicted]
+            return True
+
+    def put_disk(
+        self,
+        key: EmbeddingCacheKey,
+        embedding: EmbeddingVector,
+        *,
+        settings: Settings,
+        generation: int,
+    ) -> bool:
+        """Write ``embedding`` to the disk tier unless a purge ran since
+        ``generation`` was read (or the tier is disabled); returns whether
+        it was written. Blocking — call it off the event loop."""
+        disk_max_entries = settings.FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES
+        if disk_max_entries <= 0 or self._is_purging(key):
+            return False
+        with self._lock:
+            if generation != self._generation:
+                return False
+        try:
+            self._write_disk(_disk_root(settings), key, embedding, max_entries=disk_max_entries)
+        except OSError:
+            # The disk tier is an optimization: failing to fill it never
+            # fails the caller's (already computed) embedding.
+            logger.warning("face_embedding_cache_disk_write_failed")
+            return False
+        return True
+
+    def purge(self, image_sha256s: Iterable[str], *, settings: Settings | None = None) -> None:
+        """Drop every entry, in both tiers, for each of ``image_sha256s``.
+
+        Memory entries go at once; disk entries are queued for the purge
+        thread (``wait_for_disk_purges`` waits for it).
+        """
+        hashes = {value for value in image_sha256s if _SHA256_PATTERN.fullmatch(value)}
+        if not hashes:
+            return
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key.image_sha256 in hashes]:
+                del self._entries[key]
+                del self._stored_at[key]
+            roots = set(self._disk_counts)
+            for root in roots:
+                self._disk_counts[root] = None
+            self._purging.update(hashes)
+        roots.add(_disk_root(settings or get_settings()))
+        _purge_executor().submit(self._remove_disk_entries, roots, hashes)
+
+    def _drop_expired(self, *, ttl_seconds: float) -> None:
+        # Caller holds ``self._lock``.
+        cutoff = self._clock() - ttl_seconds
+        while self._stored_at:
+            key, stored_at = next(iter(self._stored_at.items()))
+            if stored_at > cutoff:
+                break
+            del self._stored_at[key]
+            del self._entries[key]
+
+    def _is_purging(self, key: EmbeddingCacheKey) -> bool:
+        with self._lock:
+            return self._purging[key.image_sha256] > 0
+
+    def _remove_disk_entries(self, roots: set[Path], hashes: set[str]) -> None:
+        try:
+            for root in roots:
+                for image_sha256 in hashes:
+                    shutil.rmtree(root / image_sha256, ignore_errors=True)
+        finally:
+            with self._lock:
+                self._purging.subtract(hashes)
+                self._purging += Counter()  # drops the counts that reached zero
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stored_at.clear()
+            self._disk_counts.clear()
+
+    def _read_disk(self, root: Path, key: EmbeddingCacheKey) -> EmbeddingVector | None:
+        path = _entry_path(root, key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            if not data or len(data) % 8:
+                raise ValueError("truncated embedding cache entry")
+            embedding = EmbeddingVector(values=tuple(np.frombuffer(data, dtype="<f8").tolist()))
+        except ValueError:
+            logger.warning("face_embedding_cache_disk_entry_invalid")
+            path.unlink(missing_ok=True)
+            return None
+        # Refreshes the LRU order; the file may be gone to a concurrent purge.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return embedding
+
+    def _write_disk(
+        self, root: Path, key: EmbeddingCacheKey, embedding: EmbeddingVector, *, max_entries: int
+    ) -> None:
+        path = _entry_path(root, key)
+        if path.exists():
+            # Same key, same bytes: refresh its LRU position instead.
+            os.utime(path)
+            return
+        _make_private_dir(root)
+        _make_private_dir(path.parent)
+        temporary = path.with_name(f".{uuid.uuid4().hex}.tmp")
+        temporary.write_bytes(np.asarray(embedding.values, dtype="<f8").tobytes())
+        os.replace(temporary, path)
+
+        with self._lock:
+            count = self._disk_counts.get(root)
+        if count is None:
+            count = _count_disk_entries(root)
+        else:
+            count += 1
+        if count > max_entries:
+            count = _prune_disk(root, keep=int(max_entries * _DISK_PRUNE_TARGET))
+        with self._lock:
+            self._disk_counts[root] = count
+
+
+def _disk_root(settings: Settings) -> Path:
+    return Path(settings.BIOMETRIC_STORAGE_ROOT).resolve() / DISK_ZONE
+
+
+def _entry_path(root: Path, key: EmbeddingCacheKey) -> Path:
+    # Both path components are hex digests (the image hash is checked by
+    # ``embedding_cache_key``), so neither can leave ``root``.
+    return root / key.image_sha256 / f"{key.variant_digest()}{_ENTRY_SUFFIX}"
+
+
+def _make_private_dir(path: Path) -> None:
+    if path.is_dir():
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    try:
+        os.chmod(path, 0o700)
+    except OSError:  # pragma: no cover - platform-dependent, best-effort
+        logger.warning("face_embedding_cache_chmod_failed")
+
+
+def _disk_entries(root: Path) -> list[Path]:
+    return list(root.glob(f"*/*{_ENTRY_SUFFIX}"))
+
+
+def _count_disk_entries(root: Path) -> int:
+    return len(_disk_entries(root))
+
+
+def _prune_disk(root: Path, *, keep: int) -> int:
+    """Remove the least recently used disk entries until ``keep`` remain."""
+    dated: list[tuple[int, Path]] = []
+    for path in _disk_entries(root):
+        try:
+            dated.append((path.stat().st_mtime_ns, path))
+        except OSError:  # removed concurrently
+            continue
+    dated.sort()
+    excess = max(0, len(dated) - keep)
+    for _, path in dated[:excess]:
+        path.unlink(missing_ok=True)
+        # Fails while other entries for the same image remain.
+        with contextlib.suppress(OSError):
+            path.parent.rmdir()
+    return len(dated) - excess
+
+
+_embedding_cache = EmbeddingCache()
+_purge_executor_instance: ThreadPoolExecutor | None = None
+_purge_executor_lock = threading.Lock()
+
+
+def _purge_executor() -> ThreadPoolExecutor:
+    global _purge_executor_instance
+    with _purge_executor_lock:
+        if _purge_executor_instance is None:
+            _purge_executor_instance = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="embedding-cache-purge"
+            )
+        return _purge_executor_instance
+
+
+def wait_for_disk_purges() -> None:
+    """Block until every disk purge queued so far has finished."""
+    _purge_executor().submit(lambda: None).result()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    return _embedding_cache
+
+
+def reset_embedding_cache() -> None:
+    """Drop every in-memory entry — for tests, mirroring
+    ``gallery_cache.reset_gallery_cache``."""
+    _embedding_cache.clear()
+
+
+def purge_after_commit(session: AsyncSession, image_sha256: str) -> None:
+    """Drop every cached embedding of ``image_sha256`` once ``session``'s
+    current transaction commits."""
+    session.sync_session.info.setdefault(_SESSION_INFO_KEY, set()).add(image_sha256)
+
+
+def fill_after_commit(
+    session: AsyncSession,
+    key: EmbeddingCacheKey,
+    embedding: EmbeddingVector,
+    *,
+    settings: Settings,
+    generation: int,
+) -> None:
+    """Store ``embedding`` in the memory tier once ``session``'s current
+    transaction commits, unless a purge ran since ``generation`` was read."""
+    session.sync_session.info.setdefault(_SESSION_INFO_FILLS_KEY, []).append(
+        (key, embedding, settings, generation)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _purge_on_commit(session: Session) -> None:
+    # Purges first: a fill committed together with a purge of its image
+    # is then refused by the generation the purge bumped.
+    hashes = session.info.pop(_SESSION_INFO_KEY, None)
+    if hashes:
+        _embedding_cache.purge(hashes)
+    for key, embedding, settings, generation in session.info.pop(_SESSION_INFO_FILLS_KEY, ()):
+        _embedding_cache.put_memory(key, embedding, settings=settings, generation=generation)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_on_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_SESSION_INFO_KEY, None)
+        session.info.pop(_SESSION_INFO_FILLS_KEY, None)
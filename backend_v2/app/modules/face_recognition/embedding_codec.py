@@ -0,0 +1,70 @@
+"""Packed storage format for ``BiometricEmbedding.embedding_packed``.
+
+An embedding is stored as its components in order, each a
+**little-endian IEEE-754 float32** — exactly ``4 * dimension`` bytes,
+no header, no per-element framing. The byte order is fixed here rather
+than left to the host so a row written on one machine decodes the same
+on any other. ``alembic/versions/*_pack_biometric_embeddings_as_float32.py``
+does not import this module — like every migration it re-states the
+format inline (``float4send`` in SQL, ``struct`` on downgrade) — so a
+change here must be made there too.
+
+Decoding is a ``numpy.frombuffer`` view over the bytes asyncpg already
+returned: no per-element Python ``float`` is ever built on the read
+path, and a whole roster decodes with one join and one view
+(``unpack_embedding_rows``).
+
+**Precision.** float32 keeps ~7 significant digits. dlib's ResNet
+computes its descriptor in single precision to begin with (dlib's DNN
+tensors are ``float``), so the only rounding is of the float64
+L2-normalization in ``providers/dlib_embedder.py`` — around ``1e-8``
+per component, far below any ``FACE_MATCH_THRESHOLD``/
+``FACE_MATCH_AMBIGUOUS_MARGIN`` granularity.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+EMBEDDING_STORAGE_DTYPE = np.dtype("<f4")
+EMBEDDING_STORAGE_ITEMSIZE = EMBEDDING_STORAGE_DTYPE.itemsize
+
+
+def pack_embedding(values: Sequence[float] | np.ndarray) -> bytes:
+    """Encode a non-empty, finite embedding as packed little-endian float32.
+
+    A component outside float32's range becomes ``inf`` in the cast; the
+    cast runs with numpy's overflow warning silenced so that case surfaces
+    only as the ``ValueError`` below, like any other non-finite input.
+    """
+    with np.errstate(over="ignore", invalid="ignore"):
+        packed = np.asarray(values, dtype=np.float64).astype(EMBEDDING_STORAGE_DTYPE)
+    if packed.ndim != 1 or packed.shape[0] == 0:
+        raise ValueError("an embedding must be a non-empty one-dimensional sequence")
+    if not np.all(np.isfinite(packed)):
+        raise ValueError("an embedding must be finite in float32")
+    return packed.tobytes()
+
+
+def unpack_embedding(data: bytes) -> np.ndarray:
+    """Read-only float32 view over one packed embedding."""
+    if len(data) == 0 or len(data) % EMBEDDING_STORAGE_ITEMSIZE:
+        raise ValueError("packed embedding length must be a positive multiple of 4 bytes")
+    return np.frombuffer(data, dtype=EMBEDDING_STORAGE_DTYPE)
+
+
+def unpack_embedding_rows(packed_rows: Sequence[bytes], *, dimension: int) -> np.ndarray:
+    """One read-only ``(N, dimension)`` float32 matrix from ``N`` packed rows.
+
+    Every row must already be ``4 * dimension`` bytes — the database
+    check constraint guarantees that for a row whose stored
+    ``embedding_dimension`` equals ``dimension``.
+    """
+    expected = dimension * EMBEDDING_STORAGE_ITEMSIZE
+    if dimension <= 0 or any(len(row) != expected for row in packed_rows):
+        raise ValueError("every packed embedding row must hold exactly `dimension` floats")
+    return np.frombuffer(b"".join(packed_rows), dtype=EMBEDDING_STORAGE_DTYPE).reshape(
+        len(packed_rows), dimension
+    )
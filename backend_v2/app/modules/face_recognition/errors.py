@@ -148,6 +148,27 @@ class EnrollmentSampleNoFaceDetectedError(FaceRecognitionError):
         super().__init__("No face was detected in this enrollment sample.")
 
 
+class FaceImageQualityTooLowError(FaceRecognitionError):
+    """The aligned face is below a configured quality floor (see
+    ``app.modules.face_recognition.quality``) — raised before embedding.
+
+    ``details["reasons"]`` lists which checks failed, as fixed codes
+    (``blurry``, ``too_dark``, ``low_contrast``, ``face_too_small``) so
+    a client can tell the user what to change when retaking the photo;
+    never the measured values.
+    """
+
+    code = "FACE_IMAGE_QUALITY_TOO_LOW"
+    status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def __init__(self, reasons: list[str]) -> None:
+        super().__init__(
+            "The face in this image is too blurred, dark, low-contrast, or small to "
+            "recognize. Please retake the photo.",
+            details={"reasons": list(reasons)},
+        )
+
+
 class EnrollmentSampleMultipleFacesDetectedError(FaceRecognitionError):
     """Stage 3's enrollment-processing policy: more than one face is a processing failure.
 
@@ -215,6 +236,21 @@ class ModelArtifactChecksumMismatchError(FaceRecognitionError):
         super().__init__("A face-recognition model artifact failed integrity verification.")
 
 
+class FaceModelsNotReadyError(FaceRecognitionError):
+    """GET /health/ready while startup model preloading has not finished,
+    or after it failed — see ``app.modules.face_recognition.warmup``.
+
+    The same response either way; why preloading failed is in the
+    server-side log only.
+    """
+
+    code = "FACE_MODELS_NOT_READY"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def __init__(self) -> None:
+        super().__init__("The face-recognition models are not ready yet.")
+
+
 class CandidateEmbeddingDimensionMismatchError(FaceRecognitionError):
     """A candidate embedding offered to a matcher has the wrong dimension.
 
@@ -431,3 +467,38 @@ class RecognitionAttendanceMatchOutsideRosterError(FaceRecognitionError):
 
     def __init__(self) -> None:
         super().__init__("The recognition result is not valid for the authorized roster.")
+
+
+class RecognitionAttendanceGroupPhotoNoFaceError(FaceRecognitionError):
+    """A group photo yielded no face that could be detected and aligned."""
+
+    code = "RECOGNITION_ATTENDANCE_GROUP_PHOTO_NO_FACE"
+    status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def __init__(self) -> None:
+        super().__init__("No usable face was detected in this group photo.")
+
+
+class RecognitionAttendanceGroupPhotoTooManyFacesError(FaceRecognitionError):
+    """More faces than ``Settings.FACE_GROUP_MAX_FACES`` — rejected whole,
+    never silently truncated to a subset of the class."""
+
+    code = "RECOGNITION_ATTENDANCE_GROUP_PHOTO_TOO_MANY_FACES"
+    status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def __init__(self, max_faces: int) -> None:
+        super().__init__(f"This group photo contains more than {max_faces} faces.")
+
+
+class RecognitionAttendanceBatchTooManyImagesError(FaceRecognitionError):
+    """More images than ``Settings.FACE_ATTENDANCE_BATCH_MAX_IMAGES`` in one
+    batch request — rejected whole, before any image is read."""
+
+    code = "RECOGNITION_ATTENDANCE_BATCH_TOO_MANY_IMAGES"
+    status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def __init__(self, max_images: int) -> None:
+        super().__init__(
+            f"A recognition batch may contain at most {max_images} images.",
+            details={"max_images": max_images},
+        )
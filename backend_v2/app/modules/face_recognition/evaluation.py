@@ -18,14 +18,42 @@ biometric data (which this repository must never contain at all — see
 ``docs/BIOMETRIC_DATA_POLICY.md``). Calibration against this project's
 own real classroom data is explicitly documented as **pending** — see
 ``docs/HANDOVER_PHASE_5_STAGE_3.md``, "Calibration status".
+
+**Array engine.** ``SimilarityScores`` holds the genuine and impostor
+similarities as two ``float64`` arrays, each sorted once on
+construction. FAR/FRR at any number of thresholds is then one
+``np.searchsorted`` per class (``O(t log n)`` after the ``O(n log n)``
+sort), and ``roc_curve``/``equal_error_rate``/``threshold_for_far``
+read the same sorted arrays. ``compute_far_frr``/``threshold_sweep``
+are thin wrappers over it and return exactly what the original
+per-pair loops did (same ``<``/``>=`` boundary rules, same ``0.0`` for
+an empty class).
+
+**Pair scoring.** ``score_gallery_pairs``/``score_probe_pairs`` build
+``SimilarityScores`` from embedding matrices with blocked matrix
+products (``block_size`` rows at a time, so memory stays
+``O(block_size * n)`` however large the gallery), and
+``top_two_by_identity`` produces the ``(best, runner_up)`` input
+``ambiguity_rate`` expects. All three use the matcher's cosine rules —
+``float64``, zero-norm vectors score ``0.0``, results clamped to
+``[-1.0, 1.0]`` (``providers/similarity_matcher.py``) — and the
+best-sample-per-student reduction it ranks by.
+``scripts/evaluate_thresholds.py`` is the offline command that feeds
+them from the database; nothing here reads any data itself.
 """
 
 from __future__ import annotations
 
 import math
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 
+import numpy as np
+
+#: Rows per block in the pair-scoring helpers below: a block's
+#: similarity matrix is ``DEFAULT_BLOCK_SIZE x n`` ``float64`` values.
+DEFAULT_BLOCK_SIZE = 1024
+
 
 @dataclass(frozen=True)
 class EvaluationPair:
@@ -62,6 +90,152 @@ class ThresholdEvaluation:
     impostor_pair_count: int
 
 
+@dataclass(frozen=True)
+class RocCurve:
+    """FAR/FRR at every distinct observed similarity, thresholds ascending.
+
+    The last threshold lies just above the highest score, so the curve
+    always ends at ``FAR == 0.0``; the first (the lowest score) has
+    ``FRR == 0.0``. Arrays are parallel and ``float64``.
+    """
+
+    thresholds: np.ndarray
+    false_accept_rates: np.ndarray
+    false_reject_rates: np.ndarray
+
+
+class SimilarityScores:
+    """Genuine and impostor similarities, each sorted once.
+
+    Construct from two array-likes (``SimilarityScores(genuine,
+    impostor)``) or from ``EvaluationPair``s (``from_pairs``). Values get
+    ``EvaluationPair``'s checks — finite, within ``[-1.0, 1.0]`` —
+    raising ``ValueError`` otherwise. Either class may be empty; rates
+    over an empty class are ``0.0``, as in ``compute_far_frr``.
+    """
+
+    __slots__ = ("genuine", "impostor")
+
+    def __init__(self, genuine: Iterable[float], impostor: Iterable[float]) -> None:
+        self.genuine = _sorted_similarities(genuine)
+        self.impostor = _sorted_similarities(impostor)
+
+    @classmethod
+    def from_pairs(cls, pairs: Sequence[EvaluationPair]) -> SimilarityScores:
+        genuine_mask = np.fromiter(
+            (pair.is_genuine for pair in pairs), dtype=bool, count=len(pairs)
+        )
+        similarities = np.fromiter(
+            (pair.similarity for pair in pairs), dtype=np.float64, count=len(pairs)
+        )
+        return cls(similarities[genuine_mask], similarities[~genuine_mask])
+
+    @classmethod
+    def concatenate(cls, parts: Iterable[SimilarityScores]) -> SimilarityScores:
+        parts = list(parts)
+        return cls(
+            np.concatenate([np.empty(0), *(part.genuine for part in parts)]),
+            np.concatenate([np.empty(0), *(part.impostor for part in parts)]),
+        )
+
+    @property
+    def genuine_pair_count(self) -> int:
+        return int(self.genuine.shape[0])
+
+    @property
+    def impostor_pair_count(self) -> int:
+        return int(self.impostor.shape[0])
+
+    def rates(self, thresholds: Iterable[float]) -> tuple[np.ndarray, np.ndarray]:
+        """``(false_accept_rates, false_reject_rates)`` at each threshold, in order.
+
+        A genuine score ``< threshold`` is a false reject and an
+        impostor score ``>= threshold`` a false accept — both counts are
+        a left-sided ``searchsorted`` into the sorted arrays.
+        """
+        points = np.asarray(
+            thresholds if isinstance(thresholds, np.ndarray) else list(thresholds),
+            dtype=np.float64,
+        )
+        false_rejects = np.searchsorted(self.genuine, points, side="left")
+        false_accepts = self.impostor_pair_count - np.searchsorted(
+            self.impostor, points, side="left"
+        )
+        # An empty class has zero counts, so ``max(..., 1)`` yields 0.0.
+        return (
+            false_accepts / max(self.impostor_pair_count, 1),
+            false_rejects / max(self.genuine_pair_count, 1),
+        )
+
+    def evaluate(self, thresholds: Sequence[float]) -> list[ThresholdEvaluation]:
+        far, frr = self.rates(thresholds)
+        return [
+            ThresholdEvaluation(
+                threshold=threshold,
+                false_accept_rate=float(far[index]),
+                false_reject_rate=float(frr[index]),
+                genuine_pair_count=self.genuine_pair_count,
+                impostor_pair_count=self.impostor_pair_count,
+            )
+            for index, threshold in enumerate(thresholds)
+        ]
+
+    def roc_curve(self) -> RocCurve:
+        scores = np.concatenate([self.genuine, self.impostor])
+        if scores.shape[0] == 0:
+            raise ValueError("A ROC curve needs at least one similarity score.")
+        distinct = np.unique(scores)
+        thresholds = np.append(distinct, np.nextafter(distinct[-1], np.inf))
+        far, frr = self.rates(thresholds)
+        return RocCurve(thresholds=thresholds, false_accept_rates=far, false_reject_rates=frr)
+
+    def equal_error_rate(self) -> tuple[float, float]:
+        """``(rate, threshold)`` where FAR and FRR cross on the ROC curve.
+
+        FAR falls and FRR rises along the ascending thresholds; between
+        the last point with ``FAR > FRR`` and the first with ``FAR <=
+        FRR`` both are linearly interpolated to where they meet. Raises
+        ``ValueError`` if either class is empty — the crossing is
+        meaningless then.
+        """
+        if not (self.genuine_pair_count and self.impostor_pair_count):
+            raise ValueError("The equal error rate needs both genuine and impostor scores.")
+        curve = self.roc_curve()
+        far, frr, thresholds = (
+            curve.false_accept_rates,
+            curve.false_reject_rates,
+            curve.thresholds,
+        )
+        # Always found: the last point has FAR == 0.0 and FRR == 1.0.
+        crossing = int(np.argmax(frr >= far))
+        if crossing == 0:
+            return float((far[0] + frr[0]) / 2), float(thresholds[0])
+        above = far[crossing - 1] - frr[crossing - 1]
+        below = far[crossing] - frr[crossing]
+        fraction = above / (above - below)
+        rate = far[crossing - 1] + fraction * (far[crossing] - far[crossing - 1])
+        threshold = thresholds[crossing - 1] + fraction * (
+            thresholds[crossing] - thresholds[crossing - 1]
+        )
+        return float(rate), float(threshold)
+
+    def threshold_for_far(self, target_far: float) -> float:
+        """The lowest threshold whose FAR is at most ``target_far``.
+
+        At most ``floor(target_far * impostors)`` impostor scores may
+        reach it, so it sits just above the next-highest one. Returns
+        ``-1.0`` (accept everything) when there are no impostor scores
+        or the target allows all of them.
+        """
+        if not (0.0 <= target_far <= 1.0):
+            raise ValueError("target_far must be within [0.0, 1.0].")
+        allowed = math.floor(target_far * self.impostor_pair_count)
+        if allowed >= self.impostor_pair_count:
+            return -1.0
+        highest_excluded = self.impostor[self.impostor_pair_count - 1 - allowed]
+        return float(np.nextafter(highest_excluded, np.inf))
+
+
 def compute_far_frr(pairs: Sequence[EvaluationPair], *, threshold: float) -> ThresholdEvaluation:
     """False Accept Rate / False Reject Rate at a single ``threshold``.
 
@@ -78,44 +252,204 @@ def compute_far_frr(pairs: Sequence[EvaluationPair], *, threshold: float) -> Thr
     ``impostor_pair_count`` before trusting a rate computed from an
     empty class.
     """
-    genuine = [pair for pair in pairs if pair.is_genuine]
-    impostors = [pair for pair in pairs if not pair.is_genuine]
-
-    false_rejects = sum(1 for pair in genuine if pair.similarity < threshold)
-    false_accepts = sum(1 for pair in impostors if pair.similarity >= threshold)
-
-    frr = (false_rejects / len(genuine)) if genuine else 0.0
-    far = (false_accepts / len(impostors)) if impostors else 0.0
-
-    return ThresholdEvaluation(
-        threshold=threshold,
-        false_accept_rate=far,
-        false_reject_rate=frr,
-        genuine_pair_count=len(genuine),
-        impostor_pair_count=len(impostors),
-    )
+    (result,) = SimilarityScores.from_pairs(pairs).evaluate([threshold])
+    return result
 
 
 def threshold_sweep(
     pairs: Sequence[EvaluationPair], *, thresholds: Sequence[float]
 ) -> list[ThresholdEvaluation]:
-    """``compute_far_frr`` at every threshold in ``thresholds``, in the given order."""
-    return [compute_far_frr(pairs, threshold=threshold) for threshold in thresholds]
+    """``compute_far_frr`` at every threshold in ``thresholds``, in the given order.
+
+    The pairs are sorted once, not rescanned per threshold.
+    """
+    return SimilarityScores.from_pairs(pairs).evaluate(thresholds)
 
 
 def ambiguity_rate(
-    top_similarities: Sequence[tuple[float, float]], *, ambiguous_margin: float
+    top_similarities: Sequence[tuple[float, float]] | np.ndarray, *, ambiguous_margin: float
 ) -> float:
     """Fraction of probe attempts whose best/runner-up gap is below ``ambiguous_margin``.
 
     ``top_similarities`` is a sequence of ``(best, runner_up)`` pairs —
     one per probe attempt, already computed by whatever produced the
     evaluation data (e.g. a candidate-scoped match over synthetic
-    embeddings). Returns ``0.0`` for an empty input.
+    embeddings, or ``top_two_by_identity``). Returns ``0.0`` for an
+    empty input.
+    """
+    (rate,) = ambiguity_rates(top_similarities, ambiguous_margins=[ambiguous_margin])
+    return rate
+
+
+def ambiguity_rates(
+    top_similarities: Sequence[tuple[float, float]] | np.ndarray,
+    *,
+    ambiguous_margins: Sequence[float],
+) -> list[float]:
+    """``ambiguity_rate`` at every margin in ``ambiguous_margins``, in order,
+    from one sort of the gaps."""
+    pairs = np.asarray(top_similarities, dtype=np.float64).reshape(-1, 2)
+    if pairs.shape[0] == 0:
+        return [0.0 for _ in ambiguous_margins]
+    gaps = np.sort(pairs[:, 0] - pairs[:, 1])
+    ambiguous = np.searchsorted(gaps, np.asarray(ambiguous_margins, dtype=np.float64), side="left")
+    return [float(count) / pairs.shape[0] for count in ambiguous]
+
+
+def score_gallery_pairs(
+    embeddings: np.ndarray,
+    identities: Sequence[object] | np.ndarray,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> SimilarityScores:
+    """Every unordered pair of rows in one gallery, scored.
+
+    Row ``i`` belongs to ``identities[i]``; a pair is genuine when both
+    rows share an identity. ``n`` rows give ``n * (n - 1) / 2`` scores.
     """
-    if not top_similarities:
-        return 0.0
-    ambiguous_count = sum(
-        1 for best, runner_up in top_similarities if (best - runner_up) < ambiguous_margin
+    unit_rows = _unit_rows(embeddings)
+    labels = _identity_codes(identities, expected=unit_rows.shape[0])
+    genuine: list[np.ndarray] = []
+    impostor: list[np.ndarray] = []
+    for start in range(0, unit_rows.shape[0], _checked_block_size(block_size)):
+        stop = min(start + block_size, unit_rows.shape[0])
+        similarities = _cosine_block(unit_rows[start:stop], unit_rows[start:])
+        rows = np.arange(start, stop)[:, np.newaxis]
+        columns = np.arange(start, unit_rows.shape[0])[np.newaxis, :]
+        upper = columns > rows
+        same = labels[start:stop, np.newaxis] == labels[np.newaxis, start:]
+        genuine.append(similarities[upper & same])
+        impostor.append(similarities[upper & ~same])
+    return SimilarityScores(_joined(genuine), _joined(impostor))
+
+
+def score_probe_pairs(
+    probes: np.ndarray,
+    probe_identities: Sequence[object] | np.ndarray,
+    gallery: np.ndarray,
+    gallery_identities: Sequence[object] | np.ndarray,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> SimilarityScores:
+    """Every probe row against every gallery row, scored; genuine when
+    the probe's identity is the gallery row's."""
+    unit_probes = _unit_rows(probes)
+    unit_gallery = _unit_rows(gallery)
+    probe_labels, gallery_labels = _shared_identity_codes(
+        probe_identities, gallery_identities, probes=unit_probes, gallery=unit_gallery
+    )
+    genuine: list[np.ndarray] = []
+    impostor: list[np.ndarray] = []
+    for start in range(0, unit_probes.shape[0], _checked_block_size(block_size)):
+        similarities = _cosine_block(unit_probes[start : start + block_size], unit_gallery)
+        same = probe_labels[start : start + block_size, np.newaxis] == gallery_labels
+        genuine.append(similarities[same])
+        impostor.append(similarities[~same])
+    return SimilarityScores(_joined(genuine), _joined(impostor))
+
+
+def top_two_by_identity(
+    probes: np.ndarray,
+    gallery: np.ndarray,
+    gallery_identities: Sequence[object] | np.ndarray,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> np.ndarray:
+    """``(probes, 2)`` array of each probe's best and runner-up identity score.
+
+    Like the matcher, an identity scores its best-matching row, and the
+    runner-up is the second-best *identity*. With a single identity in
+    the gallery the runner-up is ``-inf`` (never ambiguous, as in
+    ``_decide``). Feed the result to ``ambiguity_rate``/``ambiguity_rates``.
+    """
+    unit_probes = _unit_rows(probes)
+    unit_gallery = _unit_rows(gallery)
+    labels = _identity_codes(gallery_identities, expected=unit_gallery.shape[0])
+    if unit_gallery.shape[0] == 0:
+        raise ValueError("top_two_by_identity needs a non-empty gallery.")
+    if unit_probes.shape[1] != unit_gallery.shape[1]:
+        raise ValueError("Probe and gallery embeddings must have the same dimension.")
+    order = np.argsort(labels, kind="stable")
+    sorted_gallery = unit_gallery[order]
+    group_starts = np.flatnonzero(np.diff(labels[order], prepend=-1))
+    result = np.full((unit_probes.shape[0], 2), -np.inf)
+    for start in range(0, unit_probes.shape[0], _checked_block_size(block_size)):
+        similarities = _cosine_block(unit_probes[start : start + block_size], sorted_gallery)
+        per_identity = np.maximum.reduceat(similarities, group_starts, axis=1)
+        if per_identity.shape[1] == 1:
+            result[start : start + block_size, 0] = per_identity[:, 0]
+            continue
+        top_two = -np.partition(-per_identity, 1, axis=1)[:, :2]
+        result[start : start + block_size] = top_two
+    return result
+
+
+def _sorted_similarities(values: Iterable[float]) -> np.ndarray:
+    array = np.sort(
+        np.asarray(
+            values if isinstance(values, np.ndarray) else list(values), dtype=np.float64
+        ).ravel()
+    )
+    if not np.all(np.isfinite(array)):
+        raise ValueError("Similarity scores must be finite numbers.")
+    if array.shape[0] and (array[0] < -1.0 or array[-1] > 1.0):
+        raise ValueError("Similarity scores must be within [-1.0, 1.0].")
+    return array
+
+
+def _unit_rows(embeddings: np.ndarray) -> np.ndarray:
+    rows = np.asarray(embeddings, dtype=np.float64)
+    if rows.ndim != 2:
+        raise ValueError("Embeddings must be a two-dimensional (rows, dimension) array.")
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    # A zero row stays zero, so it scores 0.0 against everything.
+    return rows / np.where(norms == 0.0, 1.0, norms)
+
+
+def _cosine_block(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    if left.shape[1] != right.shape[1]:
+        raise ValueError("Probe and gallery embeddings must have the same dimension.")
+    similarities: np.ndarray = np.clip(left @ right.T, -1.0, 1.0)
+    return similarities
+
+
+def _identity_codes(identities: Sequence[object] | np.ndarray, *, expected: int) -> np.ndarray:
+    codes: dict[object, int] = {}
+    labels = np.fromiter(
+        (codes.setdefault(identity, len(codes)) for identity in identities), dtype=np.int64
     )
-    return ambiguous_count / len(top_similarities)
+    if labels.shape[0] != expected:
+        raise ValueError("Need exactly one identity per embedding row.")
+    return labels
+
+
+def _shared_identity_codes(
+    probe_identities: Sequence[object] | np.ndarray,
+    gallery_identities: Sequence[object] | np.ndarray,
+    *,
+    probes: np.ndarray,
+    gallery: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    codes: dict[object, int] = {}
+    gallery_labels = np.fromiter(
+        (codes.setdefault(identity, len(codes)) for identity in gallery_identities),
+        dtype=np.int64,
+    )
+    # -1 never equals a gallery code: a probe of an identity missing from
+    # the gallery only yields impostor scores.
+    probe_labels = np.fromiter(
+        (codes.get(identity, -1) for identity in probe_identities), dtype=np.int64
+    )
+    if probe_labels.shape[0] != probes.shape[0] or gallery_labels.shape[0] != gallery.shape[0]:
+        raise ValueError("Need exactly one identity per embedding row.")
+    return probe_labels, gallery_labels
+
+
+def _checked_block_size(block_size: int) -> int:
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1.")
+    return block_size
+
+
+def _joined(parts: list[np.ndarray]) -> np.ndarray:
+    return np.concatenate(parts) if parts else np.empty(0)
@@ -0,0 +1,180 @@
+"""In-process LRU cache of packed candidate galleries.
+
+``MatchingService.match_probe`` used to run
+``BiometricEmbeddingRepository.list_active_for_students`` — a three-way
+join with a roster-sized ``IN (...)`` list — and rebuild every row into
+a ``CandidateEmbedding`` on every call, even though a morning
+recognition rush matches the same classroom roster hundreds of times
+in a few minutes. This module keeps the ready-to-score
+``CandidateGallery`` for recently used candidate scopes instead.
+
+**Key:** the embedding model the gallery was fetched for
+(``provider_factory.current_embedding_model``) plus the candidate scope
+itself — a ``frozenset`` of the student IDs a probe is matched against —
+so two callers only share an entry when they would have issued the
+exact same query. Keying on the model matters when
+``Settings.FACE_EMBEDDING_MODEL_VERSION`` changes under a live cache
+(tests, or several ``Settings`` objects in one process): a gallery of
+the old model's vectors is never scored against a new model's probe. An empty result is
+cached too (``gallery is None``), since "no one in this roster is
+enrolled yet" is as cacheable as any other answer.
+
+**Invalidation keeps "retired samples never match" intact.** Every
+repository method that changes what ``list_active_for_students`` can
+return — a sample's ``status``/``processing_state`` transition in
+``app.modules.biometric_enrollment.repository`` and
+``BiometricEmbeddingRepository.create_active``/
+``supersede_active_for_sample`` — calls ``invalidate_after_commit``.
+That only flags the session; the whole cache is dropped from a
+SQLAlchemy ``after_commit`` listener once the change is durable, and a
+rolled-back (or abandoned) transaction drops the flag without touching
+the cache.
+Dropping every entry (rather than only scopes containing the affected
+student) is deliberate: those mutations are enrollment-time
+operations, rare next to match reads, and a full drop needs no
+sample-to-student lookup that could itself go stale.
+
+**Fill race.** A reader that fetched rows *before* a change committed
+must not re-insert them *after* the invalidation ran. Readers capture
+``generation`` before their query and ``put`` refuses to store when
+an invalidation happened in between.
+
+**Scope of the guarantee.** Invalidation is in-process: it covers
+every writer in the API process (the production image runs a single
+Uvicorn worker — see README.md). A change committed by another process
+is picked up at the latest after ``Settings.FACE_GALLERY_CACHE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.modules.face_recognition.domain import EmbeddingModel
+from app.modules.face_recognition.providers.similarity_matcher import CandidateGallery
+
+GalleryKey = tuple[EmbeddingModel, frozenset[uuid.UUID]]
+
+_SESSION_INFO_FLAG = "face_recognition.gallery_cache.invalidate_on_commit"
+
+
+@dataclass(frozen=True)
+class CachedGallery:
+    """One cached scope: its packed gallery, or ``None`` if it has no candidates."""
+
+    gallery: CandidateGallery | None
+    stored_at: float
+
+
+class GalleryCache:
+    """Thread-safe, size-bounded LRU of ``CachedGallery`` entries.
+
+    Capacity and TTL are passed per call (from ``Settings``) rather than
+    fixed at construction, so the one process-wide instance serves every
+    ``Settings`` object the same way ``provider_factory``'s caches do.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[GalleryKey, CachedGallery] = OrderedDict()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: GalleryKey, *, ttl_seconds: float) -> CachedGallery | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._clock() - entry.stored_at >= ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self,
+        key: GalleryKey,
+        gallery: CandidateGallery | None,
+        *,
+        generation: int,
+        max_entries: int,
+    ) -> bool:
+        """Store ``gallery`` unless an invalidation ran since ``generation``
+        was read (or the cache is disabled); returns whether it was stored."""
+        if max_entries <= 0:
+            return False
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._entries[key] = CachedGallery(gallery=gallery, stored_at=self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+_gallery_cache = GalleryCache()
+
+
+def get_gallery_cache() -> GalleryCache:
+    return _gallery_cache
+
+
+def reset_gallery_cache() -> None:
+    """Drop every cached gallery — for tests, mirroring
+    ``provider_factory.reset_provider_cache``."""
+    _gallery_cache.invalidate()
+
+
+def gallery_key(student_profile_ids: Iterable[uuid.UUID], *, model: EmbeddingModel) -> GalleryKey:
+    return (model, frozenset(student_profile_ids))
+
+
+def invalidate_after_commit(session: AsyncSession) -> None:
+    """Drop every cached gallery once ``session``'s current transaction commits."""
+    session.sync_session.info[_SESSION_INFO_FLAG] = True
+
+
+def has_pending_invalidation(session: AsyncSession) -> bool:
+    """Whether ``session`` holds uncommitted changes that will invalidate.
+
+    A read in such a session sees its own flushed-but-uncommitted rows,
+    which must neither be served from nor written to the shared cache.
+    """
+    return bool(session.sync_session.info.get(_SESSION_INFO_FLAG, False))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_INFO_FLAG, False):
+        _gallery_cache.invalidate()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_on_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    # Runs after ``after_commit`` on a commit (flag already consumed) and
+    # on every rollback or close of the outermost transaction.
+    if transaction.parent is None:
+        session.info.pop(_SESSION_INFO_FLAG, None)
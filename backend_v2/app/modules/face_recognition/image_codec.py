@@ -26,13 +26,37 @@ example ``app.modules.face_recognition.processing_service`` decoding a
 stored file — never something reachable from external/client input, so
 a plain ``ValueError`` (not a client-facing ``AppError``) is
 appropriate here.
+
+**In-process frames.** ``DecodedImage`` is a pydantic contract: immutable
+``bytes``, validated on construction, safe to log or pass across a module
+boundary. It is the wrong currency *inside* the pipeline, where a 12 MP
+photo is 34 MiB per copy: every ``tobytes()``, every ``[:, :, ::-1]``
+OpenCV had to make contiguous, and every per-tile repack showed up in a
+probe's peak RSS. ``ImageFrame`` is the internal type instead — a
+read-only ``(H, W, 3)`` ``uint8`` array plus its ``color_format`` and
+``dimensions``. Decoding produces one directly (``pil_image_to_frame``),
+``pipeline``, ``tiling``, ``detection_scaling``, ``alignment`` and both
+provider adapters pass it along as is, and crops (tiles) are views of
+it. ``as_frame`` wraps a ``DecodedImage`` without copying where a
+boundary caller still hands one in; ``frame_to_decoded_image`` is the
+one place a frame is copied back out.
+
+Decoded frames are **BGR**: Pillow packs BGR as cheaply as RGB, and
+OpenCV's detector, the first and only full-resolution consumer, reads
+BGR. Alignment is colour-agnostic, so the only RGB conversion left is
+dlib's, on a 150x150 chip. Aligned chips themselves stay
+``NormalizedFaceInput`` — the ``FaceEmbedder`` boundary — since at
+67 KiB each they were never the cost.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from typing import Literal
 
+import cv2
 import numpy as np
+from PIL import Image
 
 from app.modules.face_recognition.domain import (
     DecodedImage,
@@ -93,20 +117,94 @@ def normalized_face_input_to_ndarray(face: NormalizedFaceInput) -> np.ndarray:
     )
 
 
-def to_bgr(array: np.ndarray, *, color_format: Literal["rgb", "bgr"]) -> np.ndarray:
-    """Return an OpenCV-ready BGR view/copy of ``array``, converting only if needed."""
+@dataclass(frozen=True, slots=True, eq=False)
+class ImageFrame:
+    """A decoded image inside the pipeline — see this module's docstring.
+
+    ``pixels`` is stored as a read-only view of the array it was built
+    from, so no stage can modify pixels another stage is still reading.
+    Its rows need not be contiguous with each other (a ``crop`` is a
+    view), but each row's pixels are.
+    """
+
+    pixels: np.ndarray
+    color_format: Literal["rgb", "bgr"] = "rgb"
+    dimensions: ImageDimensions = field(init=False)
+
+    def __post_init__(self) -> None:
+        array = self.pixels
+        if array.ndim != 3 or array.shape[2] != _CHANNELS:
+            raise ValueError(f"expected an (H, W, {_CHANNELS}) array, got shape {array.shape!r}")
+        if array.dtype != np.uint8:
+            raise ValueError(f"expected a uint8 array, got dtype {array.dtype!r}")
+        view = array.view()
+        view.flags.writeable = False
+        height, width, _ = view.shape
+        object.__setattr__(self, "pixels", view)
+        object.__setattr__(self, "dimensions", ImageDimensions(width_px=width, height_px=height))
+
+    def crop(self, *, x_px: int, y_px: int, width_px: int, height_px: int) -> ImageFrame:
+        """A view of one rectangle of this frame (clipped to it); copies nothing."""
+        return ImageFrame(
+            self.pixels[y_px : y_px + height_px, x_px : x_px + width_px],
+            color_format=self.color_format,
+        )
+
+    def bgr_pixels(self) -> np.ndarray:
+        """The pixels in OpenCV's BGR order — ``pixels`` itself for a BGR
+        frame, otherwise one ``cv2.cvtColor`` copy."""
+        if self.color_format == "bgr":
+            return self.pixels
+        return cv2.cvtColor(self.pixels, cv2.COLOR_RGB2BGR)
+
+    def rgb_pixels(self) -> np.ndarray:
+        """The pixels in RGB order (dlib's) — ``pixels`` itself for an RGB
+        frame, otherwise one ``cv2.cvtColor`` copy."""
+        if self.color_format == "rgb":
+            return self.pixels
+        return cv2.cvtColor(self.pixels, cv2.COLOR_BGR2RGB)
+
+
+def pil_image_to_frame(image: Image.Image) -> ImageFrame:
+    """Decode ``image`` (any mode) into a BGR ``ImageFrame``.
+
+    Pillow packs straight into BGR order, so ``tobytes`` is the only
+    copy out of Pillow and the array is a view of its result. Modes
+    other than RGB are converted to RGB first, exactly as
+    ``image.convert("RGB")`` would. Raises whatever Pillow raises for an
+    undecodable image.
+    """
+
+    rgb_image = image if image.mode == "RGB" else image.convert("RGB")
+    width, height = rgb_image.size
+    pixels = np.frombuffer(rgb_image.tobytes("raw", "BGR"), dtype=np.uint8)
+    return ImageFrame(pixels.reshape((height, width, _CHANNELS)), color_format="bgr")
+
+
+def decoded_image_to_frame(image: DecodedImage) -> ImageFrame:
+    """Wrap a ``DecodedImage``'s bytes as an ``ImageFrame`` without copying."""
+
+    return ImageFrame(decoded_image_to_ndarray(image), color_format=image.color_format)
+
+
+def as_frame(image: DecodedImage | ImageFrame) -> ImageFrame:
+    """``image`` as an ``ImageFrame`` — itself, or a zero-copy wrap of a ``DecodedImage``."""
+
+    if isinstance(image, ImageFrame):
+        return image
+    return decoded_image_to_frame(image)
+
+
+def frame_to_decoded_image(frame: ImageFrame) -> DecodedImage:
+    """Copy ``frame`` out into a ``DecodedImage``, for a module boundary."""
 
-    if color_format == "bgr":
-        return array
-    return array[:, :, ::-1]
+    return ndarray_to_decoded_image(frame.pixels, color_format=frame.color_format)
 
 
-def to_rgb(array: np.ndarray, *, color_format: Literal["rgb", "bgr"]) -> np.ndarray:
-    """Return an RGB view/copy of ``array`` (dlib's expected order), converting only if needed."""
+def normalized_face_input_to_frame(face: NormalizedFaceInput) -> ImageFrame:
+    """Wrap a ``NormalizedFaceInput``'s bytes as an ``ImageFrame`` without copying."""
 
-    if color_format == "rgb":
-        return array
-    return array[:, :, ::-1]
+    return ImageFrame(normalized_face_input_to_ndarray(face), color_format=face.color_format)
 
 
 def _normalize_array(array: np.ndarray) -> np.ndarray:
@@ -31,10 +31,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.core.config import Settings
 from app.modules.biometric_enrollment.image_validation import (
     ValidatedImageContent,
     _ImageContentRejected,
+    _validate_and_decode_bgr_bytes,
     _validate_decoded_bytes,
 )
 from app.modules.face_recognition.errors import (
@@ -46,6 +49,7 @@ from app.modules.face_recognition.errors import (
     MatchProbeImageFormatNotAllowedError,
     MatchProbeImageMimeMismatchError,
 )
+from app.modules.face_recognition.image_codec import ImageFrame
 
 
 @dataclass(frozen=True)
@@ -100,6 +104,37 @@ def validate_probe_image_bytes(
     )
 
 
+def decode_validated_probe_image(
+    data: bytes,
+    *,
+    settings: Settings,
+    declared_content_type: str | None = None,
+) -> ImageFrame:
+    """Validate probe bytes exactly like ``validate_probe_image_bytes`` and
+    return the image, decoded, ready for detection.
+
+    One full decode serves both purposes: the pixel plane Pillow decodes
+    for the checks, packed as BGR (see
+    ``image_validation._validate_and_decode_bgr_bytes``), becomes the
+    returned ``ImageFrame``'s buffer without another copy, and the
+    detector reads that buffer as is. Raises the same
+    ``MatchProbeImage*`` errors, under the same conditions, as
+    ``validate_probe_image_bytes``; like it, must run off the event loop.
+    """
+    try:
+        content, bgr_pixels = _validate_and_decode_bgr_bytes(
+            data,
+            max_pixels=settings.MAX_ENROLLMENT_IMAGE_PIXELS,
+            max_dimension=settings.MAX_ENROLLMENT_IMAGE_DIMENSION_PX,
+            declared_content_type=declared_content_type,
+        )
+    except _ImageContentRejected as exc:
+        raise _translate_match_probe_rejection(exc) from exc
+
+    pixels = np.frombuffer(bgr_pixels, dtype=np.uint8)
+    return ImageFrame(pixels.reshape((content.height_px, content.width_px, 3)), color_format="bgr")
+
+
 def _translate_match_probe_rejection(exc: _ImageContentRejected) -> Exception:
     """Stage 3's translation of the shared, taxonomy-neutral signal.
 
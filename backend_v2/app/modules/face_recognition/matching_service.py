@@ -2,7 +2,7 @@
 
 This is the **only** authorized entrypoint into
 ``app.modules.face_recognition.providers.similarity_matcher`` in this
-checkpoint. Its entire purpose is enforcing the two things a bare
+checkpoint. Its entire purpose is enforcing the three things a bare
 ``FaceMatcher`` provider deliberately cannot enforce on its own (see
 ``protocols.py``'s ``FaceMatcher`` docstring):
 
@@ -16,6 +16,12 @@ checkpoint. Its entire purpose is enforcing the two things a bare
    .list_active_for_students``,
    which already joins through ``BiometricSample.status``/
    ``processing_state`` (see that method's own docstring).
+3. **Only embeddings from the configured model are compared.** The same
+   fetch is scoped to ``provider_factory.current_embedding_model`` —
+   after ``Settings.FACE_EMBEDDING_MODEL_VERSION`` is bumped, a student
+   still carrying an older model's embedding is no candidate (an
+   ``UNKNOWN`` rather than a meaningless score) until
+   ``app.modules.face_recognition.reembedding`` has moved them over.
 
 **Authorization boundary (Stage 3 brief §13):** this service does not
 itself decide *which* students an admin/teacher may query — that is
@@ -28,6 +34,25 @@ given were already authorized by its caller — matching this
 codebase's existing "role/ownership checks happen once, in an
 already-authorized service/router layer" convention.
 
+**Gallery cache.** With ``Settings.FACE_MATCHER_ENGINE="vectorized"``
+the candidate fetch goes through
+``app.modules.face_recognition.gallery_cache``: a repeated roster is
+scored against its cached ``CandidateGallery`` without a database round
+trip. The cache is dropped on every committed sample/embedding
+lifecycle change, so point 2 above holds for cached scopes too. The
+``"python"`` reference engine always queries for ``match_probe``.
+
+**Group photos.** ``match_group`` decides every face of one classroom
+photo against the scope in one call, with no student matched to two
+faces (``VectorizedCosineSimilarityFaceMatcher.assign_gallery``). Joint
+assignment only exists over a packed gallery, so it always uses the
+gallery path above, whichever engine is configured.
+
+**Batches.** ``match_batch`` decides several single-face probes against
+one scope with one gallery load and one audit row, each probe exactly as
+``match_probe`` would (``match_gallery_many``) — two probes may be the
+same student. Like ``match_group`` it always uses the gallery path.
+
 **Never returns an embedding value** — ``MatchOutcome`` below carries
 only a status, an optional matched student ID, and optional similarity
 scores (floats, not vectors).
@@ -47,10 +72,14 @@ vector, raw image bytes, a filesystem/model path, or a raw exception
 message — see ``app.modules.face_recognition.errors``'s module
 docstring on why every error message in this domain is already
 generic.
+
+The roster's embedding query (``candidate_fetch``) and each matcher call
+(``match``) are timed into ``app.modules.face_recognition.metrics``.
 """
 
 from __future__ import annotations
 
+import time
 import uuid
 from dataclasses import dataclass
 
@@ -63,15 +92,40 @@ from app.modules.attendance.repository import AuditLogRepository
 from app.modules.face_recognition.domain import (
     CandidateEmbedding,
     EmbeddingVector,
+    MatchResult,
     MatchStatus,
     validate_embedding_dimension,
 )
-from app.modules.face_recognition.errors import CandidateScopeRequiredError
-from app.modules.face_recognition.provider_factory import get_matcher
+from app.modules.face_recognition.embedding_codec import unpack_embedding_rows
+from app.modules.face_recognition.errors import (
+    CandidateEmbeddingDimensionMismatchError,
+    CandidateScopeRequiredError,
+)
+from app.modules.face_recognition.gallery_cache import (
+    gallery_key,
+    get_gallery_cache,
+    has_pending_invalidation,
+)
+from app.modules.face_recognition.metrics import (
+    EMBEDDER_PROVIDER,
+    STAGE_CANDIDATE_FETCH,
+    STAGE_MATCH,
+    embedder_model,
+    embedder_model_version,
+    observe_stage,
+)
+from app.modules.face_recognition.provider_factory import current_embedding_model, get_matcher
+from app.modules.face_recognition.providers.similarity_matcher import (
+    CandidateGallery,
+    CosineSimilarityFaceMatcher,
+    VectorizedCosineSimilarityFaceMatcher,
+)
 from app.modules.face_recognition.repository import BiometricEmbeddingRepository
 from app.modules.users.models import User
 
 ACTION_MATCH_PROBE = "face_recognition.match_probe"
+ACTION_MATCH_GROUP = "face_recognition.match_group"
+ACTION_MATCH_BATCH = "face_recognition.match_batch"
 _ENTITY_TYPE_MATCH_PROBE = "face_match_probe"
 
 # Safe, generic reason codes for a BLOCKED match-probe audit row — never
@@ -164,37 +218,240 @@ class MatchingService:
             probe_embedding, expected_dimension=self._settings.FACE_EMBEDDING_DIMENSION
         )
 
-        rows = await self._embeddings.list_active_for_students(candidate_student_profile_ids)
-        candidates = [
-            CandidateEmbedding(
-                student_profile_id=row.student_profile_id,
-                embedding=EmbeddingVector(values=tuple(row.embedding_values)),
+        if self._settings.FACE_MATCHER_ENGINE == "vectorized":
+            gallery = await self._load_gallery(candidate_student_profile_ids)
+            candidate_count = gallery.row_count if gallery is not None else 0
+            matcher = VectorizedCosineSimilarityFaceMatcher(self._settings)
+            started = time.perf_counter()
+            result = (
+                matcher.match_gallery(probe_embedding, gallery)
+                if gallery is not None
+                else MatchResult.unknown()
             )
-            for row in rows
-        ]
-
-        matcher = get_matcher(self._settings)
-        result = matcher.match(probe_embedding, candidates)
-
-        best_similarity = result.best_candidate.similarity if result.best_candidate else None
-        runner_up_similarity = (
-            result.runner_up_candidate.similarity if result.runner_up_candidate else None
-        )
+            self._observe_match(matcher.provider_name, started)
+        else:
+            candidates = await self._load_candidates(candidate_student_profile_ids)
+            candidate_count = len(candidates)
+            started = time.perf_counter()
+            result = get_matcher(self._settings).match(probe_embedding, candidates)
+            self._observe_match(CosineSimilarityFaceMatcher.provider_name, started)
 
         await self._persist_success(
             actor=actor,
             request_id=request_id,
-            candidate_count=len(candidates),
+            candidate_count=candidate_count,
             status=result.status,
             matched_student_profile_id=result.matched_student_profile_id,
         )
 
-        return MatchOutcome(
-            status=result.status,
-            matched_student_profile_id=result.matched_student_profile_id,
-            best_similarity=best_similarity,
-            runner_up_similarity=runner_up_similarity,
+        return _to_outcome(result)
+
+    async def match_group(
+        self,
+        *,
+        probe_embeddings: list[EmbeddingVector],
+        candidate_student_profile_ids: list[uuid.UUID],
+        actor: User,
+        request_id: str | None = None,
+    ) -> list[MatchOutcome]:
+        """One ``MatchOutcome`` per probe, in input order, with no student
+        FOUND for more than one probe.
+
+        Same scope requirement and ``BLOCKED`` audit as ``match_probe``;
+        one ``SUCCESS`` audit row covers the whole group (candidate,
+        face, and FOUND counts only).
+        """
+        await self.ensure_candidate_scope(
+            candidate_student_profile_ids=candidate_student_profile_ids,
+            actor=actor,
+            request_id=request_id,
+        )
+
+        probe_embeddings = [
+            validate_embedding_dimension(
+                embedding, expected_dimension=self._settings.FACE_EMBEDDING_DIMENSION
+            )
+            for embedding in probe_embeddings
+        ]
+        gallery = await self._load_gallery(candidate_student_profile_ids)
+        started = time.perf_counter()
+        results = (
+            VectorizedCosineSimilarityFaceMatcher(self._settings).assign_gallery(
+                probe_embeddings, gallery
+            )
+            if gallery is not None
+            else [MatchResult.unknown() for _ in probe_embeddings]
+        )
+        self._observe_match(VectorizedCosineSimilarityFaceMatcher.provider_name, started)
+
+        async with service_transaction(self._session):
+            await self._audit_logs.create(
+                actor_user_id=actor.id,
+                action=ACTION_MATCH_GROUP,
+                outcome=AuditOutcome.SUCCESS,
+                entity_type=_ENTITY_TYPE_MATCH_PROBE,
+                entity_id=None,
+                request_id=request_id,
+                event_metadata={
+                    "candidate_count": gallery.row_count if gallery is not None else 0,
+                    "face_count": len(results),
+                    "found_count": sum(
+                        1 for result in results if result.status is MatchStatus.FOUND
+                    ),
+                },
+            )
+
+        return [_to_outcome(result) for result in results]
+
+    async def match_batch(
+        self,
+        *,
+        probe_embeddings: list[EmbeddingVector],
+        candidate_student_profile_ids: list[uuid.UUID],
+        actor: User,
+        request_id: str | None = None,
+    ) -> list[MatchOutcome]:
+        """One independent ``MatchOutcome`` per probe, in input order.
+
+        Same scope requirement and ``BLOCKED`` audit as ``match_probe``;
+        one ``SUCCESS`` audit row covers the whole batch (candidate,
+        probe, and FOUND counts only).
+        """
+        await self.ensure_candidate_scope(
+            candidate_student_profile_ids=candidate_student_profile_ids,
+            actor=actor,
+            request_id=request_id,
+        )
+
+        probe_embeddings = [
+            validate_embedding_dimension(
+                embedding, expected_dimension=self._settings.FACE_EMBEDDING_DIMENSION
+            )
+            for embedding in probe_embeddings
+        ]
+        gallery = await self._load_gallery(candidate_student_profile_ids)
+        started = time.perf_counter()
+        results = (
+            VectorizedCosineSimilarityFaceMatcher(self._settings).match_gallery_many(
+                probe_embeddings, gallery
+            )
+            if gallery is not None
+            else [MatchResult.unknown() for _ in probe_embeddings]
         )
+        self._observe_match(VectorizedCosineSimilarityFaceMatcher.provider_name, started)
+
+        async with service_transaction(self._session):
+            await self._audit_logs.create(
+                actor_user_id=actor.id,
+                action=ACTION_MATCH_BATCH,
+                outcome=AuditOutcome.SUCCESS,
+                entity_type=_ENTITY_TYPE_MATCH_PROBE,
+                entity_id=None,
+                request_id=request_id,
+                event_metadata={
+                    "candidate_count": gallery.row_count if gallery is not None else 0,
+                    "probe_count": len(results),
+                    "found_count": sum(
+                        1 for result in results if result.status is MatchStatus.FOUND
+                    ),
+                },
+            )
+
+        return [_to_outcome(result) for result in results]
+
+    def _observe_match(self, provider: str, started: float) -> None:
+        observe_stage(
+            STAGE_MATCH,
+            time.perf_counter() - started,
+            provider=provider,
+            model=embedder_model(self._settings),
+            model_version=embedder_model_version(self._settings),
+        )
+
+    async def _load_candidates(
+        self, candidate_student_profile_ids: list[uuid.UUID]
+    ) -> list[CandidateEmbedding]:
+        started = time.perf_counter()
+        rows = await self._embeddings.list_active_for_students(
+            candidate_student_profile_ids, model=current_embedding_model(self._settings)
+        )
+        observe_stage(
+            STAGE_CANDIDATE_FETCH,
+            time.perf_counter() - started,
+            provider=EMBEDDER_PROVIDER,
+            model=embedder_model(self._settings),
+            model_version=embedder_model_version(self._settings),
+        )
+        return [
+            CandidateEmbedding(
+                student_profile_id=row.student_profile_id,
+                embedding=EmbeddingVector(values=tuple(row.embedding.tolist())),
+            )
+            for row in rows
+        ]
+
+    async def _load_gallery(
+        self, candidate_student_profile_ids: list[uuid.UUID]
+    ) -> CandidateGallery | None:
+        """The scope's packed gallery (``None`` if it has no candidates),
+        from the gallery cache when possible.
+
+        The cache generation is read *before* the query so a gallery
+        fetched across a concurrent invalidation is never stored, and a
+        session with its own uncommitted lifecycle changes bypasses the
+        cache entirely — see ``gallery_cache``'s module docstring.
+
+        A miss decodes the whole roster's packed float32 rows with one
+        ``numpy.frombuffer`` (no per-component Python float), after
+        raising the same first-offender
+        ``CandidateEmbeddingDimensionMismatchError`` the reference engine
+        would, so nothing mis-sized is ever cached.
+        """
+        cache = get_gallery_cache()
+        model = current_embedding_model(self._settings)
+        key = gallery_key(candidate_student_profile_ids, model=model)
+        use_cache = not has_pending_invalidation(self._session)
+        if use_cache:
+            cached = cache.get(key, ttl_seconds=self._settings.FACE_GALLERY_CACHE_TTL_SECONDS)
+            if cached is not None:
+                return cached.gallery
+
+        generation = cache.generation
+        started = time.perf_counter()
+        rows = await self._embeddings.list_active_for_students(
+            candidate_student_profile_ids, model=model
+        )
+        observe_stage(
+            STAGE_CANDIDATE_FETCH,
+            time.perf_counter() - started,
+            provider=EMBEDDER_PROVIDER,
+            model=embedder_model(self._settings),
+            model_version=embedder_model_version(self._settings),
+        )
+        expected_dimension = self._settings.FACE_EMBEDDING_DIMENSION
+        for row in rows:
+            if row.embedding_dimension != expected_dimension:
+                raise CandidateEmbeddingDimensionMismatchError(
+                    expected=expected_dimension, actual=row.embedding_dimension
+                )
+        gallery = (
+            CandidateGallery.from_arrays(
+                [row.student_profile_id for row in rows],
+                unpack_embedding_rows(
+                    [row.embedding_packed for row in rows], dimension=expected_dimension
+                ),
+            )
+            if rows
+            else None
+        )
+        if use_cache:
+            cache.put(
+                key,
+                gallery,
+                generation=generation,
+                max_entries=self._settings.FACE_GALLERY_CACHE_MAX_ENTRIES,
+            )
+        return gallery
 
     async def _persist_success(
         self,
@@ -235,3 +492,14 @@ class MatchingService:
                 request_id=request_id,
                 event_metadata={"reason_code": reason_code},
             )
+
+
+def _to_outcome(result: MatchResult) -> MatchOutcome:
+    return MatchOutcome(
+        status=result.status,
+        matched_student_profile_id=result.matched_student_profile_id,
+        best_similarity=result.best_candidate.similarity if result.best_candidate else None,
+        runner_up_similarity=(
+            result.runner_up_candidate.similarity if result.runner_up_candidate else None
+        ),
+    )
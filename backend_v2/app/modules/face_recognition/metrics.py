@@ -0,0 +1,347 @@
+"""In-process face-pipeline metrics, exposed in the Prometheus text format.
+
+Until now the pipeline logged only failures, so there was no way to see
+where a slow match probe spent its time, how long requests queued for a
+provider instance, or how backed up the ``asyncio.to_thread`` pool was.
+This module keeps a handful of histograms and counters in memory and
+renders them for ``GET /face-recognition/metrics`` (admin only).
+
+**Stages** (``face_pipeline_stage_seconds``, one histogram series per
+``stage``/``provider``/``model``):
+
+- ``decode``: reading and validating/decoding one upload or stored sample.
+- ``detect``: one detector call (tiled detection counts as one).
+- ``align`` and ``quality``: per face.
+- ``embed``: one single-face ``embed`` call.
+- ``embed_batch``: one batched ``embed_many`` call, observed once
+  however many faces it held — a batch's time is not a per-face time,
+  so it is never spread over ``embed``.
+- ``candidate_fetch``: the roster's active embeddings from PostgreSQL
+  (gallery-cache hits are not observed — they cost nothing).
+- ``match``: one matcher call over the gallery.
+- ``lock_wait``: checking out a provider instance
+  (``provider_pool.InstancePool``) — zero when one is idle, which is
+  what the per-instance ``RLock`` wait was before the pools.
+- ``thread_queue``: from ``offload`` handing a call to the default
+  thread pool until a thread starts running it.
+
+``provider`` is the detector's, embedder's or matcher's
+``provider_name`` (the configured adapters', so stand-ins in tests and
+benchmarks report under the same names); ``model`` the deployer's
+``FACE_DETECTION_MODEL_IDENTIFIER``/``FACE_EMBEDDING_MODEL_IDENTIFIER``.
+Embedder-side series (``embed``, ``embed_batch``, ``candidate_fetch``,
+``match`` and the embedder pool's ``lock_wait``) also carry
+``model_version`` — ``FACE_EMBEDDING_MODEL_VERSION``, the same version
+``provider_factory.current_embedding_model`` stamps on embeddings — so
+timings from before and after new weights ship under an unchanged
+identifier land in separate series. Stages that involve no model carry
+none of these labels.
+
+**Counters and gauges**: rejections by typed error code
+(``face_pipeline_rejections_total``), offloaded calls in flight, and —
+read at scrape time, not kept here — both provider pools' usage
+(``InstancePool.stats``) and the startup warm-up durations
+(``warmup.ModelWarmup``).
+
+**Cost on the hot path.** An observation is a ``bisect`` into fixed
+buckets and two additions under a lock held for nanoseconds; series are
+created once per label combination. Nothing is logged and nothing is
+formatted until a scrape. Metrics are per process: an API process sees
+its own requests and in-process sample processing, not what
+``processing_pool`` child processes or separate queue workers did.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
+from app.core.config import Settings
+from app.modules.face_recognition.provider_pool import InstancePoolStats
+from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+
+if TYPE_CHECKING:
+    # ``warmup`` imports ``provider_factory``, which imports this module.
+    from app.modules.face_recognition.warmup import ModelWarmup
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STAGE_DECODE = "decode"
+STAGE_DETECT = "detect"
+STAGE_ALIGN = "align"
+STAGE_QUALITY = "quality"
+STAGE_EMBED = "embed"
+STAGE_EMBED_BATCH = "embed_batch"
+STAGE_CANDIDATE_FETCH = "candidate_fetch"
+STAGE_MATCH = "match"
+STAGE_LOCK_WAIT = "lock_wait"
+STAGE_THREAD_QUEUE = "thread_queue"
+
+DETECTOR_PROVIDER = YuNetFaceDetector.provider_name
+EMBEDDER_PROVIDER = DlibResnetFaceEmbedder.provider_name
+
+# Seconds; from a cache-warm chip's quality check to a 12 MP decode or
+# a long queue behind a busy pool.
+_STAGE_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...],
+        *,
+        buckets: tuple[float, ...] = _STAGE_BUCKETS,
+    ) -> None:
+        self.name = name
+        self._help = help_text
+        self._label_names = label_names
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        # Per series: one count per bucket plus +Inf, then the sum.
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, labels: tuple[str, ...]) -> None:
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self._buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        lines = [f"# HELP {self.name} {self._help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(snapshot.items()):
+            pairs = list(zip(self._label_names, labels, strict=True))
+            cumulative = 0.0
+            for bound, count in zip((*self._buckets, float("inf")), series[:-1], strict=True):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_labels([*pairs, ('le', le)])} {int(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {series[-1]!r}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {int(cumulative)}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    """Monotonic counter keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self._help = help_text
+        self._label_names = label_names
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...], amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = dict(self._values)
+        return [
+            f"# HELP {self.name} {self._help}",
+            f"# TYPE {self.name} counter",
+            *(
+                f"{self.name}{_labels(zip(self._label_names, labels, strict=True))} {value!r}"
+                for labels, value in sorted(snapshot.items())
+            ),
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+STAGE_SECONDS = Histogram(
+    "face_pipeline_stage_seconds",
+    "Time spent in one face-pipeline stage.",
+    ("stage", "provider", "model", "model_version"),
+)
+REJECTIONS = Counter(
+    "face_pipeline_rejections_total",
+    "Single-face images rejected by the pipeline, by error code.",
+    ("code",),
+)
+
+# (name, type, help, ``InstancePoolStats`` field), one series per pool.
+_POOL_METRICS = (
+    ("face_provider_pool_size", "gauge", "Most instances the pool may create.", "size"),
+    ("face_provider_pool_instances", "gauge", "Instances created so far.", "created"),
+    ("face_provider_pool_in_use", "gauge", "Instances checked out right now.", "in_use"),
+    ("face_provider_pool_checkouts_total", "counter", "Instance checkouts.", "checkouts"),
+    (
+        "face_provider_pool_waited_checkouts_total",
+        "counter",
+        "Checkouts that waited for a free instance.",
+        "waited_checkouts",
+    ),
+    (
+        "face_provider_pool_wait_seconds_total",
+        "counter",
+        "Total time checkouts waited for a free instance.",
+        "total_wait_seconds",
+    ),
+    (
+        "face_provider_pool_wait_seconds_max",
+        "gauge",
+        "Longest single wait for a free instance.",
+        "max_wait_seconds",
+    ),
+)
+
+_offload_lock = threading.Lock()
+_offloads_in_flight = 0
+
+
+def observe_stage(
+    stage: str, seconds: float, *, provider: str = "", model: str = "", model_version: str = ""
+) -> None:
+    STAGE_SECONDS.observe(seconds, (stage, provider, model, model_version))
+
+
+def count_rejection(code: str) -> None:
+    REJECTIONS.inc((code,))
+
+
+def detector_model(settings: Settings) -> str:
+    return settings.FACE_DETECTION_MODEL_IDENTIFIER or ""
+
+
+def embedder_model(settings: Settings) -> str:
+    return settings.FACE_EMBEDDING_MODEL_IDENTIFIER or ""
+
+
+def embedder_model_version(settings: Settings) -> str:
+    return settings.FACE_EMBEDDING_MODEL_VERSION
+
+
+async def offload[**P, R](func: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs) -> R:
+    """``asyncio.to_thread(func, *args, **kwargs)``, observing how long the
+    call waited for a thread (``thread_queue``) and counting it in flight."""
+    global _offloads_in_flight
+    submitted = time.perf_counter()
+
+    def run() -> R:
+        observe_stage(STAGE_THREAD_QUEUE, time.perf_counter() - submitted)
+        return func(*args, **kwargs)
+
+    with _offload_lock:
+        _offloads_in_flight += 1
+    try:
+        return await asyncio.to_thread(run)
+    finally:
+        with _offload_lock:
+            _offloads_in_flight -= 1
+
+
+def render_metrics(
+    *,
+    pools: dict[str, InstancePoolStats],
+    warmup: ModelWarmup | None,
+) -> str:
+    """The text exposition of everything above, plus ``pools`` (keyed by
+    ``"detector"``/``"embedder"``) and, if this process preloads models,
+    its ``warmup`` record."""
+    lines = [*STAGE_SECONDS.render(), *REJECTIONS.render()]
+    with _offload_lock:
+        in_flight = _offloads_in_flight
+    lines += _gauge(
+        "face_offload_in_flight",
+        "Pipeline calls handed to the thread pool and not yet finished.",
+        [((), in_flight)],
+    )
+
+    for name, kind, help_text, field in _POOL_METRICS:
+        lines += _series(
+            name,
+            kind,
+            help_text,
+            [((("pool", pool),), float(getattr(stats, field))) for pool, stats in pools.items()],
+        )
+
+    if warmup is not None:
+        lines += _gauge(
+            "face_model_warmup_ready",
+            "1 once startup model preloading has finished, else 0.",
+            [((), 1 if warmup.ready else 0)],
+        )
+        lines += _gauge(
+            "face_model_load_seconds",
+            "Startup model load time, summed over the provider's instances.",
+            [((("provider", name),), value) for name, value in sorted(warmup.load_seconds.items())],
+        )
+        lines += _gauge(
+            "face_model_warmup_seconds",
+            "Startup warm-up inference time, summed over the provider's instances.",
+            [
+                ((("provider", name),), value)
+                for name, value in sorted(warmup.warmup_seconds.items())
+            ],
+        )
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """Test-only: forget every observation."""
+    STAGE_SECONDS.reset()
+    REJECTIONS.reset()
+
+
+def _gauge(
+    name: str, help_text: str, samples: list[tuple[tuple[tuple[str, str], ...], float]]
+) -> list[str]:
+    return _series(name, "gauge", help_text, samples)
+
+
+def _series(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: list[tuple[tuple[tuple[str, str], ...], float]],
+) -> list[str]:
+    return [
+        f"# HELP {name} {help_text}",
+        f"# TYPE {name} {kind}",
+        *(f"{name}{_labels(pairs)} {value!r}" for pairs, value in samples),
+    ]
+
+
+def _labels(pairs: Iterable[tuple[str, str]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs if value)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -21,28 +21,166 @@ this project's existing pattern of layering "does this pass a basic
 sanity check" ahead of "does this pass a stronger, opt-in check" rather
 than making the stronger check mandatory before any deployment can run
 at all.
+
+**Checksum cache.** Hashing the dlib model (tens of megabytes) on every
+provider load repeated on every worker boot and after every
+``reset_provider_cache``. ``cached_sha256`` now remembers a file's hash
+against its *fingerprint* — resolved path, device, inode, size,
+``mtime_ns`` and ``ctime_ns`` — in process memory and in a small JSON
+sidecar next to the model (``<model file>.sha256-cache.json``), so a new
+process finds it without hashing. Any difference in the fingerprint
+means a re-hash, and the comparison against ``expected_sha256`` is made
+as before, so a changed file still fails closed. ``ctime_ns`` is in the
+fingerprint because, unlike ``mtime``, it cannot be set back by hand.
+A file changed less than ``_RACY_WINDOW_NS`` before it was hashed is
+not cached at all: timestamps are only as fine as the kernel's clock
+tick, so a second write within it could leave the fingerprint unchanged
+(git's "racily clean" problem). A model directory that is read-only
+just means no sidecar; the in-process cache still applies.
+
+Hashes that do run read the file through ``mmap`` — one ``hashlib`` call
+over the whole mapping, which releases the GIL, instead of a
+megabyte-at-a-time read loop (falling back to that loop where a file
+cannot be mapped).
 """
 
 from __future__ import annotations
 
+import contextlib
 import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
+import structlog
+
 from app.modules.face_recognition.errors import (
     ModelArtifactChecksumMismatchError,
     ModelArtifactMissingError,
 )
 
+logger = structlog.get_logger(__name__)
+
 _HASH_CHUNK_SIZE = 1024 * 1024
+_SIDECAR_SUFFIX = ".sha256-cache.json"
+_SIDECAR_VERSION = 1
+# Coarser than any kernel timestamp tick in practice.
+_RACY_WINDOW_NS = 2_000_000_000
 
 
 def compute_sha256(path: Path) -> str:
-    """Chunked SHA-256 over a model file (never loads the whole file into memory)."""
-    digest = hashlib.sha256()
+    """SHA-256 over a model file, memory-mapped (never read into memory whole)."""
     with path.open("rb") as handle:
+        try:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
+        except (ValueError, OSError):
+            # Empty files and files on filesystems without mmap support.
+            pass
+        digest = hashlib.sha256()
+        handle.seek(0)
         for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
             digest.update(chunk)
-    return digest.hexdigest()
+        return digest.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class _Fingerprint:
+    path: str
+    device: int
+    inode: int
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+
+    @classmethod
+    def of(cls, resolved: Path) -> _Fingerprint:
+        stat_result = os.stat(resolved)
+        return cls(
+            path=str(resolved),
+            device=stat_result.st_dev,
+            inode=stat_result.st_ino,
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            ctime_ns=stat_result.st_ctime_ns,
+        )
+
+
+_cache_lock = threading.Lock()
+_checksums: dict[str, tuple[_Fingerprint, str]] = {}
+
+
+def cached_sha256(path: Path) -> str:
+    """``compute_sha256(path)``, skipped when the file is provably unchanged
+    since it was last hashed — see this module's docstring.
+
+    Raises ``OSError`` as ``compute_sha256`` does.
+    """
+    resolved = path.resolve()
+    fingerprint = _Fingerprint.of(resolved)
+    with _cache_lock:
+        cached = _checksums.get(fingerprint.path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    checksum = _read_sidecar(resolved, fingerprint)
+    if checksum is None:
+        hashed_at_ns = time.time_ns()
+        checksum = compute_sha256(resolved)
+        if (
+            _Fingerprint.of(resolved) != fingerprint
+            or max(fingerprint.mtime_ns, fingerprint.ctime_ns) >= hashed_at_ns - _RACY_WINDOW_NS
+        ):
+            # Changed while (or just before) being hashed: correct for
+            # this call's comparison, but not safe to remember.
+            return checksum
+        _write_sidecar(resolved, fingerprint, checksum)
+    with _cache_lock:
+        _checksums[fingerprint.path] = (fingerprint, checksum)
+    return checksum
+
+
+def reset_checksum_cache() -> None:
+    """Test-only: forget in-process checksums (sidecar files are kept)."""
+    with _cache_lock:
+        _checksums.clear()
+
+
+def _sidecar_path(resolved: Path) -> Path:
+    return resolved.with_name(resolved.name + _SIDECAR_SUFFIX)
+
+
+def _read_sidecar(resolved: Path, fingerprint: _Fingerprint) -> str | None:
+    try:
+        record = json.loads(_sidecar_path(resolved).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict):
+        return None
+    checksum = record.pop("sha256", None)
+    if record.pop("version", None) != _SIDECAR_VERSION or record != asdict(fingerprint):
+        return None
+    if not (isinstance(checksum, str) and len(checksum) == 64):
+        return None
+    return checksum
+
+
+def _write_sidecar(resolved: Path, fingerprint: _Fingerprint, checksum: str) -> None:
+    sidecar = _sidecar_path(resolved)
+    record = {"version": _SIDECAR_VERSION, **asdict(fingerprint), "sha256": checksum}
+    temporary = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        temporary.write_text(json.dumps(record), encoding="utf-8")
+        os.replace(temporary, sidecar)
+    except OSError as exc:
+        # A read-only model directory is normal; the memory cache still works.
+        logger.debug("model_checksum_sidecar_not_written", exc_type=type(exc).__name__)
+        with contextlib.suppress(OSError):
+            temporary.unlink()
 
 
 def verify_model_artifact(path: Path, *, expected_sha256: str | None) -> None:
@@ -65,7 +203,7 @@ def verify_model_artifact(path: Path, *, expected_sha256: str | None) -> None:
     if expected_sha256:
         normalized_expected = expected_sha256.strip().lower()
         try:
-            actual = compute_sha256(path)
+            actual = cached_sha256(path)
         except OSError as exc:
             raise ModelArtifactMissingError() from exc
         if actual != normalized_expected:
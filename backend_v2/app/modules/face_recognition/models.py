@@ -36,56 +36,64 @@ for matching per sample" invariant — at the database layer, not just
 in application code.
 
 **Embedding representation (Stage 3 brief, instruction 7):** a plain
-PostgreSQL ``DOUBLE PRECISION[]`` array
-(``postgresql.ARRAY(postgresql.DOUBLE_PRECISION)``), not ``pgvector``.
-Chosen because:
+PostgreSQL column, not ``pgvector``. Chosen because:
 
 - This project's current scale (single-school deployment, hundreds to
   low thousands of enrolled students, candidate-scoped matching against
   an explicit small roster — never a full-database nearest-neighbor
   search) does not need pgvector's approximate-nearest-neighbor index
-  structures; a bounded, explicitly-scoped Python-side cosine-
-  similarity loop (``app.modules.face_recognition.providers.similarity_matcher``)
+  structures; a bounded, explicitly-scoped cosine-similarity scan
+  (``app.modules.face_recognition.providers.similarity_matcher``)
   over at most a classroom's worth of candidates is fast enough.
 - Avoids taking a new PostgreSQL extension dependency
   (``CREATE EXTENSION vector``) for a benefit this project cannot yet
   measure a need for — "prefer the simplest correctly typed and tested
   representation unless performance evidence justifies an extension"
   (Stage 3 brief, instruction 7, verbatim).
-- A native array is directly, losslessly round-trippable to/from this
-  project's own ``EmbeddingVector`` domain type
-  (``tuple[float, ...]``) with no extra serialization library.
-- **Precision:** ``DOUBLE PRECISION`` (8-byte float, PostgreSQL's
-  `float8`) — matches Python's native ``float`` exactly, so no
-  precision is lost storing or retrieving a value already validated as
-  finite by ``EmbeddingVector`` (``app.modules.face_recognition.domain``).
 - **Portability:** PostgreSQL-specific (this project's only supported
   database — ``app/core/config.py`` rejects anything else at startup),
   so no cross-database portability concern applies.
-- **Migration consequences:** a plain array column has no extension-
-  enablement/version-pinning story the way pgvector would (no
-  ``CREATE EXTENSION``/``DROP EXTENSION`` in this migration's
-  upgrade/downgrade) — see
-  ``alembic/versions/*_create_biometric_embedding_and_processing_columns.py``.
+
+**Packed float32 storage.** Stage 3 stored a ``DOUBLE PRECISION[]``
+array; ``embedding_packed`` now holds the same components as one
+fixed-width ``bytea`` of little-endian float32 values (see
+``app.modules.face_recognition.embedding_codec``). That halves the
+per-row payload (512 bytes for 128 components, versus 1 KiB plus array
+header) and lets a roster fetch decode with a single
+``numpy.frombuffer`` instead of asyncpg building a Python list of
+floats per row. The length invariant is kept at the database layer:
+``octet_length(embedding_packed) = 4 * embedding_dimension``. See
+``alembic/versions/*_pack_biometric_embeddings_as_float32.py`` for the
+backfill.
 
 **Security/privacy:** no route/schema in this application ever returns
-``embedding_values`` — see ``app.modules.face_recognition.schemas`` (no
-schema even declares this field) and
+``embedding_packed`` (nor any decoded form of it) — see
+``app.modules.face_recognition.schemas`` (no schema even declares this
+field) and
 ``app.modules.face_recognition.router``'s module docstring. No audit-
 log call anywhere in this module ever passes embedding values as
 ``event_metadata`` — see
 ``app.modules.face_recognition.processing_service``.
+
+**Processing jobs.** ``BiometricProcessingJob`` is the durable queue
+behind ``app.modules.face_recognition.processing_jobs``: one row per
+request to process one sample, carrying only scheduling state (status,
+attempt count, next-attempt time, lease) and a safe reason code. It never
+holds image or embedding data. A partial unique index allows at most one
+*open* (``queued``/``running``) job per sample, so enqueueing the same
+sample twice is a no-op rather than a duplicate run; finished rows are
+kept as history, like superseded embeddings.
 """
 
 from __future__ import annotations
 
 import uuid
 from datetime import date, datetime
-from enum import Enum
+from enum import Enum, StrEnum
 
 import sqlalchemy as sa
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String
-from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -116,8 +124,9 @@ class BiometricEmbedding(Base):
     model_identifier: Mapped[str] = mapped_column(String(255), nullable=False)
     model_version: Mapped[str] = mapped_column(String(64), nullable=False)
     embedding_dimension: Mapped[int] = mapped_column(Integer(), nullable=False)
-    # DOUBLE PRECISION[] — see this module's docstring, "Embedding representation".
-    embedding_values: Mapped[list[float]] = mapped_column(ARRAY(DOUBLE_PRECISION()), nullable=False)
+    # Little-endian float32 components — see this module's docstring,
+    # "Packed float32 storage".
+    embedding_packed: Mapped[bytes] = mapped_column(LargeBinary(), nullable=False)
     # Optional: the model *artifact* checksum (app/modules/face_recognition/
     # model_artifacts.py) in effect when this embedding was computed — lets
     # a future audit distinguish "computed with the currently-configured
@@ -146,8 +155,8 @@ class BiometricEmbedding(Base):
         ),
         sa.CheckConstraint("embedding_dimension > 0", name="embedding_dimension_positive"),
         sa.CheckConstraint(
-            "array_length(embedding_values, 1) = embedding_dimension",
-            name="embedding_values_length_matches_dimension",
+            "octet_length(embedding_packed) = 4 * embedding_dimension",
+            name="embedding_packed_length_matches_dim",
         ),
     )
 
@@ -257,4 +266,114 @@ class RecognitionAttendanceAttempt(Base):
     )
 
 
-__all__ = ["BiometricEmbedding", "RecognitionAttendanceAttempt"]
+class ProcessingJobStatus(StrEnum):
+    """Lifecycle of one ``BiometricProcessingJob``.
+
+    ``QUEUED -> RUNNING -> SUCCEEDED | FAILED | CANCELLED``, with
+    ``RUNNING -> QUEUED`` again for a transient failure that still has
+    attempts left. ``CANCELLED`` means the sample stopped being eligible
+    (deleted, replaced, or processed by another path) before the job ran.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+OPEN_PROCESSING_JOB_STATUSES = (ProcessingJobStatus.QUEUED, ProcessingJobStatus.RUNNING)
+
+
+class BiometricProcessingJob(Base):
+    """One queued request to process one ``BiometricSample`` — see this module's docstring."""
+
+    __tablename__ = "biometric_processing_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    biometric_sample_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("biometric_samples.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # The user whose action queued this job (the bulk-enrollment admin, or
+    # the sample's uploader for a job the worker queued itself); recorded
+    # as the audit actor when the job's outcome is persisted.
+    requested_by_user_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False
+    )
+    # Groups the jobs queued by one bulk enrollment, for progress reporting.
+    batch_id: Mapped[uuid.UUID | None] = mapped_column(PGUUID(as_uuid=True), nullable=True)
+    request_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    status: Mapped[ProcessingJobStatus] = mapped_column(
+        sa.Enum(
+            ProcessingJobStatus,
+            name="biometric_processing_job_status",
+            native_enum=True,
+            validate_strings=True,
+            values_callable=_enum_values,
+        ),
+        nullable=False,
+        default=ProcessingJobStatus.QUEUED,
+    )
+    attempt_count: Mapped[int] = mapped_column(Integer(), nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer(), nullable=False)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+    )
+    # Opaque worker identifier (host and pid) — never a path.
+    locked_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # One of processing_service's reason codes, or a job-level code
+    # (processing_jobs); never raw exception text.
+    last_reason_code: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=sa.func.now(),
+        onupdate=sa.func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        sa.Index("ix_biometric_processing_jobs_biometric_sample_id", "biometric_sample_id"),
+        sa.Index("ix_biometric_processing_jobs_requested_by_user_id", "requested_by_user_id"),
+        sa.Index("ix_biometric_processing_jobs_batch_id", "batch_id"),
+        # The claim query's scan: due queued jobs and expired running ones.
+        sa.Index("ix_biometric_processing_jobs_status_available_at", "status", "available_at"),
+        sa.Index(
+            "uq_biometric_processing_jobs_sample_open",
+            "biometric_sample_id",
+            unique=True,
+            postgresql_where=sa.text("status IN ('queued', 'running')"),
+        ),
+        sa.CheckConstraint("attempt_count >= 0", name="attempt_count_non_negative"),
+        sa.CheckConstraint("max_attempts > 0", name="max_attempts_positive"),
+        sa.CheckConstraint(
+            "(status = 'running') = (lease_expires_at IS NOT NULL)",
+            name="lease_matches_status",
+        ),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return (
+            f"BiometricProcessingJob(id={self.id!r}, "
+            f"biometric_sample_id={self.biometric_sample_id!r}, status={self.status!r}, "
+            f"attempt_count={self.attempt_count!r})"
+        )
+
+
+__all__ = [
+    "OPEN_PROCESSING_JOB_STATUSES",
+    "BiometricEmbedding",
+    "BiometricProcessingJob",
+    "ProcessingJobStatus",
+    "RecognitionAttendanceAttempt",
+]
@@ -18,43 +18,246 @@ face" policy applies equally to a probe image — Stage 3 brief
 instruction 3 does not distinguish the two), plus whatever
 ``FaceDetectionFailedError``/``FaceLandmarksUnavailableError``/
 ``FaceAlignmentFailedError``/``FaceEmbeddingFailedError`` the
-individual stages raise.
+individual stages raise. Between alignment and embedding, the aligned
+chip must pass ``app.modules.face_recognition.quality``'s configured
+floors or ``FaceImageQualityTooLowError`` is raised without running the
+embedder.
+
+``detect_align_embed_all`` is the group-photo counterpart: no
+"exactly one face" policy, tiled detection (see
+``app.modules.face_recognition.tiling``), and every face aligned before
+all of them are embedded in one ``FaceEmbedder.embed_many`` call. A
+face that cannot be aligned or embedded is skipped rather than failing
+the whole photo; if *every* face fails to embed, the first embedding
+error propagates, since that is a provider problem, not a property of
+one face. An unloadable model propagates straight from ``embed_many``.
+
+``detect_and_align`` and ``embed_aligned_faces`` split
+``detect_align_embed`` in two, for a caller that aligns one face from
+each of many images and then embeds them all together (see
+``SampleProcessingService.process_pending_batch``).
+
+Both single-face entry points accept an optional ``detection_image``: a
+reduced-resolution copy of ``image`` to run the detector on (see
+``app.modules.face_recognition.detection_scaling``). Detections are
+mapped back to ``image`` and alignment always reads ``image`` itself.
+
+Every entry point takes an ``ImageFrame`` (what decoding produces) or a
+``DecodedImage`` (wrapped as a frame without copying, see
+``app.modules.face_recognition.image_codec``). From there the same
+pixel buffer is what the detector, the tiler and alignment all read.
+
+Each stage's duration goes to ``app.modules.face_recognition.metrics``
+(``detect``, ``align``, ``quality``, ``embed``), and a single-face image
+rejected by a typed error is counted by its code there.
 """
 
 from __future__ import annotations
 
+import time
+from collections.abc import Sequence
+
+import structlog
+
 from app.core.config import Settings
 from app.modules.face_recognition.alignment import align_face
+from app.modules.face_recognition.detection_scaling import detect_faces
 from app.modules.face_recognition.domain import (
     DecodedImage,
     EmbeddingVector,
+    NormalizedFaceInput,
     validate_embedding_dimension,
 )
 from app.modules.face_recognition.errors import (
     EnrollmentSampleMultipleFacesDetectedError,
     EnrollmentSampleNoFaceDetectedError,
+    FaceAlignmentFailedError,
+    FaceLandmarksUnavailableError,
+    FaceRecognitionError,
+    RecognitionAttendanceGroupPhotoNoFaceError,
+    RecognitionAttendanceGroupPhotoTooManyFacesError,
+)
+from app.modules.face_recognition.image_codec import ImageFrame, as_frame
+from app.modules.face_recognition.metrics import (
+    DETECTOR_PROVIDER,
+    EMBEDDER_PROVIDER,
+    STAGE_ALIGN,
+    STAGE_DETECT,
+    STAGE_EMBED,
+    STAGE_EMBED_BATCH,
+    STAGE_QUALITY,
+    count_rejection,
+    detector_model,
+    embedder_model,
+    embedder_model_version,
+    observe_stage,
 )
 from app.modules.face_recognition.provider_factory import get_detector, get_embedder
+from app.modules.face_recognition.quality import check_face_quality
+from app.modules.face_recognition.tiling import detect_faces_tiled
+
+logger = structlog.get_logger(__name__)
 
 
-def detect_align_embed(image: DecodedImage, *, settings: Settings) -> EmbeddingVector:
+def detect_align_embed(
+    image: DecodedImage | ImageFrame,
+    *,
+    settings: Settings,
+    detection_image: DecodedImage | ImageFrame | None = None,
+) -> EmbeddingVector:
     """Run the full detect -> align -> embed pipeline against one decoded image.
 
     Requires exactly one detected face — zero or multiple both raise
     (see this module's docstring) rather than picking one.
     """
+    normalized_face = detect_and_align(image, settings=settings, detection_image=detection_image)
+
+    embedder = get_embedder(settings)
+    started = time.perf_counter()
+    try:
+        embedding = embedder.embed(normalized_face)
+        embedding = validate_embedding_dimension(
+            embedding, expected_dimension=settings.FACE_EMBEDDING_DIMENSION
+        )
+    except FaceRecognitionError as exc:
+        count_rejection(exc.code)
+        raise
+    observe_stage(
+        STAGE_EMBED,
+        time.perf_counter() - started,
+        provider=EMBEDDER_PROVIDER,
+        model=embedder_model(settings),
+        model_version=embedder_model_version(settings),
+    )
+    return embedding
+
+
+def detect_and_align(
+    image: DecodedImage | ImageFrame,
+    *,
+    settings: Settings,
+    detection_image: DecodedImage | ImageFrame | None = None,
+) -> NormalizedFaceInput:
+    """Detect exactly one face in ``image`` and return its aligned chip,
+    once it has passed the quality gate (``quality.check_face_quality``)."""
+    frame = as_frame(image)
+    detector = get_detector(settings)
+    try:
+        started = time.perf_counter()
+        faces = detect_faces(
+            detector,
+            frame,
+            detection_image=as_frame(detection_image) if detection_image is not None else None,
+        )
+        detected = time.perf_counter()
+        observe_stage(
+            STAGE_DETECT,
+            detected - started,
+            provider=DETECTOR_PROVIDER,
+            model=detector_model(settings),
+        )
+
+        if len(faces) == 0:
+            raise EnrollmentSampleNoFaceDetectedError()
+        if len(faces) > 1:
+            raise EnrollmentSampleMultipleFacesDetectedError()
+
+        normalized_face = align_face(frame, faces[0])
+        aligned = time.perf_counter()
+        observe_stage(STAGE_ALIGN, aligned - detected)
+        check_face_quality(normalized_face, faces[0], settings=settings)
+        observe_stage(STAGE_QUALITY, time.perf_counter() - aligned)
+    except FaceRecognitionError as exc:
+        count_rejection(exc.code)
+        raise
+    return normalized_face
+
+
+def detect_align_embed_all(
+    image: DecodedImage | ImageFrame, *, settings: Settings
+) -> list[EmbeddingVector]:
+    """Embed every usable face in a group photo, in reading order.
+
+    Raises ``RecognitionAttendanceGroupPhotoTooManyFacesError`` when
+    detection finds more than ``Settings.FACE_GROUP_MAX_FACES`` faces
+    (before any alignment work), and
+    ``RecognitionAttendanceGroupPhotoNoFaceError`` when no face survives
+    alignment.
+    """
+    frame = as_frame(image)
     detector = get_detector(settings)
-    faces = detector.detect(image)
+    started = time.perf_counter()
+    faces = detect_faces_tiled(detector, frame, tile_size_px=settings.FACE_GROUP_TILE_SIZE_PX)
+    observe_stage(
+        STAGE_DETECT,
+        time.perf_counter() - started,
+        provider=DETECTOR_PROVIDER,
+        model=detector_model(settings),
+    )
+    if len(faces) > settings.FACE_GROUP_MAX_FACES:
+        raise RecognitionAttendanceGroupPhotoTooManyFacesError(settings.FACE_GROUP_MAX_FACES)
 
-    if len(faces) == 0:
-        raise EnrollmentSampleNoFaceDetectedError()
-    if len(faces) > 1:
-        raise EnrollmentSampleMultipleFacesDetectedError()
+    normalized_faces = []
+    for face in faces:
+        started = time.perf_counter()
+        try:
+            normalized_faces.append(align_face(frame, face))
+        except (FaceLandmarksUnavailableError, FaceAlignmentFailedError):
+            continue
+        observe_stage(STAGE_ALIGN, time.perf_counter() - started)
+    if not normalized_faces:
+        raise RecognitionAttendanceGroupPhotoNoFaceError()
 
-    normalized_face = align_face(image, faces[0])
+    embeddings: list[EmbeddingVector] = []
+    errors: list[FaceRecognitionError] = []
+    for result in embed_aligned_faces(normalized_faces, settings=settings):
+        if isinstance(result, FaceRecognitionError):
+            errors.append(result)
+        else:
+            embeddings.append(result)
+    if not embeddings:
+        raise errors[0]
+    if len(embeddings) < len(faces):
+        logger.info(
+            "group_photo_faces_skipped",
+            detected_count=len(faces),
+            skipped_count=len(faces) - len(embeddings),
+        )
+    return embeddings
 
+
+def embed_aligned_faces(
+    faces: Sequence[NormalizedFaceInput], *, settings: Settings
+) -> list[EmbeddingVector | FaceRecognitionError]:
+    """``FaceEmbedder.embed_many`` over ``faces``, each success dimension-checked.
+
+    One entry per face, in order — an embedding, or the typed error for
+    that face alone. ``FaceProviderUnavailableError`` (and the model
+    artifact errors) still raise for the whole call.
+    """
+    if not faces:
+        return []
     embedder = get_embedder(settings)
-    embedding = embedder.embed(normalized_face)
-    return validate_embedding_dimension(
-        embedding, expected_dimension=settings.FACE_EMBEDDING_DIMENSION
+    started = time.perf_counter()
+    embedded = embedder.embed_many(faces)
+    observe_stage(
+        STAGE_EMBED_BATCH,
+        time.perf_counter() - started,
+        provider=EMBEDDER_PROVIDER,
+        model=embedder_model(settings),
+        model_version=embedder_model_version(settings),
     )
+    results: list[EmbeddingVector | FaceRecognitionError] = []
+    for result in embedded:
+        if isinstance(result, FaceRecognitionError):
+            results.append(result)
+            continue
+        try:
+            results.append(
+                validate_embedding_dimension(
+                    result, expected_dimension=settings.FACE_EMBEDDING_DIMENSION
+                )
+            )
+        except FaceRecognitionError as exc:
+            results.append(exc)
+    return results
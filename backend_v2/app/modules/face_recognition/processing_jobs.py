@@ -0,0 +1,423 @@
+"""Durable, Postgres-backed queue for enrollment-sample processing.
+
+``SampleProcessingService.process_pending_batch`` is one bounded,
+on-demand HTTP call: an admin draining a large bulk enrollment would
+need dozens of them, each holding a request open for a whole batch of
+inference. This module is the always-running alternative. Jobs live in
+``biometric_processing_jobs`` (see
+``app.modules.face_recognition.models.BiometricProcessingJob``) and are
+drained by ``python -m scripts.processing_worker``, any number of which
+may run at once, on any number of hosts.
+
+**Where jobs come from.** ``BulkEnrollmentService`` queues one job per
+enrolled sample when a ZIP enrollment finishes, tagged with a
+``batch_id`` the admin can poll for progress
+(``GET /face-recognition/processing-jobs/summary``). Every worker cycle
+also queues any ``ACTIVE`` sample still ``PENDING_PROCESSING`` that has
+no open job — single uploads, and bulk samples whose enqueue failed —
+with the sample's uploader as the requester.
+
+**Claiming.** ``BiometricProcessingJobRepository.claim`` takes up to
+``Settings.FACE_PROCESSING_BATCH_LIMIT`` due jobs with ``SELECT ... FOR
+UPDATE SKIP LOCKED`` and commits them as ``running`` under a lease of
+``Settings.FACE_PROCESSING_JOB_LEASE_SECONDS``. Concurrent workers
+therefore take disjoint jobs without blocking one another, and no
+database transaction stays open during inference. A worker that dies
+mid-batch simply never settles its jobs; once their leases expire, the
+next claim picks them up again.
+
+**Settling.** Inference runs exactly as ``process_pending_batch`` runs
+it (``SampleProcessingService.embed_samples``, so
+``FACE_PROCESSING_WORKERS`` applies here too). Each job is then settled
+in its own transaction that first re-reads the job row ``FOR UPDATE``
+and checks that this worker still holds the lease it claimed; a worker
+whose lease ran out (and whose job another worker re-claimed) discards
+its result. The job's new status is flushed into the same transaction
+``SampleProcessingService.record_outcome`` commits, so a job is marked
+``succeeded`` or ``failed`` if and only if its sample's outcome and
+audit entry are persisted.
+
+**Retries.** Only transient failures are retried: the models being
+unavailable, and unexpected errors. The sample stays
+``PENDING_PROCESSING`` while the job waits
+``FACE_PROCESSING_JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1)``
+(capped at one hour). A failure that would recur on every attempt (no
+face, several faces, an undecodable or missing file) fails the sample
+at once, as ``process_pending_batch`` does. A job that reaches
+``FACE_PROCESSING_JOB_MAX_ATTEMPTS`` fails its sample with its last
+reason code; a job whose lease expired on its final attempt fails it
+with ``REASON_UNEXPECTED``. A sample that stopped being eligible before
+its job ran (deleted, replaced, or processed through the admin routes)
+cancels the job, whether it is noticed at claim time or, with the
+sample's row locked, when the job settles: the admin
+``/samples/process-pending`` route skips samples with an open job but
+may still pick one up just before its job is queued, and whichever
+settles first keeps the sample's outcome.
+
+**Gallery cache.** Embeddings written here invalidate the worker
+process's own candidate-gallery cache only
+(``app.modules.face_recognition.gallery_cache`` is per-process). An API
+process keeps matching against its cached gallery for a scope for up to
+``FACE_GALLERY_CACHE_TTL_SECONDS`` after the worker commits, so a newly
+processed student can be reported ``UNKNOWN`` until then. Lower that
+TTL if this staleness matters during bulk onboarding.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings, get_settings
+from app.db.transaction import service_transaction
+from app.modules.biometric_enrollment.models import (
+    BiometricSample,
+    RecognitionProcessingState,
+    SampleStatus,
+)
+from app.modules.biometric_enrollment.repository import BiometricSampleRepository
+from app.modules.biometric_enrollment.storage import PrivateBiometricStorage
+from app.modules.face_recognition.domain import EmbeddingVector
+from app.modules.face_recognition.models import BiometricProcessingJob, ProcessingJobStatus
+from app.modules.face_recognition.processing_pool import SampleOutcome
+from app.modules.face_recognition.processing_service import (
+    ACTION_SAMPLE_PROCESS,
+    REASON_PROVIDER_UNAVAILABLE,
+    REASON_UNEXPECTED,
+    SampleProcessingService,
+    reason_code_for_error,
+)
+from app.modules.face_recognition.repository import BiometricProcessingJobRepository
+
+logger = structlog.get_logger(__name__)
+
+# Job-level reason codes, alongside processing_service's sample-level ones.
+JOB_REASON_SAMPLE_NOT_ELIGIBLE = "sample_not_eligible"
+JOB_REASON_LEASE_EXPIRED = "lease_expired"
+
+# Reason codes worth another attempt: the models may be back, and an
+# unexpected error may not recur. Every other code describes the image.
+TRANSIENT_REASON_CODES = frozenset({REASON_PROVIDER_UNAVAILABLE, REASON_UNEXPECTED})
+
+_MAX_RETRY_DELAY = timedelta(hours=1)
+
+
+@dataclass(frozen=True)
+class JobRunResult:
+    """How one claimed job was settled — never carries embedding values."""
+
+    job_id: uuid.UUID
+    sample_id: uuid.UUID
+    status: ProcessingJobStatus
+    attempt: int
+    reason_code: str | None = None
+
+
+@dataclass(frozen=True)
+class ProcessingJobSummary:
+    """Job counts by status, for all jobs or one bulk-enrollment batch."""
+
+    batch_id: uuid.UUID | None
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    cancelled: int
+
+    @property
+    def total(self) -> int:
+        return self.queued + self.running + self.succeeded + self.failed + self.cancelled
+
+    @property
+    def finished(self) -> int:
+        return self.succeeded + self.failed + self.cancelled
+
+
+def retry_delay(*, attempt: int, base_seconds: int) -> timedelta:
+    """Exponential backoff after failed attempt number ``attempt`` (1-based)."""
+    return min(timedelta(seconds=base_seconds * 2 ** (attempt - 1)), _MAX_RETRY_DELAY)
+
+
+class ProcessingJobService:
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        settings: Settings | None = None,
+        storage: PrivateBiometricStorage | None = None,
+    ) -> None:
+        self._session = session
+        self._settings = settings or get_settings()
+        self._jobs = BiometricProcessingJobRepository(session)
+        self._samples = BiometricSampleRepository(session)
+        self._processing = SampleProcessingService(
+            session, settings=self._settings, storage=storage
+        )
+
+    async def enqueue_unqueued_pending(self) -> int:
+        """Queue a job for every eligible sample without one (bounded per call)."""
+        limit = self._settings.FACE_PROCESSING_BATCH_LIMIT
+        async with service_transaction(self._session):
+            entries = await self._jobs.list_unqueued_pending_samples(limit=limit)
+            queued = await self._jobs.enqueue(
+                entries, max_attempts=self._settings.FACE_PROCESSING_JOB_MAX_ATTEMPTS
+            )
+        if queued:
+            logger.info("face_recognition_processing_jobs_enqueued", job_count=len(queued))
+        return len(queued)
+
+    async def run_once(self, *, worker_id: str) -> list[JobRunResult]:
+        """One worker cycle: queue stragglers, claim a batch, process and settle it.
+
+        Returns one result per claimed job this worker still held at
+        settle time (an empty list means there was nothing due).
+        """
+        await self.enqueue_unqueued_pending()
+
+        now = _utcnow()
+        async with service_transaction(self._session):
+            jobs = await self._jobs.claim(
+                worker_id=worker_id,
+                now=now,
+                lease=timedelta(seconds=self._settings.FACE_PROCESSING_JOB_LEASE_SECONDS),
+                limit=self._settings.FACE_PROCESSING_BATCH_LIMIT,
+            )
+        if not jobs:
+            return []
+        # Snapshotted now: settling re-reads each row in place.
+        claimed_attempts = {job.id: job.attempt_count for job in jobs}
+
+        results: list[JobRunResult] = []
+        runnable: list[tuple[BiometricProcessingJob, BiometricSample]] = []
+        for job in jobs:
+            sample = await self._samples.get_by_id(job.biometric_sample_id)
+            if sample is None or not _is_eligible(sample):
+                result = await self._settle_without_running(
+                    job,
+                    sample,
+                    worker_id=worker_id,
+                    attempt=claimed_attempts[job.id],
+                    status=ProcessingJobStatus.CANCELLED,
+                    reason_code=JOB_REASON_SAMPLE_NOT_ELIGIBLE,
+                )
+            elif job.attempt_count > job.max_attempts:
+                # Claimed again only because its final attempt's lease expired.
+                result = await self._settle_without_running(
+                    job,
+                    sample,
+                    worker_id=worker_id,
+                    attempt=claimed_attempts[job.id],
+                    status=ProcessingJobStatus.FAILED,
+                    reason_code=JOB_REASON_LEASE_EXPIRED,
+                )
+            else:
+                runnable.append((job, sample))
+                continue
+            if result is not None:
+                results.append(result)
+
+        if not runnable:
+            return results
+
+        async with service_transaction(self._session):
+            started_at = _utcnow()
+            for _, sample in runnable:
+                await self._samples.mark_processing_started(sample, started_at=started_at)
+        outcomes = await self._processing.embed_samples([sample for _, sample in runnable])
+
+        model_checksum = (
+            self._processing.embedder_checksum()
+            if any(isinstance(outcome, EmbeddingVector) for outcome in outcomes)
+            else None
+        )
+        for (job, sample), outcome in zip(runnable, outcomes, strict=True):
+            result = await self._settle(
+                job,
+                sample,
+                outcome,
+                worker_id=worker_id,
+                attempt=claimed_attempts[job.id],
+                model_checksum=model_checksum,
+            )
+            if result is not None:
+                results.append(result)
+        return results
+
+    async def summarize(self, *, batch_id: uuid.UUID | None = None) -> ProcessingJobSummary:
+        counts = await self._jobs.count_by_status(batch_id=batch_id)
+        return ProcessingJobSummary(
+            batch_id=batch_id,
+            queued=counts.get(ProcessingJobStatus.QUEUED, 0),
+            running=counts.get(ProcessingJobStatus.RUNNING, 0),
+            succeeded=counts.get(ProcessingJobStatus.SUCCEEDED, 0),
+            failed=counts.get(ProcessingJobStatus.FAILED, 0),
+            cancelled=counts.get(ProcessingJobStatus.CANCELLED, 0),
+        )
+
+    # --- settling ------------------------------------------------------
+
+    async def _settle(
+        self,
+        job: BiometricProcessingJob,
+        sample: BiometricSample,
+        outcome: SampleOutcome,
+        *,
+        worker_id: str,
+        attempt: int,
+        model_checksum: str | None,
+    ) -> JobRunResult | None:
+        if not await self._lock_if_still_held(job, worker_id=worker_id, attempt=attempt):
+            return None
+        locked = await self._samples.get_by_id(sample.id, for_update=True)
+        if locked is None or not _is_eligible(locked):
+            # Settled during inference outside this job (process-pending,
+            # or deleted); its outcome stands and ours is discarded.
+            return await self._settle_without_running(
+                job,
+                locked,
+                worker_id=worker_id,
+                attempt=attempt,
+                status=ProcessingJobStatus.CANCELLED,
+                reason_code=JOB_REASON_SAMPLE_NOT_ELIGIBLE,
+            )
+        sample = locked
+
+        now = _utcnow()
+        if isinstance(outcome, EmbeddingVector):
+            await self._jobs.complete(job, status=ProcessingJobStatus.SUCCEEDED, completed_at=now)
+        else:
+            reason_code = reason_code_for_error(outcome.error_type)
+            if reason_code in TRANSIENT_REASON_CODES and attempt < job.max_attempts:
+                async with service_transaction(self._session):
+                    await self._jobs.schedule_retry(
+                        job,
+                        available_at=now
+                        + retry_delay(
+                            attempt=attempt,
+                            base_seconds=self._settings.FACE_PROCESSING_JOB_RETRY_BASE_SECONDS,
+                        ),
+                        reason_code=reason_code,
+                    )
+                logger.warning(
+                    "face_recognition_processing_job_retry_scheduled",
+                    job_id=str(job.id),
+                    attempt=attempt,
+                    reason_code=reason_code,
+                )
+                return JobRunResult(
+                    job_id=job.id,
+                    sample_id=sample.id,
+                    status=ProcessingJobStatus.QUEUED,
+                    attempt=attempt,
+                    reason_code=reason_code,
+                )
+            await self._jobs.complete(
+                job, status=ProcessingJobStatus.FAILED, completed_at=now, reason_code=reason_code
+            )
+
+        # Commits the job's flushed status together with the outcome.
+        processed = await self._processing.record_outcome(
+            sample,
+            outcome,
+            actor_user_id=job.requested_by_user_id,
+            request_id=job.request_id,
+            action=ACTION_SAMPLE_PROCESS,
+            model_checksum=model_checksum,
+        )
+        return JobRunResult(
+            job_id=job.id,
+            sample_id=sample.id,
+            status=job.status,
+            attempt=attempt,
+            reason_code=processed.reason_code,
+        )
+
+    async def _settle_without_running(
+        self,
+        job: BiometricProcessingJob,
+        sample: BiometricSample | None,
+        *,
+        worker_id: str,
+        attempt: int,
+        status: ProcessingJobStatus,
+        reason_code: str,
+    ) -> JobRunResult | None:
+        if not await self._lock_if_still_held(job, worker_id=worker_id, attempt=attempt):
+            return None
+        await self._jobs.complete(
+            job, status=status, completed_at=_utcnow(), reason_code=reason_code
+        )
+        if status is ProcessingJobStatus.FAILED and sample is not None:
+            await self._processing.record_failure(
+                sample,
+                actor_user_id=job.requested_by_user_id,
+                request_id=job.request_id,
+                action=ACTION_SAMPLE_PROCESS,
+                reason_code=REASON_UNEXPECTED,
+            )
+        else:
+            await self._session.commit()
+        logger.warning(
+            "face_recognition_processing_job_settled_without_running",
+            job_id=str(job.id),
+            status=status.value,
+            reason_code=reason_code,
+        )
+        return JobRunResult(
+            job_id=job.id,
+            sample_id=job.biometric_sample_id,
+            status=status,
+            attempt=attempt,
+            reason_code=reason_code,
+        )
+
+    async def _lock_if_still_held(
+        self, job: BiometricProcessingJob, *, worker_id: str, attempt: int
+    ) -> bool:
+        """Lock ``job``'s row and confirm this worker's claim is still current.
+
+        On ``False`` the lock is already released and the result must be
+        discarded: the lease expired and another worker re-claimed the
+        job. Released by committing the (write-free) transaction rather
+        than rolling it back, which would expire every object this cycle
+        still holds.
+        """
+        current = await self._jobs.get_for_update(job.id)
+        if (
+            current is not None
+            and current.status is ProcessingJobStatus.RUNNING
+            and current.locked_by == worker_id
+            and current.attempt_count == attempt
+        ):
+            return True
+        await self._session.commit()
+        logger.warning(
+            "face_recognition_processing_job_lease_lost", job_id=str(job.id), attempt=attempt
+        )
+        return False
+
+
+def _is_eligible(sample: BiometricSample) -> bool:
+    return (
+        sample.status is SampleStatus.ACTIVE
+        and sample.processing_state is RecognitionProcessingState.PENDING_PROCESSING
+    )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+__all__ = [
+    "JOB_REASON_LEASE_EXPIRED",
+    "JOB_REASON_SAMPLE_NOT_ELIGIBLE",
+    "TRANSIENT_REASON_CODES",
+    "JobRunResult",
+    "ProcessingJobService",
+    "ProcessingJobSummary",
+    "retry_delay",
+]
@@ -0,0 +1,261 @@
+"""Decode -> detect -> align -> embed for a batch of stored samples, in-process or
+across a pool of worker processes.
+
+``SampleProcessingService.process_pending_batch`` hands this module the
+resolved storage paths of a batch's samples and gets back one
+``SampleOutcome`` per sample, in order. Everything here is pure,
+synchronous inference work; the service keeps every database write
+(the ``processing_state`` transitions, the embedding rows, the audit
+entries) in the parent process.
+
+**Why processes.** The provider adapters serialize inference on their
+cached instances (``YuNetFaceDetector._lock``/
+``DlibResnetFaceEmbedder._lock``), so a thread pool in one process
+still runs one sample at a time. With ``Settings.FACE_PROCESSING_WORKERS``
+set to ``N >= 1``, ``embed_sample_files_in_pool`` splits the batch into
+chunks and runs them on ``N`` ``spawn``-started worker processes. Each
+worker receives the parent's ``Settings`` once, in
+``initialize_worker``, and reuses that one object for every chunk, so
+``provider_factory``'s per-``Settings`` cache gives each worker exactly
+one detector and one embedder. Each model is therefore loaded once per
+worker, not once per chunk. ``spawn`` rather than ``fork``: the parent
+is an asyncio server with live threads and open database connections,
+none of which a forked child could safely inherit.
+
+**What crosses the process boundary.** Only paths, ``Settings``,
+``EmbeddingVector`` values and ``SampleFailure`` records. The typed
+``FaceRecognitionError`` subclasses build their own message in
+``__init__`` and reject the positional arguments unpickling replays, so
+a failure travels as its exception *type* — all the service needs to
+pick a reason code.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import multiprocessing
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+
+import structlog
+from PIL import Image, UnidentifiedImageError
+
+from app.core.config import Settings
+from app.modules.face_recognition.detection_scaling import build_detection_image
+from app.modules.face_recognition.domain import EmbeddingVector, NormalizedFaceInput
+from app.modules.face_recognition.errors import (
+    SampleImageDecodeFailedError,
+    SampleStorageFileMissingError,
+)
+from app.modules.face_recognition.image_codec import ImageFrame, pil_image_to_frame
+from app.modules.face_recognition.metrics import STAGE_DECODE, observe_stage
+from app.modules.face_recognition.pipeline import detect_and_align, embed_aligned_faces
+
+logger = structlog.get_logger(__name__)
+
+# More chunks than workers, so one slow chunk (large images, many
+# decode failures) does not leave the other workers idle at the end.
+_CHUNKS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class SampleFailure:
+    """Why one sample's pipeline stopped — see this module's docstring."""
+
+    error_type: type[Exception]
+
+
+SampleOutcome = EmbeddingVector | SampleFailure
+
+
+def decode_sample_file(path: Path) -> ImageFrame:
+    """Read and decode one stored sample image (see ``image_codec.pil_image_to_frame``)."""
+    return _decode_sample_bytes(_read_sample_file(path))
+
+
+def decode_sample_file_for_detection(
+    path: Path, *, settings: Settings
+) -> tuple[ImageFrame, ImageFrame | None]:
+    """``decode_sample_file`` plus the reduced-resolution detection image,
+    if ``Settings.FACE_DETECTOR_WORKING_SIZE_FACTOR`` calls for one (see
+    ``detection_scaling.build_detection_image``), downsampled from the one
+    full decode."""
+    started = time.perf_counter()
+    image = decode_sample_file(path)
+    detection_image = build_detection_image(image, settings=settings)
+    observe_stage(STAGE_DECODE, time.perf_counter() - started)
+    return image, detection_image
+
+
+def _read_sample_file(path: Path) -> bytes:
+    try:
+        return path.read_bytes()
+    except OSError as exc:
+        raise SampleImageDecodeFailedError() from exc
+
+
+def _decode_sample_bytes(data: bytes) -> ImageFrame:
+    try:
+        with Image.open(BytesIO(data)) as image:
+            return pil_image_to_frame(image)
+    except (UnidentifiedImageError, OSError, ValueError) as exc:
+        raise SampleImageDecodeFailedError() from exc
+
+
+def embed_sample_files(paths: Sequence[Path | None], *, settings: Settings) -> list[SampleOutcome]:
+    """One outcome per path, in order; ``None`` means the file is missing.
+
+    Each image is decoded, detected and aligned in turn, keeping only its
+    150x150 chip. All chips then go through one
+    ``FaceEmbedder.embed_many`` call.
+    """
+    outcomes: list[SampleOutcome | None] = []
+    aligned_faces: list[NormalizedFaceInput] = []
+    aligned_slots: list[int] = []
+    for path in paths:
+        try:
+            if path is None:
+                raise SampleStorageFileMissingError()
+            image, detection_image = decode_sample_file_for_detection(path, settings=settings)
+            aligned_faces.append(
+                detect_and_align(image, settings=settings, detection_image=detection_image)
+            )
+        except Exception as exc:
+            outcomes.append(SampleFailure(type(exc)))
+            continue
+        aligned_slots.append(len(outcomes))
+        outcomes.append(None)
+
+    embedded: Sequence[SampleOutcome]
+    try:
+        embedded = [
+            SampleFailure(type(result)) if isinstance(result, Exception) else result
+            for result in embed_aligned_faces(aligned_faces, settings=settings)
+        ]
+    except Exception as exc:
+        embedded = [SampleFailure(type(exc))] * len(aligned_faces)
+    for slot, outcome in zip(aligned_slots, embedded, strict=True):
+        outcomes[slot] = outcome
+
+    return [outcome for outcome in outcomes if outcome is not None]
+
+
+# --- worker processes ------------------------------------------------
+
+_worker_settings: Settings | None = None
+
+
+def initialize_worker(settings: Settings) -> None:
+    """Pool initializer: runs once in each worker process."""
+    global _worker_settings
+    _worker_settings = settings
+
+
+def _embed_chunk_in_worker(paths: list[Path | None]) -> list[SampleOutcome]:
+    if _worker_settings is None:  # pragma: no cover - initializer always runs first
+        raise RuntimeError("processing pool worker was not initialized")
+    return embed_sample_files(paths, settings=_worker_settings)
+
+
+def create_processing_pool(settings: Settings, *, workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initialize_worker,
+        initargs=(settings,),
+    )
+
+
+async def embed_sample_files_in_pool(
+    pool: ProcessPoolExecutor, paths: Sequence[Path | None], *, workers: int
+) -> list[SampleOutcome]:
+    """``embed_sample_files`` across ``pool``'s workers, same order and shape.
+
+    A chunk whose worker dies (``BrokenProcessPool``) or fails outside
+    ``embed_sample_files`` gets a ``SampleFailure`` for every sample in
+    it. The other chunks keep their results.
+    """
+    if not paths:
+        return []
+    chunk_size = max(1, math.ceil(len(paths) / (workers * _CHUNKS_PER_WORKER)))
+    chunks = [list(paths[start : start + chunk_size]) for start in range(0, len(paths), chunk_size)]
+    loop = asyncio.get_running_loop()
+    chunk_results = await asyncio.gather(
+        *(loop.run_in_executor(pool, _embed_chunk_in_worker, chunk) for chunk in chunks),
+        return_exceptions=True,
+    )
+
+    outcomes: list[SampleOutcome] = []
+    for chunk, result in zip(chunks, chunk_results, strict=True):
+        if isinstance(result, BaseException):
+            logger.error(
+                "face_recognition_processing_pool_chunk_failed",
+                exc_type=type(result).__name__,
+                chunk_size=len(chunk),
+            )
+            error_type = type(result) if isinstance(result, Exception) else RuntimeError
+            outcomes.extend(SampleFailure(error_type) for _ in chunk)
+        else:
+            outcomes.extend(result)
+    return outcomes
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_key: tuple[int, int] | None = None
+_pool_lock = threading.Lock()
+
+
+def get_processing_pool(settings: Settings) -> ProcessPoolExecutor:
+    """The shared pool for ``settings``, created on first use.
+
+    Keyed like ``provider_factory``'s caches (by ``id(settings)``), plus
+    the worker count. A pool that has lost a worker is replaced rather
+    than reused.
+    """
+    global _pool, _pool_key
+    key = (id(settings), settings.FACE_PROCESSING_WORKERS)
+    with _pool_lock:
+        if _pool is not None and (_pool_key != key or _is_broken(_pool)):
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = create_processing_pool(settings, workers=settings.FACE_PROCESSING_WORKERS)
+            _pool_key = key
+        return _pool
+
+
+def shutdown_processing_pool() -> None:
+    """Stops the shared pool's workers, if one was ever started (app shutdown)."""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        _pool_key = None
+
+
+def _is_broken(pool: ProcessPoolExecutor) -> bool:
+    # ``_broken`` is set by the executor itself once a worker dies; there
+    # is no public accessor, and submitting a probe task to find out
+    # would itself raise ``BrokenProcessPool``.
+    return bool(getattr(pool, "_broken", False))
+
+
+__all__ = [
+    "SampleFailure",
+    "SampleOutcome",
+    "create_processing_pool",
+    "decode_sample_file",
+    "decode_sample_file_for_detection",
+    "embed_sample_files",
+    "embed_sample_files_in_pool",
+    "get_processing_pool",
+    "initialize_worker",
+    "shutdown_processing_pool",
+]
@@ -8,7 +8,10 @@ face -> align -> embed -> persist -> transition
 ``app.modules.face_recognition.provider_factory``, and
 ``app.modules.face_recognition.repository.BiometricEmbeddingRepository``'s
 write methods — every other Stage 3 module either implements a stage
-of this pipeline or reads its results, never re-implements it.
+of this pipeline or reads its results, never re-implements it. (The one
+later exception is ``app.modules.face_recognition.reembedding``, which
+reuses ``embed_samples`` to move already-processed samples to a new
+embedding model.)
 
 **Reuses Phase 2-4/Stage 2 patterns directly** (matching
 ``app.modules.biometric_enrollment.service``'s own stated approach):
@@ -45,16 +48,12 @@ or was never started — it must succeed on its own even though the
 
 from __future__ import annotations
 
-import asyncio
 import uuid
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from io import BytesIO
 from pathlib import Path
 
-import numpy as np
 import structlog
-from PIL import Image, UnidentifiedImageError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import Settings, get_settings
@@ -69,13 +68,19 @@ from app.modules.biometric_enrollment.models import (
 )
 from app.modules.biometric_enrollment.repository import BiometricSampleRepository
 from app.modules.biometric_enrollment.storage import PrivateBiometricStorage
-from app.modules.face_recognition.domain import DecodedImage, EmbeddingVector
+from app.modules.face_recognition.domain import EmbeddingVector
+from app.modules.face_recognition.embedding_cache import (
+    embedding_cache_key,
+    fill_after_commit,
+    get_embedding_cache,
+)
 from app.modules.face_recognition.errors import (
     EnrollmentSampleMultipleFacesDetectedError,
     EnrollmentSampleNoFaceDetectedError,
     FaceAlignmentFailedError,
     FaceDetectionFailedError,
     FaceEmbeddingFailedError,
+    FaceImageQualityTooLowError,
     FaceLandmarksUnavailableError,
     FaceProviderUnavailableError,
     FaceRecognitionError,
@@ -85,11 +90,23 @@ from app.modules.face_recognition.errors import (
     SampleNotEligibleForProcessingError,
     SampleStorageFileMissingError,
 )
-from app.modules.face_recognition.image_codec import ndarray_to_decoded_image
-from app.modules.face_recognition.model_artifacts import compute_sha256
+from app.modules.face_recognition.image_codec import ImageFrame
+from app.modules.face_recognition.metrics import offload
+from app.modules.face_recognition.model_artifacts import cached_sha256
 from app.modules.face_recognition.pipeline import detect_align_embed
-from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
-from app.modules.face_recognition.repository import BiometricEmbeddingRepository
+from app.modules.face_recognition.processing_pool import (
+    SampleFailure,
+    SampleOutcome,
+    decode_sample_file_for_detection,
+    embed_sample_files,
+    embed_sample_files_in_pool,
+    get_processing_pool,
+)
+from app.modules.face_recognition.provider_factory import current_embedding_model
+from app.modules.face_recognition.repository import (
+    BiometricEmbeddingRepository,
+    BiometricProcessingJobRepository,
+)
 from app.modules.users.models import User
 
 logger = structlog.get_logger(__name__)
@@ -107,6 +124,7 @@ REASON_DETECTION_FAILED = "detection_failed"
 REASON_ZERO_FACES = "zero_faces_detected"
 REASON_MULTIPLE_FACES = "multiple_faces_detected"
 REASON_ALIGNMENT_FAILED = "alignment_failed"
+REASON_IMAGE_QUALITY_TOO_LOW = "image_quality_too_low"
 REASON_EMBEDDING_FAILED = "embedding_failed"
 REASON_UNEXPECTED = "unexpected_processing_error"
 
@@ -121,6 +139,7 @@ _REASON_CODES_BY_ERROR_TYPE: tuple[tuple[type[FaceRecognitionError], str], ...]
     (EnrollmentSampleMultipleFacesDetectedError, REASON_MULTIPLE_FACES),
     (FaceLandmarksUnavailableError, REASON_ALIGNMENT_FAILED),
     (FaceAlignmentFailedError, REASON_ALIGNMENT_FAILED),
+    (FaceImageQualityTooLowError, REASON_IMAGE_QUALITY_TOO_LOW),
     (FaceDetectionFailedError, REASON_DETECTION_FAILED),
     (FaceEmbeddingFailedError, REASON_EMBEDDING_FAILED),
     (FaceProviderUnavailableError, REASON_PROVIDER_UNAVAILABLE),
@@ -129,9 +148,11 @@ _REASON_CODES_BY_ERROR_TYPE: tuple[tuple[type[FaceRecognitionError], str], ...]
 )
 
 
-def _reason_code_for_error(exc: FaceRecognitionError) -> str:
+def reason_code_for_error(error_type: type[Exception]) -> str:
+    # By type, not instance: an outcome from a processing-pool worker
+    # carries only its exception's type (see processing_pool).
     for exc_type, reason in _REASON_CODES_BY_ERROR_TYPE:
-        if isinstance(exc, exc_type):
+        if issubclass(error_type, exc_type):
             return reason
     return REASON_UNEXPECTED
 
@@ -158,6 +179,7 @@ class SampleProcessingService:
         self._storage = storage or PrivateBiometricStorage(self._settings)
         self._samples = BiometricSampleRepository(session)
         self._embeddings = BiometricEmbeddingRepository(session)
+        self._jobs = BiometricProcessingJobRepository(session)
         self._audit_logs = AuditLogRepository(session)
 
     async def process_sample(
@@ -216,29 +238,125 @@ class SampleProcessingService:
         """Process up to ``limit`` (default/ceiling ``Settings.FACE_PROCESSING_BATCH_LIMIT``)
         samples still awaiting processing.
 
-        Not an always-running worker — one bounded, on-demand call. A
-        single sample's failure never stops the batch; every sample's
+        Not an always-running worker — one bounded, on-demand call (the
+        always-running worker is ``app.modules.face_recognition
+        .processing_jobs``). A single sample's failure never stops the batch; every sample's
         outcome (success or failure, with its own reason code) is
         collected and returned.
+
+        Inference runs in this process or, with
+        ``Settings.FACE_PROCESSING_WORKERS > 0``, across that many worker
+        processes (see ``app.modules.face_recognition.processing_pool``).
+        Either way, the aligned faces of the batch (or of each worker's
+        chunk) go through one ``FaceEmbedder.embed_many`` call, which
+        reports a bad face in its own slot instead of failing its
+        neighbours. Every sample is then persisted here, in its own
+        transaction, as in ``process_sample``.
+
+        Safe to run alongside the processing-job queue: samples with a
+        queued or running job are left to it, each selected sample is
+        locked and re-checked before it is marked started, and each
+        outcome is persisted only if the sample, locked again, is still
+        ``ACTIVE`` and ``PENDING_PROCESSING``. A sample settled meanwhile
+        (by a job enqueued after the selection, or a concurrent call)
+        keeps that result and is left out of the returned list.
         """
         ceiling = self._settings.FACE_PROCESSING_BATCH_LIMIT
         bounded_limit = min(limit, ceiling) if limit is not None else ceiling
-        pending = await self._samples.list_active_pending_processing(limit=bounded_limit)
+        async with service_transaction(self._session):
+            entries = await self._jobs.list_unqueued_pending_samples(limit=bounded_limit)
+            started_at = _utcnow()
+            pending: list[BiometricSample] = []
+            for sample_id, _ in entries:
+                sample = await self._lock_if_pending(sample_id)
+                if sample is not None:
+                    await self._samples.mark_processing_started(sample, started_at=started_at)
+                    pending.append(sample)
+        if not pending:
+            return []
+        outcomes = await self.embed_samples(pending)
+
+        model_checksum = (
+            self.embedder_checksum()
+            if any(isinstance(outcome, EmbeddingVector) for outcome in outcomes)
+            else None
+        )
         results: list[ProcessingResult] = []
-        for sample in pending:
-            result = await self._run_pipeline(
-                sample, actor=actor, request_id=request_id, action=ACTION_SAMPLE_PROCESS
+        for sample, outcome in zip(pending, outcomes, strict=True):
+            locked = await self._lock_if_pending(sample.id)
+            if locked is None:
+                # Settled meanwhile (e.g. a queue job enqueued after our
+                # selection); releases the lock without expiring the batch.
+                await self._session.commit()
+                logger.info(
+                    "face_recognition_processing_outcome_discarded", sample_id=str(sample.id)
+                )
+                continue
+            result = await self.record_outcome(
+                locked,
+                outcome,
+                actor_user_id=actor.id,
+                request_id=request_id,
+                action=ACTION_SAMPLE_PROCESS,
+                model_checksum=model_checksum,
             )
             results.append(result)
         return results
 
+    async def _lock_if_pending(self, sample_id: uuid.UUID) -> BiometricSample | None:
+        """Lock the sample's row and return it if it is still ``ACTIVE`` and
+        ``PENDING_PROCESSING``; ``None`` (lock still held) otherwise."""
+        sample = await self._samples.get_by_id(sample_id, for_update=True)
+        if (
+            sample is None
+            or sample.status is not SampleStatus.ACTIVE
+            or sample.processing_state is not RecognitionProcessingState.PENDING_PROCESSING
+        ):
+            return None
+        return sample
+
     # --- pipeline ------------------------------------------------------
 
+    async def embed_samples(self, samples: list[BiometricSample]) -> list[SampleOutcome]:
+        """Inference for a whole batch, off the event loop — see processing_pool.
+
+        Samples whose embedding is already cached (see
+        ``embedding_cache``) are answered from the cache; only the rest
+        are run. In-process (``FACE_PROCESSING_WORKERS == 0``) that is
+        one ``asyncio.to_thread`` hop (``metrics.offload``) for the batch (see
+        ``_run_pipeline`` for why inference never runs on the event
+        loop); otherwise the batch is spread over the shared worker pool.
+        Nothing is cached here: a new embedding is cached only once its
+        success is persisted (``_persist_success``).
+        """
+        paths = [
+            self._storage.active_path(sample.storage_key)
+            if self._storage.exists_active(sample.storage_key)
+            else None
+            for sample in samples
+        ]
+        cached = await offload(self._cached_embeddings, samples, paths)
+        misses = [index for index, embedding in enumerate(cached) if embedding is None]
+        outcomes: list[SampleOutcome | None] = list(cached)
+        if misses:
+            miss_paths = [paths[index] for index in misses]
+            workers = self._settings.FACE_PROCESSING_WORKERS
+            if workers == 0:
+                computed = await offload(embed_sample_files, miss_paths, settings=self._settings)
+            else:
+                computed = await embed_sample_files_in_pool(
+                    get_processing_pool(self._settings), miss_paths, workers=workers
+                )
+            for index, outcome in zip(misses, computed, strict=True):
+                outcomes[index] = outcome
+        return [outcome for outcome in outcomes if outcome is not None]
+
     async def _run_pipeline(
         self, sample: BiometricSample, *, actor: User, request_id: str | None, action: str
     ) -> ProcessingResult:
         await self._samples.mark_processing_started(sample, started_at=_utcnow())
 
+        outcome: SampleOutcome
         try:
             # Stage 3 correction (finding 3): image decode + detect ->
             # align -> embed is synchronous, CPU/IO-bound work (Pillow
@@ -249,73 +367,138 @@ class SampleProcessingService:
             # calls) so the image decode and the inference that
             # consumes it happen back-to-back on the same worker
             # thread, with no event-loop round trip in between.
-            embedding = await asyncio.to_thread(self._load_and_embed_sync, sample)
-        except FaceRecognitionError as exc:
-            reason_code = _reason_code_for_error(exc)
-            await self._persist_failure(
-                sample,
-                actor=actor,
-                request_id=request_id,
-                action=action,
-                reason_code=reason_code,
-            )
-            return ProcessingResult(sample_id=sample.id, succeeded=False, reason_code=reason_code)
-        except Exception:
-            logger.error("face_recognition_processing_unexpected_error", sample_id=str(sample.id))
-            await self._persist_failure(
+            outcome = await offload(self._load_and_embed_sync, sample)
+        except Exception as exc:
+            outcome = SampleFailure(type(exc))
+
+        model_checksum = self.embedder_checksum() if isinstance(outcome, EmbeddingVector) else None
+        return await self.record_outcome(
+            sample,
+            outcome,
+            actor_user_id=actor.id,
+            request_id=request_id,
+            action=action,
+            model_checksum=model_checksum,
+        )
+
+    async def record_outcome(
+        self,
+        sample: BiometricSample,
+        outcome: SampleOutcome,
+        *,
+        actor_user_id: uuid.UUID,
+        request_id: str | None,
+        action: str,
+        model_checksum: str | None,
+    ) -> ProcessingResult:
+        """Persist one sample's pipeline outcome and return its safe ``ProcessingResult``.
+
+        Commits. Anything the caller flushed beforehand in this session
+        (the processing-job queue flushes its job's new status) commits or
+        rolls back together with the outcome.
+        """
+        if isinstance(outcome, EmbeddingVector):
+            await self._persist_success(
                 sample,
-                actor=actor,
+                actor_user_id=actor_user_id,
                 request_id=request_id,
                 action=action,
-                reason_code=REASON_UNEXPECTED,
+                embedding=outcome,
+                model_checksum=model_checksum,
             )
-            return ProcessingResult(
-                sample_id=sample.id, succeeded=False, reason_code=REASON_UNEXPECTED
+            return ProcessingResult(sample_id=sample.id, succeeded=True)
+
+        reason_code = reason_code_for_error(outcome.error_type)
+        if reason_code == REASON_UNEXPECTED:
+            logger.error(
+                "face_recognition_processing_unexpected_error",
+                sample_id=str(sample.id),
+                exc_type=outcome.error_type.__name__,
             )
+        return await self.record_failure(
+            sample,
+            actor_user_id=actor_user_id,
+            request_id=request_id,
+            action=action,
+            reason_code=reason_code,
+        )
 
-        model_checksum = self._embedder_checksum()
-        await self._persist_success(
+    async def record_failure(
+        self,
+        sample: BiometricSample,
+        *,
+        actor_user_id: uuid.UUID,
+        request_id: str | None,
+        action: str,
+        reason_code: str,
+    ) -> ProcessingResult:
+        """Mark ``sample`` ``PROCESSING_FAILED`` with ``reason_code`` and commit,
+        as ``record_outcome`` does for a failed outcome."""
+        await self._persist_failure(
             sample,
-            actor=actor,
+            actor_user_id=actor_user_id,
             request_id=request_id,
             action=action,
-            embedding_values=list(embedding.values),
-            model_checksum=model_checksum,
+            reason_code=reason_code,
         )
-        return ProcessingResult(sample_id=sample.id, succeeded=True)
+        return ProcessingResult(sample_id=sample.id, succeeded=False, reason_code=reason_code)
 
     def _load_and_embed_sync(self, sample: BiometricSample) -> EmbeddingVector:
         """The synchronous half of one sample's pipeline — everything that must
         run off the event loop via ``asyncio.to_thread`` (see ``_run_pipeline``).
 
+        A sample whose stored bytes were already embedded under the current
+        models is answered from ``embedding_cache`` without decoding;
+        its file must still exist.
+
         Provider-instance thread-safety for the ``detect_align_embed`` portion
         is handled inside the cached provider adapters themselves
         (``YuNetFaceDetector._lock``/``DlibResnetFaceEmbedder._lock``), not
         here — this method just makes sure the *call* happens off-thread.
         """
-        decoded_image = self._load_decoded_image(sample)
-        return detect_align_embed(decoded_image, settings=self._settings)
-
-    def _load_decoded_image(self, sample: BiometricSample) -> DecodedImage:
         if not self._storage.exists_active(sample.storage_key):
             raise SampleStorageFileMissingError()
-        path = self._storage.active_path(sample.storage_key)
-        try:
-            data = path.read_bytes()
-            with Image.open(BytesIO(data)) as image:
-                rgb_image = image.convert("RGB")
-                array = np.asarray(rgb_image, dtype=np.uint8)
-        except (UnidentifiedImageError, OSError, ValueError) as exc:
-            raise SampleImageDecodeFailedError() from exc
+        key = embedding_cache_key(sample.sha256_hash, settings=self._settings)
+        cache = get_embedding_cache()
+        if key is not None:
+            cached = cache.get(key, settings=self._settings)
+            if cached is not None:
+                return cached
+
+        decoded_image, detection_image = self._load_decoded_image(sample)
+        return detect_align_embed(
+            decoded_image, settings=self._settings, detection_image=detection_image
+        )
+
+    def _cached_embeddings(
+        self, samples: list[BiometricSample], paths: list[Path | None]
+    ) -> list[EmbeddingVector | None]:
+        """``embed_samples``' cache lookups: one slot per sample, ``None`` on
+        a miss. A sample whose file is missing is always a miss."""
+        cache = get_embedding_cache()
+        cached: list[EmbeddingVector | None] = []
+        for sample, path in zip(samples, paths, strict=True):
+            key = (
+                embedding_cache_key(sample.sha256_hash, settings=self._settings)
+                if path is not None
+                else None
+            )
+            cached.append(cache.get(key, settings=self._settings) if key is not None else None)
+        return cached
 
-        return ndarray_to_decoded_image(array, color_format="rgb")
+    def _load_decoded_image(self, sample: BiometricSample) -> tuple[ImageFrame, ImageFrame | None]:
+        if not self._storage.exists_active(sample.storage_key):
+            raise SampleStorageFileMissingError()
+        return decode_sample_file_for_detection(
+            self._storage.active_path(sample.storage_key), settings=self._settings
+        )
 
-    def _embedder_checksum(self) -> str | None:
+    def embedder_checksum(self) -> str | None:
         configured_path = (self._settings.FACE_EMBEDDER_MODEL_PATH or "").strip()
         if not configured_path:
             return None
         try:
-            return compute_sha256(Path(configured_path))
+            return cached_sha256(Path(configured_path))
         except OSError:  # pragma: no cover - defensive, model already validated by embedder
             return None
 
@@ -323,26 +506,27 @@ class SampleProcessingService:
         self,
         sample: BiometricSample,
         *,
-        actor: User,
+        actor_user_id: uuid.UUID,
         request_id: str | None,
         action: str,
-        embedding_values: list[float],
+        embedding: EmbeddingVector,
         model_checksum: str | None,
     ) -> None:
         now = _utcnow()
         async with service_transaction(self._session):
+            # Held until commit, so a concurrent retire/delete (and its
+            # cache purge) is ordered after this success and its cache fill.
+            locked = await self._samples.get_by_id(sample.id, for_update=True)
             await self._embeddings.supersede_active_for_sample(sample.id, superseded_at=now)
             await self._embeddings.create_active(
                 biometric_sample_id=sample.id,
-                provider_name=DlibResnetFaceEmbedder.provider_name,
-                model_identifier=DlibResnetFaceEmbedder.model_identifier,
-                model_version="v1",
-                embedding_values=embedding_values,
+                model=current_embedding_model(self._settings),
+                embedding_values=list(embedding.values),
                 model_artifact_checksum=model_checksum,
             )
             await self._samples.mark_processed(sample, completed_at=now)
             await self._audit_logs.create(
-                actor_user_id=actor.id,
+                actor_user_id=actor_user_id,
                 action=action,
                 outcome=AuditOutcome.SUCCESS,
                 entity_type=_ENTITY_TYPE_SAMPLE,
@@ -350,12 +534,30 @@ class SampleProcessingService:
                 request_id=request_id,
                 event_metadata={"processing_result": "processed"},
             )
+            if locked is not None and locked.status is SampleStatus.ACTIVE:
+                await self._cache_embedding(locked, embedding)
+
+    async def _cache_embedding(self, sample: BiometricSample, embedding: EmbeddingVector) -> None:
+        """Cache ``sample``'s new embedding; ``sample`` must be locked and
+        ``ACTIVE`` — see ``embedding_cache``, "Filled only for live samples"."""
+        key = embedding_cache_key(sample.sha256_hash, settings=self._settings)
+        if key is None:
+            return
+        cache = get_embedding_cache()
+        generation = cache.generation
+        if self._settings.FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES > 0:
+            await offload(
+                cache.put_disk, key, embedding, settings=self._settings, generation=generation
+            )
+        fill_after_commit(
+            self._session, key, embedding, settings=self._settings, generation=generation
+        )
 
     async def _persist_failure(
         self,
         sample: BiometricSample,
         *,
-        actor: User,
+        actor_user_id: uuid.UUID,
         request_id: str | None,
         action: str,
         reason_code: str,
@@ -366,7 +568,7 @@ class SampleProcessingService:
                 sample, completed_at=now, reason_code=reason_code
             )
             await self._audit_logs.create(
-                actor_user_id=actor.id,
+                actor_user_id=actor_user_id,
                 action=action,
                 outcome=AuditOutcome.SUCCESS,
                 entity_type=_ENTITY_TYPE_SAMPLE,
@@ -5,7 +5,10 @@ These are the exact three interfaces required by
 ``detect``, ``embed``, ``match``. No provider-specific type (OpenCV,
 ONNX Runtime, TensorFlow, a hosted-API SDK client) appears anywhere in
 this file — only the value objects from
-``app.modules.face_recognition.domain``.
+``app.modules.face_recognition.domain``, plus
+``app.modules.face_recognition.image_codec.ImageFrame``: the in-process
+pixel container a detector is handed, a read-only NumPy array with its
+colour format, not a provider type.
 
 **No implementation exists here.** These are structural (``Protocol``)
 interfaces, not abstract base classes to inherit from — any object with
@@ -33,19 +36,20 @@ from typing import Protocol, runtime_checkable
 
 from app.modules.face_recognition.domain import (
     CandidateEmbedding,
-    DecodedImage,
     DetectedFace,
     EmbeddingVector,
     MatchResult,
     NormalizedFaceInput,
 )
+from app.modules.face_recognition.errors import FaceRecognitionError
+from app.modules.face_recognition.image_codec import ImageFrame
 
 
 @runtime_checkable
 class FaceDetector(Protocol):
     """Detects zero or more faces within one decoded image."""
 
-    def detect(self, image: DecodedImage) -> list[DetectedFace]:
+    def detect(self, image: ImageFrame) -> list[DetectedFace]:
         """Return every face detected in ``image``.
 
         An empty list is a normal, valid result ("no face found") — not
@@ -70,6 +74,19 @@ class FaceEmbedder(Protocol):
         """
         ...
 
+    def embed_many(
+        self, faces: Sequence[NormalizedFaceInput]
+    ) -> list[EmbeddingVector | FaceRecognitionError]:
+        """Embed every face in ``faces``, returning one entry per input, in order.
+
+        Each entry is either the validated embedding ``embed`` would have
+        returned for that face or the typed error it would have raised —
+        one bad face never costs the others their embeddings. An error
+        that is not a property of any one face (the model cannot be
+        loaded at all) is still raised for the whole call.
+        """
+        ...
+
 
 @runtime_checkable
 class FaceMatcher(Protocol):
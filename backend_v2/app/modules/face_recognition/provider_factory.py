@@ -19,20 +19,46 @@ own underlying model on first real use (see each adapter's own
 docstring) — caching the *adapter object* here just avoids re-creating
 that lazy-loading wrapper (and re-running its own cheap bookkeeping) on
 every request.
+
+Since ``Settings.FACE_PROVIDER_POOL_SIZE`` was added, the cached detector
+and embedder are ``provider_pool.PooledFaceDetector``/
+``PooledFaceEmbedder`` facades over a pool of adapter instances, so
+concurrent requests no longer all serialize on one instance's lock —
+see ``app.modules.face_recognition.provider_pool``. Each pool reports
+its checkout waits to ``app.modules.face_recognition.metrics``.
 """
 
 from __future__ import annotations
 
 import threading
+from functools import partial
 
 from app.core.config import Settings
+from app.modules.face_recognition.domain import EmbeddingModel
+from app.modules.face_recognition.metrics import (
+    DETECTOR_PROVIDER,
+    EMBEDDER_PROVIDER,
+    STAGE_LOCK_WAIT,
+    detector_model,
+    embedder_model,
+    embedder_model_version,
+    observe_stage,
+)
 from app.modules.face_recognition.protocols import FaceMatcher
+from app.modules.face_recognition.provider_pool import (
+    InstancePool,
+    PooledFaceDetector,
+    PooledFaceEmbedder,
+)
 from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
-from app.modules.face_recognition.providers.similarity_matcher import CosineSimilarityFaceMatcher
+from app.modules.face_recognition.providers.similarity_matcher import (
+    CosineSimilarityFaceMatcher,
+    VectorizedCosineSimilarityFaceMatcher,
+)
 from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
 
-_detector_cache: dict[int, YuNetFaceDetector] = {}
-_embedder_cache: dict[int, DlibResnetFaceEmbedder] = {}
+_detector_cache: dict[int, PooledFaceDetector] = {}
+_embedder_cache: dict[int, PooledFaceEmbedder] = {}
 
 # Stage 3 correction (finding 3): guards only this module's two cache
 # dicts' get-or-create step (a tiny, fast critical section) — not the
@@ -48,8 +74,8 @@ _embedder_cache: dict[int, DlibResnetFaceEmbedder] = {}
 _cache_lock = threading.Lock()
 
 
-def get_detector(settings: Settings) -> YuNetFaceDetector:
-    """Returns the cached ``YuNetFaceDetector`` for ``settings``.
+def get_detector(settings: Settings) -> PooledFaceDetector:
+    """Returns the cached, pooled ``YuNetFaceDetector`` for ``settings``.
 
     Typed concretely (not as the ``FaceDetector`` Protocol) so callers
     that need the extra, non-Protocol ``is_available()`` readiness
@@ -62,29 +88,84 @@ def get_detector(settings: Settings) -> YuNetFaceDetector:
     with _cache_lock:
         detector = _detector_cache.get(key)
         if detector is None:
-            detector = YuNetFaceDetector(settings)
+            detector = PooledFaceDetector(
+                InstancePool(
+                    lambda: YuNetFaceDetector(settings),
+                    size=settings.FACE_PROVIDER_POOL_SIZE,
+                    on_checkout=partial(
+                        observe_stage,
+                        STAGE_LOCK_WAIT,
+                        provider=DETECTOR_PROVIDER,
+                        model=detector_model(settings),
+                    ),
+                )
+            )
             _detector_cache[key] = detector
         return detector
 
 
-def get_embedder(settings: Settings) -> DlibResnetFaceEmbedder:
-    """Returns the cached ``DlibResnetFaceEmbedder`` for ``settings`` — see ``get_detector``."""
+def get_embedder(settings: Settings) -> PooledFaceEmbedder:
+    """Returns the cached, pooled ``DlibResnetFaceEmbedder`` for ``settings`` — see
+    ``get_detector``."""
     key = id(settings)
     with _cache_lock:
         embedder = _embedder_cache.get(key)
         if embedder is None:
-            embedder = DlibResnetFaceEmbedder(settings)
+            embedder = PooledFaceEmbedder(
+                InstancePool(
+                    lambda: DlibResnetFaceEmbedder(settings),
+                    size=settings.FACE_PROVIDER_POOL_SIZE,
+                    on_checkout=partial(
+                        observe_stage,
+                        STAGE_LOCK_WAIT,
+                        provider=EMBEDDER_PROVIDER,
+                        model=embedder_model(settings),
+                        model_version=embedder_model_version(settings),
+                    ),
+                )
+            )
             _embedder_cache[key] = embedder
         return embedder
 
 
+def current_embedding_model(settings: Settings) -> EmbeddingModel:
+    """The model new embeddings are stamped with, and the only one
+    ``MatchingService`` compares — see ``domain.EmbeddingModel``."""
+    return EmbeddingModel(
+        provider_name=DlibResnetFaceEmbedder.provider_name,
+        model_identifier=DlibResnetFaceEmbedder.model_identifier,
+        model_version=settings.FACE_EMBEDDING_MODEL_VERSION,
+    )
+
+
 def get_matcher(settings: Settings) -> FaceMatcher:
     # The matcher provider is stateless/cheap to construct (holds only
     # two float settings, loads no model) — no caching benefit, so a
     # fresh instance every call keeps this function trivially correct
     # even if a caller mutates threshold-related settings between
-    # calls in a test.
-    return CosineSimilarityFaceMatcher(settings)
+    # calls in a test. ``FACE_MATCHER_ENGINE`` only picks how the same
+    # decision rule is computed — see similarity_matcher's docstring.
+    if settings.FACE_MATCHER_ENGINE == "python":
+        return CosineSimilarityFaceMatcher(settings)
+    return VectorizedCosineSimilarityFaceMatcher(settings)
+
+
+def install_providers(
+    settings: Settings, *, detector: PooledFaceDetector, embedder: PooledFaceEmbedder
+) -> None:
+    """Make ``get_detector``/``get_embedder`` return ``detector``/``embedder``
+    for ``settings``.
+
+    For ``scripts/benchmarks``, which run the real pipeline around
+    stand-in models: every caller that resolves its providers through
+    this module (``pipeline``, the processing-pool workers, the router)
+    then picks them up without any of those modules being patched.
+    ``reset_provider_cache`` removes them again.
+    """
+    key = id(settings)
+    with _cache_lock:
+        _detector_cache[key] = detector
+        _embedder_cache[key] = embedder
 
 
 def reset_provider_cache() -> None:
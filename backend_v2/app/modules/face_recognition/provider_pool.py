@@ -0,0 +1,222 @@
+"""Checkout/return pools of detector and embedder instances.
+
+Every ``YuNetFaceDetector``/``DlibResnetFaceEmbedder`` holds an ``RLock``
+around inference, because OpenCV's and dlib's model objects must never
+run on two threads at once. With one cached instance per ``Settings``,
+that lock serialized every match probe in the process. Requests
+offloaded with ``asyncio.to_thread`` queued behind each other even when
+there were free threads and free cores.
+
+``provider_factory`` now hands out a ``PooledFaceDetector``/
+``PooledFaceEmbedder`` instead. Each call checks one instance out of an
+``InstancePool`` of up to ``Settings.FACE_PROVIDER_POOL_SIZE``
+independent instances, runs on it, and returns it. A thread only ever
+runs inside an instance it has checked out, so the "no two threads
+inside one native model" guarantee holds, and up to ``N`` inferences
+run at once. The per-instance locks stay as a second line of defence.
+Outside a pool they cost one uncontended acquire.
+
+**Lazy growth.** A pool starts empty and constructs an instance only
+when every existing one is checked out and the pool is below its size.
+Each instance loads its own copy of its model on first use, so memory
+grows with the concurrency a process actually sees, not with ``N``.
+A worker process in ``processing_pool`` runs one sample at a time, so
+it never grows past one instance.
+
+**Preloading.** ``InstancePool.prefill`` builds every instance up front
+and runs a callback on each before it first becomes available; it is
+how ``warmup`` loads all ``N`` model copies at startup when
+``Settings.FACE_PRELOAD_MODELS`` asks for it.
+
+**Metrics.** ``InstancePool.stats()`` reports checkouts, how many had to
+wait for a free instance, and the total and longest wait.
+``GET /face-recognition/provider-pools`` returns both pools' stats.
+Waits that are frequent or long mean the pool is too small for the
+request concurrency (or the host has too few cores for a larger one).
+An ``on_checkout`` callback additionally receives every checkout's wait
+(zero when an instance was idle); ``provider_factory`` feeds it to the
+``lock_wait`` histogram in ``app.modules.face_recognition.metrics``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import ClassVar
+
+from app.modules.face_recognition.domain import (
+    DecodedImage,
+    DetectedFace,
+    EmbeddingVector,
+    NormalizedFaceInput,
+)
+from app.modules.face_recognition.errors import FaceRecognitionError
+from app.modules.face_recognition.image_codec import ImageFrame
+from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+
+
+@dataclass(frozen=True)
+class InstancePoolStats:
+    """A point-in-time snapshot of one pool's usage since it was created."""
+
+    size: int
+    created: int
+    in_use: int
+    checkouts: int
+    waited_checkouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+
+class InstancePool[InstanceT]:
+    """Up to ``size`` instances from ``factory``, each used by one thread at a time."""
+
+    def __init__(
+        self,
+        factory: Callable[[], InstanceT],
+        *,
+        size: int,
+        on_checkout: Callable[[float], None] | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("InstancePool size must be at least 1.")
+        self._factory = factory
+        self._size = size
+        self._on_checkout = on_checkout
+        self._idle: list[InstanceT] = []
+        self._created = 0
+        self._condition = threading.Condition()
+        self._checkouts = 0
+        self._waited_checkouts = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    @contextmanager
+    def checkout(self) -> Iterator[InstanceT]:
+        """Borrow an instance for the duration of the ``with`` block."""
+        instance, waited = self._acquire()
+        if self._on_checkout is not None:
+            self._on_checkout(waited)
+        try:
+            yield instance
+        finally:
+            with self._condition:
+                self._idle.append(instance)
+                self._condition.notify()
+
+    def prefill(self, prepare: Callable[[InstanceT], None]) -> int:
+        """Create the instances still missing up to ``size``, running
+        ``prepare`` on each before it joins the idle set.
+
+        Returns how many were created. An instance whose ``prepare``
+        raises is discarded and the exception propagates; the pool can
+        still grow lazily into that slot later.
+        """
+        created = 0
+        while True:
+            with self._condition:
+                if self._created >= self._size:
+                    return created
+                self._created += 1
+            try:
+                instance = self._factory()
+                prepare(instance)
+            except BaseException:
+                with self._condition:
+                    self._created -= 1
+                    # A checkout waiting for this instance may now create its own.
+                    self._condition.notify_all()
+                raise
+            with self._condition:
+                self._idle.append(instance)
+                self._condition.notify()
+            created += 1
+
+    def stats(self) -> InstancePoolStats:
+        with self._condition:
+            return InstancePoolStats(
+                size=self._size,
+                created=self._created,
+                in_use=self._created - len(self._idle),
+                checkouts=self._checkouts,
+                waited_checkouts=self._waited_checkouts,
+                total_wait_seconds=self._total_wait_seconds,
+                max_wait_seconds=self._max_wait_seconds,
+            )
+
+    def _acquire(self) -> tuple[InstanceT, float]:
+        """An instance, and how many seconds were spent waiting for it."""
+        with self._condition:
+            self._checkouts += 1
+            waited = 0.0
+            if not self._idle and self._created >= self._size:
+                started = time.perf_counter()
+                # A failed ``prefill`` frees its slot rather than returning
+                # an instance, so a woken waiter may have to create one.
+                while not self._idle and self._created >= self._size:
+                    self._condition.wait()
+                waited = time.perf_counter() - started
+                self._waited_checkouts += 1
+                self._total_wait_seconds += waited
+                self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            if self._idle:
+                return self._idle.pop(), waited
+            # Constructing an adapter is cheap (models load lazily on
+            # first use), so it is done under the lock.
+            self._created += 1
+            try:
+                return self._factory(), waited
+            except BaseException:
+                self._created -= 1
+                self._condition.notify_all()
+                raise
+
+
+class PooledFaceDetector:
+    """A ``FaceDetector`` running each call on a pooled ``YuNetFaceDetector``."""
+
+    provider_name: ClassVar[str] = YuNetFaceDetector.provider_name
+
+    def __init__(self, pool: InstancePool[YuNetFaceDetector]) -> None:
+        self.pool = pool
+
+    def is_available(self) -> bool:
+        """See ``YuNetFaceDetector.is_available``; loads one instance's model."""
+        with self.pool.checkout() as detector:
+            return detector.is_available()
+
+    def detect(self, image: ImageFrame | DecodedImage) -> list[DetectedFace]:
+        with self.pool.checkout() as detector:
+            return detector.detect(image)
+
+
+class PooledFaceEmbedder:
+    """A ``FaceEmbedder`` running each call on a pooled ``DlibResnetFaceEmbedder``.
+
+    ``embed_many`` keeps one instance for the whole batch.
+    """
+
+    provider_name: ClassVar[str] = DlibResnetFaceEmbedder.provider_name
+    model_identifier: ClassVar[str] = DlibResnetFaceEmbedder.model_identifier
+
+    def __init__(self, pool: InstancePool[DlibResnetFaceEmbedder]) -> None:
+        self.pool = pool
+
+    def is_available(self) -> bool:
+        """See ``DlibResnetFaceEmbedder.is_available``; loads one instance's model."""
+        with self.pool.checkout() as embedder:
+            return embedder.is_available()
+
+    def embed(self, face: NormalizedFaceInput) -> EmbeddingVector:
+        with self.pool.checkout() as embedder:
+            return embedder.embed(face)
+
+    def embed_many(
+        self, faces: Sequence[NormalizedFaceInput]
+    ) -> list[EmbeddingVector | FaceRecognitionError]:
+        with self.pool.checkout() as embedder:
+            return embedder.embed_many(faces)
@@ -52,13 +52,25 @@ because it directly explains this adapter's shape:
   Euclidean-distance convention — a real, documented calibration
   difference, not an oversight (see the handover doc's "Calibration
   status: pending").
+
+**Batches.** ``embed_many`` hands dlib up to ``_INFERENCE_BATCH_SIZE``
+chips per ``compute_face_descriptor`` call (dlib's list-of-images
+overload), so the network's per-call setup is paid once per batch
+rather than once per face, and validates and L2-normalizes each batch's
+descriptors as one ``(n, 128)`` matrix. The instance lock is held per
+batch, not for the whole list, so a large enrollment run cannot starve
+a concurrent single-probe request for its full duration. If dlib
+rejects a batch outright, that batch is re-run one chip at a time, so
+the failure is pinned on the chip that caused it. A chip that cannot
+even be converted to dlib's RGB layout is left out of the batch, logged
+(``dlib_chip_conversion_failed``, exception type only) and reported as
+``FaceEmbeddingFailedError`` in its own slot.
 """
 
 from __future__ import annotations
 
-import math
 import threading
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 from typing import ClassVar, Protocol, cast
 
@@ -74,17 +86,21 @@ from app.modules.face_recognition.domain import (
 from app.modules.face_recognition.errors import (
     FaceEmbeddingFailedError,
     FaceProviderUnavailableError,
+    FaceRecognitionError,
 )
-from app.modules.face_recognition.image_codec import normalized_face_input_to_ndarray, to_rgb
+from app.modules.face_recognition.image_codec import normalized_face_input_to_frame
 from app.modules.face_recognition.model_artifacts import verify_model_artifact
 
 logger = structlog.get_logger(__name__)
 
 _EXPECTED_RAW_DIMENSION = 128
+_INFERENCE_BATCH_SIZE = 32
 
 
 class _DlibEmbeddingModel(Protocol):
-    def compute_face_descriptor(self, image: object, *, num_jitters: int) -> Iterable[float]: ...
+    # dlib overloads this one method: a single chip returns one
+    # descriptor, a list of chips returns a list of descriptors.
+    def compute_face_descriptor(self, image: object, *, num_jitters: int) -> Iterable[object]: ...
 
 
 class DlibResnetFaceEmbedder:
@@ -164,38 +180,125 @@ class DlibResnetFaceEmbedder:
             model = self._ensure_loaded()
 
             try:
-                source_array = normalized_face_input_to_ndarray(face)
-                rgb = np.ascontiguousarray(to_rgb(source_array, color_format=face.color_format))
-                raw_descriptor = model.compute_face_descriptor(rgb, num_jitters=1)
+                raw_descriptor = model.compute_face_descriptor(_to_rgb_chip(face), num_jitters=1)
             except FaceProviderUnavailableError:
                 raise
             except Exception as exc:
                 logger.error("dlib_embedding_inference_failed", exc_type=type(exc).__name__)
                 raise FaceEmbeddingFailedError() from exc
 
-        raw_values = tuple(float(component) for component in raw_descriptor)
-        if len(raw_values) != _EXPECTED_RAW_DIMENSION:
-            raise FaceEmbeddingFailedError()
-        if any(not math.isfinite(value) for value in raw_values):
-            raise FaceEmbeddingFailedError()
-
-        normalized_values = _l2_normalize(raw_values)
-
-        vector = EmbeddingVector(values=normalized_values)
-        return validate_embedding_dimension(
-            vector, expected_dimension=self._settings.FACE_EMBEDDING_DIMENSION
-        )
-
-
-def _l2_normalize(values: tuple[float, ...]) -> tuple[float, ...]:
-    """L2-normalize a raw embedding to a unit vector — see this module's docstring.
+        result = self._finish([raw_descriptor])[0]
+        if isinstance(result, FaceRecognitionError):
+            raise result
+        return result
+
+    def embed_many(
+        self, faces: Sequence[NormalizedFaceInput]
+    ) -> list[EmbeddingVector | FaceRecognitionError]:
+        """Batched ``embed`` — see this module's docstring, "Batches"."""
+        results: list[EmbeddingVector | FaceRecognitionError] = []
+        for start in range(0, len(faces), _INFERENCE_BATCH_SIZE):
+            batch = faces[start : start + _INFERENCE_BATCH_SIZE]
+            with self._lock:
+                model = self._ensure_loaded()
+                raw_descriptors = self._infer_batch(model, batch)
+            results.extend(self._finish(raw_descriptors))
+        return results
+
+    def _infer_batch(
+        self, model: _DlibEmbeddingModel, faces: Sequence[NormalizedFaceInput]
+    ) -> list[object]:
+        """Raw descriptors for ``faces`` (``None`` for a chip that could not
+        be converted or that dlib rejected)."""
+        chips: list[np.ndarray | None] = []
+        for face in faces:
+            try:
+                chips.append(_to_rgb_chip(face))
+            except Exception as exc:
+                logger.warning("dlib_chip_conversion_failed", exc_type=type(exc).__name__)
+                chips.append(None)
+        valid_chips = [chip for chip in chips if chip is not None]
+        if not valid_chips:
+            return [None] * len(chips)
 
-    Raises ``FaceEmbeddingFailedError`` on a (practically unreachable
-    for a real face descriptor, but defensively checked) all-zero
-    vector, since a zero vector has no defined direction to normalize
-    to and would otherwise propagate a ``ZeroDivisionError``/``nan``.
+        try:
+            batch_descriptors = list(model.compute_face_descriptor(valid_chips, num_jitters=1))
+        except Exception as exc:
+            logger.warning("dlib_batch_inference_failed", exc_type=type(exc).__name__)
+            batch_descriptors = [_compute_one(model, chip) for chip in valid_chips]
+        if len(batch_descriptors) != len(valid_chips):
+            logger.error("dlib_batch_inference_count_mismatch")
+            batch_descriptors = [None] * len(valid_chips)
+
+        remaining = iter(batch_descriptors)
+        return [next(remaining) if chip is not None else None for chip in chips]
+
+    def _finish(
+        self, raw_descriptors: Sequence[object]
+    ) -> list[EmbeddingVector | FaceRecognitionError]:
+        """Validate and L2-normalize raw descriptors as one matrix, in order."""
+        matrix = np.full((len(raw_descriptors), _EXPECTED_RAW_DIMENSION), np.nan)
+        for row, raw_descriptor in enumerate(raw_descriptors):
+            values = _descriptor_values(raw_descriptor)
+            if values is not None:
+                matrix[row] = values
+
+        normalized, usable = _l2_normalize_rows(matrix)
+        results: list[EmbeddingVector | FaceRecognitionError] = []
+        for row, is_usable in zip(normalized, usable, strict=True):
+            if not is_usable:
+                results.append(FaceEmbeddingFailedError())
+                continue
+            try:
+                results.append(
+                    validate_embedding_dimension(
+                        EmbeddingVector(values=tuple(row.tolist())),
+                        expected_dimension=self._settings.FACE_EMBEDDING_DIMENSION,
+                    )
+                )
+            except FaceRecognitionError as exc:
+                results.append(exc)
+        return results
+
+
+def _to_rgb_chip(face: NormalizedFaceInput) -> np.ndarray:
+    # A view of the chip's bytes for an RGB chip, one ``cvtColor`` for a
+    # BGR one; either way already C-contiguous, as dlib requires.
+    return normalized_face_input_to_frame(face).rgb_pixels()
+
+
+def _compute_one(model: _DlibEmbeddingModel, chip: np.ndarray) -> object:
+    try:
+        return model.compute_face_descriptor(chip, num_jitters=1)
+    except Exception as exc:
+        logger.error("dlib_embedding_inference_failed", exc_type=type(exc).__name__)
+        return None
+
+
+def _descriptor_values(raw_descriptor: object) -> np.ndarray | None:
+    """``raw_descriptor`` as a float64 row, or ``None`` if it is not 128 numbers."""
+    if raw_descriptor is None:
+        return None
+    try:
+        values = np.asarray(list(cast(Iterable[float], raw_descriptor)), dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if values.shape != (_EXPECTED_RAW_DIMENSION,):
+        return None
+    return values
+
+
+def _l2_normalize_rows(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """L2-normalize every row of ``matrix`` to a unit vector — see this module's docstring.
+
+    Returns the normalized rows and a boolean mask of the usable ones. A
+    row is unusable if any component is non-finite, or if it is all
+    zeros (practically unreachable for a real face descriptor, but
+    defensively checked): a zero vector has no defined direction to
+    normalize to and would otherwise propagate ``nan``.
     """
-    norm = math.sqrt(sum(component * component for component in values))
-    if not math.isfinite(norm) or norm == 0.0:
-        raise FaceEmbeddingFailedError()
-    return tuple(component / norm for component in values)
+    with np.errstate(invalid="ignore", over="ignore"):
+        norms = np.linalg.norm(matrix, axis=1)
+    usable = np.isfinite(matrix).all(axis=1) & np.isfinite(norms) & (norms > 0.0)
+    safe_norms = np.where(usable, norms, 1.0)
+    return matrix / safe_norms[:, np.newaxis], usable
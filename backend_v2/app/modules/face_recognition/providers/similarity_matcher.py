@@ -46,6 +46,41 @@ similarity first, ties broken by the candidate's UUID string form.
 This guarantees the exact same ``MatchResult`` for the exact same
 input on every run, on every machine, regardless of dict/set
 iteration order upstream.
+
+**Two engines, one decision rule.** ``CosineSimilarityFaceMatcher`` is
+the original per-candidate Python loop and remains the reference
+implementation. ``VectorizedCosineSimilarityFaceMatcher`` packs the
+candidates into a ``CandidateGallery`` — one contiguous ``(N, D)``
+``float32`` matrix of unit rows plus a row-to-student index — and
+scores it with a single matrix-vector product, a ``reduceat`` for the
+best-sample-per-student aggregation, and one stable ``argsort`` for
+the ranking. ``float32`` is only used to *screen*: every student whose
+screened score could still be in the top two (within
+``_SCREENING_TOLERANCE`` of the runner-up) is re-scored in ``float64``
+from the gallery's source-precision rows before the threshold and
+ambiguity-margin decision runs, so both engines reach the same
+``MatchResult`` status, student IDs, and tie-break order.
+``Settings.FACE_MATCHER_ENGINE`` selects between them in
+``app.modules.face_recognition.provider_factory.get_matcher``.
+
+**Group assignment.** ``VectorizedCosineSimilarityFaceMatcher.assign_gallery``
+decides many probes (every face in one classroom photo) against one
+gallery at once, from a single ``float64`` faces-by-students similarity
+matrix, such that no student is FOUND for two faces. Each face is decided
+by the same ``_decide`` rule over *every* student, exactly as
+``match_gallery`` would, so the ambiguity margin always compares a face's
+true top two. Faces are then settled from the most similar best match
+down: a FOUND face claims its student, unless a more similar face already
+has. Such a face resembles someone already in the photo, so it is
+AMBIGUOUS between that student and its runner-up (UNKNOWN, with that
+student as ``best_candidate``, when there is no runner-up). It is never
+handed to its runner-up instead — that would mark a student who may be
+absent PRESENT on a weaker match than the one that was refused.
+
+**Independent batches.** ``match_gallery_many`` scores several probes
+from the same matrix but decides each one exactly as ``match_gallery``
+would on its own: probes are separate single-face photos (a teacher
+scanning a queue of students), so two of them may be the same student.
 """
 
 from __future__ import annotations
@@ -53,6 +88,9 @@ from __future__ import annotations
 import math
 import uuid
 from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
 
 from app.core.config import Settings
 from app.modules.face_recognition.domain import (
@@ -60,6 +98,7 @@ from app.modules.face_recognition.domain import (
     EmbeddingVector,
     MatchCandidate,
     MatchResult,
+    MatchStatus,
 )
 from app.modules.face_recognition.errors import CandidateEmbeddingDimensionMismatchError
 
@@ -94,27 +133,307 @@ class CosineSimilarityFaceMatcher:
             per_student_best.items(),
             key=lambda item: (-item[1], str(item[0])),
         )
+        return _decide(ranked, threshold=self._threshold, ambiguous_margin=self._ambiguous_margin)
+
+
+# Upper bound on how far a float32 screening score may sit from its
+# float64 value for the embedding dimensions this application accepts
+# (``Settings.FACE_EMBEDDING_DIMENSION`` <= 4096). The observed error for
+# unit 128-D rows is around 1e-7; 1e-4 leaves a wide safety margin while
+# still shortlisting only a handful of students for float64 re-scoring.
+_SCREENING_TOLERANCE = 1e-4
+
+
+@dataclass(frozen=True, eq=False)
+class CandidateGallery:
+    """A candidate set packed for ``VectorizedCosineSimilarityFaceMatcher``.
+
+    - ``student_profile_ids``: every distinct student, sorted by
+      ``str(uuid)`` so that "lower index" *is* the matcher's tie-break
+      order.
+    - ``row_starts``: for each student, the first row of its contiguous
+      block in the matrices below (rows are grouped by student).
+    - ``row_owners``: for each row, the index of its student.
+    - ``unit_rows``: ``(N, D)`` C-contiguous ``float32``, each row
+      L2-normalized (an all-zero source row stays all-zero) — the
+      screening matrix.
+    - ``source_rows``/``source_norms``: the rows at their original
+      precision and their ``float64`` norms, used only to re-score the
+      shortlist.
 
-        best_student_id, best_similarity = ranked[0]
-        best_candidate = MatchCandidate(
-            student_profile_id=best_student_id, similarity=best_similarity
+    Immutable once built and holds no ORM or database state, so one
+    instance may be reused across many probes.
+    """
+
+    student_profile_ids: tuple[uuid.UUID, ...]
+    row_starts: np.ndarray
+    row_owners: np.ndarray
+    unit_rows: np.ndarray
+    source_rows: np.ndarray
+    source_norms: np.ndarray
+
+    @property
+    def dimension(self) -> int:
+        return int(self.unit_rows.shape[1])
+
+    @property
+    def row_count(self) -> int:
+        return int(self.unit_rows.shape[0])
+
+    @classmethod
+    def from_candidates(cls, candidates: Sequence[CandidateEmbedding]) -> CandidateGallery:
+        """Pack ``candidates`` (at least one, all of one dimension)."""
+        if not candidates:
+            raise ValueError("a CandidateGallery needs at least one candidate")
+        dimension = candidates[0].embedding.dimension
+        for candidate in candidates:
+            if candidate.embedding.dimension != dimension:
+                raise CandidateEmbeddingDimensionMismatchError(
+                    expected=dimension, actual=candidate.embedding.dimension
+                )
+        return cls.from_arrays(
+            [candidate.student_profile_id for candidate in candidates],
+            np.array([candidate.embedding.values for candidate in candidates], dtype=np.float64),
         )
 
-        if best_similarity < self._threshold:
-            return MatchResult.unknown(best_candidate=best_candidate)
+    @classmethod
+    def from_arrays(
+        cls, student_profile_ids: Sequence[uuid.UUID], rows: np.ndarray
+    ) -> CandidateGallery:
+        """Pack one ``(N, D)`` float array whose row ``i`` belongs to
+        ``student_profile_ids[i]``.
+
+        ``rows`` keeps its own floating dtype as the re-scoring precision
+        (``float64`` from ``EmbeddingVector`` values; ``float32`` if the
+        caller already holds single-precision data).
+        """
+        if rows.ndim != 2 or rows.shape[0] != len(student_profile_ids) or rows.shape[0] == 0:
+            raise ValueError("rows must be a non-empty (N, D) array with one row per student id")
+        if not np.issubdtype(rows.dtype, np.floating):
+            raise ValueError("rows must have a floating-point dtype")
+
+        ordered_students = sorted(set(student_profile_ids), key=str)
+        index_of = {student_id: index for index, student_id in enumerate(ordered_students)}
+        owners = np.fromiter(
+            (index_of[student_id] for student_id in student_profile_ids),
+            dtype=np.intp,
+            count=len(student_profile_ids),
+        )
+        order = np.argsort(owners, kind="stable")
+        row_owners = owners[order]
+        source_rows = np.ascontiguousarray(rows[order])
+        source_norms = np.linalg.norm(source_rows.astype(np.float64, copy=False), axis=1)
+        safe_norms = np.where(source_norms == 0.0, 1.0, source_norms)
+        unit_rows = np.ascontiguousarray(
+            (source_rows / safe_norms[:, np.newaxis]).astype(np.float32, copy=False)
+        )
+        row_starts = np.searchsorted(row_owners, np.arange(len(ordered_students)))
+        return cls(
+            student_profile_ids=tuple(ordered_students),
+            row_starts=row_starts,
+            row_owners=row_owners,
+            unit_rows=unit_rows,
+            source_rows=source_rows,
+            source_norms=source_norms,
+        )
+
+
+class VectorizedCosineSimilarityFaceMatcher:
+    """``CosineSimilarityFaceMatcher``'s decision rule over a packed gallery.
+
+    ``match`` satisfies the ``FaceMatcher`` protocol (it packs the
+    candidates itself); ``match_gallery`` scores an already-packed
+    ``CandidateGallery`` so a caller that reuses one roster across many
+    probes pays the packing cost once.
+    """
+
+    provider_name = "cosine_similarity_vectorized_local"
+
+    def __init__(self, settings: Settings) -> None:
+        self._threshold = settings.FACE_MATCH_THRESHOLD
+        self._ambiguous_margin = settings.FACE_MATCH_AMBIGUOUS_MARGIN
+
+    def match(
+        self, embedding: EmbeddingVector, candidates: Sequence[CandidateEmbedding]
+    ) -> MatchResult:
+        if not candidates:
+            return MatchResult.unknown()
+        # Same first-offender error as the reference loop, before packing.
+        for candidate in candidates:
+            if candidate.embedding.dimension != embedding.dimension:
+                raise CandidateEmbeddingDimensionMismatchError(
+                    expected=embedding.dimension, actual=candidate.embedding.dimension
+                )
+        return self.match_gallery(embedding, CandidateGallery.from_candidates(candidates))
+
+    def match_gallery(self, embedding: EmbeddingVector, gallery: CandidateGallery) -> MatchResult:
+        if gallery.dimension != embedding.dimension:
+            raise CandidateEmbeddingDimensionMismatchError(
+                expected=embedding.dimension, actual=gallery.dimension
+            )
 
-        if len(ranked) > 1:
-            runner_up_student_id, runner_up_similarity = ranked[1]
-            gap = best_similarity - runner_up_similarity
-            if gap < self._ambiguous_margin:
-                runner_up_candidate = MatchCandidate(
-                    student_profile_id=runner_up_student_id, similarity=runner_up_similarity
+        probe = np.asarray(embedding.values, dtype=np.float64)
+        probe_norm = float(np.linalg.norm(probe))
+        unit_probe = (probe / probe_norm if probe_norm != 0.0 else probe).astype(np.float32)
+
+        screened = np.maximum.reduceat(gallery.unit_rows @ unit_probe, gallery.row_starts)
+
+        if screened.shape[0] > 2:
+            runner_up_floor = np.partition(screened, -2)[-2]
+            shortlist = np.flatnonzero(screened >= runner_up_floor - 2 * _SCREENING_TOLERANCE)
+        else:
+            shortlist = np.arange(screened.shape[0])
+
+        exact = _exact_student_similarities(gallery, shortlist, probe=probe, probe_norm=probe_norm)
+        # Shortlist indices are ascending, i.e. already in str(uuid) order,
+        # so a stable sort on -similarity reproduces (-similarity, str(id)).
+        ranking = np.argsort(-exact, kind="stable")[:2]
+        ranked = [
+            (gallery.student_profile_ids[int(shortlist[position])], float(exact[position]))
+            for position in ranking
+        ]
+        return _decide(ranked, threshold=self._threshold, ambiguous_margin=self._ambiguous_margin)
+
+    def match_gallery_many(
+        self, embeddings: Sequence[EmbeddingVector], gallery: CandidateGallery
+    ) -> list[MatchResult]:
+        """One independent ``match_gallery`` decision per probe, in input
+        order, from a single faces-by-students similarity matrix."""
+        for embedding in embeddings:
+            if gallery.dimension != embedding.dimension:
+                raise CandidateEmbeddingDimensionMismatchError(
+                    expected=embedding.dimension, actual=gallery.dimension
                 )
-                return MatchResult.ambiguous(
-                    best_candidate=best_candidate, runner_up_candidate=runner_up_candidate
+        if not embeddings:
+            return []
+
+        similarities = _student_similarity_matrix(
+            gallery, np.array([embedding.values for embedding in embeddings], dtype=np.float64)
+        )
+        return self._decide_rows(gallery, similarities, _top_two(similarities))
+
+    def assign_gallery(
+        self, embeddings: Sequence[EmbeddingVector], gallery: CandidateGallery
+    ) -> list[MatchResult]:
+        """One ``MatchResult`` per probe, in input order, with no student
+        FOUND twice — see this module's docstring, "Group assignment"."""
+        for embedding in embeddings:
+            if gallery.dimension != embedding.dimension:
+                raise CandidateEmbeddingDimensionMismatchError(
+                    expected=embedding.dimension, actual=gallery.dimension
                 )
+        if not embeddings:
+            return []
+
+        similarities = _student_similarity_matrix(
+            gallery, np.array([embedding.values for embedding in embeddings], dtype=np.float64)
+        )
+        rankings = _top_two(similarities)
+        decisions = self._decide_rows(gallery, similarities, rankings)
+        best_similarities = similarities[np.arange(similarities.shape[0]), rankings[:, 0]]
+        claimed: set[uuid.UUID] = set()
+        results = list(decisions)
+        # Most similar best match first; ties go to the lower face index.
+        for face in np.argsort(-best_similarities, kind="stable"):
+            decision = decisions[int(face)]
+            best_candidate = decision.best_candidate
+            if decision.status is not MatchStatus.FOUND or best_candidate is None:
+                continue
+            if best_candidate.student_profile_id not in claimed:
+                claimed.add(best_candidate.student_profile_id)
+                continue
+            if rankings.shape[1] < 2:
+                results[int(face)] = MatchResult.unknown(best_candidate=best_candidate)
+                continue
+            runner_up = int(rankings[face, 1])
+            results[int(face)] = MatchResult.ambiguous(
+                best_candidate=best_candidate,
+                runner_up_candidate=MatchCandidate(
+                    student_profile_id=gallery.student_profile_ids[runner_up],
+                    similarity=float(similarities[face, runner_up]),
+                ),
+            )
+        return results
+
+    def _decide_rows(
+        self, gallery: CandidateGallery, similarities: np.ndarray, rankings: np.ndarray
+    ) -> list[MatchResult]:
+        """``_decide`` for every row of a faces-by-students matrix."""
+        return [
+            _decide(
+                [
+                    (gallery.student_profile_ids[int(student)], float(row[student]))
+                    for student in ranking
+                ],
+                threshold=self._threshold,
+                ambiguous_margin=self._ambiguous_margin,
+            )
+            for row, ranking in zip(similarities, rankings, strict=True)
+        ]
+
+
+def _top_two(similarities: np.ndarray) -> np.ndarray:
+    """Each row's two most similar columns, best first.
+
+    Columns are in str(uuid) order, so a stable sort on -similarity
+    reproduces (-similarity, str(id)) for every row at once.
+    """
+    return np.argsort(-similarities, axis=1, kind="stable")[:, :2]
+
+
+def _student_similarity_matrix(gallery: CandidateGallery, probes: np.ndarray) -> np.ndarray:
+    """``(faces, students)`` float64 best-sample similarity under
+    ``_cosine_similarity``'s clamping and zero-norm rules."""
+    probe_norms = np.linalg.norm(probes, axis=1)
+    dots = gallery.source_rows.astype(np.float64, copy=False) @ probes.T
+    norms = gallery.source_norms[:, np.newaxis] * probe_norms[np.newaxis, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarities = np.where(norms == 0.0, 0.0, dots / norms)
+    similarities = np.clip(similarities, -1.0, 1.0)
+    return np.maximum.reduceat(similarities, gallery.row_starts, axis=0).T
+
+
+def _exact_student_similarities(
+    gallery: CandidateGallery, shortlist: np.ndarray, *, probe: np.ndarray, probe_norm: float
+) -> np.ndarray:
+    """Float64 best-sample similarity for each shortlisted student, clamped
+    to ``[-1.0, 1.0]`` with zero-norm vectors scoring ``0.0`` — exactly
+    ``_cosine_similarity``'s rules."""
+    rows = np.flatnonzero(np.isin(gallery.row_owners, shortlist))
+    norms = gallery.source_norms[rows]
+    dots = gallery.source_rows[rows].astype(np.float64, copy=False) @ probe
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarities = np.where(
+            (norms == 0.0) | (probe_norm == 0.0), 0.0, dots / (norms * probe_norm)
+        )
+    similarities = np.clip(similarities, -1.0, 1.0)
+    group_starts = np.searchsorted(gallery.row_owners[rows], shortlist)
+    return np.maximum.reduceat(similarities, group_starts)
+
+
+def _decide(
+    ranked: Sequence[tuple[uuid.UUID, float]], *, threshold: float, ambiguous_margin: float
+) -> MatchResult:
+    """Threshold/ambiguity-margin decision over students already ranked by
+    ``(-similarity, str(student_profile_id))`` — shared by both engines."""
+    best_student_id, best_similarity = ranked[0]
+    best_candidate = MatchCandidate(student_profile_id=best_student_id, similarity=best_similarity)
+
+    if best_similarity < threshold:
+        return MatchResult.unknown(best_candidate=best_candidate)
+
+    if len(ranked) > 1:
+        runner_up_student_id, runner_up_similarity = ranked[1]
+        gap = best_similarity - runner_up_similarity
+        if gap < ambiguous_margin:
+            runner_up_candidate = MatchCandidate(
+                student_profile_id=runner_up_student_id, similarity=runner_up_similarity
+            )
+            return MatchResult.ambiguous(
+                best_candidate=best_candidate, runner_up_candidate=runner_up_candidate
+            )
 
-        return MatchResult.found(best_candidate)
+    return MatchResult.found(best_candidate)
 
 
 def _cosine_similarity(a: EmbeddingVector, b: EmbeddingVector) -> float:
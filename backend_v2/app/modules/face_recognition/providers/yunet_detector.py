@@ -60,7 +60,7 @@ from app.modules.face_recognition.errors import (
     FaceDetectionFailedError,
     FaceProviderUnavailableError,
 )
-from app.modules.face_recognition.image_codec import decoded_image_to_ndarray, to_bgr
+from app.modules.face_recognition.image_codec import ImageFrame, as_frame
 from app.modules.face_recognition.model_artifacts import verify_model_artifact
 
 logger = structlog.get_logger(__name__)
@@ -182,7 +182,7 @@ class YuNetFaceDetector:
             return False
         return True
 
-    def detect(self, image: DecodedImage) -> list[DetectedFace]:
+    def detect(self, image: ImageFrame | DecodedImage) -> list[DetectedFace]:
         with self._lock:
             detector = self._ensure_loaded()
 
@@ -192,8 +192,9 @@ class YuNetFaceDetector:
                 self._loaded_input_size = (width, height)
 
             try:
-                source_array = decoded_image_to_ndarray(image)
-                bgr = to_bgr(source_array, color_format=image.color_format)
+                # Zero-copy for a BGR frame (what decoding produces); an
+                # RGB one pays a single ``cvtColor``.
+                bgr = as_frame(image).bgr_pixels()
                 _retval, raw_faces = detector.detect(bgr)
             except (cv2.error, ValueError) as exc:
                 raise FaceDetectionFailedError() from exc
@@ -0,0 +1,151 @@
+"""Cheap image-quality gate between alignment and embedding.
+
+A blurred, badly lit or distant face still goes through detection and
+alignment, and then through the embedder — by far the most expensive
+stage — only to come out ``UNKNOWN`` or ``AMBIGUOUS``, after which the
+teacher retakes the photo anyway. ``check_face_quality`` runs on the
+aligned 150x150 chip, before the embedder, and rejects such a face
+straight away with ``FaceImageQualityTooLowError``: the client learns
+to retake the photo immediately, and the CPU is spent on faces that can
+be recognized.
+
+Four measurements, all plain ``numpy`` over one greyscale copy of the
+chip (``assess_face_quality``):
+
+- **Sharpness**: variance of the 4-neighbour Laplacian. Defocus and
+  motion blur remove the high frequencies it responds to.
+- **Brightness**: mean grey level, 0-255.
+- **Contrast**: standard deviation of the grey level.
+- **Inter-ocular distance**: pixels between the detector's two eye
+  landmarks in the *original* image, i.e. how many real pixels the
+  chip was upsampled from. A face that is too small has no detail left
+  to embed, however sharp the 150x150 chip looks after resampling.
+
+The three pixel measurements are taken over the central face region
+(between the eyes and below the mouth, in the aligned frame), so the
+black border alignment pads with near an image edge does not count.
+
+Each ``Settings.FACE_QUALITY_MIN_*`` floor is ``0`` — off — by default:
+good values depend on the cameras and lighting in use, and this MVP
+makes no accuracy claim for any of them. Rejections are logged
+(``face_quality_rejected``) with the measured values, which are
+statistics of the chip and carry no identity, to calibrate the floors
+against.
+
+Only the single-face paths (``pipeline.detect_and_align``: match
+probes, recognition attendance, enrollment processing) are gated. A
+group photo's faces are small by nature and are not filtered.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import structlog
+
+from app.core.config import Settings
+from app.modules.face_recognition.domain import DetectedFace, NormalizedFaceInput
+from app.modules.face_recognition.errors import FaceImageQualityTooLowError
+from app.modules.face_recognition.image_codec import normalized_face_input_to_ndarray
+
+logger = structlog.get_logger(__name__)
+
+REASON_BLURRY = "blurry"
+REASON_TOO_DARK = "too_dark"
+REASON_LOW_CONTRAST = "low_contrast"
+REASON_FACE_TOO_SMALL = "face_too_small"
+
+# Rows/columns of the aligned chip around the reference eye, nose and
+# mouth positions (``alignment._REFERENCE_POINTS``) with a margin.
+_FACE_REGION = (slice(45, 130), slice(40, 111))
+
+# ITU-R BT.601 luma weights, in RGB order.
+_LUMA_RGB = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+@dataclass(frozen=True)
+class FaceQuality:
+    sharpness: float
+    brightness: float
+    contrast: float
+    inter_ocular_px: float | None
+
+
+def quality_gate_enabled(settings: Settings) -> bool:
+    return any(value > 0.0 for value in _floors(settings))
+
+
+def quality_settings_key(settings: Settings) -> str:
+    """The floors as a string, for cache keys of results that passed them."""
+    return ":".join(f"{value:g}" for value in _floors(settings))
+
+
+def assess_face_quality(chip: NormalizedFaceInput, face: DetectedFace) -> FaceQuality:
+    """Measure ``chip`` (aligned from ``face``); see the module docstring."""
+    pixels = normalized_face_input_to_ndarray(chip)[_FACE_REGION]
+    weights = _LUMA_RGB if chip.color_format == "rgb" else _LUMA_RGB[::-1]
+    grey = pixels.astype(np.float32) @ weights
+    laplacian = (
+        grey[:-2, 1:-1] + grey[2:, 1:-1] + grey[1:-1, :-2] + grey[1:-1, 2:] - 4.0 * grey[1:-1, 1:-1]
+    )
+    return FaceQuality(
+        sharpness=float(laplacian.var()),
+        brightness=float(grey.mean()),
+        contrast=float(grey.std()),
+        inter_ocular_px=_inter_ocular_px(face),
+    )
+
+
+def check_face_quality(
+    chip: NormalizedFaceInput, face: DetectedFace, *, settings: Settings
+) -> None:
+    """Raise ``FaceImageQualityTooLowError`` if ``chip`` is below any
+    configured floor; a no-op when every floor is off."""
+    if not quality_gate_enabled(settings):
+        return
+    quality = assess_face_quality(chip, face)
+    reasons = [
+        reason
+        for reason, failed in (
+            (REASON_BLURRY, quality.sharpness < settings.FACE_QUALITY_MIN_SHARPNESS),
+            (REASON_TOO_DARK, quality.brightness < settings.FACE_QUALITY_MIN_BRIGHTNESS),
+            (REASON_LOW_CONTRAST, quality.contrast < settings.FACE_QUALITY_MIN_CONTRAST),
+            (
+                REASON_FACE_TOO_SMALL,
+                quality.inter_ocular_px is not None
+                and quality.inter_ocular_px < settings.FACE_QUALITY_MIN_INTER_OCULAR_PX,
+            ),
+        )
+        if failed
+    ]
+    if reasons:
+        logger.info(
+            "face_quality_rejected",
+            reasons=reasons,
+            sharpness=round(quality.sharpness, 1),
+            brightness=round(quality.brightness, 1),
+            contrast=round(quality.contrast, 1),
+            inter_ocular_px=(
+                round(quality.inter_ocular_px, 1) if quality.inter_ocular_px is not None else None
+            ),
+        )
+        raise FaceImageQualityTooLowError(reasons)
+
+
+def _floors(settings: Settings) -> tuple[float, float, float, float]:
+    return (
+        settings.FACE_QUALITY_MIN_SHARPNESS,
+        settings.FACE_QUALITY_MIN_BRIGHTNESS,
+        settings.FACE_QUALITY_MIN_CONTRAST,
+        settings.FACE_QUALITY_MIN_INTER_OCULAR_PX,
+    )
+
+
+def _inter_ocular_px(face: DetectedFace) -> float | None:
+    # Alignment has already required five landmarks; right eye, left eye first.
+    if face.landmarks is None or len(face.landmarks) < 2:
+        return None
+    right_eye, left_eye = face.landmarks[0], face.landmarks[1]
+    return math.hypot(left_eye.x_px - right_eye.x_px, left_eye.y_px - right_eye.y_px)
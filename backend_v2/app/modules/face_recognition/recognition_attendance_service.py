@@ -4,6 +4,17 @@ This is the only face-recognition application layer that may request an
 attendance mutation, and it does so exclusively through Phase 4's
 ``AttendanceService``. It never imports ``AttendanceRepository`` or constructs
 an ``AttendanceRecord``.
+
+``create_group_attempts`` is the group-photo variant of ``create_attempt``:
+one attempt (and decision audit) per detected face, committed together, then
+every FOUND student marked present by a single ``bulk_save`` call — one
+attendance transaction for the whole photo — and finally every attempt
+linked to its attendance record in one more transaction. UNKNOWN/AMBIGUOUS
+faces follow the existing per-attempt confirmation flow.
+
+``create_batch_attempts`` takes several single-face probes at once (one
+photo per student) and commits all of their attempts, decision audits and
+attendance marks in a single transaction — see its docstring.
 """
 
 from __future__ import annotations
@@ -31,7 +42,7 @@ from app.modules.face_recognition.errors import (
     RecognitionAttendanceRosterEmptyError,
     RecognitionAttendanceStudentNotInRosterError,
 )
-from app.modules.face_recognition.matching_service import MatchingService
+from app.modules.face_recognition.matching_service import MatchingService, MatchOutcome
 from app.modules.face_recognition.repository import RecognitionAttendanceAttemptRepository
 from app.modules.profiles.repository import StudentProfileRepository
 from app.modules.users.models import User
@@ -158,49 +169,17 @@ class RecognitionAttendanceService:
         )
 
         matched_id = outcome.matched_student_profile_id
-        if (
-            outcome.status is MatchStatus.FOUND
-            and matched_id not in scope.candidate_student_profile_ids
-        ):
-            await self._write_blocked_audit(
-                actor_user_id=current_user.id,
-                action=ACTION_RECOGNITION_ATTENDANCE_DECISION,
-                entity_id=None,
-                classroom_id=scope.classroom_id,
-                subject_id=scope.subject_id,
-                request_id=request_id,
-                event_metadata={
-                    "reason_code": _REASON_MATCH_OUTSIDE_AUTHORIZED_ROSTER,
-                    "recognition_decision": outcome.status.value,
-                },
-            )
-            raise RecognitionAttendanceMatchOutsideRosterError()
+        await self._ensure_matches_within_roster(
+            [outcome], scope=scope, current_user=current_user, request_id=request_id
+        )
 
         async with service_transaction(self._session):
-            attempt = await self._attempts.create(
-                actor_user_id=current_user.id,
-                classroom_id=scope.classroom_id,
-                subject_id=scope.subject_id,
-                attendance_date=scope.attendance_date,
-                decision=outcome.status,
-                matched_student_profile_id=matched_id,
-                candidate_student_profile_ids=roster,
-            )
-            await self._audit_logs.create(
-                actor_user_id=current_user.id,
-                action=ACTION_RECOGNITION_ATTENDANCE_DECISION,
-                outcome=AuditOutcome.SUCCESS,
-                entity_type=_ENTITY_TYPE_RECOGNITION_ATTEMPT,
-                entity_id=attempt.id,
-                classroom_id=scope.classroom_id,
-                subject_id=scope.subject_id,
+            attempt_id = await self._record_decision(
+                current_user=current_user,
+                scope=scope,
+                outcome=outcome,
+                attendance_record_id=None,
                 request_id=request_id,
-                event_metadata={
-                    "recognition_attempt_id": str(attempt.id),
-                    "recognition_decision": outcome.status.value,
-                    "matched_student_profile_id": str(matched_id) if matched_id else None,
-                    "candidate_count": len(roster),
-                },
             )
 
         attendance_record_id: uuid.UUID | None = None
@@ -217,7 +196,7 @@ class RecognitionAttendanceService:
                 request_id=request_id,
             )
             async with service_transaction(self._session):
-                persisted = await self._attempts.get_by_id(attempt.id, for_update=True)
+                persisted = await self._attempts.get_by_id(attempt_id, for_update=True)
                 if persisted is None:  # pragma: no cover - same-request invariant
                     raise RuntimeError("recognition attempt disappeared before attendance linkage")
                 await self._attempts.set_attendance_record(
@@ -225,7 +204,7 @@ class RecognitionAttendanceService:
                 )
 
         return RecognitionAttemptOutcome(
-            attempt_id=attempt.id,
+            attempt_id=attempt_id,
             classroom_id=scope.classroom_id,
             subject_id=scope.subject_id,
             attendance_date=scope.attendance_date,
@@ -234,6 +213,180 @@ class RecognitionAttendanceService:
             attendance_record_id=attendance_record_id,
         )
 
+    async def create_group_attempts(
+        self,
+        *,
+        current_user: User,
+        scope: AuthorizedRecognitionScope,
+        probe_embeddings: list[EmbeddingVector],
+        request_id: str | None = None,
+    ) -> list[RecognitionAttemptOutcome]:
+        """Match every face of one photo within ``scope`` (no student
+        twice), persist/audit one attempt per face, and mark all FOUND
+        students present in one attendance transaction."""
+        roster = list(scope.candidate_student_profile_ids)
+        outcomes = await MatchingService(self._session, settings=self._settings).match_group(
+            probe_embeddings=probe_embeddings,
+            candidate_student_profile_ids=roster,
+            actor=current_user,
+            request_id=request_id,
+        )
+
+        await self._ensure_matches_within_roster(
+            outcomes, scope=scope, current_user=current_user, request_id=request_id
+        )
+
+        async with service_transaction(self._session):
+            attempt_ids: list[uuid.UUID] = []
+            for outcome in outcomes:
+                attempt_id = await self._record_decision(
+                    current_user=current_user,
+                    scope=scope,
+                    outcome=outcome,
+                    attendance_record_id=None,
+                    request_id=request_id,
+                )
+                attempt_ids.append(attempt_id)
+
+        found = [
+            (attempt_id, outcome.matched_student_profile_id)
+            for attempt_id, outcome in zip(attempt_ids, outcomes, strict=True)
+            if outcome.status is MatchStatus.FOUND
+        ]
+        record_ids: dict[uuid.UUID, uuid.UUID] = {}
+        if found:
+            student_ids: list[uuid.UUID] = []
+            for _attempt_id, matched_id in found:
+                if matched_id is None:  # pragma: no cover - MatchStatus invariant
+                    raise RuntimeError("FOUND recognition result has no matched student")
+                student_ids.append(matched_id)
+            attendance_record_ids = await self._mark_present_many(
+                session=self._session,
+                current_user=current_user,
+                classroom_id=scope.classroom_id,
+                subject_id=scope.subject_id,
+                attendance_date=scope.attendance_date,
+                student_profile_ids=student_ids,
+                request_id=request_id,
+            )
+            async with service_transaction(self._session):
+                for (attempt_id, _matched_id), attendance_record_id in zip(
+                    found, attendance_record_ids, strict=True
+                ):
+                    persisted = await self._attempts.get_by_id(attempt_id, for_update=True)
+                    if persisted is None:  # pragma: no cover - same-request invariant
+                        raise RuntimeError(
+                            "recognition attempt disappeared before attendance linkage"
+                        )
+                    await self._attempts.set_attendance_record(
+                        persisted, attendance_record_id=attendance_record_id
+                    )
+                    record_ids[attempt_id] = attendance_record_id
+
+        return [
+            RecognitionAttemptOutcome(
+                attempt_id=attempt_id,
+                classroom_id=scope.classroom_id,
+                subject_id=scope.subject_id,
+                attendance_date=scope.attendance_date,
+                decision=outcome.status,
+                matched_student_profile_id=outcome.matched_student_profile_id,
+                attendance_record_id=record_ids.get(attempt_id),
+            )
+            for attempt_id, outcome in zip(attempt_ids, outcomes, strict=True)
+        ]
+
+    async def create_batch_attempts(
+        self,
+        *,
+        current_user: User,
+        scope: AuthorizedRecognitionScope,
+        probe_embeddings: list[EmbeddingVector],
+        request_id: str | None = None,
+    ) -> list[RecognitionAttemptOutcome]:
+        """Match several single-face probes within ``scope`` and persist
+        them in one transaction.
+
+        The batch counterpart of calling ``create_attempt`` once per
+        probe, without repeating its per-probe work: the gallery is
+        loaded and scored once (``MatchingService.match_batch``, each
+        probe decided independently), then every attempt, every decision
+        audit row and the attendance marks for all FOUND students
+        (``AttendanceService.bulk_save_in_transaction``, one success
+        audit) are written and committed together, each FOUND attempt
+        already linked to its record. A student FOUND by two probes is
+        marked once and both attempts link to that record. Any failure
+        rolls back the whole batch, so a retry starts clean.
+        """
+        roster = list(scope.candidate_student_profile_ids)
+        outcomes = await MatchingService(self._session, settings=self._settings).match_batch(
+            probe_embeddings=probe_embeddings,
+            candidate_student_profile_ids=roster,
+            actor=current_user,
+            request_id=request_id,
+        )
+        await self._ensure_matches_within_roster(
+            outcomes, scope=scope, current_user=current_user, request_id=request_id
+        )
+
+        found_ids: list[uuid.UUID] = []
+        for outcome in outcomes:
+            if outcome.status is not MatchStatus.FOUND:
+                continue
+            if outcome.matched_student_profile_id is None:  # pragma: no cover - invariant
+                raise RuntimeError("FOUND recognition result has no matched student")
+            if outcome.matched_student_profile_id not in found_ids:
+                found_ids.append(outcome.matched_student_profile_id)
+
+        async with service_transaction(self._session):
+            record_ids: dict[uuid.UUID, uuid.UUID] = {}
+            if found_ids:
+                result = await AttendanceService(self._session).bulk_save_in_transaction(
+                    current_user=current_user,
+                    payload=BulkAttendanceRequest(
+                        classroom_id=scope.classroom_id,
+                        subject_id=scope.subject_id,
+                        attendance_date=scope.attendance_date,
+                        records=[
+                            BulkAttendanceRecordIn(
+                                student_profile_id=student_profile_id,
+                                status=AttendanceStatus.PRESENT,
+                            )
+                            for student_profile_id in found_ids
+                        ],
+                    ),
+                    request_id=request_id,
+                )
+                record_ids = dict(zip(found_ids, result.record_ids, strict=True))
+
+            persisted: list[RecognitionAttemptOutcome] = []
+            for outcome in outcomes:
+                matched_id = outcome.matched_student_profile_id
+                attendance_record_id = (
+                    record_ids[matched_id]
+                    if outcome.status is MatchStatus.FOUND and matched_id is not None
+                    else None
+                )
+                attempt_id = await self._record_decision(
+                    current_user=current_user,
+                    scope=scope,
+                    outcome=outcome,
+                    attendance_record_id=attendance_record_id,
+                    request_id=request_id,
+                )
+                persisted.append(
+                    RecognitionAttemptOutcome(
+                        attempt_id=attempt_id,
+                        classroom_id=scope.classroom_id,
+                        subject_id=scope.subject_id,
+                        attendance_date=scope.attendance_date,
+                        decision=outcome.status,
+                        matched_student_profile_id=matched_id,
+                        attendance_record_id=attendance_record_id,
+                    )
+                )
+        return persisted
+
     async def confirm_attempt(
         self,
         *,
@@ -362,6 +515,74 @@ class RecognitionAttendanceService:
                 attendance_record_id=attendance_record_id,
             )
 
+    async def _ensure_matches_within_roster(
+        self,
+        outcomes: list[MatchOutcome],
+        *,
+        scope: AuthorizedRecognitionScope,
+        current_user: User,
+        request_id: str | None,
+    ) -> None:
+        for outcome in outcomes:
+            if (
+                outcome.status is MatchStatus.FOUND
+                and outcome.matched_student_profile_id not in scope.candidate_student_profile_ids
+            ):
+                await self._write_blocked_audit(
+                    actor_user_id=current_user.id,
+                    action=ACTION_RECOGNITION_ATTENDANCE_DECISION,
+                    entity_id=None,
+                    classroom_id=scope.classroom_id,
+                    subject_id=scope.subject_id,
+                    request_id=request_id,
+                    event_metadata={
+                        "reason_code": _REASON_MATCH_OUTSIDE_AUTHORIZED_ROSTER,
+                        "recognition_decision": outcome.status.value,
+                    },
+                )
+                raise RecognitionAttendanceMatchOutsideRosterError()
+
+    async def _record_decision(
+        self,
+        *,
+        current_user: User,
+        scope: AuthorizedRecognitionScope,
+        outcome: MatchOutcome,
+        attendance_record_id: uuid.UUID | None,
+        request_id: str | None,
+    ) -> uuid.UUID:
+        """One attempt row plus its decision audit row, in the caller's
+        open transaction."""
+        roster = list(scope.candidate_student_profile_ids)
+        matched_id = outcome.matched_student_profile_id
+        attempt = await self._attempts.create(
+            actor_user_id=current_user.id,
+            classroom_id=scope.classroom_id,
+            subject_id=scope.subject_id,
+            attendance_date=scope.attendance_date,
+            decision=outcome.status,
+            matched_student_profile_id=matched_id,
+            candidate_student_profile_ids=roster,
+            attendance_record_id=attendance_record_id,
+        )
+        await self._audit_logs.create(
+            actor_user_id=current_user.id,
+            action=ACTION_RECOGNITION_ATTENDANCE_DECISION,
+            outcome=AuditOutcome.SUCCESS,
+            entity_type=_ENTITY_TYPE_RECOGNITION_ATTEMPT,
+            entity_id=attempt.id,
+            classroom_id=scope.classroom_id,
+            subject_id=scope.subject_id,
+            request_id=request_id,
+            event_metadata={
+                "recognition_attempt_id": str(attempt.id),
+                "recognition_decision": outcome.status.value,
+                "matched_student_profile_id": str(matched_id) if matched_id else None,
+                "candidate_count": len(roster),
+            },
+        )
+        return attempt.id
+
     async def _mark_present(
         self,
         *,
@@ -373,6 +594,30 @@ class RecognitionAttendanceService:
         student_profile_id: uuid.UUID,
         request_id: str | None,
     ) -> uuid.UUID:
+        record_ids = await self._mark_present_many(
+            session=session,
+            current_user=current_user,
+            classroom_id=classroom_id,
+            subject_id=subject_id,
+            attendance_date=attendance_date,
+            student_profile_ids=[student_profile_id],
+            request_id=request_id,
+        )
+        return record_ids[0]
+
+    async def _mark_present_many(
+        self,
+        *,
+        session: AsyncSession,
+        current_user: User,
+        classroom_id: uuid.UUID,
+        subject_id: uuid.UUID,
+        attendance_date: date,
+        student_profile_ids: list[uuid.UUID],
+        request_id: str | None,
+    ) -> list[uuid.UUID]:
+        """Mark every student present in one ``bulk_save`` transaction;
+        record IDs come back in ``student_profile_ids`` order."""
         result = await AttendanceService(session).bulk_save(
             current_user=current_user,
             payload=BulkAttendanceRequest(
@@ -384,11 +629,12 @@ class RecognitionAttendanceService:
                         student_profile_id=student_profile_id,
                         status=AttendanceStatus.PRESENT,
                     )
+                    for student_profile_id in student_profile_ids
                 ],
             ),
             request_id=request_id,
         )
-        return result.record_ids[0]
+        return list(result.record_ids)
 
     async def _audit_invalid_confirmation(
         self,
@@ -0,0 +1,327 @@
+"""Moving processed samples to a new embedding model.
+
+Every ``BiometricEmbedding`` row records which model produced it
+(``domain.EmbeddingModel``), and matching only compares embeddings of
+the configured one (``provider_factory.current_embedding_model``). When
+the embedder's weights change, the deployer bumps
+``Settings.FACE_EMBEDDING_MODEL_VERSION``; from then on every sample
+whose active embedding is from an older model is *stale* — its student
+cannot be matched — until this module has re-embedded it. Run it with
+``python -m scripts.reembed_samples``.
+
+**One batch** (``ReembeddingService.run_batch``):
+
+1. Select up to ``Settings.FACE_REEMBED_BATCH_SIZE`` stale, live,
+   ``PROCESSED`` samples in sample-ID (keyset) order after the last
+   batch's final sample — see
+   ``BiometricEmbeddingRepository.list_stale_samples``.
+2. Embed them exactly as processing does
+   (``SampleProcessingService.embed_samples``, so
+   ``FACE_PROCESSING_WORKERS`` and embedding-cache hits apply; a shadow
+   is never written to the cache), and commit each result as an inactive
+   *shadow* row. A shadow left by an earlier, interrupted run is reused
+   rather than recomputed.
+3. Flip each sample in its own transaction: lock the sample, confirm it
+   is still live and ``PROCESSED`` and that its active row is still the
+   stale one, supersede that row and activate the shadow, and write an
+   audit entry. A sample that changed meanwhile (deleted, replaced,
+   reprocessed) keeps its state and its shadow is dropped.
+
+Matching therefore sees either the old row or the new one for a
+student, never both and never neither, and no transaction stays open
+during inference.
+
+**Failures.** A sample the new model cannot embed for a reason that
+would recur (no face, several faces, a missing or undecodable file) is
+marked ``PROCESSING_FAILED`` with that reason code, as processing would
+have done, so it shows up for an admin to retry or re-enroll. A
+transient failure (models unavailable, an unexpected error) leaves the
+sample stale for the next run.
+
+**Resuming and running in parallel.** There is no cursor to persist:
+the stale set itself is the job's state, so a restarted job carries on
+where the last one stopped. ``shard=(k, n)`` splits the samples into
+``n`` disjoint slices for ``n`` jobs; the flip's re-check keeps even
+overlapping jobs correct, only wasting inference.
+
+**Throttling** is the caller's: ``scripts.reembed_samples`` runs in its
+own process, optionally at a lower CPU priority, and pauses
+``Settings.FACE_REEMBED_PAUSE_SECONDS`` between batches so online
+recognition keeps its share of CPU and database time.
+
+**Acting admin.** Flip and failure audit rows name the admin who ran
+the job (``actor_user_id``, which ``scripts.reembed_samples`` resolves
+once from ``--actor-email`` via ``resolve_acting_admin``), the way a
+processing job carries ``requested_by_user_id`` — never the sample's
+uploader, who started nothing.
+
+**Gallery cache.** As with the processing worker, a flip invalidates only
+the job process's own gallery cache; API processes pick the new rows up
+within ``FACE_GALLERY_CACHE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings, get_settings
+from app.db.transaction import service_transaction
+from app.modules.attendance.models import AuditOutcome
+from app.modules.attendance.repository import AuditLogRepository
+from app.modules.biometric_enrollment.models import (
+    BiometricSample,
+    RecognitionProcessingState,
+    SampleStatus,
+)
+from app.modules.biometric_enrollment.repository import BiometricSampleRepository
+from app.modules.biometric_enrollment.storage import PrivateBiometricStorage
+from app.modules.face_recognition.domain import EmbeddingModel, EmbeddingVector
+from app.modules.face_recognition.models import BiometricEmbedding
+from app.modules.face_recognition.processing_jobs import TRANSIENT_REASON_CODES
+from app.modules.face_recognition.processing_service import (
+    SampleProcessingService,
+    reason_code_for_error,
+)
+from app.modules.face_recognition.provider_factory import current_embedding_model
+from app.modules.face_recognition.repository import BiometricEmbeddingRepository
+from app.modules.users.models import UserRole
+from app.modules.users.normalization import normalize_email
+from app.modules.users.repository import UserRepository
+
+logger = structlog.get_logger(__name__)
+
+ACTION_SAMPLE_REEMBED = "face_recognition.sample_reembed"
+_ENTITY_TYPE_SAMPLE = "biometric_sample"
+
+
+@dataclass(frozen=True)
+class ReembeddingProgress:
+    """Live, ``PROCESSED`` samples by whether their active embedding is
+    from the configured model."""
+
+    model: EmbeddingModel
+    current: int
+    stale: int
+
+    @property
+    def total(self) -> int:
+        return self.current + self.stale
+
+
+@dataclass(frozen=True)
+class ReembeddingBatchResult:
+    """What one batch did — never carries embedding values.
+
+    ``last_sample_id`` is the keyset position to pass as the next batch's
+    ``after``; ``None`` (with ``scanned == 0``) means the walk is done.
+    """
+
+    scanned: int
+    flipped: int
+    failed: int
+    deferred: int
+    skipped: int
+    last_sample_id: uuid.UUID | None
+
+
+async def resolve_acting_admin(session: AsyncSession, email: str) -> uuid.UUID:
+    """The ID of the active admin with ``email``; ``ValueError`` if there
+    is none (unknown email, another role, or a deactivated account)."""
+    user = await UserRepository(session).get_by_email(normalize_email(email))
+    if user is None or user.role is not UserRole.ADMIN or not user.is_active:
+        raise ValueError("the acting user must be an active admin")
+    return user.id
+
+
+class ReembeddingService:
+    """``actor_user_id`` is the admin running the job; it is required by
+    ``run_batch`` (it is written to every audit row) and unused by
+    ``progress``."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        actor_user_id: uuid.UUID | None = None,
+        settings: Settings | None = None,
+        storage: PrivateBiometricStorage | None = None,
+    ) -> None:
+        self._session = session
+        self._actor_user_id = actor_user_id
+        self._settings = settings or get_settings()
+        self._model = current_embedding_model(self._settings)
+        self._samples = BiometricSampleRepository(session)
+        self._embeddings = BiometricEmbeddingRepository(session)
+        self._audit_logs = AuditLogRepository(session)
+        self._processing = SampleProcessingService(
+            session, settings=self._settings, storage=storage
+        )
+
+    async def progress(self) -> ReembeddingProgress:
+        current, stale = await self._embeddings.count_processed_by_model(model=self._model)
+        return ReembeddingProgress(model=self._model, current=current, stale=stale)
+
+    async def run_batch(
+        self,
+        *,
+        after: uuid.UUID | None = None,
+        limit: int | None = None,
+        shard: tuple[int, int] | None = None,
+    ) -> ReembeddingBatchResult:
+        """Re-embed and flip the next batch of stale samples after ``after``."""
+        if self._actor_user_id is None:
+            raise RuntimeError("re-embedding needs an acting admin (actor_user_id)")
+        actor_user_id = self._actor_user_id
+        async with service_transaction(self._session):
+            stale = await self._embeddings.list_stale_samples(
+                model=self._model,
+                after=after,
+                limit=limit or self._settings.FACE_REEMBED_BATCH_SIZE,
+                shard=shard,
+            )
+            shadows = await self._embeddings.get_shadows(
+                [sample.id for sample, _ in stale], model=self._model
+            )
+        if not stale:
+            return ReembeddingBatchResult(
+                scanned=0, flipped=0, failed=0, deferred=0, skipped=0, last_sample_id=None
+            )
+
+        failures = await self._write_shadows(
+            [sample for sample, _ in stale if sample.id not in shadows], shadows
+        )
+
+        flipped = failed = deferred = skipped = 0
+        for sample, stale_embedding_id in stale:
+            shadow = shadows.get(sample.id)
+            if shadow is not None:
+                if await self._flip(
+                    sample,
+                    shadow,
+                    stale_embedding_id=stale_embedding_id,
+                    actor_user_id=actor_user_id,
+                ):
+                    flipped += 1
+                else:
+                    skipped += 1
+                continue
+            reason_code = failures[sample.id]
+            logger.warning(
+                "face_recognition_reembedding_sample_failed",
+                sample_id=str(sample.id),
+                reason_code=reason_code,
+            )
+            if reason_code in TRANSIENT_REASON_CODES:
+                deferred += 1
+            elif await self._fail(sample, reason_code=reason_code, actor_user_id=actor_user_id):
+                failed += 1
+            else:
+                skipped += 1
+
+        return ReembeddingBatchResult(
+            scanned=len(stale),
+            flipped=flipped,
+            failed=failed,
+            deferred=deferred,
+            skipped=skipped,
+            last_sample_id=stale[-1][0].id,
+        )
+
+    async def _write_shadows(
+        self, samples: list[BiometricSample], shadows: dict[uuid.UUID, BiometricEmbedding]
+    ) -> dict[uuid.UUID, str]:
+        """Embed ``samples`` and commit a shadow row for each success into
+        ``shadows``; returns the others' reason codes."""
+        if not samples:
+            return {}
+        outcomes = await self._processing.embed_samples(samples)
+        model_checksum = (
+            self._processing.embedder_checksum()
+            if any(isinstance(outcome, EmbeddingVector) for outcome in outcomes)
+            else None
+        )
+        failures: dict[uuid.UUID, str] = {}
+        async with service_transaction(self._session):
+            for sample, outcome in zip(samples, outcomes, strict=True):
+                if isinstance(outcome, EmbeddingVector):
+                    shadows[sample.id] = await self._embeddings.create_shadow(
+                        biometric_sample_id=sample.id,
+                        model=self._model,
+                        embedding_values=list(outcome.values),
+                        model_artifact_checksum=model_checksum,
+                    )
+                else:
+                    failures[sample.id] = reason_code_for_error(outcome.error_type)
+        return failures
+
+    async def _flip(
+        self,
+        sample: BiometricSample,
+        shadow: BiometricEmbedding,
+        *,
+        stale_embedding_id: uuid.UUID,
+        actor_user_id: uuid.UUID,
+    ) -> bool:
+        async with service_transaction(self._session):
+            locked = await self._samples.get_by_id(sample.id, for_update=True)
+            if (
+                locked is None
+                or not _is_processed(locked)
+                or not await self._embeddings.activate_shadow(
+                    shadow, stale_embedding_id=stale_embedding_id, superseded_at=_utcnow()
+                )
+            ):
+                await self._embeddings.delete(shadow)
+                return False
+            await self._audit_logs.create(
+                actor_user_id=actor_user_id,
+                action=ACTION_SAMPLE_REEMBED,
+                outcome=AuditOutcome.SUCCESS,
+                entity_type=_ENTITY_TYPE_SAMPLE,
+                entity_id=locked.id,
+                request_id=None,
+                event_metadata={"processing_result": "reembedded"},
+            )
+        return True
+
+    async def _fail(
+        self, sample: BiometricSample, *, reason_code: str, actor_user_id: uuid.UUID
+    ) -> bool:
+        locked = await self._samples.get_by_id(sample.id, for_update=True)
+        if locked is None or not _is_processed(locked):
+            # Releases the lock; see ProcessingJobService._lock_if_still_held.
+            await self._session.commit()
+            return False
+        await self._processing.record_failure(
+            locked,
+            actor_user_id=actor_user_id,
+            request_id=None,
+            action=ACTION_SAMPLE_REEMBED,
+            reason_code=reason_code,
+        )
+        return True
+
+
+def _is_processed(sample: BiometricSample) -> bool:
+    return (
+        sample.status is SampleStatus.ACTIVE
+        and sample.processing_state is RecognitionProcessingState.PROCESSED
+    )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+__all__ = [
+    "ACTION_SAMPLE_REEMBED",
+    "ReembeddingBatchResult",
+    "ReembeddingProgress",
+    "ReembeddingService",
+    "resolve_acting_admin",
+]
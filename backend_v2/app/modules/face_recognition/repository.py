@@ -14,15 +14,25 @@ default" (the other half — actually requiring a non-empty scope before
 calling this — is
 ``app.modules.face_recognition.matching_service.MatchingService``'s
 job).
+
+Every read that feeds matching is also scoped to one
+``domain.EmbeddingModel``: embeddings from another model are never
+candidates. Re-embedding after a model change
+(``app.modules.face_recognition.reembedding``) writes inactive *shadow*
+rows first (``create_shadow``) and activates each one in its own
+transaction (``activate_shadow``).
 """
 
 from __future__ import annotations
 
 import builtins
 import uuid
-from datetime import date, datetime
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import ColumnElement, and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.biometric_enrollment.models import (
@@ -31,8 +41,16 @@ from app.modules.biometric_enrollment.models import (
     RecognitionProcessingState,
     SampleStatus,
 )
-from app.modules.face_recognition.domain import MatchStatus
-from app.modules.face_recognition.models import BiometricEmbedding, RecognitionAttendanceAttempt
+from app.modules.face_recognition.domain import EmbeddingModel, MatchStatus
+from app.modules.face_recognition.embedding_codec import pack_embedding, unpack_embedding
+from app.modules.face_recognition.gallery_cache import invalidate_after_commit
+from app.modules.face_recognition.models import (
+    OPEN_PROCESSING_JOB_STATUSES,
+    BiometricEmbedding,
+    BiometricProcessingJob,
+    ProcessingJobStatus,
+    RecognitionAttendanceAttempt,
+)
 
 
 class CandidateEmbeddingRow:
@@ -42,21 +60,29 @@ class CandidateEmbeddingRow:
     ``Row``/tuple so callers (``MatchingService``) get named attributes
     without importing SQLAlchemy themselves — this repository's only
     export that isn't an ORM model or a UUID/primitive.
+
+    ``embedding_packed`` is the stored bytes as returned by the driver;
+    ``embedding`` is a zero-copy float32 view over them (see
+    ``app.modules.face_recognition.embedding_codec``).
     """
 
-    __slots__ = ("embedding_dimension", "embedding_values", "student_profile_id")
+    __slots__ = ("embedding_dimension", "embedding_packed", "student_profile_id")
 
     def __init__(
         self,
         *,
         student_profile_id: uuid.UUID,
-        embedding_values: list[float],
+        embedding_packed: bytes,
         embedding_dimension: int,
     ) -> None:
         self.student_profile_id = student_profile_id
-        self.embedding_values = embedding_values
+        self.embedding_packed = embedding_packed
         self.embedding_dimension = embedding_dimension
 
+    @property
+    def embedding(self) -> np.ndarray:
+        return unpack_embedding(self.embedding_packed)
+
 
 class BiometricEmbeddingRepository:
     def __init__(self, session: AsyncSession) -> None:
@@ -76,35 +102,78 @@ class BiometricEmbeddingRepository:
         self,
         *,
         biometric_sample_id: uuid.UUID,
-        provider_name: str,
-        model_identifier: str,
-        model_version: str,
+        model: EmbeddingModel,
         embedding_values: builtins.list[float],
         model_artifact_checksum: str | None,
     ) -> BiometricEmbedding:
         """Insert one new active embedding row for a sample.
 
-        Callers are responsible for first superseding any existing
-        active row for this sample (see ``supersede_active_for_sample``)
-        — this method does not do it implicitly, so the caller's
-        transaction boundary controls exactly when the old row stops
-        being active relative to when the new one starts.
+        ``embedding_values`` is packed to float32 here (see
+        ``app.modules.face_recognition.embedding_codec``). Callers are
+        responsible for first superseding any existing active row for
+        this sample (see ``supersede_active_for_sample``) — this method
+        does not do it implicitly, so the caller's transaction boundary
+        controls exactly when the old row stops being active relative to
+        when the new one starts.
         """
-        embedding = BiometricEmbedding(
+        embedding = self._new_row(
             biometric_sample_id=biometric_sample_id,
-            provider_name=provider_name,
-            model_identifier=model_identifier,
-            model_version=model_version,
-            embedding_dimension=len(embedding_values),
+            model=model,
             embedding_values=embedding_values,
             model_artifact_checksum=model_artifact_checksum,
             is_active=True,
         )
         self._session.add(embedding)
+        invalidate_after_commit(self._session)
         await self._session.flush()
         await self._session.refresh(embedding)
         return embedding
 
+    async def create_shadow(
+        self,
+        *,
+        biometric_sample_id: uuid.UUID,
+        model: EmbeddingModel,
+        embedding_values: builtins.list[float],
+        model_artifact_checksum: str | None,
+    ) -> BiometricEmbedding:
+        """Insert an inactive, never-superseded embedding row for a sample.
+
+        Matching ignores it until ``activate_shadow`` swaps it in; an
+        inactive row with ``superseded_at IS NULL`` is how a shadow is told
+        apart from a row that was once active.
+        """
+        embedding = self._new_row(
+            biometric_sample_id=biometric_sample_id,
+            model=model,
+            embedding_values=embedding_values,
+            model_artifact_checksum=model_artifact_checksum,
+            is_active=False,
+        )
+        self._session.add(embedding)
+        await self._session.flush()
+        return embedding
+
+    def _new_row(
+        self,
+        *,
+        biometric_sample_id: uuid.UUID,
+        model: EmbeddingModel,
+        embedding_values: builtins.list[float],
+        model_artifact_checksum: str | None,
+        is_active: bool,
+    ) -> BiometricEmbedding:
+        return BiometricEmbedding(
+            biometric_sample_id=biometric_sample_id,
+            provider_name=model.provider_name,
+            model_identifier=model.model_identifier,
+            model_version=model.model_version,
+            embedding_dimension=len(embedding_values),
+            embedding_packed=pack_embedding(embedding_values),
+            model_artifact_checksum=model_artifact_checksum,
+            is_active=is_active,
+        )
+
     async def supersede_active_for_sample(
         self, biometric_sample_id: uuid.UUID, *, superseded_at: datetime
     ) -> None:
@@ -120,12 +189,14 @@ class BiometricEmbeddingRepository:
             return
         existing.is_active = False
         existing.superseded_at = superseded_at
+        invalidate_after_commit(self._session)
         await self._session.flush()
 
     async def list_active_for_students(
-        self, student_profile_ids: builtins.list[uuid.UUID]
+        self, student_profile_ids: builtins.list[uuid.UUID], *, model: EmbeddingModel
     ) -> builtins.list[CandidateEmbeddingRow]:
-        """Active embeddings for the given students, from live, PROCESSED samples only.
+        """Active embeddings for the given students, from live, PROCESSED samples only,
+        produced by ``model``.
 
         The three-way join below is the single enforcement point for
         "retired/deleted/quarantined samples must never match" (Stage 3
@@ -137,13 +208,17 @@ class BiometricEmbeddingRepository:
         step is required to make deletion "take effect" for matching
         purposes; see ``app.modules.face_recognition.models``'s module
         docstring.
+
+        A student whose active embedding is from another model (not yet
+        re-embedded after a model change) is simply absent from the
+        result, as if not enrolled.
         """
         if not student_profile_ids:
             return []
         stmt = (
             select(
                 BiometricEnrollment.student_profile_id,
-                BiometricEmbedding.embedding_values,
+                BiometricEmbedding.embedding_packed,
                 BiometricEmbedding.embedding_dimension,
             )
             .join(BiometricSample, BiometricSample.id == BiometricEmbedding.biometric_sample_id)
@@ -153,18 +228,142 @@ class BiometricEmbeddingRepository:
                 BiometricSample.status == SampleStatus.ACTIVE,
                 BiometricSample.processing_state == RecognitionProcessingState.PROCESSED,
                 BiometricEnrollment.student_profile_id.in_(student_profile_ids),
+                _produced_by(model),
             )
         )
         result = await self._session.execute(stmt)
         return [
             CandidateEmbeddingRow(
                 student_profile_id=row.student_profile_id,
-                embedding_values=list(row.embedding_values),
+                embedding_packed=row.embedding_packed,
                 embedding_dimension=row.embedding_dimension,
             )
             for row in result.all()
         ]
 
+    async def list_stale_samples(
+        self,
+        *,
+        model: EmbeddingModel,
+        after: uuid.UUID | None,
+        limit: int,
+        shard: tuple[int, int] | None = None,
+    ) -> builtins.list[tuple[BiometricSample, uuid.UUID]]:
+        """Live, ``PROCESSED`` samples whose active embedding is not from
+        ``model``, as ``(sample, stale_embedding_id)``, in sample-ID order
+        starting after ``after``.
+
+        Keyset order rather than an offset, so each page costs the same
+        however far the walk has got, and samples flipped meanwhile drop
+        out without shifting the rest. ``shard=(k, n)`` keeps only samples
+        whose ID's last byte is ``k`` modulo ``n`` — disjoint slices for
+        ``n`` jobs running side by side.
+        """
+        stmt = (
+            select(BiometricSample, BiometricEmbedding.id)
+            .join(BiometricEmbedding, BiometricEmbedding.biometric_sample_id == BiometricSample.id)
+            .where(
+                BiometricEmbedding.is_active.is_(True),
+                ~_produced_by(model),
+                BiometricSample.status == SampleStatus.ACTIVE,
+                BiometricSample.processing_state == RecognitionProcessingState.PROCESSED,
+            )
+            .order_by(BiometricSample.id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(BiometricSample.id > after)
+        if shard is not None:
+            index, count = shard
+            stmt = stmt.where(
+                func.get_byte(func.uuid_send(BiometricSample.id), 15) % count == index
+            )
+        result = await self._session.execute(stmt)
+        return [(row[0], row[1]) for row in result.all()]
+
+    async def get_shadows(
+        self, biometric_sample_ids: builtins.list[uuid.UUID], *, model: EmbeddingModel
+    ) -> dict[uuid.UUID, BiometricEmbedding]:
+        """Each sample's shadow row from ``model``, if one was already
+        written (by an earlier, interrupted run)."""
+        if not biometric_sample_ids:
+            return {}
+        stmt = select(BiometricEmbedding).where(
+            BiometricEmbedding.biometric_sample_id.in_(biometric_sample_ids),
+            BiometricEmbedding.is_active.is_(False),
+            BiometricEmbedding.superseded_at.is_(None),
+            _produced_by(model),
+        )
+        result = await self._session.execute(stmt)
+        return {row.biometric_sample_id: row for row in result.scalars().all()}
+
+    async def activate_shadow(
+        self,
+        shadow: BiometricEmbedding,
+        *,
+        stale_embedding_id: uuid.UUID,
+        superseded_at: datetime,
+    ) -> bool:
+        """Supersede the sample's active row and make ``shadow`` active.
+
+        The active row is locked and must still be ``stale_embedding_id``;
+        if processing replaced it meanwhile, nothing changes and this
+        returns ``False``. The deactivation is flushed before the
+        activation so the one-active-row-per-sample index never sees two.
+        """
+        stmt = (
+            select(BiometricEmbedding)
+            .where(
+                BiometricEmbedding.biometric_sample_id == shadow.biometric_sample_id,
+                BiometricEmbedding.is_active.is_(True),
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self._session.execute(stmt)
+        current = result.scalar_one_or_none()
+        if current is None or current.id != stale_embedding_id:
+            return False
+        current.is_active = False
+        current.superseded_at = superseded_at
+        await self._session.flush()
+        shadow.is_active = True
+        invalidate_after_commit(self._session)
+        await self._session.flush()
+        return True
+
+    async def delete(self, embedding: BiometricEmbedding) -> None:
+        await self._session.delete(embedding)
+        await self._session.flush()
+
+    async def count_processed_by_model(self, *, model: EmbeddingModel) -> tuple[int, int]:
+        """``(current, stale)``: live, ``PROCESSED`` samples whose active
+        embedding is, or is not, from ``model``."""
+        current = _produced_by(model)
+        stmt = (
+            select(
+                func.count().filter(current),
+                func.count().filter(~current),
+            )
+            .select_from(BiometricEmbedding)
+            .join(BiometricSample, BiometricSample.id == BiometricEmbedding.biometric_sample_id)
+            .where(
+                BiometricEmbedding.is_active.is_(True),
+                BiometricSample.status == SampleStatus.ACTIVE,
+                BiometricSample.processing_state == RecognitionProcessingState.PROCESSED,
+            )
+        )
+        row = (await self._session.execute(stmt)).one()
+        return int(row[0]), int(row[1])
+
+
+def _produced_by(model: EmbeddingModel) -> ColumnElement[bool]:
+    return and_(
+        BiometricEmbedding.provider_name == model.provider_name,
+        BiometricEmbedding.model_identifier == model.model_identifier,
+        BiometricEmbedding.model_version == model.model_version,
+    )
+
 
 class RecognitionAttendanceAttemptRepository:
     """Thin persistence boundary for the Stage 4 attempt lifecycle."""
@@ -193,6 +392,7 @@ class RecognitionAttendanceAttemptRepository:
         decision: MatchStatus,
         matched_student_profile_id: uuid.UUID | None,
         candidate_student_profile_ids: list[uuid.UUID],
+        attendance_record_id: uuid.UUID | None = None,
     ) -> RecognitionAttendanceAttempt:
         attempt = RecognitionAttendanceAttempt(
             actor_user_id=actor_user_id,
@@ -203,6 +403,7 @@ class RecognitionAttendanceAttemptRepository:
             matched_student_profile_id=matched_student_profile_id,
             candidate_count=len(candidate_student_profile_ids),
             candidate_student_profile_ids=list(candidate_student_profile_ids),
+            attendance_record_id=attendance_record_id,
         )
         self._session.add(attempt)
         await self._session.flush()
@@ -238,8 +439,184 @@ class RecognitionAttendanceAttemptRepository:
         return attempt
 
 
+class BiometricProcessingJobRepository:
+    """Queue operations for ``BiometricProcessingJob``.
+
+    Same conventions as the repositories above: callers own the
+    transaction boundary. ``claim`` in particular must be committed
+    promptly by its caller — the row locks it takes are what keep two
+    workers from claiming the same job, and the committed lease is what
+    keeps them apart afterwards.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def enqueue(
+        self,
+        entries: Sequence[tuple[uuid.UUID, uuid.UUID]],
+        *,
+        max_attempts: int,
+        batch_id: uuid.UUID | None = None,
+        request_id: str | None = None,
+    ) -> builtins.list[uuid.UUID]:
+        """Queue one job per ``(sample_id, requested_by_user_id)`` entry.
+
+        A sample that already has an open job is skipped (the partial
+        unique index is the arbiter), so enqueueing is idempotent and safe
+        to race. Returns the sample IDs actually queued.
+        """
+        if not entries:
+            return []
+        stmt = (
+            insert(BiometricProcessingJob)
+            .values(
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "biometric_sample_id": sample_id,
+                        "requested_by_user_id": requested_by_user_id,
+                        "batch_id": batch_id,
+                        "request_id": request_id,
+                        "status": ProcessingJobStatus.QUEUED,
+                        "attempt_count": 0,
+                        "max_attempts": max_attempts,
+                    }
+                    for sample_id, requested_by_user_id in entries
+                ]
+            )
+            .on_conflict_do_nothing(
+                index_elements=[BiometricProcessingJob.biometric_sample_id],
+                index_where=BiometricProcessingJob.status.in_(OPEN_PROCESSING_JOB_STATUSES),
+            )
+            .returning(BiometricProcessingJob.biometric_sample_id)
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def list_unqueued_pending_samples(
+        self, *, limit: int
+    ) -> builtins.list[tuple[uuid.UUID, uuid.UUID]]:
+        """``(sample_id, created_by_user_id)`` of ``ACTIVE``, still-pending
+        samples with no open job, oldest first — the same eligibility as
+        ``BiometricSampleRepository.list_active_pending_processing``."""
+        open_job = select(BiometricProcessingJob.id).where(
+            BiometricProcessingJob.biometric_sample_id == BiometricSample.id,
+            BiometricProcessingJob.status.in_(OPEN_PROCESSING_JOB_STATUSES),
+        )
+        stmt = (
+            select(BiometricSample.id, BiometricSample.created_by_user_id)
+            .where(
+                BiometricSample.status == SampleStatus.ACTIVE,
+                BiometricSample.processing_state == RecognitionProcessingState.PENDING_PROCESSING,
+                ~open_job.exists(),
+            )
+            .order_by(BiometricSample.created_at, BiometricSample.id)
+            .limit(limit)
+        )
+        result = await self._session.execute(stmt)
+        return [(row.id, row.created_by_user_id) for row in result.all()]
+
+    async def claim(
+        self, *, worker_id: str, now: datetime, lease: timedelta, limit: int
+    ) -> builtins.list[BiometricProcessingJob]:
+        """Lease up to ``limit`` due jobs to ``worker_id``, oldest first.
+
+        Due means ``queued`` with ``available_at`` reached, or ``running``
+        under a lease that has expired (its worker died or hung). The
+        candidate rows are locked with ``FOR UPDATE SKIP LOCKED``, so
+        concurrent workers each take a disjoint set without waiting on
+        one another. Every claim counts as an attempt.
+        """
+        due = (
+            select(BiometricProcessingJob.id)
+            .where(
+                or_(
+                    and_(
+                        BiometricProcessingJob.status == ProcessingJobStatus.QUEUED,
+                        BiometricProcessingJob.available_at <= now,
+                    ),
+                    and_(
+                        BiometricProcessingJob.status == ProcessingJobStatus.RUNNING,
+                        BiometricProcessingJob.lease_expires_at <= now,
+                    ),
+                )
+            )
+            .order_by(BiometricProcessingJob.available_at, BiometricProcessingJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(BiometricProcessingJob)
+            .where(BiometricProcessingJob.id.in_(due.scalar_subquery()))
+            .values(
+                status=ProcessingJobStatus.RUNNING,
+                attempt_count=BiometricProcessingJob.attempt_count + 1,
+                locked_by=worker_id,
+                lease_expires_at=now + lease,
+                updated_at=now,
+            )
+            .returning(BiometricProcessingJob)
+            .execution_options(populate_existing=True)
+        )
+        result = await self._session.execute(stmt)
+        jobs = list(result.scalars().all())
+        jobs.sort(key=lambda job: (job.available_at, job.id))
+        return jobs
+
+    async def get_for_update(self, job_id: uuid.UUID) -> BiometricProcessingJob | None:
+        """The job's current row, locked — used to confirm a lease is still held."""
+        stmt = (
+            select(BiometricProcessingJob)
+            .where(BiometricProcessingJob.id == job_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def complete(
+        self,
+        job: BiometricProcessingJob,
+        *,
+        status: ProcessingJobStatus,
+        completed_at: datetime,
+        reason_code: str | None = None,
+    ) -> BiometricProcessingJob:
+        job.status = status
+        job.completed_at = completed_at
+        job.last_reason_code = reason_code
+        job.locked_by = None
+        job.lease_expires_at = None
+        await self._session.flush()
+        return job
+
+    async def schedule_retry(
+        self, job: BiometricProcessingJob, *, available_at: datetime, reason_code: str
+    ) -> BiometricProcessingJob:
+        job.status = ProcessingJobStatus.QUEUED
+        job.available_at = available_at
+        job.last_reason_code = reason_code
+        job.locked_by = None
+        job.lease_expires_at = None
+        await self._session.flush()
+        return job
+
+    async def count_by_status(
+        self, *, batch_id: uuid.UUID | None = None
+    ) -> dict[ProcessingJobStatus, int]:
+        stmt = select(BiometricProcessingJob.status, func.count()).group_by(
+            BiometricProcessingJob.status
+        )
+        if batch_id is not None:
+            stmt = stmt.where(BiometricProcessingJob.batch_id == batch_id)
+        result = await self._session.execute(stmt)
+        return dict(result.tuples().all())
+
+
 __all__ = [
     "BiometricEmbeddingRepository",
+    "BiometricProcessingJobRepository",
     "CandidateEmbeddingRow",
     "RecognitionAttendanceAttemptRepository",
 ]
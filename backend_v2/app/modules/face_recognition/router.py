@@ -10,14 +10,12 @@ bytes, candidate-roster snapshots, or filesystem/model paths.
 from __future__ import annotations
 
 import asyncio
+import time
 import uuid
 from datetime import date
-from io import BytesIO
 from typing import Annotated
 
-import numpy as np
-from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
-from PIL import Image
+from fastapi import APIRouter, Depends, File, Form, Request, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import Settings, get_settings
@@ -25,32 +23,55 @@ from app.db.session import get_db_session
 from app.modules.auth.dependencies import require_roles
 from app.modules.biometric_enrollment.errors import EnrollmentSampleNotFoundError
 from app.modules.biometric_enrollment.repository import BiometricSampleRepository
+from app.modules.face_recognition.detection_scaling import build_detection_image
 from app.modules.face_recognition.domain import EmbeddingVector, MatchStatus
-from app.modules.face_recognition.errors import MatchProbeImageTooLargeError
+from app.modules.face_recognition.errors import (
+    FaceRecognitionError,
+    MatchProbeImageTooLargeError,
+    RecognitionAttendanceBatchTooManyImagesError,
+)
 from app.modules.face_recognition.health import get_face_recognition_health
-from app.modules.face_recognition.image_codec import ndarray_to_decoded_image
+from app.modules.face_recognition.image_codec import ImageFrame
 from app.modules.face_recognition.match_probe_validation import (
-    ValidatedProbeImage,
-    validate_probe_image_bytes,
+    decode_validated_probe_image,
 )
 from app.modules.face_recognition.matching_service import MatchingService
-from app.modules.face_recognition.pipeline import detect_align_embed
+from app.modules.face_recognition.metrics import (
+    CONTENT_TYPE,
+    STAGE_DECODE,
+    observe_stage,
+    offload,
+    render_metrics,
+)
+from app.modules.face_recognition.pipeline import detect_align_embed, detect_align_embed_all
+from app.modules.face_recognition.processing_jobs import ProcessingJobService
 from app.modules.face_recognition.processing_service import SampleProcessingService
+from app.modules.face_recognition.provider_factory import get_detector, get_embedder
+from app.modules.face_recognition.provider_pool import InstancePoolStats
 from app.modules.face_recognition.recognition_attendance_service import (
     RecognitionAttendanceService,
 )
+from app.modules.face_recognition.reembedding import ReembeddingService
 from app.modules.face_recognition.schemas import (
     BatchProcessingResult,
     FaceRecognitionHealthRead,
     MatchProbeResult,
+    ProcessingJobSummaryRead,
     ProcessSampleResult,
     ProviderHealthRead,
+    ProviderPoolsRead,
+    ProviderPoolStatsRead,
     RecognitionAttendanceAttemptRead,
+    RecognitionAttendanceBatchItemRead,
+    RecognitionAttendanceBatchRead,
     RecognitionAttendanceConfirmationRead,
     RecognitionAttendanceConfirmationRequest,
+    RecognitionAttendanceGroupRead,
+    ReembeddingProgressRead,
     SampleProcessingStatusRead,
 )
 from app.modules.users.models import User, UserRole
+from app.schemas.error import ErrorDetail
 
 router = APIRouter(prefix="/face-recognition", tags=["face recognition"])
 
@@ -118,7 +139,9 @@ async def process_pending_samples(
     """Process up to a bounded number of samples still awaiting processing.
 
     One on-demand call, not a background worker — see
-    ``SampleProcessingService.process_pending_batch``'s docstring.
+    ``SampleProcessingService.process_pending_batch``'s docstring. The
+    background alternative is the processing-job queue
+    (``app.modules.face_recognition.processing_jobs``).
     """
     service = SampleProcessingService(session)
     results = await service.process_pending_batch(
@@ -159,6 +182,86 @@ async def get_sample_processing_status(
     )
 
 
+@router.get("/processing-jobs/summary", response_model=ProcessingJobSummaryRead)
+async def get_processing_job_summary(
+    admin: AdminUser,
+    session: Session,
+    batch_id: uuid.UUID | None = None,
+) -> ProcessingJobSummaryRead:
+    """Processing-queue progress, overall or for one bulk-enrollment batch.
+
+    An unknown ``batch_id`` is all zeros, not a 404: the counts describe
+    the queue, and a batch with no jobs is simply empty.
+    """
+    summary = await ProcessingJobService(session).summarize(batch_id=batch_id)
+    return ProcessingJobSummaryRead(
+        batch_id=summary.batch_id,
+        total=summary.total,
+        queued=summary.queued,
+        running=summary.running,
+        succeeded=summary.succeeded,
+        failed=summary.failed,
+        cancelled=summary.cancelled,
+        finished=summary.finished,
+    )
+
+
+@router.get("/reembedding/progress", response_model=ReembeddingProgressRead)
+async def get_reembedding_progress(admin: AdminUser, session: Session) -> ReembeddingProgressRead:
+    """How far re-embedding after an embedding-model change has got — see
+    ``app.modules.face_recognition.reembedding``."""
+    progress = await ReembeddingService(session).progress()
+    return ReembeddingProgressRead(
+        model_version=progress.model.model_version,
+        total=progress.total,
+        current=progress.current,
+        stale=progress.stale,
+    )
+
+
+@router.get("/provider-pools", response_model=ProviderPoolsRead)
+async def get_provider_pools(admin: AdminUser) -> ProviderPoolsRead:
+    """This process's detector/embedder pool usage, including how long
+    inference calls waited for a free instance — see
+    ``app.modules.face_recognition.provider_pool``. Reading the stats
+    creates no instance and loads no model."""
+    settings = get_settings()
+    return ProviderPoolsRead(
+        detector=_pool_stats_read(get_detector(settings).pool.stats()),
+        embedder=_pool_stats_read(get_embedder(settings).pool.stats()),
+    )
+
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics(admin: AdminUser, request: Request) -> Response:
+    """This process's face-pipeline metrics in the Prometheus text format:
+    per-stage latency histograms, rejection counts, provider-pool usage
+    and startup warm-up durations — see
+    ``app.modules.face_recognition.metrics``. Creates no instance and
+    loads no model."""
+    settings = get_settings()
+    body = render_metrics(
+        pools={
+            "detector": get_detector(settings).pool.stats(),
+            "embedder": get_embedder(settings).pool.stats(),
+        },
+        warmup=getattr(request.app.state, "face_model_warmup", None),
+    )
+    return Response(content=body, media_type=CONTENT_TYPE)
+
+
+def _pool_stats_read(stats: InstancePoolStats) -> ProviderPoolStatsRead:
+    return ProviderPoolStatsRead(
+        size=stats.size,
+        created=stats.created,
+        in_use=stats.in_use,
+        checkouts=stats.checkouts,
+        waited_checkouts=stats.waited_checkouts,
+        total_wait_seconds=stats.total_wait_seconds,
+        max_wait_seconds=stats.max_wait_seconds,
+    )
+
+
 @router.get("/health", response_model=FaceRecognitionHealthRead)
 async def get_health(admin: AdminUser) -> FaceRecognitionHealthRead:
     """Provider/model readiness — never runs recognition against a real image.
@@ -188,6 +291,21 @@ async def get_health(admin: AdminUser) -> FaceRecognitionHealthRead:
     )
 
 
+def _decode_validated_probe_sync(
+    data: bytes, *, settings: Settings, declared_content_type: str | None
+) -> ImageFrame:
+    """Decoded-content validation (Stage 3 correction finding 5) and the
+    decoded frame detection needs, from one full decode of the upload —
+    shared by the single-face and group-photo offload targets below.
+    See ``match_probe_validation.decode_validated_probe_image``."""
+    started = time.perf_counter()
+    decoded = decode_validated_probe_image(
+        data, settings=settings, declared_content_type=declared_content_type
+    )
+    observe_stage(STAGE_DECODE, time.perf_counter() - started)
+    return decoded
+
+
 def _validate_and_embed_probe_sync(
     data: bytes, *, settings: Settings, declared_content_type: str | None
 ) -> EmbeddingVector:
@@ -195,23 +313,35 @@ def _validate_and_embed_probe_sync(
     validation (Stage 3 correction finding 5) followed by detect -> align ->
     embed (finding 3's offload target). Both are CPU/IO-bound and must run
     off the event loop; bundled into one function so ``match_probe`` below
-    can offload them with a single ``asyncio.to_thread`` call, exactly
+    can offload them with a single ``metrics.offload`` (``asyncio.to_thread``) call, exactly
     mirroring ``SampleProcessingService._load_and_embed_sync``.
 
     Raises a ``MatchProbeImage*Error`` (validation) or a
     ``FaceRecognitionError`` subclass (detection/alignment/embedding) —
     both are already sanitized, generic ``AppError``s; nothing here needs
     to catch and re-wrap them again.
+
+    Never consults or fills ``embedding_cache``: a probe is not a
+    ``BiometricSample``, so a cached probe embedding could never be
+    purged (see ``docs/BIOMETRIC_DATA_POLICY.md``).
     """
-    validated: ValidatedProbeImage = validate_probe_image_bytes(
+    decoded_image = _decode_validated_probe_sync(
         data, settings=settings, declared_content_type=declared_content_type
     )
-    with Image.open(BytesIO(data)) as image:
-        rgb_image = image.convert("RGB")
-        array = np.asarray(rgb_image, dtype=np.uint8)
-    del validated  # metadata only used for validation; the array above is re-decoded fresh
-    decoded_image = ndarray_to_decoded_image(array, color_format="rgb")
-    return detect_align_embed(decoded_image, settings=settings)
+    detection_image = build_detection_image(decoded_image, settings=settings)
+    return detect_align_embed(decoded_image, settings=settings, detection_image=detection_image)
+
+
+def _validate_and_embed_group_sync(
+    data: bytes, *, settings: Settings, declared_content_type: str | None
+) -> list[EmbeddingVector]:
+    """Group-photo counterpart of ``_validate_and_embed_probe_sync``: the
+    same validation, then one embedding per usable face (see
+    ``pipeline.detect_align_embed_all``) — all in one offloaded call."""
+    decoded_image = _decode_validated_probe_sync(
+        data, settings=settings, declared_content_type=declared_content_type
+    )
+    return detect_align_embed_all(decoded_image, settings=settings)
 
 
 @router.post("/match-probe", response_model=MatchProbeResult)
@@ -277,7 +407,7 @@ async def match_probe(
     # Stage 3 correction (finding 3): validation + detect -> align ->
     # embed is synchronous, CPU/IO-bound work — never called directly on
     # the event loop. See ``_validate_and_embed_probe_sync``.
-    probe_embedding = await asyncio.to_thread(
+    probe_embedding = await offload(
         _validate_and_embed_probe_sync,
         data,
         settings=settings,
@@ -332,7 +462,7 @@ async def create_recognition_attendance_attempt(
     if len(data) > _MAX_PROBE_IMAGE_BYTES:
         raise MatchProbeImageTooLargeError(_MAX_PROBE_IMAGE_BYTES)
 
-    probe_embedding = await asyncio.to_thread(
+    probe_embedding = await offload(
         _validate_and_embed_probe_sync,
         data,
         settings=settings,
@@ -356,6 +486,217 @@ async def create_recognition_attendance_attempt(
     )
 
 
+@router.post(
+    "/attendance/group-attempts",
+    response_model=RecognitionAttendanceGroupRead,
+)
+async def create_recognition_attendance_group_attempts(
+    current_user: AdminOrTeacher,
+    session: Session,
+    request: Request,
+    classroom_id: Annotated[uuid.UUID, Form()],
+    subject_id: Annotated[uuid.UUID, Form()],
+    attendance_date: Annotated[date, Form()],
+    file: Annotated[UploadFile, File(description="One classroom photo (JPEG/PNG/WEBP).")],
+) -> RecognitionAttendanceGroupRead:
+    """Recognize every face of one classroom photo within the authorized roster.
+
+    Same authorize-before-upload ordering and upload limits as the
+    single-face route. Each usable face gets its own attempt; no student
+    is FOUND for two faces, and every FOUND student is marked present in
+    one attendance transaction.
+    """
+    settings = get_settings()
+    service = RecognitionAttendanceService(session, settings=settings)
+    request_id = _request_id(request)
+
+    scope = await service.resolve_authorized_scope(
+        current_user=current_user,
+        classroom_id=classroom_id,
+        subject_id=subject_id,
+        attendance_date=attendance_date,
+        request_id=request_id,
+    )
+
+    data = await file.read(_MAX_PROBE_IMAGE_BYTES + 1)
+    declared_content_type = file.content_type
+    await file.close()
+    if len(data) > _MAX_PROBE_IMAGE_BYTES:
+        raise MatchProbeImageTooLargeError(_MAX_PROBE_IMAGE_BYTES)
+
+    probe_embeddings = await offload(
+        _validate_and_embed_group_sync,
+        data,
+        settings=settings,
+        declared_content_type=declared_content_type,
+    )
+    outcomes = await service.create_group_attempts(
+        current_user=current_user,
+        scope=scope,
+        probe_embeddings=probe_embeddings,
+        request_id=request_id,
+    )
+    return RecognitionAttendanceGroupRead(
+        classroom_id=scope.classroom_id,
+        subject_id=scope.subject_id,
+        attendance_date=scope.attendance_date,
+        face_count=len(outcomes),
+        found_count=sum(1 for outcome in outcomes if outcome.decision is MatchStatus.FOUND),
+        attempts=[
+            RecognitionAttendanceAttemptRead(
+                attempt_id=outcome.attempt_id,
+                classroom_id=outcome.classroom_id,
+                subject_id=outcome.subject_id,
+                attendance_date=outcome.attendance_date,
+                decision=outcome.decision,
+                matched_student_profile_id=outcome.matched_student_profile_id,
+                attendance_record_id=outcome.attendance_record_id,
+                requires_confirmation=outcome.decision is not MatchStatus.FOUND,
+            )
+            for outcome in outcomes
+        ],
+    )
+
+
+async def _read_and_embed_probe(
+    file: UploadFile, *, settings: Settings
+) -> EmbeddingVector | FaceRecognitionError:
+    """Read, validate and embed one batch image — the single-image route's
+    steps, with a per-image rejection (any 4xx ``FaceRecognitionError``:
+    too large, undecodable, no face, ...) returned instead of raised so
+    the rest of the batch still counts. Provider/model failures (5xx)
+    still fail the whole request."""
+    data = await file.read(_MAX_PROBE_IMAGE_BYTES + 1)
+    declared_content_type = file.content_type
+    await file.close()
+    if len(data) > _MAX_PROBE_IMAGE_BYTES:
+        return MatchProbeImageTooLargeError(_MAX_PROBE_IMAGE_BYTES)
+    try:
+        return await offload(
+            _validate_and_embed_probe_sync,
+            data,
+            settings=settings,
+            declared_content_type=declared_content_type,
+        )
+    except FaceRecognitionError as exc:
+        if exc.status_code >= 500:
+            raise
+        return exc
+
+
+async def _embed_batch_probes(
+    files: list[UploadFile], *, settings: Settings
+) -> list[EmbeddingVector | FaceRecognitionError]:
+    """Every batch image through ``_read_and_embed_probe``, at most
+    ``FACE_PROVIDER_POOL_SIZE`` at a time — as many as the provider pool
+    can run in parallel, and no more uploads held in memory than that."""
+    limit = asyncio.Semaphore(settings.FACE_PROVIDER_POOL_SIZE)
+
+    async def bounded(file: UploadFile) -> EmbeddingVector | FaceRecognitionError:
+        async with limit:
+            return await _read_and_embed_probe(file, settings=settings)
+
+    return list(await asyncio.gather(*(bounded(file) for file in files)))
+
+
+@router.post(
+    "/attendance/batch-attempts",
+    response_model=RecognitionAttendanceBatchRead,
+)
+async def create_recognition_attendance_batch_attempts(
+    current_user: AdminOrTeacher,
+    session: Session,
+    request: Request,
+    classroom_id: Annotated[uuid.UUID, Form()],
+    subject_id: Annotated[uuid.UUID, Form()],
+    attendance_date: Annotated[date, Form()],
+    files: Annotated[
+        list[UploadFile],
+        File(description="Single-face still images (JPEG/PNG/WEBP), one student each."),
+    ],
+) -> RecognitionAttendanceBatchRead:
+    """Recognize several single-face photos for one authorized scope at once.
+
+    Equivalent to one ``/attendance/attempts`` call per image, but the
+    scope is authorized and the roster and gallery are loaded once, the
+    images are embedded in parallel, and every attempt, decision audit
+    and attendance mark is committed in one transaction (see
+    ``RecognitionAttendanceService.create_batch_attempts``). Same
+    authorize-before-upload ordering and per-image limits. An image that
+    cannot be used gets an ``error`` in its result and no attempt.
+    """
+    settings = get_settings()
+    service = RecognitionAttendanceService(session, settings=settings)
+    request_id = _request_id(request)
+
+    scope = await service.resolve_authorized_scope(
+        current_user=current_user,
+        classroom_id=classroom_id,
+        subject_id=subject_id,
+        attendance_date=attendance_date,
+        request_id=request_id,
+    )
+    if len(files) > settings.FACE_ATTENDANCE_BATCH_MAX_IMAGES:
+        raise RecognitionAttendanceBatchTooManyImagesError(
+            settings.FACE_ATTENDANCE_BATCH_MAX_IMAGES
+        )
+
+    embedded = await _embed_batch_probes(files, settings=settings)
+    probes = [item for item in embedded if isinstance(item, EmbeddingVector)]
+    outcomes = iter(
+        await service.create_batch_attempts(
+            current_user=current_user,
+            scope=scope,
+            probe_embeddings=probes,
+            request_id=request_id,
+        )
+        if probes
+        else []
+    )
+
+    results: list[RecognitionAttendanceBatchItemRead] = []
+    for index, item in enumerate(embedded):
+        if isinstance(item, FaceRecognitionError):
+            results.append(
+                RecognitionAttendanceBatchItemRead(
+                    index=index,
+                    attempt=None,
+                    error=ErrorDetail(code=item.code, message=item.message, details=item.details),
+                )
+            )
+            continue
+        outcome = next(outcomes)
+        results.append(
+            RecognitionAttendanceBatchItemRead(
+                index=index,
+                attempt=RecognitionAttendanceAttemptRead(
+                    attempt_id=outcome.attempt_id,
+                    classroom_id=outcome.classroom_id,
+                    subject_id=outcome.subject_id,
+                    attendance_date=outcome.attendance_date,
+                    decision=outcome.decision,
+                    matched_student_profile_id=outcome.matched_student_profile_id,
+                    attendance_record_id=outcome.attendance_record_id,
+                    requires_confirmation=outcome.decision is not MatchStatus.FOUND,
+                ),
+                error=None,
+            )
+        )
+    return RecognitionAttendanceBatchRead(
+        classroom_id=scope.classroom_id,
+        subject_id=scope.subject_id,
+        attendance_date=scope.attendance_date,
+        image_count=len(results),
+        found_count=sum(
+            1
+            for result in results
+            if result.attempt is not None and result.attempt.decision is MatchStatus.FOUND
+        ),
+        rejected_count=sum(1 for result in results if result.error is not None),
+        results=results,
+    )
+
+
 @router.post(
     "/attendance/attempts/{attempt_id}/confirm",
     response_model=RecognitionAttendanceConfirmationRead,
@@ -16,6 +16,7 @@ from datetime import date, datetime
 from pydantic import BaseModel, ConfigDict
 
 from app.modules.face_recognition.domain import MatchStatus, ProviderStatus
+from app.schemas.error import ErrorDetail
 
 
 class SampleProcessingStatusRead(BaseModel):
@@ -57,6 +58,35 @@ class BatchProcessingResult(BaseModel):
     results: list[ProcessSampleResult]
 
 
+class ProcessingJobSummaryRead(BaseModel):
+    """Processing-queue progress: job counts by status, overall or for one
+    bulk-enrollment batch (``BulkEnrollmentResult.processing_batch_id``)."""
+
+    model_config = ConfigDict(frozen=True)
+
+    batch_id: uuid.UUID | None
+    total: int
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    cancelled: int
+    finished: int
+
+
+class ReembeddingProgressRead(BaseModel):
+    """Live, processed samples by whether their active embedding is from
+    the configured model (``model_version``); ``stale`` ones cannot be
+    matched until ``scripts.reembed_samples`` has re-embedded them."""
+
+    model_config = ConfigDict(frozen=True)
+
+    model_version: str
+    total: int
+    current: int
+    stale: int
+
+
 class ProviderHealthRead(BaseModel):
     """One provider's safe health metadata — mirrors ``domain.ProviderHealth`` exactly."""
 
@@ -67,6 +97,30 @@ class ProviderHealthRead(BaseModel):
     detail: str | None = None
 
 
+class ProviderPoolStatsRead(BaseModel):
+    """One provider instance pool's usage since process start — mirrors
+    ``provider_pool.InstancePoolStats``. Counts are per API process."""
+
+    model_config = ConfigDict(frozen=True)
+
+    size: int
+    created: int
+    in_use: int
+    checkouts: int
+    waited_checkouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+
+class ProviderPoolsRead(BaseModel):
+    """Detector and embedder pool usage for ``GET /face-recognition/provider-pools``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    detector: ProviderPoolStatsRead
+    embedder: ProviderPoolStatsRead
+
+
 class FaceRecognitionHealthRead(BaseModel):
     """Combined detector + embedder health for the ``GET /face-recognition/health`` route."""
 
@@ -110,6 +164,48 @@ class RecognitionAttendanceAttemptRead(BaseModel):
     requires_confirmation: bool
 
 
+class RecognitionAttendanceGroupRead(BaseModel):
+    """One group photo's result: one attempt per usable face, in reading order."""
+
+    model_config = ConfigDict(frozen=True)
+
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    attendance_date: date
+    face_count: int
+    found_count: int
+    attempts: list[RecognitionAttendanceAttemptRead]
+
+
+class RecognitionAttendanceBatchItemRead(BaseModel):
+    """One uploaded image's result, at its position in the request.
+
+    Exactly one of ``attempt`` and ``error`` is set. ``error`` is the same
+    sanitized code/message the single-image route would have answered
+    with (no face, unreadable image, ...); such an image has no attempt.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    index: int
+    attempt: RecognitionAttendanceAttemptRead | None
+    error: ErrorDetail | None
+
+
+class RecognitionAttendanceBatchRead(BaseModel):
+    """A batch of single-face photos: one item per uploaded image, in order."""
+
+    model_config = ConfigDict(frozen=True)
+
+    classroom_id: uuid.UUID
+    subject_id: uuid.UUID
+    attendance_date: date
+    image_count: int
+    found_count: int
+    rejected_count: int
+    results: list[RecognitionAttendanceBatchItemRead]
+
+
 class RecognitionAttendanceConfirmationRequest(BaseModel):
     model_config = ConfigDict(extra="forbid", frozen=True)
 
@@ -0,0 +1,153 @@
+"""Tiled multi-face detection for group (classroom) photos.
+
+``pipeline.detect_align_embed`` enforces "exactly one face" and runs the
+detector once over the whole image. A classroom photo is the opposite
+case: dozens of faces, the back rows only a few dozen pixels across.
+``detect_faces_tiled`` runs the detector once over the whole image and,
+when the image is larger than one tile
+(``Settings.FACE_GROUP_TILE_SIZE_PX``) in either direction, once more
+over each tile of an overlapping grid. Each tile is a native-resolution
+crop, so a small face keeps every one of its pixels however the
+detector sizes a whole-image pass; the whole-image pass still finds a
+face too large to sit inside a single tile.
+
+**Coordinates.** Every tile detection is translated back into the whole
+image's pixel space before it is returned — boxes *and* landmarks — so
+``alignment.align_face`` warps from the original full-resolution image,
+exactly as it does for a single-face probe. Tiles are ``ImageFrame.crop``
+views of that image, so tiling copies no pixels.
+
+**Partial faces and duplicates.** A tile detection whose box comes
+within ``_SEAM_MARGIN_PX`` of a tile edge that is *not* also an image
+edge is discarded as a face cut by the tile: tiles overlap by
+``_TILE_OVERLAP_RATIO`` of their edge, so a face up to that size lies
+wholly inside a neighbouring tile, and a larger one is the whole-image
+pass's to find. What remains can still be seen twice — by two
+overlapping tiles, or by a tile and the whole-image pass — so
+detections are then merged greedily in descending confidence, dropping
+any that overlaps an already-kept detection by more than
+``_DUPLICATE_IOU`` intersection-over-union.
+
+The merged list is returned in reading order (top-to-bottom, then
+left-to-right) so the same photo always yields the same face order.
+"""
+
+from __future__ import annotations
+
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DetectedFace,
+    FacialLandmark,
+)
+from app.modules.face_recognition.image_codec import ImageFrame
+from app.modules.face_recognition.protocols import FaceDetector
+
+_TILE_OVERLAP_RATIO = 0.25
+_SEAM_MARGIN_PX = 2
+_DUPLICATE_IOU = 0.3
+
+
+def tile_origins(length_px: int, *, tile_size_px: int) -> list[int]:
+    """Start offsets of overlapping tiles covering ``[0, length_px)``.
+
+    One tile (at ``0``) when the image fits; otherwise tiles advance by
+    ``tile_size_px * (1 - _TILE_OVERLAP_RATIO)`` and the last one is
+    pinned to the far edge, so no tile extends past the image.
+    """
+    if length_px <= tile_size_px:
+        return [0]
+    stride = max(1, int(tile_size_px * (1 - _TILE_OVERLAP_RATIO)))
+    last = length_px - tile_size_px
+    origins = list(range(0, last, stride))
+    origins.append(last)
+    return origins
+
+
+def detect_faces_tiled(
+    detector: FaceDetector, image: ImageFrame, *, tile_size_px: int
+) -> list[DetectedFace]:
+    """Every distinct face in ``image``, in reading order — see this
+    module's docstring. Raises whatever ``detector.detect`` raises."""
+    detections = list(detector.detect(image))
+
+    width, height = image.dimensions.width_px, image.dimensions.height_px
+    if width > tile_size_px or height > tile_size_px:
+        for y0 in tile_origins(height, tile_size_px=tile_size_px):
+            for x0 in tile_origins(width, tile_size_px=tile_size_px):
+                tile = image.crop(x_px=x0, y_px=y0, width_px=tile_size_px, height_px=tile_size_px)
+                detections.extend(
+                    _translate(face, image=image, dx=x0, dy=y0)
+                    for face in detector.detect(tile)
+                    if not _touches_seam(face.bounding_box, x0=x0, y0=y0, tile=tile, image=image)
+                )
+
+    return sorted(
+        merge_duplicate_detections(detections),
+        key=lambda face: (face.bounding_box.y_px, face.bounding_box.x_px),
+    )
+
+
+def merge_duplicate_detections(detections: list[DetectedFace]) -> list[DetectedFace]:
+    """Greedy confidence-ordered duplicate suppression (see module docstring)."""
+    ranked = sorted(
+        detections,
+        key=lambda face: (
+            -face.confidence,
+            -(face.bounding_box.width_px * face.bounding_box.height_px),
+            face.bounding_box.y_px,
+            face.bounding_box.x_px,
+        ),
+    )
+    kept: list[DetectedFace] = []
+    for face in ranked:
+        if not any(_is_duplicate(face.bounding_box, other.bounding_box) for other in kept):
+            kept.append(face)
+    return kept
+
+
+def _is_duplicate(a: BoundingBox, b: BoundingBox) -> bool:
+    overlap_width = min(a.right_px, b.right_px) - max(a.x_px, b.x_px)
+    overlap_height = min(a.bottom_px, b.bottom_px) - max(a.y_px, b.y_px)
+    if overlap_width <= 0 or overlap_height <= 0:
+        return False
+    intersection = overlap_width * overlap_height
+    union = a.width_px * a.height_px + b.width_px * b.height_px - intersection
+    return intersection / union > _DUPLICATE_IOU
+
+
+def _touches_seam(
+    box: BoundingBox, *, x0: int, y0: int, tile: ImageFrame, image: ImageFrame
+) -> bool:
+    """Whether ``box`` (tile coordinates) reaches a tile edge inside the image."""
+    tile_width, tile_height = tile.dimensions.width_px, tile.dimensions.height_px
+    return (
+        (x0 > 0 and box.x_px <= _SEAM_MARGIN_PX)
+        or (y0 > 0 and box.y_px <= _SEAM_MARGIN_PX)
+        or (
+            x0 + tile_width < image.dimensions.width_px
+            and box.right_px >= tile_width - _SEAM_MARGIN_PX
+        )
+        or (
+            y0 + tile_height < image.dimensions.height_px
+            and box.bottom_px >= tile_height - _SEAM_MARGIN_PX
+        )
+    )
+
+
+def _translate(face: DetectedFace, *, image: ImageFrame, dx: int, dy: int) -> DetectedFace:
+    box = face.bounding_box
+    return DetectedFace(
+        bounding_box=BoundingBox(
+            x_px=box.x_px + dx, y_px=box.y_px + dy, width_px=box.width_px, height_px=box.height_px
+        ),
+        source_image_dimensions=image.dimensions,
+        confidence=face.confidence,
+        landmarks=(
+            tuple(
+                FacialLandmark(x_px=point.x_px + dx, y_px=point.y_px + dy)
+                for point in face.landmarks
+            )
+            if face.landmarks is not None
+            else None
+        ),
+    )
@@ -0,0 +1,170 @@
+"""Opt-in model preloading and warm-up at API startup.
+
+Detector and embedder instances load their models lazily, on their first
+``detect``/``embed`` call (or an admin's ``/face-recognition/health``).
+That first call pays for SHA-256 verification of the model file
+(``model_artifacts``), parsing it, and cold native caches, so the first
+probe after a deploy or restart is slow enough to time out.
+
+With ``Settings.FACE_PRELOAD_MODELS`` (and a provider configured),
+``app.main.lifespan`` starts ``run_model_warmup`` as a background task:
+
+- **Load**: every instance of both provider pools is created up front
+  (``InstancePool.prefill``, all ``FACE_PROVIDER_POOL_SIZE`` of each)
+  and loads its model through the same ``is_available`` probe health
+  reporting uses.
+- **Warm-up**: each instance then runs one inference on synthetic
+  pixels — a flat grey frame at ``FACE_DETECTOR_INPUT_SIZE_PX`` through
+  the detector, a seeded-noise chip of the aligned size through the
+  embedder. No biometric image is involved and the results are
+  discarded.
+- **Durations**: summed load and warm-up seconds per provider are kept
+  on the ``ModelWarmup`` record and logged as ``face_models_warmed``.
+
+Until the task has finished, GET /health/ready answers 503
+(``require_face_models_ready`` -> ``FaceModelsNotReadyError``), so a load
+balancer only routes traffic to warm processes. Liveness and every
+other route are served meanwhile. If loading fails (a missing or
+mismatched model file, say) readiness stays 503 and the cause is
+logged (``face_models_warmup_failed``): a process told to preload models
+it cannot load is misconfigured, not ready.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+import numpy as np
+import structlog
+from fastapi import Request
+
+from app.core.config import Settings
+from app.modules.face_recognition.alignment import ALIGNED_FACE_SIZE_PX
+from app.modules.face_recognition.domain import ImageDimensions, NormalizedFaceInput
+from app.modules.face_recognition.errors import (
+    FaceModelsNotReadyError,
+    FaceProviderUnavailableError,
+)
+from app.modules.face_recognition.image_codec import ImageFrame
+from app.modules.face_recognition.provider_factory import get_detector, get_embedder
+from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+
+logger = structlog.get_logger(__name__)
+
+
+class ModelWarmupStatus(StrEnum):
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass
+class ModelWarmup:
+    """Progress and timings of one process's startup preload.
+
+    ``instances``/``load_seconds``/``warmup_seconds`` are keyed by
+    ``"detector"``/``"embedder"``; the seconds are summed over that
+    provider's instances.
+    """
+
+    status: ModelWarmupStatus = ModelWarmupStatus.PENDING
+    instances: dict[str, int] = field(default_factory=dict)
+    load_seconds: dict[str, float] = field(default_factory=dict)
+    warmup_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ready(self) -> bool:
+        return self.status is ModelWarmupStatus.READY
+
+
+def preload_models(settings: Settings, warmup: ModelWarmup) -> None:
+    """Load and warm every pooled detector and embedder instance.
+
+    Blocking — model I/O and inference; ``run_model_warmup`` runs it in
+    a worker thread. Raises ``FaceProviderUnavailableError`` if a model
+    cannot be loaded, or whatever the synthetic inference raised.
+    """
+    detector_pool = get_detector(settings).pool
+    embedder_pool = get_embedder(settings).pool
+    warmup.instances["detector"] = detector_pool.prefill(
+        _timed("detector", warmup, infer=_detector_inference(settings))
+    )
+    warmup.instances["embedder"] = embedder_pool.prefill(
+        _timed("embedder", warmup, infer=_embedder_inference())
+    )
+
+
+async def run_model_warmup(settings: Settings, warmup: ModelWarmup) -> None:
+    """``preload_models`` off the event loop, then settle ``warmup.status``."""
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(preload_models, settings, warmup)
+    except Exception as exc:
+        warmup.status = ModelWarmupStatus.FAILED
+        logger.error("face_models_warmup_failed", exc_type=type(exc).__name__)
+        return
+    warmup.status = ModelWarmupStatus.READY
+    logger.info(
+        "face_models_warmed",
+        instances=warmup.instances,
+        load_seconds=warmup.load_seconds,
+        warmup_seconds=warmup.warmup_seconds,
+        total_seconds=round(time.perf_counter() - started, 3),
+    )
+
+
+async def require_face_models_ready(request: Request) -> str | None:
+    """FastAPI dependency for GET /health/ready.
+
+    ``None`` when this process is not preloading models (nothing to
+    report), ``"ready"`` once it has finished; raises
+    ``FaceModelsNotReadyError`` before then or after a failure.
+    """
+    warmup: ModelWarmup | None = getattr(request.app.state, "face_model_warmup", None)
+    if warmup is None:
+        return None
+    if warmup.status is not ModelWarmupStatus.READY:
+        raise FaceModelsNotReadyError()
+    return "ready"
+
+
+type _Provider = YuNetFaceDetector | DlibResnetFaceEmbedder
+
+
+def _timed[ProviderT: _Provider](
+    name: str, warmup: ModelWarmup, *, infer: Callable[[ProviderT], object]
+) -> Callable[[ProviderT], None]:
+    def prepare(instance: ProviderT) -> None:
+        started = time.perf_counter()
+        if not instance.is_available():
+            raise FaceProviderUnavailableError()
+        loaded = time.perf_counter()
+        infer(instance)
+        finished = time.perf_counter()
+        warmup.load_seconds[name] = warmup.load_seconds.get(name, 0.0) + (loaded - started)
+        warmup.warmup_seconds[name] = warmup.warmup_seconds.get(name, 0.0) + (finished - loaded)
+
+    return prepare
+
+
+def _detector_inference(settings: Settings) -> Callable[[YuNetFaceDetector], object]:
+    size = settings.FACE_DETECTOR_INPUT_SIZE_PX
+    frame = ImageFrame(np.full((size, size, 3), 128, dtype=np.uint8), color_format="bgr")
+    return lambda detector: detector.detect(frame)
+
+
+def _embedder_inference() -> Callable[[DlibResnetFaceEmbedder], object]:
+    pixels = np.random.default_rng(0).integers(
+        0, 256, size=(ALIGNED_FACE_SIZE_PX, ALIGNED_FACE_SIZE_PX, 3), dtype=np.uint8
+    )
+    chip = NormalizedFaceInput(
+        dimensions=ImageDimensions(width_px=ALIGNED_FACE_SIZE_PX, height_px=ALIGNED_FACE_SIZE_PX),
+        pixel_data=pixels.tobytes(),
+        color_format="rgb",
+    )
+    return lambda embedder: embedder.embed(chip)
@@ -10,6 +10,7 @@ not (and cannot cleanly be) a single-table database CHECK constraint.
 from __future__ import annotations
 
 import uuid
+from collections.abc import Collection
 
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
@@ -139,6 +140,16 @@ class StudentProfileRepository:
     async def get_by_id(self, profile_id: uuid.UUID) -> StudentProfile | None:
         return await self._session.get(StudentProfile, profile_id)
 
+    async def get_by_ids(
+        self, profile_ids: Collection[uuid.UUID]
+    ) -> dict[uuid.UUID, StudentProfile]:
+        """The existing profiles among ``profile_ids``, keyed by ID, in one query."""
+        if not profile_ids:
+            return {}
+        stmt = select(StudentProfile).where(StudentProfile.id.in_(profile_ids))
+        result = await self._session.execute(stmt)
+        return {profile.id: profile for profile in result.scalars().all()}
+
     async def get_by_user_id(self, user_id: uuid.UUID) -> StudentProfile | None:
         stmt = select(StudentProfile).where(StudentProfile.user_id == user_id)
         result = await self._session.execute(stmt)
@@ -2,6 +2,8 @@
 
 The active classroom roster is the left side of grouped report queries, so
 zero-record students are represented without running one query per student.
+Summary and roster counts sum ``attendance_counts_source`` — monthly
+rollups for whole months, raw rows for the partial months at the edges.
 """
 
 from __future__ import annotations
@@ -10,10 +12,11 @@ import uuid
 from dataclasses import dataclass
 from datetime import date
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.attendance.models import AttendanceRecord, AttendanceStatus
+from app.modules.attendance.repository import attendance_counts_source
 from app.modules.profiles.models import StudentProfile
 
 
@@ -58,29 +61,26 @@ class ReportsRepository:
         date_to: date,
         student_profile_id: uuid.UUID | None,
     ) -> tuple[int, int, int]:
+        source = attendance_counts_source(
+            classroom_id=classroom_id,
+            subject_id=subject_id,
+            student_profile_id=student_profile_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
         stmt = (
             select(
-                func.count(AttendanceRecord.id).label("total"),
-                func.count(AttendanceRecord.id)
-                .filter(AttendanceRecord.status == AttendanceStatus.PRESENT)
-                .label("present_count"),
-                func.count(AttendanceRecord.id)
-                .filter(AttendanceRecord.status == AttendanceStatus.ABSENT)
-                .label("absent_count"),
+                func.coalesce(func.sum(source.c.total_count), 0).label("total"),
+                func.coalesce(func.sum(source.c.present_count), 0).label("present_count"),
+                func.coalesce(func.sum(source.c.absent_count), 0).label("absent_count"),
             )
-            .select_from(AttendanceRecord)
-            .join(StudentProfile, StudentProfile.id == AttendanceRecord.student_profile_id)
+            .select_from(source)
+            .join(StudentProfile, StudentProfile.id == source.c.student_profile_id)
             .where(
-                AttendanceRecord.classroom_id == classroom_id,
-                AttendanceRecord.subject_id == subject_id,
-                AttendanceRecord.attendance_date >= date_from,
-                AttendanceRecord.attendance_date <= date_to,
                 StudentProfile.classroom_id == classroom_id,
                 StudentProfile.is_active.is_(True),
             )
         )
-        if student_profile_id is not None:
-            stmt = stmt.where(AttendanceRecord.student_profile_id == student_profile_id)
         row = (await self._session.execute(stmt)).one()
         return int(row.total), int(row.present_count), int(row.absent_count)
 
@@ -142,32 +142,36 @@ class ReportsRepository:
         date_to: date,
         limit: int,
     ) -> list[RosterAttendanceAggregate]:
-        attendance_scope = and_(
-            AttendanceRecord.student_profile_id == StudentProfile.id,
-            AttendanceRecord.classroom_id == classroom_id,
-            AttendanceRecord.subject_id == subject_id,
-            AttendanceRecord.attendance_date >= date_from,
-            AttendanceRecord.attendance_date <= date_to,
+        source = attendance_counts_source(
+            classroom_id=classroom_id,
+            subject_id=subject_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        per_student = (
+            select(
+                source.c.student_profile_id,
+                func.sum(source.c.total_count).label("total"),
+                func.sum(source.c.present_count).label("present_count"),
+                func.sum(source.c.absent_count).label("absent_count"),
+            )
+            .group_by(source.c.student_profile_id)
+            .subquery("per_student")
         )
         stmt = (
             select(
                 StudentProfile.id.label("student_profile_id"),
                 StudentProfile.roll_number,
-                func.count(AttendanceRecord.id).label("total"),
-                func.count(AttendanceRecord.id)
-                .filter(AttendanceRecord.status == AttendanceStatus.PRESENT)
-                .label("present_count"),
-                func.count(AttendanceRecord.id)
-                .filter(AttendanceRecord.status == AttendanceStatus.ABSENT)
-                .label("absent_count"),
+                func.coalesce(per_student.c.total, 0).label("total"),
+                func.coalesce(per_student.c.present_count, 0).label("present_count"),
+                func.coalesce(per_student.c.absent_count, 0).label("absent_count"),
             )
             .select_from(StudentProfile)
-            .outerjoin(AttendanceRecord, attendance_scope)
+            .outerjoin(per_student, per_student.c.student_profile_id == StudentProfile.id)
             .where(
                 StudentProfile.classroom_id == classroom_id,
                 StudentProfile.is_active.is_(True),
             )
-            .group_by(StudentProfile.id, StudentProfile.roll_number)
             .order_by(
                 StudentProfile.roll_number.asc().nulls_last(),
                 StudentProfile.id,
@@ -1,12 +1,66 @@
-"""Shared offset-pagination response model."""
+"""Shared pagination response models and the opaque keyset cursor codec.
+
+``Page`` is the offset-pagination shape every list endpoint returns.
+``CursorPage`` adds ``next_cursor`` for endpoints that also support
+keyset pagination: the cursor encodes the sort key of a page's last row,
+so the next page starts with an indexed range condition instead of
+scanning and discarding ``offset`` rows. Its ``total`` is ``None`` when
+the caller asked to skip the count.
+
+Cursor tokens are opaque to clients — base64url-encoded JSON of the sort
+key values as strings. They are not signed: a forged cursor can only move
+the start of a page the caller is already authorized to read, since every
+filter and authorization check still applies.
+"""
 
 from __future__ import annotations
 
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
 from pydantic import BaseModel, Field
 
+from app.core.exceptions import InvalidPaginationCursorError
+
 
 class Page[ItemT](BaseModel):
     items: list[ItemT]
     total: int = Field(..., ge=0)
     limit: int = Field(..., ge=1, le=100)
     offset: int = Field(..., ge=0)
+
+
+class CursorPage[ItemT](BaseModel):
+    items: list[ItemT]
+    total: int | None = Field(..., ge=0)
+    limit: int = Field(..., ge=1, le=100)
+    offset: int = Field(..., ge=0)
+    next_cursor: str | None
+
+
+def encode_cursor(values: Sequence[str]) -> str:
+    payload = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str, *, size: int) -> list[str]:
+    """The ``size`` string values in ``token``, or ``InvalidPaginationCursorError``."""
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidPaginationCursorError() from exc
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise InvalidPaginationCursorError()
+    return values
+
+
+def reject_offset_with_cursor(cursor: str | None, offset: int) -> None:
+    if cursor is not None and offset != 0:
+        raise InvalidPaginationCursorError("cursor cannot be combined with a non-zero offset.")
@@ -160,6 +160,8 @@ _PHASE2_AND_PHASE3_TABLES_CHILD_FIRST: tuple[str, ...] = (
     # Phase 5 Stage 4: attempts reference users, classroom/subject,
     # student profiles, and (after a mark) attendance_records.
     "recognition_attendance_attempts",
+    # Processing jobs reference biometric_samples and users.
+    "biometric_processing_jobs",
     # Phase 5 Stage 3: biometric_embeddings FKs to biometric_samples,
     # so it must be deleted first.
     "biometric_embeddings",
@@ -167,6 +169,9 @@ _PHASE2_AND_PHASE3_TABLES_CHILD_FIRST: tuple[str, ...] = (
     "biometric_enrollments",
     "audit_logs",
     "attendance_records",
+    # Emptied by the attendance_records triggers already; listed so a
+    # drifted row left by a test cannot leak into the next one.
+    "attendance_monthly_rollups",
     "announcement_classrooms",
     "announcements",
     "timetable_entries",
@@ -22,6 +22,7 @@ import hashlib
 import io
 import math
 import uuid
+from collections.abc import Sequence
 from contextlib import contextmanager
 from datetime import UTC, datetime
 from typing import Any
@@ -47,6 +48,7 @@ from app.modules.face_recognition.domain import (
     ImageDimensions,
     NormalizedFaceInput,
 )
+from app.modules.face_recognition.errors import FaceProviderUnavailableError, FaceRecognitionError
 
 DEFAULT_DIMENSIONS = ImageDimensions(width_px=400, height_px=400)
 
@@ -198,6 +200,7 @@ class FakeFaceEmbedder:
         self._seed = seed
         self._raise_error = raise_error
         self.available = True
+        self.embed_many_batch_sizes: list[int] = []
 
     def is_available(self) -> bool:
         return self.available
@@ -207,6 +210,24 @@ class FakeFaceEmbedder:
             raise self._raise_error
         return make_unit_embedding_vector(dimension=self._dimension, seed=self._seed)
 
+    def embed_many(
+        self, faces: Sequence[NormalizedFaceInput]
+    ) -> list[EmbeddingVector | FaceRecognitionError]:
+        """Per-face ``embed`` with the real adapter's failure contract: a
+        ``FaceProviderUnavailableError`` fails the whole call, any other
+        typed error is returned in that face's slot. Records each call's
+        batch size in ``embed_many_batch_sizes``."""
+        self.embed_many_batch_sizes.append(len(faces))
+        results: list[EmbeddingVector | FaceRecognitionError] = []
+        for face in faces:
+            try:
+                results.append(self.embed(face))
+            except FaceProviderUnavailableError:
+                raise
+            except FaceRecognitionError as exc:
+                results.append(exc)
+        return results
+
 
 @contextmanager
 def patch_providers(detector: FakeFaceDetector, embedder: FakeFaceEmbedder):
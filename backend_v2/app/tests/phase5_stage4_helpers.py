@@ -11,7 +11,9 @@ from datetime import UTC, datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.modules.biometric_enrollment.repository import BiometricSampleRepository
+from app.modules.face_recognition.provider_factory import current_embedding_model
 from app.modules.face_recognition.repository import BiometricEmbeddingRepository
 from app.tests.phase5_stage3_helpers import seed_active_sample_direct
 
@@ -35,9 +37,7 @@ async def seed_processed_embedding_direct(
     await samples.mark_processed(sample, completed_at=datetime.now(UTC))
     await BiometricEmbeddingRepository(session).create_active(
         biometric_sample_id=sample.id,
-        provider_name="stage4_fake",
-        model_identifier="stage4_fake_model",
-        model_version="test-v1",
+        model=current_embedding_model(get_settings()),
         embedding_values=embedding_values,
         model_artifact_checksum=None,
     )
@@ -3,7 +3,7 @@
 Covers authorization (same exact-scope rules as detail/stats), CSV
 shape (headers, stable column order, empty-result behavior), and
 formula-injection escaping for every trigger character the Stage 3
-brief lists (``=``, ``+``, ``-``, ``@``).
+brief lists (``=``, ``+``, ``-``, ``@``), and the chunked, streamed body.
 """
 
 from __future__ import annotations
@@ -12,14 +12,19 @@ import csv
 import io
 import os
 import tempfile
-from datetime import date
+from collections.abc import AsyncIterator
+from datetime import date, timedelta
 
+import pytest
 from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.attendance.csv_export import CSV_COLUMNS
+from app.modules.academics.models import Classroom, Subject
+from app.modules.attendance import read_service
+from app.modules.attendance.csv_export import CSV_COLUMNS, iter_attendance_csv
 from app.modules.attendance.models import AuditLog, AuditOutcome
+from app.modules.attendance.repository import AttendanceExportRow
 from app.tests.attendance_http_helpers import mark_attendance, seed_attendance_scope
 from app.tests.phase3_http_helpers import auth_headers
 
@@ -243,3 +248,54 @@ async def test_csv_output_contains_no_sensitive_data(
     assert bearer_token not in body_text
     assert "password" not in body_text.lower()
     assert "authorization" not in body_text.lower()
+
+
+async def test_csv_streams_rows_fetched_in_chunks_in_order(
+    client_db: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(read_service, "EXPORT_FETCH_CHUNK_ROWS", 2)
+    scope = await seed_attendance_scope(client_db, db_session, suffix="csv-chunks")
+    days = [(date.today() - timedelta(days=offset)).isoformat() for offset in (2, 1, 0)]
+    for day in reversed(days):
+        await mark_attendance(
+            client_db,
+            user=scope["admin"],
+            classroom_id=scope["classroom"]["id"],
+            subject_id=scope["subject"]["id"],
+            attendance_date=day,
+            records=[
+                {"student_profile_id": scope["student_profile_1"]["id"], "status": "present"},
+                {"student_profile_id": scope["student_profile_2"]["id"], "status": "absent"},
+            ],
+        )
+    response = await client_db.get(
+        "/api/v1/attendance/export",
+        params={"classroom_id": scope["classroom"]["id"], "subject_id": scope["subject"]["id"]},
+        headers=auth_headers(scope["admin"]),
+    )
+    assert response.status_code == 200
+    rows = _parse_csv(response.content)
+    date_index = list(CSV_COLUMNS).index("attendance_date")
+    student_index = list(CSV_COLUMNS).index("student_profile_id")
+    assert [row[date_index] for row in rows[1:]] == [day for day in days for _ in range(2)]
+    assert [row[student_index] for row in rows[1:]] == sorted(
+        [scope["student_profile_1"]["id"], scope["student_profile_2"]["id"]]
+    ) * 3
+
+
+async def test_csv_header_is_yielded_before_rows_are_fetched() -> None:
+    pulled = False
+
+    async def chunks() -> AsyncIterator[list[AttendanceExportRow]]:
+        nonlocal pulled
+        pulled = True
+        yield []
+
+    body = iter_attendance_csv(
+        classroom=Classroom(code="C"), subject=Subject(code="S"), chunks=chunks()
+    )
+    first = await anext(body)
+    assert _parse_csv(first) == [list(CSV_COLUMNS)]
+    assert not pulled
+    assert [chunk async for chunk in body] == []
+    assert pulled
@@ -313,6 +313,70 @@ async def test_detail_deterministic_pagination(
     assert first_id != second_id
 
 
+async def _walk_cursor_pages(
+    client_db: AsyncClient, path: str, params: dict[str, Any], headers: dict[str, str]
+) -> list[str]:
+    ids: list[str] = []
+    cursor: str | None = None
+    while True:
+        page_params = {**params, "limit": 1, "include_total": "false"}
+        if cursor is not None:
+            page_params["cursor"] = cursor
+        response = await client_db.get(path, params=page_params, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["total"] is None
+        ids.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+async def test_detail_cursor_pagination_matches_offset_order(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="detail-cursor")
+    await _mark_two_students(client_db, scope, when=TODAY)
+    await _mark_two_students(client_db, scope, when=(date.today() - timedelta(days=1)).isoformat())
+    params = {"classroom_id": scope["classroom"]["id"], "subject_id": scope["subject"]["id"]}
+    headers = auth_headers(scope["admin"])
+
+    full = await client_db.get("/api/v1/attendance/detail", params=params, headers=headers)
+    assert full.json()["total"] == 4
+    assert full.json()["next_cursor"] is None
+    offset_page = await client_db.get(
+        "/api/v1/attendance/detail", params={**params, "limit": 3}, headers=headers
+    )
+    assert offset_page.json()["next_cursor"] is not None
+
+    walked = await _walk_cursor_pages(client_db, "/api/v1/attendance/detail", params, headers)
+    assert walked == [item["id"] for item in full.json()["items"]]
+
+
+async def test_detail_rejects_malformed_cursor_and_cursor_with_offset(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="detail-bad-cursor")
+    await _mark_two_students(client_db, scope, when=TODAY)
+    params = {"classroom_id": scope["classroom"]["id"], "subject_id": scope["subject"]["id"]}
+    headers = auth_headers(scope["admin"])
+    first = await client_db.get(
+        "/api/v1/attendance/detail", params={**params, "limit": 1}, headers=headers
+    )
+    cursor = first.json()["next_cursor"]
+
+    for bad_params in (
+        {"cursor": "not-a-cursor"},
+        {"cursor": cursor[:-4]},
+        {"cursor": cursor, "offset": 1},
+    ):
+        response = await client_db.get(
+            "/api/v1/attendance/detail", params={**params, **bad_params}, headers=headers
+        )
+        assert response.status_code == 422, bad_params
+        assert response.json()["error"]["code"] == "INVALID_PAGINATION_CURSOR"
+
+
 async def test_detail_classroom_and_subject_filtering(
     client_db: AsyncClient, db_session: AsyncSession
 ) -> None:
@@ -489,6 +553,20 @@ async def test_student_self_detail_and_stats_succeed(
     assert stats_body["present_count"] == 1
 
 
+async def test_student_self_detail_cursor_pagination(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="self-cursor")
+    await _mark_two_students(client_db, scope, when=TODAY)
+    await _mark_two_students(client_db, scope, when=(date.today() - timedelta(days=1)).isoformat())
+    headers = auth_headers(scope["student_1"])
+
+    full = await client_db.get("/api/v1/attendance/me/detail", headers=headers)
+    walked = await _walk_cursor_pages(client_db, "/api/v1/attendance/me/detail", {}, headers)
+    assert len(walked) == 2
+    assert walked == [item["id"] for item in full.json()["items"]]
+
+
 async def test_student_self_detail_ignores_unsupported_student_profile_id_param(
     client_db: AsyncClient, db_session: AsyncSession
 ) -> None:
@@ -18,7 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.modules.academics.repository import ClassroomRepository, SubjectRepository
 from app.modules.attendance.errors import AttendanceRecordAlreadyExistsError
 from app.modules.attendance.models import AttendanceStatus
-from app.modules.attendance.repository import AttendanceRepository
+from app.modules.attendance.repository import AttendanceMark, AttendanceRepository
 from app.modules.auth.security import hash_password
 from app.modules.profiles.repository import StudentProfileRepository
 from app.modules.users.models import UserRole
@@ -212,6 +212,76 @@ async def test_update_changes_status_remarks_and_marked_by(db_session: AsyncSess
     assert updated.marked_by_user_id == other_marker_id
 
 
+async def test_upsert_many_creates_and_updates_in_one_statement(db_session: AsyncSession) -> None:
+    fx = await _seed(db_session, suffix="upsert")
+    repo = AttendanceRepository(db_session)
+    on = date(2026, 7, 5)
+    existing = await repo.create(
+        student_profile_id=fx.student_b_id,
+        classroom_id=fx.classroom_id,
+        subject_id=fx.subject_id,
+        attendance_date=on,
+        status=AttendanceStatus.ABSENT,
+        marked_by_user_id=fx.teacher_user_id,
+    )
+    await db_session.commit()
+    existing_id, existing_updated_at = existing.id, existing.updated_at
+
+    results = await repo.upsert_many(
+        classroom_id=fx.classroom_id,
+        subject_id=fx.subject_id,
+        attendance_date=on,
+        marks=[
+            AttendanceMark(
+                student_profile_id=fx.student_b_id, status=AttendanceStatus.PRESENT, remarks="late"
+            ),
+            AttendanceMark(
+                student_profile_id=fx.student_a_id, status=AttendanceStatus.ABSENT, remarks=None
+            ),
+        ],
+        marked_by_user_id=fx.teacher_user_id,
+    )
+    await db_session.commit()
+
+    assert [result.created for result in results] == [False, True]
+    assert [result.record.student_profile_id for result in results] == [
+        fx.student_b_id,
+        fx.student_a_id,
+    ]
+    updated = results[0].record
+    assert updated.id == existing_id
+    assert (updated.status, updated.remarks) == (AttendanceStatus.PRESENT, "late")
+    assert updated.updated_at > existing_updated_at
+    assert await repo.count(classroom_id=fx.classroom_id, subject_id=fx.subject_id) == 2
+
+
+async def test_upsert_many_leaves_updated_at_alone_for_unchanged_rows(
+    db_session: AsyncSession,
+) -> None:
+    fx = await _seed(db_session, suffix="upsert-same")
+    repo = AttendanceRepository(db_session)
+    mark = AttendanceMark(
+        student_profile_id=fx.student_a_id, status=AttendanceStatus.PRESENT, remarks=None
+    )
+    kwargs = {
+        "classroom_id": fx.classroom_id,
+        "subject_id": fx.subject_id,
+        "attendance_date": date(2026, 7, 6),
+        "marks": [mark],
+        "marked_by_user_id": fx.teacher_user_id,
+    }
+    (first,) = await repo.upsert_many(**kwargs)
+    await db_session.commit()
+    first_updated_at = first.record.updated_at
+
+    (second,) = await repo.upsert_many(**kwargs)
+    await db_session.commit()
+
+    assert second.created is False
+    assert second.record.updated_at == first_updated_at
+    assert await repo.upsert_many(**{**kwargs, "marks": []}) == []
+
+
 # --- listing / filtering -----------------------------------------------------
 
 
@@ -0,0 +1,180 @@
+"""Tests for ``attendance_monthly_rollups``: the ``attendance_records``
+triggers that maintain it, the whole-month split the aggregates read it
+through, and ``AttendanceRollupService``'s check and rebuild.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.attendance.models import (
+    AttendanceMonthlyRollup,
+    AttendanceRecord,
+    AttendanceStatus,
+)
+from app.modules.attendance.repository import (
+    AttendanceMark,
+    AttendanceRepository,
+    whole_month_window,
+)
+from app.modules.attendance.rollups import AttendanceRollupService
+from app.modules.profiles.models import StudentProfile
+from app.tests.attendance_http_helpers import seed_attendance_scope
+
+_PRESENT, _ABSENT = AttendanceStatus.PRESENT, AttendanceStatus.ABSENT
+
+
+@pytest.mark.parametrize(
+    ("date_from", "date_to", "expected"),
+    [
+        (None, None, (None, None)),
+        (date(2026, 1, 1), date(2026, 3, 31), (date(2026, 1, 1), date(2026, 4, 1))),
+        (date(2026, 1, 31), date(2026, 3, 1), (date(2026, 2, 1), date(2026, 3, 1))),
+        (date(2026, 2, 2), None, (date(2026, 3, 1), None)),
+        (None, date(2026, 2, 28), (None, date(2026, 3, 1))),
+        (date(2026, 12, 1), date(2026, 12, 31), (date(2026, 12, 1), date(2027, 1, 1))),
+        (date(2026, 2, 2), date(2026, 2, 27), None),
+        (date(2026, 1, 15), date(2026, 2, 14), None),
+    ],
+)
+def test_whole_month_window(
+    date_from: date | None,
+    date_to: date | None,
+    expected: tuple[date | None, date | None] | None,
+) -> None:
+    assert whole_month_window(date_from, date_to) == expected
+
+
+async def _mark(
+    db_session: AsyncSession,
+    scope: dict[str, Any],
+    on: date,
+    *marks: tuple[str, AttendanceStatus],
+) -> None:
+    await AttendanceRepository(db_session).upsert_many(
+        classroom_id=uuid.UUID(scope["classroom"]["id"]),
+        subject_id=uuid.UUID(scope["subject"]["id"]),
+        attendance_date=on,
+        marks=[
+            AttendanceMark(
+                student_profile_id=uuid.UUID(scope[key]["id"]), status=status, remarks=None
+            )
+            for key, status in marks
+        ],
+        marked_by_user_id=scope["admin"].id,
+    )
+    await db_session.commit()
+
+
+async def _rollups(db_session: AsyncSession) -> dict[tuple[uuid.UUID, date], tuple[int, int, int]]:
+    rows = (
+        await db_session.execute(
+            select(AttendanceMonthlyRollup).execution_options(populate_existing=True)
+        )
+    ).scalars()
+    return {
+        (row.student_profile_id, row.month): (row.present_count, row.absent_count, row.total_count)
+        for row in rows
+    }
+
+
+async def test_triggers_follow_inserts_flips_and_deletes(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="rollup-trg")
+    first = uuid.UUID(scope["student_profile_1"]["id"])
+    second = uuid.UUID(scope["student_profile_2"]["id"])
+    january, february = date(2026, 1, 1), date(2026, 2, 1)
+
+    await _mark(
+        db_session,
+        scope,
+        date(2026, 1, 5),
+        ("student_profile_1", _PRESENT),
+        ("student_profile_2", _ABSENT),
+    )
+    await _mark(db_session, scope, date(2026, 1, 6), ("student_profile_1", _ABSENT))
+    await _mark(db_session, scope, date(2026, 2, 2), ("student_profile_1", _PRESENT))
+    assert await _rollups(db_session) == {
+        (first, january): (1, 1, 2),
+        (second, january): (0, 1, 1),
+        (first, february): (1, 0, 1),
+    }
+
+    # A re-save flipping one status and repeating another.
+    await _mark(
+        db_session,
+        scope,
+        date(2026, 1, 5),
+        ("student_profile_1", _PRESENT),
+        ("student_profile_2", _PRESENT),
+    )
+    assert (await _rollups(db_session))[(second, january)] == (1, 0, 1)
+
+    await db_session.execute(
+        delete(AttendanceRecord).where(AttendanceRecord.attendance_date == date(2026, 2, 2))
+    )
+    await db_session.commit()
+    assert (first, february) not in await _rollups(db_session)
+
+    # Deleting a student cascades to their records and their rollup rows.
+    await db_session.execute(delete(StudentProfile).where(StudentProfile.id == second))
+    await db_session.commit()
+    assert await _rollups(db_session) == {(first, january): (1, 1, 2)}
+    assert (await AttendanceRollupService(db_session).check()).drifted == 0
+
+
+async def test_aggregates_read_rollups_only_for_whole_months(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="rollup-read")
+    student = uuid.UUID(scope["student_profile_1"]["id"])
+    for on, status in (
+        (date(2026, 1, 31), _PRESENT),
+        (date(2026, 2, 1), _ABSENT),
+        (date(2026, 2, 15), _PRESENT),
+        (date(2026, 3, 1), _PRESENT),
+    ):
+        await _mark(db_session, scope, on, ("student_profile_1", status))
+    repo = AttendanceRepository(db_session)
+    spanning = {"date_from": date(2026, 1, 31), "date_to": date(2026, 3, 1)}
+    assert await repo.aggregate_counts(**spanning) == (4, 3, 1)
+
+    # Skew February's rollup: only reads that cover February whole see it.
+    await db_session.execute(
+        update(AttendanceMonthlyRollup)
+        .where(AttendanceMonthlyRollup.month == date(2026, 2, 1))
+        .values(
+            present_count=AttendanceMonthlyRollup.present_count + 1,
+            total_count=AttendanceMonthlyRollup.total_count + 1,
+        )
+    )
+    await db_session.commit()
+
+    assert await repo.aggregate_counts(**spanning) == (5, 4, 1)
+    assert await repo.aggregate_counts(**spanning, status=_ABSENT) == (1, 0, 1)
+    assert await repo.aggregate_counts(date_from=date(2026, 2, 2), date_to=date(2026, 3, 1)) == (
+        2,
+        2,
+        0,
+    )
+    (by_student,) = await repo.aggregate_by_student(**spanning)
+    assert (by_student.student_profile_id, by_student.total_count) == (student, 5)
+
+    service = AttendanceRollupService(db_session)
+    check = await service.check()
+    assert check.drifted == 1
+    (drift,) = check.samples
+    assert (drift.student_profile_id, drift.month) == (student, date(2026, 2, 1))
+    assert (drift.expected_present, drift.stored_present) == (1, 2)
+
+    rebuilt = await service.rebuild()
+    assert (rebuilt.rows_written, rebuilt.check.drifted) == (3, 0)
+    assert await repo.aggregate_counts(**spanning) == (4, 3, 1)
@@ -13,10 +13,11 @@ from __future__ import annotations
 import uuid
 from dataclasses import dataclass
 from datetime import date
-from typing import Any
+from typing import Any, cast
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from app.modules.academics.errors import InactiveAcademicReferenceError
 from app.modules.academics.models import Classroom, Subject, TeacherAssignment
@@ -429,6 +430,8 @@ async def test_inactive_student_rejected(db_session: AsyncSession) -> None:
         is_active=False,
     )
     service = AttendanceService(db_session)
+    classroom_id = scope.classroom.id
+    subject_id = scope.subject.id
     payload = _single_record_payload(
         scope, status=AttendanceStatus.PRESENT, student_id=inactive_student.id
     )
@@ -436,10 +439,7 @@ async def test_inactive_student_rejected(db_session: AsyncSession) -> None:
         await service.bulk_save(current_user=scope.admin_user, payload=payload)
     assert (
         await _attendance_count(
-            db_session,
-            classroom_id=scope.classroom.id,
-            subject_id=scope.subject.id,
-            on=date(2026, 7, 1),
+            db_session, classroom_id=classroom_id, subject_id=subject_id, on=date(2026, 7, 1)
         )
         == 0
     )
@@ -573,6 +573,61 @@ async def test_existing_rows_updated_deterministically(db_session: AsyncSession)
     )
 
 
+async def test_mixed_batch_is_validated_and_written_set_based(db_session: AsyncSession) -> None:
+    scope = await _seed_basic(db_session, suffix="set-based")
+    service = AttendanceService(db_session)
+    on = date(2026, 7, 8)
+    first = await service.bulk_save(
+        current_user=scope.admin_user,
+        payload=_single_record_payload(scope, status=AttendanceStatus.PRESENT, attendance_date=on),
+    )
+    payload = BulkAttendanceRequest(
+        classroom_id=scope.classroom.id,
+        subject_id=scope.subject.id,
+        attendance_date=on,
+        records=[
+            BulkAttendanceRecordIn(
+                student_profile_id=scope.student_b.id, status=AttendanceStatus.ABSENT
+            ),
+            BulkAttendanceRecordIn(
+                student_profile_id=scope.student_a.id, status=AttendanceStatus.ABSENT
+            ),
+        ],
+    )
+    engine = cast(AsyncEngine, db_session.bind)
+    statements: list[str] = []
+
+    def record_statement(
+        _connection: object,
+        _cursor: object,
+        statement: str,
+        _parameters: object,
+        _context: object,
+        _executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record_statement)
+    try:
+        second = await service.bulk_save(current_user=scope.admin_user, payload=payload)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record_statement)
+
+    assert (second.created_count, second.updated_count, second.total_count) == (1, 1, 2)
+    assert second.record_ids[1] == first.record_ids[0]
+    assert second.record_ids[0] not in first.record_ids
+    assert sum("FROM student_profiles" in statement for statement in statements) == 1
+    assert sum("attendance_records" in statement for statement in statements) == 1
+    success_rows = await AuditLogRepository(db_session).list(
+        outcome=AuditOutcome.SUCCESS, classroom_id=scope.classroom.id, subject_id=scope.subject.id
+    )
+    metadata = next(
+        row.event_metadata for row in success_rows if row.event_metadata["total_count"] == 2
+    )
+    assert metadata["record_ids"] == [str(record_id) for record_id in second.record_ids]
+    assert (metadata["created_count"], metadata["updated_count"]) == (1, 1)
+
+
 async def test_marked_by_user_id_comes_from_current_user(db_session: AsyncSession) -> None:
     scope = await _seed_basic(db_session, suffix="marked-by")
     service = AttendanceService(db_session)
@@ -599,16 +654,15 @@ async def test_forced_repository_failure_midway_rolls_back_complete_batch(
 ) -> None:
     scope = await _seed_basic(db_session, suffix="mid-fail")
     service = AttendanceService(db_session)
-    original_create = service._attendance.create
-    calls = {"n": 0}
+    original_upsert_many = service._attendance.upsert_many
+    written = {"n": 0}
 
-    async def flaky_create(**kwargs: Any) -> Any:
-        calls["n"] += 1
-        if calls["n"] == 2:
-            raise RuntimeError("simulated repository failure")
-        return await original_create(**kwargs)
+    async def flaky_upsert_many(*, marks: Any, **kwargs: Any) -> Any:
+        # Writes the first row for real, then fails before the rest.
+        written["n"] = len(await original_upsert_many(marks=marks[:1], **kwargs))
+        raise RuntimeError("simulated repository failure")
 
-    monkeypatch.setattr(service._attendance, "create", flaky_create)
+    monkeypatch.setattr(service._attendance, "upsert_many", flaky_upsert_many)
 
     on = date(2026, 7, 10)
     classroom_id = scope.classroom.id
@@ -629,7 +683,7 @@ async def test_forced_repository_failure_midway_rolls_back_complete_batch(
     with pytest.raises(RuntimeError, match="simulated repository failure"):
         await service.bulk_save(current_user=scope.admin_user, payload=payload)
 
-    assert calls["n"] == 2
+    assert written["n"] == 1
     assert (
         await _attendance_count(db_session, classroom_id=classroom_id, subject_id=subject_id, on=on)
         == 0
@@ -698,10 +752,10 @@ async def test_failed_attendance_transaction_creates_no_success_audit(
     scope = await _seed_basic(db_session, suffix="no-audit-on-fail")
     service = AttendanceService(db_session)
 
-    async def failing_create(**kwargs: object) -> object:
+    async def failing_upsert_many(**kwargs: object) -> object:
         raise RuntimeError("simulated repository failure")
 
-    monkeypatch.setattr(service._attendance, "create", failing_create)
+    monkeypatch.setattr(service._attendance, "upsert_many", failing_upsert_many)
 
     on = date(2026, 7, 13)
     classroom_id = scope.classroom.id
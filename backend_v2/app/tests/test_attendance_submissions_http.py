@@ -0,0 +1,182 @@
+"""HTTP coverage for ``POST /attendance/submissions`` (multi-scope save).
+
+Two ``seed_attendance_scope`` seeds give two classroom/subject scopes,
+each with its own assigned teacher. The service's staging, validation
+and merge statements run for real against PostgreSQL.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.attendance.models import AttendanceRecord, AuditLog, AuditOutcome
+from app.tests.attendance_http_helpers import mark_attendance, seed_attendance_scope
+from app.tests.phase3_http_helpers import auth_headers
+
+_DATE = "2026-09-01"
+_PATH = "/api/v1/attendance/submissions"
+
+
+def _scope(seed: dict[str, Any], *records: tuple[str, str]) -> dict[str, Any]:
+    return {
+        "classroom_id": seed["classroom"]["id"],
+        "subject_id": seed["subject"]["id"],
+        "records": [
+            {"student_profile_id": seed[key]["id"], "status": status} for key, status in records
+        ],
+    }
+
+
+async def _attendance_rows(db_session: AsyncSession) -> list[AttendanceRecord]:
+    result = await db_session.execute(
+        select(AttendanceRecord).execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+async def test_admin_submission_merges_every_scope_and_audits_each(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    first = await seed_attendance_scope(client_db, db_session, suffix="sub-ok-a")
+    second = await seed_attendance_scope(client_db, db_session, suffix="sub-ok-b")
+    await mark_attendance(
+        client_db,
+        user=first["admin"],
+        classroom_id=first["classroom"]["id"],
+        subject_id=first["subject"]["id"],
+        attendance_date=_DATE,
+        records=[{"student_profile_id": first["student_profile_1"]["id"], "status": "present"}],
+    )
+
+    response = await client_db.post(
+        _PATH,
+        json={
+            "attendance_date": _DATE,
+            "scopes": [
+                _scope(second, ("student_profile_1", "present")),
+                _scope(first, ("student_profile_1", "absent"), ("student_profile_2", "present")),
+            ],
+        },
+        headers=auth_headers(first["admin"], request_id="req-submission"),
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created_count"], body["updated_count"], body["total_count"]) == (2, 1, 3)
+    assert [
+        (scope["classroom_id"], scope["created_count"], scope["updated_count"])
+        for scope in body["scopes"]
+    ] == [(second["classroom"]["id"], 1, 0), (first["classroom"]["id"], 1, 1)]
+    statuses = {
+        (str(row.student_profile_id), str(row.classroom_id)): row.status.value
+        for row in await _attendance_rows(db_session)
+    }
+    assert statuses[(first["student_profile_1"]["id"], first["classroom"]["id"])] == "absent"
+    assert len(statuses) == 3
+
+    audits = (
+        (await db_session.execute(select(AuditLog).where(AuditLog.request_id == "req-submission")))
+        .scalars()
+        .all()
+    )
+    assert len(audits) == 2
+    assert {audit.outcome for audit in audits} == {AuditOutcome.SUCCESS}
+    assert {audit.event_metadata["submission_id"] for audit in audits} == {body["submission_id"]}
+    by_classroom = {str(audit.classroom_id): audit.event_metadata for audit in audits}
+    assert by_classroom[first["classroom"]["id"]]["updated_count"] == 1
+    assert by_classroom[second["classroom"]["id"]]["total_count"] == 1
+
+
+async def test_teacher_denied_any_scope_writes_nothing(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    first = await seed_attendance_scope(client_db, db_session, suffix="sub-deny-a")
+    second = await seed_attendance_scope(client_db, db_session, suffix="sub-deny-b")
+
+    response = await client_db.post(
+        _PATH,
+        json={
+            "attendance_date": _DATE,
+            "scopes": [
+                _scope(first, ("student_profile_1", "present")),
+                _scope(second, ("student_profile_1", "present")),
+            ],
+        },
+        headers=auth_headers(first["teacher"]),
+    )
+
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "ATTENDANCE_SCOPE_NOT_FOUND"
+    assert await _attendance_rows(db_session) == []
+    blocked = (
+        (await db_session.execute(select(AuditLog).where(AuditLog.outcome == AuditOutcome.BLOCKED)))
+        .scalars()
+        .all()
+    )
+    assert [str(audit.classroom_id) for audit in blocked] == [second["classroom"]["id"]]
+
+
+async def test_assigned_teacher_may_submit_own_scope(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await seed_attendance_scope(client_db, db_session, suffix="sub-teacher")
+
+    response = await client_db.post(
+        _PATH,
+        json={"attendance_date": _DATE, "scopes": [_scope(seed, ("student_profile_2", "absent"))]},
+        headers=auth_headers(seed["teacher"]),
+    )
+
+    assert response.status_code == 200, response.text
+    (row,) = await _attendance_rows(db_session)
+    assert row.marked_by_user_id == seed["teacher"].id
+
+
+async def test_first_invalid_row_rejects_the_whole_submission(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    first = await seed_attendance_scope(client_db, db_session, suffix="sub-bad-a")
+    second = await seed_attendance_scope(client_db, db_session, suffix="sub-bad-b")
+    # A student of the first classroom listed under the second scope.
+    misplaced = _scope(second, ("student_profile_1", "present"))
+    misplaced["records"].append(
+        {"student_profile_id": first["student_profile_2"]["id"], "status": "present"}
+    )
+
+    response = await client_db.post(
+        _PATH,
+        json={
+            "attendance_date": _DATE,
+            "scopes": [_scope(first, ("student_profile_1", "present")), misplaced],
+        },
+        headers=auth_headers(first["admin"]),
+    )
+
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == "ATTENDANCE_STUDENT_NOT_IN_CLASSROOM"
+    assert await _attendance_rows(db_session) == []
+
+
+async def test_repeated_scope_is_rejected_at_parsing(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    seed = await seed_attendance_scope(client_db, db_session, suffix="sub-dup")
+
+    response = await client_db.post(
+        _PATH,
+        json={
+            "attendance_date": _DATE,
+            "scopes": [
+                _scope(seed, ("student_profile_1", "present")),
+                _scope(seed, ("student_profile_2", "present")),
+            ],
+        },
+        headers=auth_headers(seed["admin"]),
+    )
+
+    assert response.status_code == 422
+    assert await _attendance_rows(db_session) == []
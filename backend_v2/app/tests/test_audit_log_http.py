@@ -95,6 +95,63 @@ async def test_audit_log_filtering_and_pagination(
     assert len(paginated.json()["items"]) == 1
 
 
+async def test_audit_log_cursor_pagination_visits_tied_rows_once(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    first = await seed_attendance_scope(client_db, db_session, suffix="audit-cursor-a")
+    second = await seed_attendance_scope(client_db, db_session, suffix="audit-cursor-b")
+    # One submission's audit rows share a transaction, so a created_at.
+    response = await client_db.post(
+        "/api/v1/attendance/submissions",
+        json={
+            "attendance_date": TODAY,
+            "scopes": [
+                {
+                    "classroom_id": seed["classroom"]["id"],
+                    "subject_id": seed["subject"]["id"],
+                    "records": [
+                        {"student_profile_id": seed["student_profile_1"]["id"], "status": "present"}
+                    ],
+                }
+                for seed in (first, second)
+            ],
+        },
+        headers=auth_headers(first["admin"]),
+    )
+    assert response.status_code == 200, response.text
+    await mark_attendance(
+        client_db,
+        user=first["admin"],
+        classroom_id=first["classroom"]["id"],
+        subject_id=first["subject"]["id"],
+        attendance_date=TODAY,
+        records=[{"student_profile_id": first["student_profile_2"]["id"], "status": "absent"}],
+    )
+    headers = auth_headers(first["admin"])
+    full = (await client_db.get("/api/v1/audit-logs", headers=headers)).json()
+    assert full["total"] == 3
+
+    walked: list[str] = []
+    cursor: str | None = None
+    while True:
+        params: dict[str, str | int] = {"limit": 1, "include_total": "false"}
+        if cursor is not None:
+            params["cursor"] = cursor
+        page = (await client_db.get("/api/v1/audit-logs", params=params, headers=headers)).json()
+        assert page["total"] is None
+        walked.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert walked == [item["id"] for item in full["items"]]
+
+    bad = await client_db.get(
+        "/api/v1/audit-logs", params={"cursor": "e30", "limit": 1}, headers=headers
+    )
+    assert bad.status_code == 422
+    assert bad.json()["error"]["code"] == "INVALID_PAGINATION_CURSOR"
+
+
 async def test_audit_log_missing_id_returns_404(
     client_db: AsyncClient, db_session: AsyncSession
 ) -> None:
@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.academics.repository import ClassroomRepository, SubjectRepository
 from app.modules.attendance.models import AuditOutcome
-from app.modules.attendance.repository import AuditLogRepository
+from app.modules.attendance.repository import AuditLogRepository, ScopeAuditEntry
 from app.modules.auth.security import hash_password
 from app.modules.users.models import UserRole
 from app.modules.users.normalization import normalize_email
@@ -197,6 +197,44 @@ async def test_count_matches_list_filters(db_session: AsyncSession) -> None:
     assert await repo.count(actor_user_id=actor_id, outcome=AuditOutcome.BLOCKED) == 0
 
 
+async def test_create_many_appends_one_row_per_scope_entry(db_session: AsyncSession) -> None:
+    actor_id = await _create_user(
+        db_session, email="audit-actor-7@example.com", role=UserRole.ADMIN
+    )
+    classroom = await ClassroomRepository(db_session).create(
+        name="Audit Many Classroom", code="audit-many-classroom"
+    )
+    subjects = [
+        await SubjectRepository(db_session).create(name=f"Audit Many {n}", code=f"audit-many-{n}")
+        for n in range(2)
+    ]
+    repo = AuditLogRepository(db_session)
+
+    await repo.create_many(
+        actor_user_id=actor_id,
+        action="attendance_bulk_mark",
+        outcome=AuditOutcome.SUCCESS,
+        entity_type="attendance_batch",
+        request_id="req-many",
+        entries=[
+            ScopeAuditEntry(
+                classroom_id=classroom.id,
+                subject_id=subject.id,
+                event_metadata={"total_count": index},
+            )
+            for index, subject in enumerate(subjects)
+        ],
+    )
+    await db_session.commit()
+
+    rows = await repo.list(actor_user_id=actor_id)
+    assert {(row.subject_id, row.event_metadata["total_count"]) for row in rows} == {
+        (subjects[0].id, 0),
+        (subjects[1].id, 1),
+    }
+    assert {row.request_id for row in rows} == {"req-many"}
+
+
 def test_audit_log_repository_has_no_update_or_delete_method() -> None:
     """Structural regression test for the append-only design.
 
@@ -212,7 +250,7 @@ def test_audit_log_repository_has_no_update_or_delete_method() -> None:
     }
     forbidden = {"update", "delete", "patch", "remove", "edit"}
     assert public_methods.isdisjoint(forbidden)
-    assert public_methods == {"create", "get_by_id", "list", "count"}
+    assert public_methods == {"create", "create_many", "get_by_id", "list", "count"}
 
 
 @pytest.mark.parametrize("outcome", list(AuditOutcome))
@@ -282,6 +282,12 @@ def test_face_detector_input_size_outside_safe_range_is_rejected(size_px: int) -
         Settings(**_BASE_KWARGS, FACE_DETECTOR_INPUT_SIZE_PX=size_px)
 
 
+@pytest.mark.parametrize("factor", [-1, 17])
+def test_face_detector_working_size_factor_out_of_range_is_rejected(factor: int) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**_BASE_KWARGS, FACE_DETECTOR_WORKING_SIZE_FACTOR=factor)
+
+
 @pytest.mark.parametrize("dimension", [0, 7, 4097, -128])
 def test_face_embedding_dimension_outside_safe_range_is_rejected(dimension: int) -> None:
     with pytest.raises(ValidationError):
@@ -420,3 +426,111 @@ def test_enabling_a_provider_with_identifiers_and_model_paths_set_succeeds() ->
     assert (
         settings.FACE_EMBEDDER_MODEL_PATH == "/var/models/dlib_face_recognition_resnet_model_v1.dat"
     )
+
+
+@pytest.mark.parametrize("size", [0, 33])
+def test_face_provider_pool_size_out_of_range_is_rejected(size: int) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**_BASE_KWARGS, FACE_PROVIDER_POOL_SIZE=size)
+
+
+@pytest.mark.parametrize("images", [0, 201])
+def test_face_attendance_batch_max_images_out_of_range_is_rejected(images: int) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**_BASE_KWARGS, FACE_ATTENDANCE_BATCH_MAX_IMAGES=images)
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("FACE_QUALITY_MIN_SHARPNESS", -1.0),
+        ("FACE_QUALITY_MIN_SHARPNESS", 1_000_001.0),
+        ("FACE_QUALITY_MIN_BRIGHTNESS", -1.0),
+        ("FACE_QUALITY_MIN_BRIGHTNESS", 256.0),
+        ("FACE_QUALITY_MIN_CONTRAST", -1.0),
+        ("FACE_QUALITY_MIN_CONTRAST", 129.0),
+        ("FACE_QUALITY_MIN_INTER_OCULAR_PX", -1.0),
+        ("FACE_QUALITY_MIN_INTER_OCULAR_PX", 10_001.0),
+    ],
+)
+def test_face_quality_floor_out_of_range_is_rejected(field: str, value: float) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**_BASE_KWARGS, **{field: value})
+
+
+@pytest.mark.parametrize("workers", [-1, 65])
+def test_face_processing_workers_out_of_range_is_rejected(workers: int) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**_BASE_KWARGS, FACE_PROCESSING_WORKERS=workers)
+
+
+def test_face_processing_workers_defaults_to_in_process() -> None:
+    assert Settings(**_BASE_KWARGS).FACE_PROCESSING_WORKERS == 0
+
+
+def test_face_model_preload_is_opt_in() -> None:
+    assert Settings(**_BASE_KWARGS).FACE_PRELOAD_MODELS is False
+    assert Settings(**_BASE_KWARGS, FACE_PRELOAD_MODELS=True).FACE_PRELOAD_MODELS is True
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("FACE_PROCESSING_JOB_MAX_ATTEMPTS", 0),
+        ("FACE_PROCESSING_JOB_MAX_ATTEMPTS", 21),
+        ("FACE_PROCESSING_JOB_RETRY_BASE_SECONDS", 0),
+        ("FACE_PROCESSING_JOB_LEASE_SECONDS", 29),
+        ("FACE_PROCESSING_WORKER_POLL_SECONDS", 0),
+        ("FACE_PROCESSING_WORKER_POLL_SECONDS", 301),
+    ],
+)
+def test_face_processing_job_settings_out_of_range_are_rejected(field: str, value: float) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**_BASE_KWARGS, **{field: value})
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("FACE_EMBEDDING_MODEL_VERSION", "   "),
+        ("FACE_EMBEDDING_MODEL_VERSION", "v" * 65),
+        ("FACE_REEMBED_BATCH_SIZE", 0),
+        ("FACE_REEMBED_BATCH_SIZE", 1001),
+        ("FACE_REEMBED_PAUSE_SECONDS", -1),
+        ("FACE_REEMBED_PAUSE_SECONDS", 3601),
+    ],
+)
+def test_face_reembedding_settings_out_of_range_are_rejected(field: str, value: object) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**_BASE_KWARGS, **{field: value})
+
+
+def test_face_embedding_model_version_defaults_to_the_original_model() -> None:
+    assert Settings(**_BASE_KWARGS).FACE_EMBEDDING_MODEL_VERSION == "v1"
+    assert (
+        Settings(**_BASE_KWARGS, FACE_EMBEDDING_MODEL_VERSION=" v2 ").FACE_EMBEDDING_MODEL_VERSION
+        == "v2"
+    )
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [
+        ("FACE_EMBEDDING_CACHE_MAX_ENTRIES", -1),
+        ("FACE_EMBEDDING_CACHE_MAX_ENTRIES", 65537),
+        ("FACE_EMBEDDING_CACHE_TTL_SECONDS", 0),
+        ("FACE_EMBEDDING_CACHE_TTL_SECONDS", 86401),
+        ("FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES", -1),
+        ("FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES", 1_000_001),
+    ],
+)
+def test_face_embedding_cache_bounds_out_of_range_are_rejected(field: str, value: int) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**_BASE_KWARGS, **{field: value})
+
+
+def test_face_embedding_cache_disk_tier_is_off_by_default() -> None:
+    settings = Settings(**_BASE_KWARGS)
+    assert settings.FACE_EMBEDDING_CACHE_MAX_ENTRIES == 1024
+    assert settings.FACE_EMBEDDING_CACHE_TTL_SECONDS == 600
+    assert settings.FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES == 0
@@ -416,6 +416,9 @@ class _FakeConstantFaceEmbedder:
         vector = EmbeddingVector(values=tuple(1.0 for _ in range(self._dimension)))
         return validate_embedding_dimension(vector, expected_dimension=self._dimension)
 
+    def embed_many(self, faces: Sequence[NormalizedFaceInput]) -> list[EmbeddingVector]:
+        return [self.embed(face) for face in faces]
+
 
 class _FakeLookupFaceMatcher:
     """Matches against a caller-supplied candidate list, keyed by a known student ID.
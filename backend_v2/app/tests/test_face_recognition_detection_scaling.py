@@ -0,0 +1,227 @@
+"""Tests for ``app.modules.face_recognition.detection_scaling`` — reduced-
+resolution single-face detection with full-resolution alignment.
+
+Uses real Pillow/OpenCV resampling on synthetic images and
+``FakeFaceDetector``/``FakeFaceEmbedder`` for the providers, so no model
+file is needed.
+"""
+
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.config import Settings, get_settings
+from app.modules.face_recognition.alignment import align_face
+from app.modules.face_recognition.detection_scaling import (
+    build_detection_image,
+    scale_detected_face,
+    working_dimensions,
+)
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DetectedFace,
+    FacialLandmark,
+    ImageDimensions,
+)
+from app.modules.face_recognition.image_codec import ImageFrame, pil_image_to_frame
+from app.modules.face_recognition.pipeline import detect_and_align
+from app.tests.phase5_stage3_helpers import (
+    FakeFaceDetector,
+    FakeFaceEmbedder,
+    make_detected_face,
+    patch_providers,
+)
+
+
+def _settings(*, factor: int, input_size_px: int = 320) -> Settings:
+    return get_settings().model_copy(
+        update={
+            "FACE_DETECTOR_WORKING_SIZE_FACTOR": factor,
+            "FACE_DETECTOR_INPUT_SIZE_PX": input_size_px,
+        }
+    )
+
+
+def _photo_array(width: int, height: int) -> np.ndarray:
+    # Smooth noise: compresses and resamples like a photo, not like flat colour.
+    small = np.random.default_rng(3).integers(0, 256, size=(height // 20, width // 20, 3))
+    image = Image.fromarray(small.astype(np.uint8)).resize(
+        (width, height), Image.Resampling.BILINEAR
+    )
+    return np.asarray(image)
+
+
+def _encode(array: np.ndarray, *, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format=image_format, quality=95)
+    return buffer.getvalue()
+
+
+def _decode(data: bytes) -> ImageFrame:
+    with Image.open(io.BytesIO(data)) as image:
+        return pil_image_to_frame(image)
+
+
+def test_working_dimensions_is_none_when_the_mode_is_off() -> None:
+    dimensions = ImageDimensions(width_px=6000, height_px=4000)
+    assert working_dimensions(dimensions, settings=_settings(factor=0)) is None
+
+
+def test_working_dimensions_is_none_when_the_image_already_fits() -> None:
+    dimensions = ImageDimensions(width_px=640, height_px=480)
+    assert working_dimensions(dimensions, settings=_settings(factor=2)) is None
+
+
+@pytest.mark.parametrize(
+    ("width", "height", "expected"),
+    [
+        (6000, 4000, (640, 427)),
+        (3000, 4000, (480, 640)),
+        (1281, 100, (640, 50)),
+    ],
+)
+def test_working_dimensions_bounds_the_longer_side_and_keeps_aspect(
+    width: int, height: int, expected: tuple[int, int]
+) -> None:
+    result = working_dimensions(
+        ImageDimensions(width_px=width, height_px=height), settings=_settings(factor=2)
+    )
+    assert result is not None
+    assert (result.width_px, result.height_px) == expected
+
+
+@pytest.mark.parametrize("image_format", ["JPEG", "PNG"])
+def test_build_detection_image_is_a_faithful_downscale(image_format: str) -> None:
+    array = _photo_array(1600, 1200)
+    data = _encode(array, image_format=image_format)
+    image = _decode(data)
+
+    detection_image = build_detection_image(image, settings=_settings(factor=1))
+
+    assert detection_image is not None
+    assert detection_image.dimensions == ImageDimensions(width_px=320, height_px=240)
+    assert detection_image.color_format == "bgr"
+    reference = Image.fromarray(image.rgb_pixels()).resize((320, 240), Image.Resampling.BOX)
+    difference = np.abs(
+        detection_image.rgb_pixels().astype(np.int16) - np.asarray(reference).astype(np.int16)
+    )
+    assert difference.mean() < 4.0
+
+
+def test_build_detection_image_never_decodes_the_file_again(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    image = _decode(_encode(_photo_array(1600, 1200), image_format="JPEG"))
+
+    def refuse_open(*args: object, **kwargs: object) -> None:
+        raise AssertionError("the detection image must come from the decoded buffer")
+
+    monkeypatch.setattr(Image, "open", refuse_open)
+    detection_image = build_detection_image(image, settings=_settings(factor=1))
+
+    assert detection_image is not None
+    assert detection_image.dimensions == ImageDimensions(width_px=320, height_px=240)
+
+
+def test_uploads_of_one_aspect_ratio_share_a_detection_image_size() -> None:
+    settings = _settings(factor=2)
+    sizes = {
+        working_dimensions(ImageDimensions(width_px=width, height_px=height), settings=settings)
+        for width, height in [(6000, 4000), (4500, 3000), (3000, 2000), (1500, 1000)]
+    }
+
+    assert sizes == {ImageDimensions(width_px=640, height_px=427)}
+
+
+def test_build_detection_image_is_none_for_small_images() -> None:
+    data = _encode(_photo_array(600, 400), image_format="JPEG")
+    assert build_detection_image(_decode(data), settings=_settings(factor=2)) is None
+
+
+def test_scale_detected_face_maps_box_and_landmarks_to_full_resolution() -> None:
+    small = ImageDimensions(width_px=400, height_px=300)
+    full = ImageDimensions(width_px=4000, height_px=3000)
+    face = DetectedFace(
+        bounding_box=BoundingBox(x_px=100, y_px=50, width_px=120, height_px=150),
+        source_image_dimensions=small,
+        confidence=0.93,
+        landmarks=(
+            FacialLandmark(x_px=140.0, y_px=100.0),
+            FacialLandmark(x_px=180.0, y_px=100.0),
+            FacialLandmark(x_px=160.0, y_px=130.0),
+            FacialLandmark(x_px=145.0, y_px=160.0),
+            FacialLandmark(x_px=175.0, y_px=160.0),
+        ),
+    )
+
+    scaled = scale_detected_face(face, to=full)
+
+    assert scaled.source_image_dimensions == full
+    assert scaled.bounding_box == BoundingBox(x_px=1000, y_px=500, width_px=1200, height_px=1500)
+    assert scaled.confidence == 0.93
+    assert scaled.landmarks is not None
+    assert scaled.landmarks[0] == FacialLandmark(x_px=1404.5, y_px=1004.5)
+    assert scaled.landmarks[4] == FacialLandmark(x_px=1754.5, y_px=1604.5)
+
+
+def test_scale_detected_face_keeps_edge_detections_inside_the_image() -> None:
+    small = ImageDimensions(width_px=333, height_px=250)
+    full = ImageDimensions(width_px=1000, height_px=751)
+    face = DetectedFace(
+        bounding_box=BoundingBox(x_px=300, y_px=200, width_px=33, height_px=50),
+        source_image_dimensions=small,
+        confidence=0.8,
+        landmarks=(FacialLandmark(x_px=332.9, y_px=249.9),),
+    )
+
+    scaled = scale_detected_face(face, to=full)
+
+    assert scaled.bounding_box.right_px <= 1000
+    assert scaled.bounding_box.bottom_px <= 751
+    assert scaled.landmarks is not None
+    assert scaled.landmarks[0].x_px <= 999
+    assert scaled.landmarks[0].y_px <= 750
+
+
+class _RecordingDetector(FakeFaceDetector):
+    """Returns ``make_detected_face`` for whatever image it is given."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.seen: list[ImageDimensions] = []
+
+    def detect(self, image: ImageFrame) -> list[DetectedFace]:
+        self.seen.append(image.dimensions)
+        return [make_detected_face(dimensions=image.dimensions)]
+
+
+def test_detect_and_align_detects_on_the_small_image_and_aligns_the_full_one() -> None:
+    data = _encode(_photo_array(2000, 1500), image_format="JPEG")
+    image = _decode(data)
+    settings = _settings(factor=2)
+    detection_image = build_detection_image(image, settings=settings)
+    assert detection_image is not None
+    detector = _RecordingDetector()
+
+    with patch_providers(detector, FakeFaceEmbedder()):
+        chip = detect_and_align(image, settings=settings, detection_image=detection_image)
+
+    assert detector.seen == [ImageDimensions(width_px=640, height_px=480)]
+    expected_face = scale_detected_face(
+        make_detected_face(dimensions=detection_image.dimensions), to=image.dimensions
+    )
+    assert chip == align_face(image, expected_face)
+
+
+def test_detect_and_align_without_a_detection_image_detects_at_full_resolution() -> None:
+    data = _encode(_photo_array(2000, 1500), image_format="JPEG")
+    detector = _RecordingDetector()
+
+    with patch_providers(detector, FakeFaceEmbedder()):
+        detect_and_align(_decode(data), settings=_settings(factor=0))
+
+    assert detector.seen == [ImageDimensions(width_px=2000, height_px=1500)]
@@ -5,7 +5,8 @@ dlib`` inside ``_ensure_loaded`` is lazy (see that module's docstring),
 so injecting a fake module object into ``sys.modules["dlib"]`` before
 the call is enough to exercise this adapter's own logic (artifact
 validation, preprocessing, dimension/finiteness checks, L2
-normalization, exception mapping) deterministically — the same
+normalization, exception mapping, ``embed_many`` batching)
+deterministically — the same
 technique ``test_face_recognition_yunet_detector.py`` uses for
 ``cv2.FaceDetectorYN``, just via ``sys.modules`` instead of
 ``unittest.mock.patch`` since ``dlib`` may not be importable at all in
@@ -20,14 +21,22 @@ import sys
 from types import ModuleType
 from unittest.mock import patch
 
+import numpy as np
 import pytest
+from structlog.testing import capture_logs
 
+from app.modules.face_recognition.domain import (
+    EmbeddingVector,
+    ImageDimensions,
+    NormalizedFaceInput,
+)
 from app.modules.face_recognition.errors import (
     FaceEmbeddingFailedError,
     FaceProviderUnavailableError,
     ModelArtifactChecksumMismatchError,
     ModelArtifactMissingError,
 )
+from app.modules.face_recognition.providers import dlib_embedder
 from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
 from app.tests.phase5_stage3_helpers import make_normalized_face
 
@@ -192,3 +201,160 @@ def test_is_available_true_when_model_loads(tmp_path) -> None:
     embedder = DlibResnetFaceEmbedder(_SettingsLike(model_path=model_path))
     _install_fake_dlib(_FakeDlibModel())
     assert embedder.is_available() is True
+
+
+class _FakeBatchDlibModel:
+    """Answers both ``compute_face_descriptor`` overloads (one chip, or a
+    list of chips). A chip's descriptor is derived from its first pixel
+    value, so results can be traced back to inputs: ``0`` yields an
+    all-zero descriptor and ``_POISON_PIXEL`` makes dlib raise."""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+        self.single_calls = 0
+
+    def compute_face_descriptor(self, img, num_jitters=1):
+        if isinstance(img, list):
+            self.batch_sizes.append(len(img))
+            if any(int(chip[0, 0, 0]) == _POISON_PIXEL for chip in img):
+                raise RuntimeError("bad image in batch")
+            return [self._descriptor(chip) for chip in img]
+        self.single_calls += 1
+        if int(img[0, 0, 0]) == _POISON_PIXEL:
+            raise RuntimeError("bad image")
+        return self._descriptor(img)
+
+    @staticmethod
+    def _descriptor(chip) -> list[float]:
+        return [float(chip[0, 0, 0])] + [0.0] * 127
+
+
+_POISON_PIXEL = 13
+
+
+def _chip(pixel: int) -> NormalizedFaceInput:
+    return NormalizedFaceInput(
+        dimensions=ImageDimensions(width_px=150, height_px=150),
+        pixel_data=bytes([pixel]) * (150 * 150 * 3),
+    )
+
+
+def _batch_embedder(model: _FakeBatchDlibModel) -> DlibResnetFaceEmbedder:
+    _install_fake_dlib(model)  # type: ignore[arg-type]
+    return DlibResnetFaceEmbedder(_SettingsLike(model_path="/irrelevant/because/mocked"))
+
+
+@pytest.fixture
+def _skip_artifact_verification():
+    with patch(
+        "app.modules.face_recognition.providers.dlib_embedder.verify_model_artifact",
+        return_value=None,
+    ):
+        yield
+
+
+@pytest.mark.usefixtures("_skip_artifact_verification")
+def test_embed_many_runs_one_batched_inference_and_keeps_input_order() -> None:
+    model = _FakeBatchDlibModel()
+    embedder = _batch_embedder(model)
+
+    results = embedder.embed_many([_chip(pixel) for pixel in (200, 50, 120)])
+
+    assert model.batch_sizes == [3]
+    assert model.single_calls == 0
+    assert all(isinstance(result, EmbeddingVector) for result in results)
+    # The descriptor's single non-zero component normalizes to exactly 1.0.
+    assert [result.values[0] for result in results] == [1.0, 1.0, 1.0]  # type: ignore[union-attr]
+
+
+@pytest.mark.usefixtures("_skip_artifact_verification")
+def test_embed_many_matches_embed_for_the_same_face() -> None:
+    embedder = _batch_embedder(_FakeBatchDlibModel())
+
+    [batched] = embedder.embed_many([_chip(77)])
+
+    assert batched == embedder.embed(_chip(77))
+
+
+@pytest.mark.usefixtures("_skip_artifact_verification")
+def test_embed_many_isolates_an_unusable_descriptor_to_its_own_slot() -> None:
+    model = _FakeBatchDlibModel()
+    embedder = _batch_embedder(model)
+
+    results = embedder.embed_many([_chip(200), _chip(0), _chip(90)])
+
+    assert isinstance(results[0], EmbeddingVector)
+    assert isinstance(results[1], FaceEmbeddingFailedError)
+    assert isinstance(results[2], EmbeddingVector)
+
+
+@pytest.mark.usefixtures("_skip_artifact_verification")
+def test_embed_many_reruns_a_rejected_batch_one_chip_at_a_time() -> None:
+    model = _FakeBatchDlibModel()
+    embedder = _batch_embedder(model)
+
+    results = embedder.embed_many([_chip(200), _chip(_POISON_PIXEL), _chip(90)])
+
+    assert model.batch_sizes == [3]
+    assert model.single_calls == 3
+    assert isinstance(results[0], EmbeddingVector)
+    assert isinstance(results[1], FaceEmbeddingFailedError)
+    assert "bad image" not in str(results[1])
+    assert isinstance(results[2], EmbeddingVector)
+
+
+@pytest.mark.usefixtures("_skip_artifact_verification")
+def test_embed_many_logs_a_chip_that_cannot_be_converted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    model = _FakeBatchDlibModel()
+    embedder = _batch_embedder(model)
+    unconvertible = _chip(66)
+    real_to_rgb_chip = dlib_embedder._to_rgb_chip
+
+    def to_rgb_chip(face: NormalizedFaceInput) -> np.ndarray:
+        if face is unconvertible:
+            raise ValueError("secret detail")
+        return real_to_rgb_chip(face)
+
+    monkeypatch.setattr(dlib_embedder, "_to_rgb_chip", to_rgb_chip)
+    with capture_logs() as logs:
+        results = embedder.embed_many([_chip(200), unconvertible, _chip(90)])
+
+    assert model.batch_sizes == [2]
+    assert model.single_calls == 0
+    assert isinstance(results[1], FaceEmbeddingFailedError)
+    assert [result.__class__ for result in (results[0], results[2])] == [EmbeddingVector] * 2
+    assert logs == [
+        {
+            "event": "dlib_chip_conversion_failed",
+            "exc_type": "ValueError",
+            "log_level": "warning",
+        }
+    ]
+
+
+@pytest.mark.usefixtures("_skip_artifact_verification")
+def test_embed_many_splits_long_inputs_into_bounded_batches() -> None:
+    model = _FakeBatchDlibModel()
+    embedder = _batch_embedder(model)
+
+    results = embedder.embed_many([_chip(100)] * 70)
+
+    assert model.batch_sizes == [32, 32, 6]
+    assert len(results) == 70
+
+
+@pytest.mark.usefixtures("_skip_artifact_verification")
+def test_embed_many_of_nothing_never_calls_the_model() -> None:
+    model = _FakeBatchDlibModel()
+    embedder = _batch_embedder(model)
+
+    assert embedder.embed_many([]) == []
+    assert model.batch_sizes == []
+
+
+def test_embed_many_raises_when_the_model_is_unavailable() -> None:
+    embedder = DlibResnetFaceEmbedder(_SettingsLike(model_path=None))
+    with pytest.raises(FaceProviderUnavailableError):
+        embedder.embed_many([make_normalized_face()])
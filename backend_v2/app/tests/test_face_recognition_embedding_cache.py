@@ -0,0 +1,411 @@
+"""Tests for ``app.modules.face_recognition.embedding_cache``.
+
+The key, both tiers, the generation/TTL guards and the commit/rollback
+purge and fill are tested without a database (the listeners through an
+unbound ``AsyncSession``, as in ``test_face_recognition_gallery_cache``).
+The sample path is then checked end to end: only a persisted success is
+cached, a later run over the same bytes must not reach the (fake)
+detector, deleting a sample must purge its entries, and a sample deleted
+while it is being embedded must never be cached. The probe
+path must never cache at all. Model "files" are small temporary files — only their checksums
+matter here.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import stat
+import threading
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings, get_settings
+from app.modules.biometric_enrollment.repository import BiometricSampleRepository
+from app.modules.face_recognition import processing_service
+from app.modules.face_recognition.alignment import ALIGNMENT_VERSION
+from app.modules.face_recognition.embedding_cache import (
+    DISK_ZONE,
+    EmbeddingCache,
+    EmbeddingCacheKey,
+    _disk_root,
+    _entry_path,
+    _purge_executor,
+    embedding_cache_key,
+    fill_after_commit,
+    get_embedding_cache,
+    purge_after_commit,
+    reset_embedding_cache,
+    wait_for_disk_purges,
+)
+from app.modules.face_recognition.processing_service import SampleProcessingService
+from app.modules.face_recognition.router import _validate_and_embed_probe_sync
+from app.tests.phase5_stage2_http_helpers import seed_enrollment_scope
+from app.tests.phase5_stage3_helpers import (
+    FakeFaceDetector,
+    FakeFaceEmbedder,
+    make_real_jpeg_bytes,
+    make_unit_embedding_vector,
+    patch_providers,
+    seed_active_sample_direct,
+)
+
+_IMAGE_SHA256 = hashlib.sha256(b"image").hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> Iterator[None]:
+    reset_embedding_cache()
+    yield
+    reset_embedding_cache()
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    detector_path = tmp_path / "detector.onnx"
+    embedder_path = tmp_path / "embedder.dat"
+    detector_path.write_bytes(b"detector-model")
+    embedder_path.write_bytes(b"embedder-model")
+    return get_settings().model_copy(
+        update={
+            "FACE_DETECTOR_MODEL_PATH": str(detector_path),
+            "FACE_EMBEDDER_MODEL_PATH": str(embedder_path),
+            "FACE_EMBEDDING_CACHE_MAX_ENTRIES": 8,
+            "FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES": 0,
+            "BIOMETRIC_STORAGE_ROOT": str(tmp_path / "storage"),
+        }
+    )
+
+
+def _key(settings: Settings, image_sha256: str = _IMAGE_SHA256) -> EmbeddingCacheKey:
+    key = embedding_cache_key(image_sha256, settings=settings)
+    assert key is not None
+    return key
+
+
+def _with_disk(settings: Settings, max_entries: int = 10) -> Settings:
+    return settings.model_copy(update={"FACE_EMBEDDING_CACHE_DISK_MAX_ENTRIES": max_entries})
+
+
+# --- key --------------------------------------------------------------------
+
+
+def test_key_covers_both_models_alignment_and_detection_settings(settings: Settings) -> None:
+    key = _key(settings)
+
+    assert key.detector_checksum == hashlib.sha256(b"detector-model").hexdigest()
+    assert key.embedder_checksum == hashlib.sha256(b"embedder-model").hexdigest()
+    assert key.alignment_version == ALIGNMENT_VERSION
+
+    Path(settings.FACE_EMBEDDER_MODEL_PATH or "").write_bytes(b"embedder-model-v2")
+    rescaled = settings.model_copy(update={"FACE_DETECTOR_WORKING_SIZE_FACTOR": 3})
+    gated = settings.model_copy(update={"FACE_QUALITY_MIN_SHARPNESS": 50.0})
+    assert _key(settings).embedder_checksum == hashlib.sha256(b"embedder-model-v2").hexdigest()
+    assert len({key, _key(settings), _key(rescaled), _key(gated)}) == 4
+
+
+def test_key_prefers_the_configured_model_checksum(settings: Settings) -> None:
+    pinned = settings.model_copy(update={"FACE_DETECTOR_MODEL_SHA256": "AB" * 32})
+
+    assert _key(pinned).detector_checksum == "ab" * 32
+
+
+def test_no_key_without_model_paths_a_valid_hash_or_any_tier(settings: Settings) -> None:
+    assert embedding_cache_key(_IMAGE_SHA256, settings=get_settings()) is None
+    assert embedding_cache_key("../../etc", settings=settings) is None
+    disabled = settings.model_copy(update={"FACE_EMBEDDING_CACHE_MAX_ENTRIES": 0})
+    assert embedding_cache_key(_IMAGE_SHA256, settings=disabled) is None
+
+
+# --- tiers --------------------------------------------------------------------
+
+
+def test_memory_tier_evicts_least_recently_used(settings: Settings) -> None:
+    cache = EmbeddingCache()
+    small = settings.model_copy(update={"FACE_EMBEDDING_CACHE_MAX_ENTRIES": 2})
+    keys = [_key(small, hashlib.sha256(bytes([i])).hexdigest()) for i in range(3)]
+    embedding = make_unit_embedding_vector(seed=1.0)
+
+    cache.put(keys[0], embedding, settings=small, generation=cache.generation)
+    cache.put(keys[1], embedding, settings=small, generation=cache.generation)
+    assert cache.get(keys[0], settings=small) == embedding  # now most recent
+    cache.put(keys[2], embedding, settings=small, generation=cache.generation)
+
+    assert len(cache) == 2
+    assert cache.get(keys[1], settings=small) is None
+    assert cache.get(keys[0], settings=small) == embedding
+
+
+def test_disk_tier_is_private_and_shared_with_a_fresh_process(settings: Settings) -> None:
+    disk = _with_disk(settings)
+    key = _key(disk)
+    embedding = make_unit_embedding_vector(seed=2.0)
+
+    EmbeddingCache().put(key, embedding, settings=disk, generation=0)
+
+    root = Path(disk.BIOMETRIC_STORAGE_ROOT).resolve() / DISK_ZONE
+    assert stat.S_IMODE(os.stat(root).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(root / _IMAGE_SHA256).st_mode) == 0o700
+    assert EmbeddingCache().get(key, settings=disk) == embedding
+
+
+def test_unreadable_disk_entry_is_a_miss_and_removed(settings: Settings) -> None:
+    disk = _with_disk(settings)
+    key = _key(disk)
+    EmbeddingCache().put(key, make_unit_embedding_vector(), settings=disk, generation=0)
+    (entry,) = (Path(disk.BIOMETRIC_STORAGE_ROOT) / DISK_ZONE / _IMAGE_SHA256).iterdir()
+    entry.write_bytes(b"\x00" * 7)
+
+    assert EmbeddingCache().get(key, settings=disk) is None
+    assert not entry.exists()
+
+
+def test_disk_tier_prunes_least_recently_used_entries(settings: Settings) -> None:
+    disk = _with_disk(settings, max_entries=4)
+    cache = EmbeddingCache()
+    keys = [_key(disk, hashlib.sha256(bytes([i])).hexdigest()) for i in range(5)]
+    for index, key in enumerate(keys):
+        cache.put(
+            key,
+            make_unit_embedding_vector(seed=float(index + 1)),
+            settings=disk,
+            generation=cache.generation,
+        )
+        path = Path(disk.BIOMETRIC_STORAGE_ROOT).resolve() / DISK_ZONE / key.image_sha256
+        for entry in path.iterdir():
+            os.utime(entry, ns=(index * 10**9, index * 10**9))
+
+    entries = list((Path(disk.BIOMETRIC_STORAGE_ROOT) / DISK_ZONE).glob("*/*.bin"))
+    assert len(entries) <= 4
+    fresh = EmbeddingCache()
+    assert fresh.get(keys[0], settings=disk) is None
+    assert fresh.get(keys[4], settings=disk) is not None
+
+
+# --- purge ------------------------------------------------------------------------
+
+
+async def test_purge_after_commit_drops_both_tiers(settings: Settings) -> None:
+    disk = _with_disk(settings)
+    cache = get_embedding_cache()
+    key = _key(disk)
+    other = _key(disk, hashlib.sha256(b"other").hexdigest())
+    cache.put(key, make_unit_embedding_vector(), settings=disk, generation=cache.generation)
+    cache.put(other, make_unit_embedding_vector(), settings=disk, generation=cache.generation)
+    session = AsyncSession()
+    try:
+        purge_after_commit(session, _IMAGE_SHA256)
+        assert cache.get(key, settings=disk) is not None  # not yet durable
+
+        await session.commit()
+
+        assert cache.get(key, settings=disk) is None
+        wait_for_disk_purges()
+        assert EmbeddingCache().get(key, settings=disk) is None
+        assert cache.get(other, settings=disk) is not None
+    finally:
+        await session.close()
+
+
+def test_queued_disk_purge_hides_entries_until_it_runs(settings: Settings) -> None:
+    disk = _with_disk(settings)
+    cache = get_embedding_cache()
+    key = _key(disk)
+    cache.put(key, make_unit_embedding_vector(), settings=disk, generation=cache.generation)
+    release = threading.Event()
+    _purge_executor().submit(release.wait, 5)
+    try:
+        cache.purge([_IMAGE_SHA256], settings=disk)
+
+        assert _entry_path(_disk_root(disk), key).exists()
+        assert cache.get(key, settings=disk) is None
+        cache.put(key, make_unit_embedding_vector(), settings=disk, generation=cache.generation)
+    finally:
+        release.set()
+    wait_for_disk_purges()
+    assert not _entry_path(_disk_root(disk), key).exists()
+    cache.clear()
+    assert cache.get(key, settings=disk) is None
+
+
+def test_fill_read_before_a_purge_is_refused(settings: Settings) -> None:
+    disk = _with_disk(settings)
+    cache = get_embedding_cache()
+    key = _key(disk)
+    generation = cache.generation
+
+    cache.purge([hashlib.sha256(b"unrelated").hexdigest()], settings=disk)
+    cache.put(key, make_unit_embedding_vector(), settings=disk, generation=generation)
+
+    wait_for_disk_purges()
+    assert cache.get(key, settings=disk) is None
+    assert not _entry_path(_disk_root(disk), key).exists()
+
+
+def test_memory_entries_expire_after_the_ttl(settings: Settings) -> None:
+    now = [0.0]
+    cache = EmbeddingCache(clock=lambda: now[0])
+    short = settings.model_copy(update={"FACE_EMBEDDING_CACHE_TTL_SECONDS": 60})
+    old, new = (_key(short, hashlib.sha256(bytes([i])).hexdigest()) for i in range(2))
+    cache.put(old, make_unit_embedding_vector(), settings=short, generation=cache.generation)
+    now[0] = 30.0
+    cache.put(new, make_unit_embedding_vector(), settings=short, generation=cache.generation)
+
+    now[0] = 61.0
+    assert cache.get(new, settings=short) is not None
+    assert len(cache) == 1
+    now[0] = 91.0
+    assert cache.get(new, settings=short) is None
+
+
+async def test_fill_after_commit_lands_only_on_commit(settings: Settings) -> None:
+    cache = get_embedding_cache()
+    key = _key(settings)
+    embedding = make_unit_embedding_vector()
+    session = AsyncSession()
+    try:
+        await session.begin()
+        fill_after_commit(session, key, embedding, settings=settings, generation=cache.generation)
+        await session.rollback()
+        assert cache.get(key, settings=settings) is None
+
+        fill_after_commit(session, key, embedding, settings=settings, generation=cache.generation)
+        purge_after_commit(session, _IMAGE_SHA256)
+        await session.commit()
+        assert cache.get(key, settings=settings) is None  # the purge in the same commit wins
+
+        fill_after_commit(session, key, embedding, settings=settings, generation=cache.generation)
+        await session.commit()
+        assert cache.get(key, settings=settings) == embedding
+    finally:
+        await session.close()
+
+
+async def test_rolled_back_purge_leaves_entries(settings: Settings) -> None:
+    cache = get_embedding_cache()
+    key = _key(settings)
+    cache.put(key, make_unit_embedding_vector(), settings=settings, generation=cache.generation)
+    session = AsyncSession()
+    try:
+        await session.begin()
+        purge_after_commit(session, _IMAGE_SHA256)
+
+        await session.rollback()
+        await session.commit()
+
+        assert cache.get(key, settings=settings) is not None
+    finally:
+        await session.close()
+
+
+# --- consulting paths ---------------------------------------------------------------
+
+
+def test_probe_embeddings_are_never_cached(settings: Settings) -> None:
+    disk = _with_disk(settings)
+    data = make_real_jpeg_bytes(size=(320, 240))
+    detector = FakeFaceDetector()
+
+    with patch_providers(detector, FakeFaceEmbedder(seed=3.0)):
+        first = _validate_and_embed_probe_sync(
+            data, settings=disk, declared_content_type="image/jpeg"
+        )
+        second = _validate_and_embed_probe_sync(
+            data, settings=disk, declared_content_type="image/jpeg"
+        )
+
+    assert second == first
+    assert detector._call_count == 2
+    assert len(get_embedding_cache()) == 0
+    assert not (Path(disk.BIOMETRIC_STORAGE_ROOT).resolve() / DISK_ZONE).exists()
+
+
+async def test_sample_embedding_is_cached_on_success_and_purged_on_deletion(
+    client_db, db_session: AsyncSession, settings: Settings
+) -> None:
+    scope = await seed_enrollment_scope(client_db, db_session, suffix="embcache")
+    sample_id = await seed_active_sample_direct(
+        db_session,
+        student_profile_id=uuid.UUID(scope["student_profile_1"]["id"]),
+        created_by_user_id=scope["admin"].id,
+        content=make_real_jpeg_bytes(color=(40, 50, 60)),
+    )
+    settings = settings.model_copy(
+        update={"BIOMETRIC_STORAGE_ROOT": get_settings().BIOMETRIC_STORAGE_ROOT}
+    )
+    samples = BiometricSampleRepository(db_session)
+    sample = await samples.get_by_id(sample_id)
+    assert sample is not None
+    key = _key(settings, sample.sha256_hash)
+    detector = FakeFaceDetector()
+    service = SampleProcessingService(db_session, settings=settings)
+
+    with patch_providers(detector, FakeFaceEmbedder(seed=4.0)):
+        first = service._load_and_embed_sync(sample)
+        assert get_embedding_cache().get(key, settings=settings) is None  # not yet persisted
+        await service.process_sample(sample_id=sample_id, actor=scope["admin"])
+        (batched,) = await service.embed_samples([sample])
+
+    assert batched == first
+    assert detector._call_count == 2
+    assert get_embedding_cache().get(key, settings=settings) == first
+
+    await samples.mark_deletion_pending(sample)
+    await db_session.commit()
+
+    assert get_embedding_cache().get(key, settings=settings) is None
+
+
+async def test_sample_deleted_while_its_embedding_is_computed_is_never_cached(
+    client_db, db_session: AsyncSession, settings: Settings
+) -> None:
+    scope = await seed_enrollment_scope(client_db, db_session, suffix="embcache2")
+    sample_id = await seed_active_sample_direct(
+        db_session,
+        student_profile_id=uuid.UUID(scope["student_profile_1"]["id"]),
+        created_by_user_id=scope["admin"].id,
+        content=make_real_jpeg_bytes(color=(60, 50, 40)),
+    )
+    disk = _with_disk(settings).model_copy(
+        update={"BIOMETRIC_STORAGE_ROOT": get_settings().BIOMETRIC_STORAGE_ROOT}
+    )
+    loop = asyncio.get_running_loop()
+    embed_sample_files = processing_service.embed_sample_files
+
+    async def delete_sample() -> None:
+        async with AsyncSession(bind=db_session.bind, expire_on_commit=False) as other_session:
+            samples = BiometricSampleRepository(other_session)
+            sample = await samples.get_by_id(sample_id, for_update=True)
+            assert sample is not None
+            await samples.mark_deletion_pending(sample)
+            await other_session.commit()
+
+    def embed_then_delete(*args: Any, **kwargs: Any) -> Any:
+        # Runs on the inference thread: the deletion commits (and purges)
+        # after the cache lookup missed and before the outcome is persisted.
+        outcomes = embed_sample_files(*args, **kwargs)
+        asyncio.run_coroutine_threadsafe(delete_sample(), loop).result(timeout=30)
+        return outcomes
+
+    with (
+        patch_providers(FakeFaceDetector(), FakeFaceEmbedder(seed=5.0)),
+        patch.object(processing_service, "embed_sample_files", embed_then_delete),
+    ):
+        results = await SampleProcessingService(db_session, settings=disk).process_pending_batch(
+            actor=scope["admin"]
+        )
+
+    assert results == []
+    sample = await BiometricSampleRepository(db_session).get_by_id(sample_id)
+    assert sample is not None
+    key = _key(disk, sample.sha256_hash)
+    wait_for_disk_purges()
+    assert get_embedding_cache().get(key, settings=disk) is None
+    assert not _entry_path(_disk_root(disk), key).exists()
@@ -0,0 +1,76 @@
+"""Tests for ``app.modules.face_recognition.embedding_codec``.
+
+Pure-logic tests: the stored byte layout (little-endian float32, no
+header) is pinned explicitly, since rows written today must decode the
+same way on every future host.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+import pytest
+
+from app.modules.face_recognition.embedding_codec import (
+    pack_embedding,
+    unpack_embedding,
+    unpack_embedding_rows,
+)
+from app.tests.phase5_stage3_helpers import make_unit_embedding_vector
+
+
+def test_pack_embedding_is_little_endian_float32_without_header() -> None:
+    assert pack_embedding([1.0, -2.5]) == struct.pack("<2f", 1.0, -2.5)
+
+
+def test_round_trip_is_float32_rounding_of_the_input() -> None:
+    values = make_unit_embedding_vector(seed=3.0).values
+
+    decoded = unpack_embedding(pack_embedding(values))
+
+    assert decoded.dtype == np.dtype("<f4")
+    assert decoded.shape == (128,)
+    assert decoded.tolist() == [float(np.float32(value)) for value in values]
+    assert np.max(np.abs(decoded.astype(np.float64) - np.array(values))) < 1e-7
+
+
+def test_unpack_embedding_is_a_read_only_view() -> None:
+    decoded = unpack_embedding(pack_embedding([0.5, 0.25]))
+
+    assert decoded.flags.writeable is False
+
+
+@pytest.mark.parametrize("values", [[], [float("nan")], [1e39], [[1.0, 2.0]]])
+def test_pack_embedding_rejects_empty_non_finite_and_nested_input(values: list) -> None:
+    with pytest.raises(ValueError):
+        pack_embedding(values)
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize("values", [[1e39], [-1e39, 0.0]])
+def test_pack_embedding_rejects_float32_overflow_without_a_numpy_warning(values: list) -> None:
+    with pytest.raises(ValueError, match="finite in float32"):
+        pack_embedding(values)
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00\x00\x80"])
+def test_unpack_embedding_rejects_truncated_bytes(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        unpack_embedding(data)
+
+
+def test_unpack_embedding_rows_stacks_rows_in_order() -> None:
+    rows = [pack_embedding([1.0, 2.0, 3.0]), pack_embedding([4.0, 5.0, 6.0])]
+
+    matrix = unpack_embedding_rows(rows, dimension=3)
+
+    assert matrix.shape == (2, 3)
+    assert matrix.tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+
+def test_unpack_embedding_rows_rejects_a_row_of_another_dimension() -> None:
+    rows = [pack_embedding([1.0, 2.0, 3.0]), pack_embedding([4.0, 5.0])]
+
+    with pytest.raises(ValueError):
+        unpack_embedding_rows(rows, dimension=3)
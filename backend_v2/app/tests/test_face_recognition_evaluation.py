@@ -7,13 +7,19 @@ actual deployment (see that module's own docstring).
 
 from __future__ import annotations
 
+import numpy as np
 import pytest
 
 from app.modules.face_recognition.evaluation import (
     EvaluationPair,
+    SimilarityScores,
     ambiguity_rate,
+    ambiguity_rates,
     compute_far_frr,
+    score_gallery_pairs,
+    score_probe_pairs,
     threshold_sweep,
+    top_two_by_identity,
 )
 
 
@@ -109,6 +115,137 @@ def test_ambiguity_rate_of_empty_input_is_zero() -> None:
     assert ambiguity_rate([], ambiguous_margin=0.05) == 0.0
 
 
+def _loop_far_frr(pairs: list[EvaluationPair], threshold: float) -> tuple[float, float]:
+    """The original two-filter, per-threshold loop, kept as the reference."""
+    genuine = [pair for pair in pairs if pair.is_genuine]
+    impostors = [pair for pair in pairs if not pair.is_genuine]
+    frr = sum(1 for p in genuine if p.similarity < threshold) / len(genuine)
+    far = sum(1 for p in impostors if p.similarity >= threshold) / len(impostors)
+    return far, frr
+
+
+def test_sweep_matches_the_per_pair_loop_exactly_including_ties() -> None:
+    rng = np.random.default_rng(7)
+    values = np.round(rng.uniform(-1.0, 1.0, size=400), 2)  # plenty of ties
+    pairs = [
+        EvaluationPair(is_genuine=bool(index % 3), similarity=float(value))
+        for index, value in enumerate(values)
+    ]
+    thresholds = [*np.unique(values).tolist(), -1.0, 0.333, 1.0, 1.01]
+
+    results = threshold_sweep(pairs, thresholds=thresholds)
+
+    for threshold, result in zip(thresholds, results, strict=True):
+        assert (result.false_accept_rate, result.false_reject_rate) == _loop_far_frr(
+            pairs, threshold
+        )
+
+
+def test_similarity_scores_validate_like_evaluation_pair() -> None:
+    with pytest.raises(ValueError):
+        SimilarityScores([0.5, 1.5], [])
+    with pytest.raises(ValueError):
+        SimilarityScores([], [float("nan")])
+
+
+def test_roc_curve_runs_from_accept_all_to_reject_all() -> None:
+    scores = SimilarityScores.from_pairs(_synthetic_pairs())
+
+    curve = scores.roc_curve()
+
+    assert curve.thresholds.tolist() == sorted(set(curve.thresholds.tolist()))
+    assert (curve.false_accept_rates[0], curve.false_reject_rates[0]) == (1.0, 0.0)
+    assert (curve.false_accept_rates[-1], curve.false_reject_rates[-1]) == (0.0, 1.0)
+    assert np.all(np.diff(curve.false_accept_rates) <= 0)
+    assert np.all(np.diff(curve.false_reject_rates) >= 0)
+
+
+def test_equal_error_rate_is_where_far_and_frr_cross() -> None:
+    # Genuine 0.6..0.9, impostor 0.1..0.7: the 0.6/0.7 overlap makes
+    # FAR == FRR == 1/4 for any threshold in (0.6, 0.7].
+    scores = SimilarityScores([0.6, 0.7, 0.8, 0.9], [0.1, 0.2, 0.3, 0.7])
+
+    rate, threshold = scores.equal_error_rate()
+
+    assert rate == pytest.approx(0.25)
+    assert 0.6 <= threshold <= 0.7
+    with pytest.raises(ValueError):
+        SimilarityScores([0.9], []).equal_error_rate()
+
+
+def test_threshold_for_far_is_the_lowest_threshold_meeting_the_target() -> None:
+    impostor = np.linspace(-0.5, 0.5, 1000)
+    scores = SimilarityScores([], impostor)
+
+    threshold = scores.threshold_for_far(0.01)
+
+    (at_threshold,) = scores.evaluate([threshold])
+    (just_below,) = scores.evaluate([float(np.nextafter(threshold, -np.inf))])
+    assert at_threshold.false_accept_rate <= 0.01 < just_below.false_accept_rate
+    assert scores.threshold_for_far(1.0) == -1.0
+
+
+def test_ambiguity_rates_match_ambiguity_rate_per_margin() -> None:
+    top_similarities = [(0.9, 0.85), (0.9, 0.5), (0.8, 0.79), (0.7, 0.1)]
+    margins = [0.0, 0.01, 0.05, 0.1, 0.5, 0.7]
+
+    assert ambiguity_rates(top_similarities, ambiguous_margins=margins) == [
+        ambiguity_rate(top_similarities, ambiguous_margin=margin) for margin in margins
+    ]
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.clip(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)), -1.0, 1.0))
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 1024])
+def test_gallery_pairs_score_each_unordered_pair_once(block_size: int) -> None:
+    rng = np.random.default_rng(11)
+    embeddings = rng.standard_normal((7, 16))
+    identities = ["a", "b", "a", "c", "d", "b", "e"]
+
+    scores = score_gallery_pairs(embeddings, identities, block_size=block_size)
+
+    expected_genuine, expected_impostor = [], []
+    for i in range(7):
+        for j in range(i + 1, 7):
+            same = identities[i] == identities[j]
+            (expected_genuine if same else expected_impostor).append(
+                _cosine(embeddings[i], embeddings[j])
+            )
+    np.testing.assert_allclose(scores.genuine, sorted(expected_genuine))
+    np.testing.assert_allclose(scores.impostor, sorted(expected_impostor))
+
+
+def test_probe_pairs_and_top_two_follow_the_matcher_rules() -> None:
+    rng = np.random.default_rng(13)
+    gallery = rng.standard_normal((5, 16))
+    gallery[4] = 0.0  # zero-norm row: scores 0.0 against everything
+    gallery_ids = ["a", "a", "b", "c", "d"]
+    probes = gallery[[0, 2]] + 0.01 * rng.standard_normal((2, 16))
+
+    scores = score_probe_pairs(probes, ["a", "z"], gallery, gallery_ids, block_size=1)
+    top_two = top_two_by_identity(probes, gallery, gallery_ids, block_size=1)
+
+    assert (scores.genuine_pair_count, scores.impostor_pair_count) == (2, 8)
+    assert 0.0 in scores.impostor.tolist()
+    per_student = [
+        sorted(
+            (
+                max(
+                    _cosine(probe, gallery[i]) if np.any(gallery[i]) else 0.0
+                    for i in range(5)
+                    if gallery_ids[i] == student
+                )
+                for student in "abcd"
+            ),
+            reverse=True,
+        )[:2]
+        for probe in probes
+    ]
+    np.testing.assert_allclose(top_two, per_student)
+
+
 def test_evaluation_module_never_asserts_a_real_accuracy_claim() -> None:
     """Structural guard: this module's docstring states no benchmark
     number is presented as this project's actual calibrated accuracy —
@@ -0,0 +1,178 @@
+"""Tests for ``app.modules.face_recognition.gallery_cache``.
+
+Pure-logic tests: no database. ``GalleryCache`` gets an injected clock
+so TTL expiry is deterministic; the commit/rollback listeners are
+exercised through an unbound ``AsyncSession``, which commits and rolls
+back without ever opening a connection.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.face_recognition.domain import EmbeddingModel
+from app.modules.face_recognition.gallery_cache import (
+    GalleryCache,
+    GalleryKey,
+    gallery_key,
+    get_gallery_cache,
+    has_pending_invalidation,
+    invalidate_after_commit,
+)
+from app.modules.face_recognition.providers.similarity_matcher import CandidateGallery
+from app.tests.phase5_stage3_helpers import make_candidate
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _gallery() -> CandidateGallery:
+    return CandidateGallery.from_candidates([make_candidate(seed=1.0)])
+
+
+def _model(version: str = "v1") -> EmbeddingModel:
+    return EmbeddingModel(
+        provider_name="dlib_resnet_local", model_identifier="resnet-128", model_version=version
+    )
+
+
+def _key() -> GalleryKey:
+    return gallery_key([uuid.uuid4(), uuid.uuid4()], model=_model())
+
+
+def test_gallery_key_ignores_order_and_duplicates() -> None:
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    assert gallery_key([first, second], model=_model()) == gallery_key(
+        [second, first, second], model=_model()
+    )
+
+
+def test_gallery_key_separates_embedding_models() -> None:
+    cache = GalleryCache()
+    students = [uuid.uuid4(), uuid.uuid4()]
+    cache.put(
+        gallery_key(students, model=_model("v1")),
+        _gallery(),
+        generation=cache.generation,
+        max_entries=4,
+    )
+
+    assert cache.get(gallery_key(students, model=_model("v1")), ttl_seconds=60) is not None
+    assert cache.get(gallery_key(students, model=_model("v2")), ttl_seconds=60) is None
+
+
+def test_get_returns_stored_gallery_and_empty_scope_marker() -> None:
+    cache = GalleryCache()
+    key, empty_key = _key(), _key()
+    gallery = _gallery()
+
+    assert cache.put(key, gallery, generation=cache.generation, max_entries=4) is True
+    assert cache.put(empty_key, None, generation=cache.generation, max_entries=4) is True
+
+    hit = cache.get(key, ttl_seconds=60)
+    empty_hit = cache.get(empty_key, ttl_seconds=60)
+    assert hit is not None and hit.gallery is gallery
+    assert empty_hit is not None and empty_hit.gallery is None
+    assert cache.get(_key(), ttl_seconds=60) is None
+
+
+def test_least_recently_used_entry_is_evicted_first() -> None:
+    cache = GalleryCache()
+    first, second, third = _key(), _key(), _key()
+    cache.put(first, _gallery(), generation=cache.generation, max_entries=2)
+    cache.put(second, _gallery(), generation=cache.generation, max_entries=2)
+
+    assert cache.get(first, ttl_seconds=60) is not None  # first is now most recent
+    cache.put(third, _gallery(), generation=cache.generation, max_entries=2)
+
+    assert len(cache) == 2
+    assert cache.get(second, ttl_seconds=60) is None
+    assert cache.get(first, ttl_seconds=60) is not None
+    assert cache.get(third, ttl_seconds=60) is not None
+
+
+def test_entry_expires_after_ttl() -> None:
+    clock = _FakeClock()
+    cache = GalleryCache(clock=clock)
+    key = _key()
+    cache.put(key, _gallery(), generation=cache.generation, max_entries=4)
+
+    clock.now = 59.9
+    assert cache.get(key, ttl_seconds=60) is not None
+    clock.now = 60.0
+    assert cache.get(key, ttl_seconds=60) is None
+    assert len(cache) == 0
+
+
+def test_zero_max_entries_disables_the_cache() -> None:
+    cache = GalleryCache()
+    key = _key()
+
+    assert cache.put(key, _gallery(), generation=cache.generation, max_entries=0) is False
+    assert cache.get(key, ttl_seconds=60) is None
+
+
+def test_put_refuses_a_gallery_read_before_an_invalidation() -> None:
+    cache = GalleryCache()
+    key = _key()
+    generation = cache.generation  # reader starts its query...
+
+    cache.invalidate()  # ...a lifecycle change commits meanwhile...
+
+    assert cache.put(key, _gallery(), generation=generation, max_entries=4) is False
+    assert cache.get(key, ttl_seconds=60) is None
+
+
+def test_invalidate_drops_every_entry() -> None:
+    cache = GalleryCache()
+    keys = [_key(), _key()]
+    for key in keys:
+        cache.put(key, _gallery(), generation=cache.generation, max_entries=4)
+
+    cache.invalidate()
+
+    assert len(cache) == 0
+
+
+async def test_flagged_session_invalidates_only_on_commit() -> None:
+    cache = get_gallery_cache()
+    key = _key()
+    session = AsyncSession()
+    try:
+        cache.put(key, _gallery(), generation=cache.generation, max_entries=4)
+        invalidate_after_commit(session)
+        assert has_pending_invalidation(session) is True
+        assert cache.get(key, ttl_seconds=60) is not None  # not yet durable
+
+        await session.commit()
+
+        assert has_pending_invalidation(session) is False
+        assert cache.get(key, ttl_seconds=60) is None
+    finally:
+        await session.close()
+
+
+async def test_rolled_back_session_leaves_cache_untouched() -> None:
+    cache = get_gallery_cache()
+    key = _key()
+    session = AsyncSession()
+    try:
+        cache.put(key, _gallery(), generation=cache.generation, max_entries=4)
+        await session.begin()
+        invalidate_after_commit(session)
+
+        await session.rollback()
+        await session.commit()  # a later, unrelated commit must not invalidate either
+
+        assert has_pending_invalidation(session) is False
+        assert cache.get(key, ttl_seconds=60) is not None
+    finally:
+        await session.close()
@@ -0,0 +1,195 @@
+"""Tests for ``app.modules.face_recognition.image_codec.ImageFrame`` and the
+pipeline stages that pass it along without copying.
+
+Copy-freedom is asserted directly with ``np.shares_memory`` against the
+buffer decoding produced. Uses real Pillow/OpenCV and no model file: the
+YuNet adapter runs against a fake ``cv2.FaceDetectorYN`` (as in
+``test_face_recognition_yunet_detector``), the dlib adapter's chip
+preparation is called directly.
+"""
+
+from __future__ import annotations
+
+import io
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.config import get_settings
+from app.modules.face_recognition.alignment import align_face
+from app.modules.face_recognition.domain import DetectedFace, ImageDimensions
+from app.modules.face_recognition.image_codec import (
+    ImageFrame,
+    as_frame,
+    frame_to_decoded_image,
+    normalized_face_input_to_ndarray,
+    pil_image_to_frame,
+)
+from app.modules.face_recognition.pipeline import detect_align_embed_all
+from app.modules.face_recognition.providers.dlib_embedder import _to_rgb_chip
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+from app.tests.phase5_stage3_helpers import (
+    FakeFaceDetector,
+    FakeFaceEmbedder,
+    make_decoded_image,
+    make_detected_face,
+    patch_providers,
+)
+
+
+def _photo_array(width: int, height: int) -> np.ndarray:
+    return np.random.default_rng(5).integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+class _SettingsLike:
+    FACE_DETECTOR_MODEL_PATH: str
+    FACE_DETECTOR_MODEL_SHA256 = None
+    FACE_DETECTOR_INPUT_SIZE_PX = 320
+
+
+class _RecordingCvDetector:
+    """Stands in for ``cv2.FaceDetectorYN``; keeps every array it is given."""
+
+    def __init__(self) -> None:
+        self.seen: list[np.ndarray] = []
+
+    def setInputSize(self, size: tuple[int, int]) -> None:
+        pass
+
+    def detect(self, image: np.ndarray) -> tuple[int, None]:
+        self.seen.append(image)
+        return (1, None)
+
+
+def test_frame_is_read_only_and_reports_its_dimensions() -> None:
+    array = _photo_array(64, 48)
+    frame = ImageFrame(array, color_format="bgr")
+
+    assert frame.dimensions == ImageDimensions(width_px=64, height_px=48)
+    assert np.shares_memory(frame.pixels, array)
+    with pytest.raises(ValueError):
+        frame.pixels[0, 0, 0] = 1
+    # The caller's own array is left writable.
+    assert array.flags.writeable
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.zeros((4, 4), dtype=np.uint8),
+        np.zeros((4, 4, 4), dtype=np.uint8),
+        np.zeros((4, 4, 3), dtype=np.float32),
+    ],
+)
+def test_frame_rejects_anything_but_hw3_uint8(array: np.ndarray) -> None:
+    with pytest.raises(ValueError):
+        ImageFrame(array)
+
+
+def test_crop_is_a_view_clipped_to_the_frame() -> None:
+    frame = ImageFrame(_photo_array(100, 80))
+
+    tile = frame.crop(x_px=60, y_px=50, width_px=64, height_px=64)
+
+    assert tile.dimensions == ImageDimensions(width_px=40, height_px=30)
+    assert np.shares_memory(tile.pixels, frame.pixels)
+    np.testing.assert_array_equal(tile.pixels, frame.pixels[50:, 60:])
+
+
+def test_channel_order_conversion_only_copies_when_the_order_differs() -> None:
+    rgb = _photo_array(32, 24)
+    rgb_frame = ImageFrame(rgb, color_format="rgb")
+    bgr_frame = ImageFrame(np.ascontiguousarray(rgb[:, :, ::-1]), color_format="bgr")
+
+    assert rgb_frame.rgb_pixels() is rgb_frame.pixels
+    assert bgr_frame.bgr_pixels() is bgr_frame.pixels
+    np.testing.assert_array_equal(rgb_frame.bgr_pixels(), bgr_frame.pixels)
+    np.testing.assert_array_equal(bgr_frame.rgb_pixels(), rgb)
+    assert bgr_frame.rgb_pixels().flags.c_contiguous
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "P"])
+def test_pil_image_to_frame_is_the_rgb_decode_in_bgr_order(mode: str) -> None:
+    buffer = io.BytesIO()
+    Image.fromarray(_photo_array(40, 30)).convert(mode).save(buffer, format="PNG")
+    with Image.open(io.BytesIO(buffer.getvalue())) as image:
+        frame = pil_image_to_frame(image)
+        expected = np.asarray(image.convert("RGB"))
+
+    assert frame.color_format == "bgr"
+    assert frame.pixels.flags.c_contiguous
+    np.testing.assert_array_equal(frame.pixels, expected[:, :, ::-1])
+
+
+def test_as_frame_wraps_a_decoded_image_without_copying() -> None:
+    image = make_decoded_image(color_format="bgr")
+
+    frame = as_frame(image)
+
+    assert frame.color_format == "bgr"
+    assert frame.dimensions == image.dimensions
+    assert np.shares_memory(frame.pixels, np.frombuffer(image.pixel_data, dtype=np.uint8))
+    assert as_frame(frame) is frame
+    assert frame_to_decoded_image(frame) == image
+
+
+def test_yunet_detector_reads_a_bgr_frame_in_place(tmp_path) -> None:
+    model_path = tmp_path / "yunet.onnx"
+    model_path.write_bytes(b"fake-onnx-model-bytes")
+    settings = _SettingsLike()
+    settings.FACE_DETECTOR_MODEL_PATH = str(model_path)
+    fake = _RecordingCvDetector()
+    frame = ImageFrame(_photo_array(400, 300), color_format="bgr")
+    rgb_frame = ImageFrame(np.ascontiguousarray(frame.pixels[:, :, ::-1]), color_format="rgb")
+
+    with patch.object(cv2.FaceDetectorYN, "create", return_value=fake):
+        detector = YuNetFaceDetector(settings)  # type: ignore[arg-type]
+        detector.detect(frame)
+        detector.detect(rgb_frame)
+
+    assert fake.seen[0] is frame.pixels
+    np.testing.assert_array_equal(fake.seen[1], frame.pixels)
+
+
+def test_embedder_sees_the_same_rgb_chip_whatever_the_source_order() -> None:
+    rgb = _photo_array(400, 400)
+    face = make_detected_face()
+
+    rgb_chip = align_face(ImageFrame(rgb, color_format="rgb"), face)
+    bgr_chip = align_face(
+        ImageFrame(np.ascontiguousarray(rgb[:, :, ::-1]), color_format="bgr"), face
+    )
+
+    assert (rgb_chip.color_format, bgr_chip.color_format) == ("rgb", "bgr")
+    np.testing.assert_array_equal(_to_rgb_chip(bgr_chip), _to_rgb_chip(rgb_chip))
+    np.testing.assert_array_equal(
+        normalized_face_input_to_ndarray(bgr_chip)[:, :, ::-1],
+        normalized_face_input_to_ndarray(rgb_chip),
+    )
+
+
+class _TileRecordingDetector(FakeFaceDetector):
+    def __init__(self) -> None:
+        super().__init__()
+        self.seen: list[ImageFrame] = []
+
+    def detect(self, image: ImageFrame) -> list[DetectedFace]:  # type: ignore[override]
+        self.seen.append(image)
+        return [make_detected_face(dimensions=image.dimensions)]
+
+
+def test_group_photo_tiles_are_views_of_the_decoded_frame() -> None:
+    frame = ImageFrame(_photo_array(2000, 1200), color_format="bgr")
+    detector = _TileRecordingDetector()
+
+    settings = get_settings().model_copy(update={"FACE_GROUP_TILE_SIZE_PX": 960})
+
+    with patch_providers(detector, FakeFaceEmbedder()):
+        detect_align_embed_all(frame, settings=settings)
+
+    assert len(detector.seen) > 1
+    assert detector.seen[0] is frame
+    assert all(np.shares_memory(tile.pixels, frame.pixels) for tile in detector.seen)
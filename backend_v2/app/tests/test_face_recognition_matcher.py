@@ -1,9 +1,11 @@
 """Tests for the face-recognition cosine-similarity matcher.
 
-Pure-logic tests: no database, no HTTP, real cosine-similarity math only
-(numpy-free — the matcher itself uses plain Python floats). A tiny
-``_SettingsLike`` stand-in supplies just the two attributes the matcher
-reads, so these tests do not need a real ``Settings`` instance.
+Pure-logic tests: no database, no HTTP, real cosine-similarity math only.
+The reference ``CosineSimilarityFaceMatcher`` uses plain Python floats;
+the ``VectorizedCosineSimilarityFaceMatcher`` tests at the bottom check
+that the NumPy engine reaches the exact same decisions. A tiny
+``_SettingsLike`` stand-in supplies just the attributes the matchers
+read, so these tests do not need a real ``Settings`` instance.
 """
 
 from __future__ import annotations
@@ -11,11 +13,22 @@ from __future__ import annotations
 import math
 import uuid
 
+import numpy as np
 import pytest
 
-from app.modules.face_recognition.domain import CandidateEmbedding, MatchStatus
+from app.modules.face_recognition.domain import (
+    CandidateEmbedding,
+    EmbeddingVector,
+    MatchResult,
+    MatchStatus,
+)
 from app.modules.face_recognition.errors import CandidateEmbeddingDimensionMismatchError
-from app.modules.face_recognition.providers.similarity_matcher import CosineSimilarityFaceMatcher
+from app.modules.face_recognition.provider_factory import get_matcher
+from app.modules.face_recognition.providers.similarity_matcher import (
+    CandidateGallery,
+    CosineSimilarityFaceMatcher,
+    VectorizedCosineSimilarityFaceMatcher,
+)
 from app.tests.phase5_stage3_helpers import (
     make_candidate,
     make_unit_embedding_vector,
@@ -24,9 +37,12 @@ from app.tests.phase5_stage3_helpers import (
 
 
 class _SettingsLike:
-    def __init__(self, *, threshold: float = 0.8, ambiguous_margin: float = 0.05) -> None:
+    def __init__(
+        self, *, threshold: float = 0.8, ambiguous_margin: float = 0.05, engine: str = "python"
+    ) -> None:
         self.FACE_MATCH_THRESHOLD = threshold
         self.FACE_MATCH_AMBIGUOUS_MARGIN = ambiguous_margin
+        self.FACE_MATCHER_ENGINE = engine
 
 
 def _matcher(**kwargs: float) -> CosineSimilarityFaceMatcher:
@@ -184,3 +200,352 @@ def test_match_two_samples_of_same_student_never_produce_self_ambiguity() -> Non
 
     assert result.status is MatchStatus.FOUND
     assert result.matched_student_profile_id == student_id
+
+
+# ---------------------------------------------------------------------------
+# Vectorized engine: same decisions as the reference loop
+# ---------------------------------------------------------------------------
+
+
+def _vectorized(**kwargs: float) -> VectorizedCosineSimilarityFaceMatcher:
+    return VectorizedCosineSimilarityFaceMatcher(_SettingsLike(**kwargs))
+
+
+def _assert_same_decision(expected: MatchResult, actual: MatchResult) -> None:
+    assert actual.status is expected.status
+    assert actual.matched_student_profile_id == expected.matched_student_profile_id
+    for expected_candidate, actual_candidate in (
+        (expected.best_candidate, actual.best_candidate),
+        (expected.runner_up_candidate, actual.runner_up_candidate),
+    ):
+        if expected_candidate is None:
+            assert actual_candidate is None
+            continue
+        assert actual_candidate is not None
+        assert actual_candidate.student_profile_id == expected_candidate.student_profile_id
+        assert math.isclose(
+            actual_candidate.similarity, expected_candidate.similarity, abs_tol=1e-12
+        )
+
+
+def _random_roster(
+    rng: np.random.Generator, *, students: int, samples_per_student: int
+) -> tuple[EmbeddingVector, list[CandidateEmbedding]]:
+    """A roster where one student's samples sit close to the probe and the
+    rest are random — with duplicated rows to force exact ties."""
+    dimension = 128
+    probe_values = rng.standard_normal(dimension)
+    probe_values /= np.linalg.norm(probe_values)
+    student_ids = [uuid.uuid4() for _ in range(students)]
+    candidates: list[CandidateEmbedding] = []
+    for index, student_id in enumerate(student_ids):
+        for _ in range(samples_per_student):
+            if index == 0:
+                row = probe_values + rng.normal(scale=0.05, size=dimension)
+            else:
+                row = rng.standard_normal(dimension)
+            candidates.append(
+                CandidateEmbedding(
+                    student_profile_id=student_id,
+                    embedding=EmbeddingVector(values=tuple(float(v) for v in row)),
+                )
+            )
+    # An exact duplicate of another student's row: an identical-similarity tie.
+    candidates.append(
+        CandidateEmbedding(student_profile_id=uuid.uuid4(), embedding=candidates[-1].embedding)
+    )
+    rng.shuffle(candidates)
+    return EmbeddingVector(values=tuple(float(v) for v in probe_values)), candidates
+
+
+@pytest.mark.parametrize("seed", range(12))
+@pytest.mark.parametrize(
+    ("threshold", "ambiguous_margin"), [(0.82, 0.05), (0.1, 0.0), (0.99, 0.5), (0.5, 0.9)]
+)
+def test_vectorized_engine_matches_reference_decisions(
+    seed: int, threshold: float, ambiguous_margin: float
+) -> None:
+    rng = np.random.default_rng(seed)
+    probe, candidates = _random_roster(rng, students=40, samples_per_student=3)
+
+    expected = _matcher(threshold=threshold, ambiguous_margin=ambiguous_margin).match(
+        probe, candidates
+    )
+    actual = _vectorized(threshold=threshold, ambiguous_margin=ambiguous_margin).match(
+        probe, candidates
+    )
+
+    _assert_same_decision(expected, actual)
+
+
+def test_vectorized_engine_breaks_exact_ties_by_student_id() -> None:
+    shared_embedding = make_unit_embedding_vector(seed=1.0)
+    id_low = uuid.UUID("00000000-0000-0000-0000-000000000001")
+    id_high = uuid.UUID("ffffffff-ffff-ffff-ffff-ffffffffffff")
+    candidates = [
+        CandidateEmbedding(student_profile_id=id_high, embedding=shared_embedding),
+        CandidateEmbedding(student_profile_id=id_low, embedding=shared_embedding),
+    ]
+    matcher = _vectorized(threshold=0.0, ambiguous_margin=0.0)
+
+    assert matcher.match(shared_embedding, candidates).matched_student_profile_id == id_low
+    assert matcher.match(shared_embedding, candidates[::-1]).matched_student_profile_id == id_low
+
+
+def test_vectorized_engine_handles_empty_scope_and_zero_vectors() -> None:
+    matcher = _vectorized(threshold=0.5)
+    probe = make_unit_embedding_vector(seed=1.0)
+    zero = EmbeddingVector(values=(0.0,) * 128)
+    candidates = [make_candidate(seed=2.0), make_candidate(seed=3.0)]
+    candidates.append(CandidateEmbedding(student_profile_id=uuid.uuid4(), embedding=zero))
+
+    assert matcher.match(probe, []).status is MatchStatus.UNKNOWN
+    _assert_same_decision(
+        _matcher(threshold=0.5).match(zero, candidates), matcher.match(zero, candidates)
+    )
+    _assert_same_decision(
+        _matcher(threshold=0.5).match(probe, candidates), matcher.match(probe, candidates)
+    )
+
+
+def test_vectorized_engine_rejects_dimension_mismatch() -> None:
+    matcher = _vectorized()
+    probe = make_unit_embedding_vector(dimension=128, seed=1.0)
+
+    with pytest.raises(CandidateEmbeddingDimensionMismatchError):
+        matcher.match(probe, [make_candidate(dimension=64, seed=1.0)])
+    gallery = CandidateGallery.from_candidates([make_candidate(dimension=64, seed=1.0)])
+    with pytest.raises(CandidateEmbeddingDimensionMismatchError):
+        matcher.match_gallery(probe, gallery)
+
+
+def test_candidate_gallery_groups_rows_by_student_in_id_order() -> None:
+    student_a = uuid.UUID("00000000-0000-0000-0000-00000000000a")
+    student_b = uuid.UUID("00000000-0000-0000-0000-00000000000b")
+    candidates = [
+        make_candidate(student_profile_id=student_b, seed=1.0),
+        make_candidate(student_profile_id=student_a, seed=2.0),
+        make_candidate(student_profile_id=student_b, seed=3.0),
+    ]
+
+    gallery = CandidateGallery.from_candidates(candidates)
+
+    assert gallery.student_profile_ids == (student_a, student_b)
+    assert gallery.row_owners.tolist() == [0, 1, 1]
+    assert gallery.row_starts.tolist() == [0, 1]
+    assert gallery.unit_rows.dtype == np.float32
+    assert gallery.unit_rows.flags.c_contiguous
+    assert np.allclose(np.linalg.norm(gallery.unit_rows, axis=1), 1.0, atol=1e-6)
+
+
+def test_prebuilt_gallery_is_reusable_across_probes() -> None:
+    rng = np.random.default_rng(7)
+    probe, candidates = _random_roster(rng, students=60, samples_per_student=2)
+    matcher = _vectorized(threshold=0.82, ambiguous_margin=0.05)
+    gallery = CandidateGallery.from_candidates(candidates)
+
+    for _ in range(3):
+        _assert_same_decision(
+            matcher.match(probe, candidates), matcher.match_gallery(probe, gallery)
+        )
+
+
+@pytest.mark.parametrize(
+    ("engine", "expected_type"),
+    [
+        ("python", CosineSimilarityFaceMatcher),
+        ("vectorized", VectorizedCosineSimilarityFaceMatcher),
+    ],
+)
+def test_get_matcher_selects_configured_engine(engine: str, expected_type: type) -> None:
+    assert isinstance(get_matcher(_SettingsLike(engine=engine)), expected_type)
+
+
+# ---------------------------------------------------------------------------
+# Group assignment: many faces, one gallery, no student FOUND twice
+# ---------------------------------------------------------------------------
+
+
+def test_assign_gallery_matches_each_face_to_its_own_student() -> None:
+    student_ids = [uuid.uuid4() for _ in range(3)]
+    candidates = [
+        make_candidate(student_profile_id=student_id, seed=float(index + 1))
+        for index, student_id in enumerate(student_ids)
+    ]
+    probes = [make_unit_embedding_vector(seed=float(seed)) for seed in (3, 1, 2)]
+
+    results = _vectorized(threshold=0.99).assign_gallery(
+        probes, CandidateGallery.from_candidates(candidates)
+    )
+
+    assert [result.status for result in results] == [MatchStatus.FOUND] * 3
+    assert [result.matched_student_profile_id for result in results] == [
+        student_ids[2],
+        student_ids[0],
+        student_ids[1],
+    ]
+
+
+def test_assign_gallery_never_finds_one_student_for_two_faces() -> None:
+    student_id = uuid.uuid4()
+    gallery = CandidateGallery.from_candidates(
+        [make_candidate(student_profile_id=student_id, seed=1.0), make_candidate(seed=40.0)]
+    )
+    exact = make_unit_embedding_vector(seed=1.0)
+    near = nudge_unit_vector(exact, epsilon=0.05)
+
+    results = _vectorized(threshold=0.9, ambiguous_margin=0.0).assign_gallery(
+        [near, exact], gallery
+    )
+
+    # The closer face claims the student; the other still looks most like
+    # that student, so it is left ambiguous rather than given to anyone.
+    assert results[1].status is MatchStatus.FOUND
+    assert results[1].matched_student_profile_id == student_id
+    assert results[0].status is MatchStatus.AMBIGUOUS
+    assert results[0].matched_student_profile_id is None
+    assert results[0].best_candidate is not None
+    assert results[0].best_candidate.student_profile_id == student_id
+
+
+def _two_students_at(similarity: float) -> tuple[np.ndarray, np.ndarray]:
+    """Unit vectors A and B whose cosine similarity is ``similarity``."""
+    angle = math.acos(similarity)
+    a = np.zeros(128)
+    a[0] = 1.0
+    b = np.zeros(128)
+    b[0], b[1] = math.cos(angle), math.sin(angle)
+    return a, b
+
+
+def _probe_at(a: np.ndarray, b: np.ndarray, *, to_a: float, to_b: float) -> EmbeddingVector:
+    """A unit probe with cosine ``to_a`` to A and ``to_b`` to B (A, B as above)."""
+    x = to_a
+    y = (to_b - to_a * b[0]) / b[1]
+    probe = np.zeros(128)
+    probe[0], probe[1], probe[2] = x, y, math.sqrt(1.0 - x * x - y * y)
+    return EmbeddingVector(values=tuple(probe.tolist()))
+
+
+def test_assign_gallery_keeps_the_margin_after_a_rival_is_claimed() -> None:
+    # A and B are 0.85-similar; the "between" probe is equally close (~0.96)
+    # to both of them.
+    a, b = _two_students_at(0.85)
+    between = (a + b) / np.linalg.norm(a + b)
+    student_a, student_b = uuid.uuid4(), uuid.uuid4()
+    gallery = CandidateGallery.from_arrays([student_a, student_b], np.stack([a, b]))
+    probe_a = EmbeddingVector(values=tuple(a.tolist()))
+    probe_between = EmbeddingVector(values=tuple(between.tolist()))
+    matcher = _vectorized(threshold=0.9, ambiguous_margin=0.05)
+
+    assert matcher.match_gallery(probe_between, gallery).status is MatchStatus.AMBIGUOUS
+    # A's own face claiming A does not make the in-between face B.
+    results = matcher.assign_gallery([probe_between, probe_a], gallery)
+    assert results[1].matched_student_profile_id == student_a
+    assert results[0].status is MatchStatus.AMBIGUOUS
+    assert results[0].matched_student_profile_id is None
+
+
+def test_assign_gallery_never_hands_a_claimed_best_match_to_the_runner_up() -> None:
+    # face2 scores 0.90 against A (claimed by face1 at 1.0) and 0.85
+    # against B: it looks more like A, so it must not be FOUND for B.
+    a, b = _two_students_at(0.80)
+    student_a, student_b = uuid.uuid4(), uuid.uuid4()
+    gallery = CandidateGallery.from_arrays([student_a, student_b], np.stack([a, b]))
+    face1 = EmbeddingVector(values=tuple(a.tolist()))
+    face2 = _probe_at(a, b, to_a=0.90, to_b=0.85)
+    matcher = _vectorized(threshold=0.82, ambiguous_margin=0.03)
+
+    results = matcher.assign_gallery([face1, face2], gallery)
+
+    assert results[0].status is MatchStatus.FOUND
+    assert results[0].matched_student_profile_id == student_a
+    assert results[1].status is MatchStatus.AMBIGUOUS
+    assert results[1].matched_student_profile_id is None
+    assert results[1].best_candidate is not None
+    assert results[1].best_candidate.student_profile_id == student_a
+    assert results[1].best_candidate.similarity == pytest.approx(0.90)
+    assert results[1].runner_up_candidate is not None
+    assert results[1].runner_up_candidate.student_profile_id == student_b
+    assert results[1].runner_up_candidate.similarity == pytest.approx(0.85)
+
+
+def test_assign_gallery_keeps_near_identical_enrollments_ambiguous() -> None:
+    base = make_unit_embedding_vector(seed=1.0)
+    twin = nudge_unit_vector(base, epsilon=0.01)
+    gallery = CandidateGallery.from_candidates(
+        [
+            CandidateEmbedding(student_profile_id=uuid.uuid4(), embedding=base),
+            CandidateEmbedding(student_profile_id=uuid.uuid4(), embedding=twin),
+        ]
+    )
+
+    results = _vectorized(threshold=0.9, ambiguous_margin=0.05).assign_gallery(
+        [twin, base], gallery
+    )
+
+    # Neither face is confident, so neither claims a student for the other.
+    assert [result.status for result in results] == [MatchStatus.AMBIGUOUS] * 2
+
+
+def test_assign_gallery_with_more_faces_than_students_leaves_the_rest_unknown() -> None:
+    student_id = uuid.uuid4()
+    gallery = CandidateGallery.from_candidates(
+        [make_candidate(student_profile_id=student_id, seed=1.0)]
+    )
+    probe = make_unit_embedding_vector(seed=1.0)
+
+    results = _vectorized(threshold=0.5).assign_gallery([probe, probe, probe], gallery)
+
+    assert [result.status for result in results] == [
+        MatchStatus.FOUND,
+        MatchStatus.UNKNOWN,
+        MatchStatus.UNKNOWN,
+    ]
+    assert results[1].matched_student_profile_id is None
+    assert results[1].best_candidate is not None
+    assert results[1].best_candidate.student_profile_id == student_id
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_assign_gallery_single_face_agrees_with_match_gallery(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    probe, candidates = _random_roster(rng, students=30, samples_per_student=2)
+    matcher = _vectorized(threshold=0.82, ambiguous_margin=0.05)
+    gallery = CandidateGallery.from_candidates(candidates)
+
+    (result,) = matcher.assign_gallery([probe], gallery)
+
+    _assert_same_decision(matcher.match_gallery(probe, gallery), result)
+
+
+def test_assign_gallery_rejects_dimension_mismatch() -> None:
+    gallery = CandidateGallery.from_candidates([make_candidate(dimension=64, seed=1.0)])
+
+    with pytest.raises(CandidateEmbeddingDimensionMismatchError):
+        _vectorized().assign_gallery([make_unit_embedding_vector(seed=1.0)], gallery)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_match_gallery_many_decides_each_probe_like_match_gallery(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    probe, candidates = _random_roster(rng, students=30, samples_per_student=2)
+    other = EmbeddingVector(values=tuple(float(v) for v in rng.standard_normal(128)))
+    matcher = _vectorized(threshold=0.82, ambiguous_margin=0.05)
+    gallery = CandidateGallery.from_candidates(candidates)
+    # The same student twice is allowed: probes are separate photos.
+    probes = [probe, other, probe]
+
+    results = matcher.match_gallery_many(probes, gallery)
+
+    assert len(results) == 3
+    for expected_probe, result in zip(probes, results, strict=True):
+        _assert_same_decision(matcher.match_gallery(expected_probe, gallery), result)
+
+
+def test_match_gallery_many_handles_no_probes_and_rejects_dimension_mismatch() -> None:
+    gallery = CandidateGallery.from_candidates([make_candidate(dimension=64, seed=1.0)])
+
+    assert _vectorized().match_gallery_many([], gallery) == []
+    with pytest.raises(CandidateEmbeddingDimensionMismatchError):
+        _vectorized().match_gallery_many([make_unit_embedding_vector(seed=1.0)], gallery)
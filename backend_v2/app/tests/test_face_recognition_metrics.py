@@ -0,0 +1,222 @@
+"""Tests for ``app.modules.face_recognition.metrics``.
+
+The text exposition is checked line by line for a known set of
+observations; the pipeline, pool and offload hooks are checked by
+running them with the fake providers and reading the rendered output.
+The admin route is checked over HTTP.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.modules.face_recognition.errors import EnrollmentSampleNoFaceDetectedError
+from app.modules.face_recognition.metrics import (
+    DETECTOR_PROVIDER,
+    EMBEDDER_PROVIDER,
+    Histogram,
+    offload,
+    render_metrics,
+    reset_metrics,
+)
+from app.modules.face_recognition.pipeline import detect_align_embed, embed_aligned_faces
+from app.modules.face_recognition.provider_pool import InstancePool
+from app.modules.face_recognition.warmup import ModelWarmup, ModelWarmupStatus
+from app.tests.phase3_http_helpers import auth_headers
+from app.tests.phase5_stage2_http_helpers import seed_enrollment_scope
+from app.tests.phase5_stage3_helpers import (
+    FakeFaceDetector,
+    FakeFaceEmbedder,
+    make_decoded_image,
+    make_normalized_face,
+    patch_providers,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics() -> Iterator[None]:
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def _rendered() -> list[str]:
+    return render_metrics(pools={}, warmup=None).splitlines()
+
+
+def _value(lines: list[str], prefix: str) -> float:
+    matches = [line for line in lines if line.startswith(prefix + " ")]
+    assert len(matches) == 1, (prefix, lines)
+    return float(matches[0].rsplit(" ", 1)[1])
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count() -> None:
+    histogram = Histogram("demo_seconds", "Demo.", ("stage", "model"), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, ("detect", "m1"))
+    histogram.observe(0.2, ("align", ""))
+
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{stage="align",le="0.1"} 0',
+        'demo_seconds_bucket{stage="align",le="1"} 1',
+        'demo_seconds_bucket{stage="align",le="+Inf"} 1',
+        'demo_seconds_sum{stage="align"} 0.2',
+        'demo_seconds_count{stage="align"} 1',
+        'demo_seconds_bucket{stage="detect",model="m1",le="0.1"} 2',
+        'demo_seconds_bucket{stage="detect",model="m1",le="1"} 3',
+        'demo_seconds_bucket{stage="detect",model="m1",le="+Inf"} 4',
+        'demo_seconds_sum{stage="detect",model="m1"} 3.65',
+        'demo_seconds_count{stage="detect",model="m1"} 4',
+    ]
+
+
+def test_single_face_pipeline_observes_each_stage_with_model_labels() -> None:
+    settings = get_settings().model_copy(
+        update={
+            "FACE_DETECTION_MODEL_IDENTIFIER": "yunet-2023mar",
+            "FACE_EMBEDDING_MODEL_IDENTIFIER": "dlib-v1",
+            "FACE_EMBEDDING_MODEL_VERSION": "v1",
+        }
+    )
+    with patch_providers(FakeFaceDetector(), FakeFaceEmbedder()):
+        detect_align_embed(make_decoded_image(), settings=settings)
+    with (
+        patch_providers(FakeFaceDetector(results=[[]]), FakeFaceEmbedder()),
+        pytest.raises(EnrollmentSampleNoFaceDetectedError),
+    ):
+        detect_align_embed(make_decoded_image(), settings=settings)
+
+    lines = _rendered()
+    detect = (
+        f'face_pipeline_stage_seconds_count{{stage="detect",'
+        f'provider="{DETECTOR_PROVIDER}",model="yunet-2023mar"}}'
+    )
+    embed = (
+        f'face_pipeline_stage_seconds_count{{stage="embed",'
+        f'provider="{EMBEDDER_PROVIDER}",model="dlib-v1",model_version="v1"}}'
+    )
+    assert _value(lines, detect) == 2
+    assert _value(lines, 'face_pipeline_stage_seconds_count{stage="align"}') == 1
+    assert _value(lines, 'face_pipeline_stage_seconds_count{stage="quality"}') == 1
+    assert _value(lines, embed) == 1
+    no_face = EnrollmentSampleNoFaceDetectedError.code
+    assert _value(lines, f'face_pipeline_rejections_total{{code="{no_face}"}}') == 1
+
+
+def test_batched_embedding_is_observed_once_per_batch() -> None:
+    settings = get_settings().model_copy(
+        update={"FACE_EMBEDDING_MODEL_IDENTIFIER": "dlib-v1", "FACE_EMBEDDING_MODEL_VERSION": "v1"}
+    )
+    with patch_providers(FakeFaceDetector(), FakeFaceEmbedder()):
+        embed_aligned_faces([make_normalized_face()] * 3, settings=settings)
+
+    lines = _rendered()
+    labels = f'provider="{EMBEDDER_PROVIDER}",model="dlib-v1",model_version="v1"'
+    assert _value(lines, f'face_pipeline_stage_seconds_count{{stage="embed_batch",{labels}}}') == 1
+    assert not any('stage="embed",' in line for line in lines)
+
+
+def test_embedding_series_split_by_model_version_under_one_identifier() -> None:
+    before, after = (
+        get_settings().model_copy(
+            update={
+                "FACE_EMBEDDING_MODEL_IDENTIFIER": "dlib-v1",
+                "FACE_EMBEDDING_MODEL_VERSION": version,
+            }
+        )
+        for version in ("2026-01", "2026-09")
+    )
+    with patch_providers(FakeFaceDetector(), FakeFaceEmbedder()):
+        detect_align_embed(make_decoded_image(), settings=before)
+        detect_align_embed(make_decoded_image(), settings=after)
+        detect_align_embed(make_decoded_image(), settings=after)
+
+    lines = _rendered()
+    for version, count in (("2026-01", 1), ("2026-09", 2)):
+        embed = (
+            f'face_pipeline_stage_seconds_count{{stage="embed",provider="{EMBEDDER_PROVIDER}",'
+            f'model="dlib-v1",model_version="{version}"}}'
+        )
+        assert _value(lines, embed) == count
+    detect = f'face_pipeline_stage_seconds_count{{stage="detect",provider="{DETECTOR_PROVIDER}"}}'
+    assert _value(lines, detect) == 3
+
+
+def test_pool_reports_every_checkout_wait() -> None:
+    waits: list[float] = []
+    pool = InstancePool(object, size=1, on_checkout=waits.append)
+    release = threading.Event()
+    checked_out = threading.Event()
+
+    def hold() -> None:
+        with pool.checkout():
+            checked_out.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    checked_out.wait()
+    threading.Timer(0.05, release.set).start()
+    with pool.checkout():
+        pass
+    holder.join()
+
+    assert waits[0] == 0.0
+    assert waits[1] >= 0.04
+
+
+async def test_offload_runs_in_a_thread_and_observes_queue_time() -> None:
+    caller = threading.get_ident()
+
+    ran_on = await offload(threading.get_ident)
+
+    assert ran_on != caller
+    lines = _rendered()
+    assert _value(lines, 'face_pipeline_stage_seconds_count{stage="thread_queue"}') == 1
+    assert _value(lines, "face_offload_in_flight") == 0
+
+
+def test_pool_stats_and_warmup_durations_are_exported() -> None:
+    pool = InstancePool(object, size=3)
+    with pool.checkout():
+        pass
+    warmup = ModelWarmup(
+        status=ModelWarmupStatus.READY,
+        load_seconds={"detector": 0.25},
+        warmup_seconds={"detector": 0.5},
+    )
+
+    lines = render_metrics(pools={"detector": pool.stats()}, warmup=warmup).splitlines()
+
+    assert _value(lines, 'face_provider_pool_size{pool="detector"}') == 3
+    assert _value(lines, 'face_provider_pool_checkouts_total{pool="detector"}') == 1
+    assert _value(lines, "face_model_warmup_ready") == 1
+    assert _value(lines, 'face_model_load_seconds{provider="detector"}') == 0.25
+    assert _value(lines, 'face_model_warmup_seconds{provider="detector"}') == 0.5
+    assert "# TYPE face_provider_pool_checkouts_total counter" in lines
+
+
+async def test_metrics_route_is_admin_only(client_db, db_session: AsyncSession) -> None:
+    client: AsyncClient = client_db
+    scope = await seed_enrollment_scope(client, db_session, suffix="metrics")
+
+    response = await client.get(
+        "/api/v1/face-recognition/metrics", headers=auth_headers(scope["admin"])
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE face_pipeline_stage_seconds histogram" in response.text
+    assert 'face_provider_pool_size{pool="embedder"}' in response.text
+
+    forbidden = await client.get(
+        "/api/v1/face-recognition/metrics", headers=auth_headers(scope["teacher"])
+    )
+    assert forbidden.status_code == 403
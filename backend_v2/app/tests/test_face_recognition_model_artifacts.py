@@ -3,14 +3,25 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
 
 import pytest
 
+from app.modules.face_recognition import model_artifacts
 from app.modules.face_recognition.errors import (
     ModelArtifactChecksumMismatchError,
     ModelArtifactMissingError,
 )
-from app.modules.face_recognition.model_artifacts import compute_sha256, verify_model_artifact
+from app.modules.face_recognition.model_artifacts import (
+    cached_sha256,
+    compute_sha256,
+    reset_checksum_cache,
+    verify_model_artifact,
+)
 
 
 def test_verify_model_artifact_raises_missing_for_nonexistent_path(tmp_path) -> None:
@@ -71,3 +82,92 @@ def test_verify_model_artifact_error_messages_never_contain_the_path(tmp_path) -
         assert str(path) not in str(exc)
     else:
         pytest.fail("expected ModelArtifactMissingError")
+
+
+# --- checksum cache -----------------------------------------------------------
+
+
+@pytest.fixture
+def hash_calls(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[Path]]:
+    """Counts real hashes; the racy window is disabled so a just-written
+    test file may be cached (see the racy-file test for the default)."""
+    calls: list[Path] = []
+    real = model_artifacts.compute_sha256
+
+    def counting(path: Path) -> str:
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(model_artifacts, "compute_sha256", counting)
+    monkeypatch.setattr(model_artifacts, "_RACY_WINDOW_NS", 0)
+    reset_checksum_cache()
+    yield calls
+    reset_checksum_cache()
+
+
+def _model(tmp_path: Path, content: bytes = b"model-weights" * 1000) -> tuple[Path, str]:
+    path = tmp_path / "model.dat"
+    path.write_bytes(content)
+    return path, hashlib.sha256(content).hexdigest()
+
+
+def test_compute_sha256_of_an_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+
+    assert compute_sha256(path) == hashlib.sha256(b"").hexdigest()
+
+
+def test_unchanged_model_is_hashed_once_per_fingerprint(
+    tmp_path: Path, hash_calls: list[Path]
+) -> None:
+    path, expected = _model(tmp_path)
+
+    verify_model_artifact(path, expected_sha256=expected)
+    verify_model_artifact(path, expected_sha256=expected)
+    assert len(hash_calls) == 1
+
+    # A new process (or a reset provider cache) reads the sidecar instead.
+    reset_checksum_cache()
+    assert cached_sha256(path) == expected
+    assert len(hash_calls) == 1
+    assert (tmp_path / "model.dat.sha256-cache.json").is_file()
+
+
+def test_changed_model_still_fails_closed(tmp_path: Path, hash_calls: list[Path]) -> None:
+    path, expected = _model(tmp_path)
+    verify_model_artifact(path, expected_sha256=expected)
+
+    path.write_bytes(b"tampered-weights")
+    reset_checksum_cache()
+
+    with pytest.raises(ModelArtifactChecksumMismatchError):
+        verify_model_artifact(path, expected_sha256=expected)
+    assert len(hash_calls) == 2
+
+
+def test_sidecar_for_another_fingerprint_is_ignored(tmp_path: Path, hash_calls: list[Path]) -> None:
+    path, expected = _model(tmp_path)
+    cached_sha256(path)
+    sidecar = tmp_path / "model.dat.sha256-cache.json"
+    record = json.loads(sidecar.read_text())
+    record["inode"] += 1
+    sidecar.write_text(json.dumps(record))
+    reset_checksum_cache()
+
+    assert cached_sha256(path) == expected
+    assert len(hash_calls) == 2
+
+
+def test_recently_modified_model_is_never_cached(tmp_path: Path) -> None:
+    path, expected = _model(tmp_path)
+    reset_checksum_cache()
+
+    assert cached_sha256(path) == expected
+
+    assert not (tmp_path / "model.dat.sha256-cache.json").exists()
+    old = time.time_ns() - 3 * model_artifacts._RACY_WINDOW_NS
+    os.utime(path, ns=(old, old))
+    # ctime was just bumped by utime, so the file is still too fresh.
+    assert cached_sha256(path) == expected
+    assert not (tmp_path / "model.dat.sha256-cache.json").exists()
@@ -1,9 +1,10 @@
-"""Tests for ``app.modules.face_recognition.pipeline.detect_align_embed``.
+"""Tests for ``app.modules.face_recognition.pipeline``.
 
 Covers the "exactly one face" enrollment-processing policy (Stage 3
 brief §3/§8) at the one place it is enforced, using
 ``FakeFaceDetector``/``FakeFaceEmbedder`` (see
-``app.tests.phase5_stage3_helpers``) so no real model file is needed.
+``app.tests.phase5_stage3_helpers``) so no real model file is needed,
+plus the group-photo ``detect_align_embed_all`` face policy.
 """
 
 from __future__ import annotations
@@ -11,12 +12,23 @@ from __future__ import annotations
 import pytest
 
 from app.core.config import get_settings
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DetectedFace,
+    EmbeddingVector,
+    FacialLandmark,
+    NormalizedFaceInput,
+)
 from app.modules.face_recognition.errors import (
     EnrollmentSampleMultipleFacesDetectedError,
     EnrollmentSampleNoFaceDetectedError,
+    FaceEmbeddingFailedError,
+    RecognitionAttendanceGroupPhotoNoFaceError,
+    RecognitionAttendanceGroupPhotoTooManyFacesError,
 )
-from app.modules.face_recognition.pipeline import detect_align_embed
+from app.modules.face_recognition.pipeline import detect_align_embed, detect_align_embed_all
 from app.tests.phase5_stage3_helpers import (
+    DEFAULT_DIMENSIONS,
     FakeFaceDetector,
     FakeFaceEmbedder,
     make_decoded_image,
@@ -48,3 +60,85 @@ def test_detect_align_embed_rejects_multiple_faces_without_picking_one() -> None
         pytest.raises(EnrollmentSampleMultipleFacesDetectedError),
     ):
         detect_align_embed(make_decoded_image(), settings=get_settings())
+
+
+def _face_at(x: int, y: int, *, with_landmarks: bool = True) -> DetectedFace:
+    """A 60px face at ``(x, y)`` of the default 400x400 image."""
+    return DetectedFace(
+        bounding_box=BoundingBox(x_px=x, y_px=y, width_px=60, height_px=60),
+        source_image_dimensions=DEFAULT_DIMENSIONS,
+        confidence=0.9,
+        landmarks=(
+            tuple(
+                FacialLandmark(x_px=x + fx * 60, y_px=y + fy * 60)
+                for fx, fy in ((0.3, 0.4), (0.7, 0.4), (0.5, 0.6), (0.35, 0.8), (0.65, 0.8))
+            )
+            if with_landmarks
+            else None
+        ),
+    )
+
+
+def test_detect_align_embed_all_embeds_every_face_and_skips_unalignable_ones() -> None:
+    detector = FakeFaceDetector(
+        results=[[_face_at(200, 20), _face_at(20, 20), _face_at(20, 200, with_landmarks=False)]]
+    )
+    embedder = FakeFaceEmbedder()
+    with patch_providers(detector, embedder):
+        embeddings = detect_align_embed_all(make_decoded_image(), settings=get_settings())
+
+    assert len(embeddings) == 2
+    assert all(embedding.dimension == 128 for embedding in embeddings)
+    assert embedder.embed_many_batch_sizes == [2]
+
+
+def test_detect_align_embed_all_rejects_a_photo_without_usable_faces() -> None:
+    for faces in ([], [_face_at(20, 20, with_landmarks=False)]):
+        detector = FakeFaceDetector(results=[faces])
+        with (
+            patch_providers(detector, FakeFaceEmbedder()),
+            pytest.raises(RecognitionAttendanceGroupPhotoNoFaceError),
+        ):
+            detect_align_embed_all(make_decoded_image(), settings=get_settings())
+
+
+def test_detect_align_embed_all_rejects_more_faces_than_the_configured_cap() -> None:
+    settings = get_settings().model_copy(update={"FACE_GROUP_MAX_FACES": 2})
+    detector = FakeFaceDetector(results=[[_face_at(20, 20), _face_at(200, 20), _face_at(20, 200)]])
+    with (
+        patch_providers(detector, FakeFaceEmbedder()),
+        pytest.raises(RecognitionAttendanceGroupPhotoTooManyFacesError),
+    ):
+        detect_align_embed_all(make_decoded_image(), settings=settings)
+
+
+class _FailingOnCallsEmbedder(FakeFaceEmbedder):
+    """Fails ``embed`` on the given (zero-based) call numbers only."""
+
+    def __init__(self, failing_calls: set[int]) -> None:
+        super().__init__()
+        self._failing_calls = failing_calls
+        self._calls = 0
+
+    def embed(self, face: NormalizedFaceInput) -> EmbeddingVector:
+        call, self._calls = self._calls, self._calls + 1
+        if call in self._failing_calls:
+            raise FaceEmbeddingFailedError()
+        return super().embed(face)
+
+
+def test_detect_align_embed_all_skips_a_face_that_fails_to_embed() -> None:
+    detector = FakeFaceDetector(results=[[_face_at(20, 20), _face_at(200, 20), _face_at(20, 200)]])
+    with patch_providers(detector, _FailingOnCallsEmbedder({1})):
+        embeddings = detect_align_embed_all(make_decoded_image(), settings=get_settings())
+
+    assert len(embeddings) == 2
+
+
+def test_detect_align_embed_all_raises_the_embedding_error_when_no_face_embeds() -> None:
+    detector = FakeFaceDetector(results=[[_face_at(20, 20), _face_at(200, 20)]])
+    with (
+        patch_providers(detector, _FailingOnCallsEmbedder({0, 1})),
+        pytest.raises(FaceEmbeddingFailedError),
+    ):
+        detect_align_embed_all(make_decoded_image(), settings=get_settings())
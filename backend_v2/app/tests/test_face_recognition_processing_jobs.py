@@ -0,0 +1,446 @@
+"""DB-backed tests for ``app.modules.face_recognition.processing_jobs``.
+
+Samples are seeded with ``seed_active_sample_direct`` and inference runs
+against ``FakeFaceDetector``/``FakeFaceEmbedder`` (see
+``app.tests.phase5_stage3_helpers``), so only the queue's own claiming,
+lease, retry, and settling logic is under test. A crashed or slow worker
+is simulated by claiming through the repository and then moving the
+lease into the past.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.modules.attendance.models import AuditLog
+from app.modules.biometric_enrollment.models import (
+    BiometricSample,
+    RecognitionProcessingState,
+    SampleStatus,
+)
+from app.modules.biometric_enrollment.repository import BiometricSampleRepository
+from app.modules.face_recognition.errors import FaceProviderUnavailableError
+from app.modules.face_recognition.models import (
+    BiometricEmbedding,
+    BiometricProcessingJob,
+    ProcessingJobStatus,
+)
+from app.modules.face_recognition.processing_jobs import (
+    JOB_REASON_LEASE_EXPIRED,
+    JOB_REASON_SAMPLE_NOT_ELIGIBLE,
+    ProcessingJobService,
+    retry_delay,
+)
+from app.modules.face_recognition.processing_pool import SampleOutcome
+from app.modules.face_recognition.processing_service import (
+    ACTION_SAMPLE_PROCESS,
+    REASON_PROVIDER_UNAVAILABLE,
+    REASON_STORAGE_FILE_MISSING,
+    REASON_UNEXPECTED,
+    SampleProcessingService,
+)
+from app.modules.face_recognition.repository import BiometricProcessingJobRepository
+from app.modules.users.models import User
+from app.tests.phase3_http_helpers import auth_headers
+from app.tests.phase5_stage2_http_helpers import seed_enrollment_scope
+from app.tests.phase5_stage3_helpers import (
+    FakeFaceDetector,
+    FakeFaceEmbedder,
+    patch_providers,
+    seed_active_sample_direct,
+)
+
+_LEASE = timedelta(minutes=10)
+
+
+async def _seed_samples(
+    client_db: AsyncClient, db_session: AsyncSession, *, suffix: str, with_files: list[bool]
+) -> tuple[dict, list[uuid.UUID]]:
+    scope = await seed_enrollment_scope(client_db, db_session, suffix=suffix)
+    profiles = [scope["student_profile_1"], scope["student_profile_2"]]
+    sample_ids = [
+        await seed_active_sample_direct(
+            db_session,
+            student_profile_id=uuid.UUID(profile["id"]),
+            created_by_user_id=scope["admin"].id,
+            write_file=write_file,
+        )
+        for profile, write_file in zip(profiles, with_files, strict=False)
+    ]
+    return scope, sample_ids
+
+
+async def _job_for(db_session: AsyncSession, sample_id: uuid.UUID) -> BiometricProcessingJob:
+    result = await db_session.execute(
+        select(BiometricProcessingJob)
+        .where(BiometricProcessingJob.biometric_sample_id == sample_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def _expire_leases(db_session: AsyncSession) -> None:
+    past = datetime.now(UTC) - timedelta(seconds=1)
+    await db_session.execute(
+        update(BiometricProcessingJob)
+        .where(BiometricProcessingJob.status == ProcessingJobStatus.RUNNING)
+        .values(lease_expires_at=past)
+    )
+    await db_session.commit()
+
+
+async def _active_embedding_count(db_session: AsyncSession, sample_id: uuid.UUID) -> int:
+    result = await db_session.execute(
+        select(func.count())
+        .select_from(BiometricEmbedding)
+        .where(
+            BiometricEmbedding.biometric_sample_id == sample_id,
+            BiometricEmbedding.is_active.is_(True),
+        )
+    )
+    return result.scalar_one()
+
+
+async def _process_audit_count(db_session: AsyncSession, sample_id: uuid.UUID) -> int:
+    result = await db_session.execute(
+        select(func.count())
+        .select_from(AuditLog)
+        .where(AuditLog.action == ACTION_SAMPLE_PROCESS, AuditLog.entity_id == sample_id)
+    )
+    return result.scalar_one()
+
+
+@contextmanager
+def _while_embedding(race: Callable[[], Awaitable[None]]) -> Iterator[None]:
+    """Run ``race`` (another session's work) once, right after the first
+    ``embed_samples`` call's inference — i.e. while its caller holds no
+    locks and has not yet persisted anything."""
+    original = SampleProcessingService.embed_samples
+    pending = [race]
+
+    async def embed_samples(
+        self: SampleProcessingService, samples: list[BiometricSample]
+    ) -> list[SampleOutcome]:
+        outcomes = await original(self, samples)
+        if pending:
+            await pending.pop()()
+        return outcomes
+
+    with patch.object(SampleProcessingService, "embed_samples", embed_samples):
+        yield
+
+
+def test_retry_delay_doubles_per_attempt_up_to_one_hour() -> None:
+    assert [retry_delay(attempt=n, base_seconds=30).total_seconds() for n in (1, 2, 3)] == [
+        30,
+        60,
+        120,
+    ]
+    assert retry_delay(attempt=12, base_seconds=30) == timedelta(hours=1)
+
+
+async def test_run_once_queues_pending_samples_and_settles_each_job_with_its_sample(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, (processed_id, missing_file_id) = await _seed_samples(
+        client_db, db_session, suffix="jobs1", with_files=[True, False]
+    )
+    service = ProcessingJobService(db_session)
+
+    with patch_providers(FakeFaceDetector(), FakeFaceEmbedder()):
+        results = await service.run_once(worker_id="worker-a")
+
+    assert {(result.sample_id, result.status, result.reason_code) for result in results} == {
+        (processed_id, ProcessingJobStatus.SUCCEEDED, None),
+        (missing_file_id, ProcessingJobStatus.FAILED, REASON_STORAGE_FILE_MISSING),
+    }
+    samples = BiometricSampleRepository(db_session)
+    processed = await samples.get_by_id(processed_id)
+    failed = await samples.get_by_id(missing_file_id)
+    assert processed is not None and failed is not None
+    assert processed.processing_state is RecognitionProcessingState.PROCESSED
+    assert failed.processing_state is RecognitionProcessingState.PROCESSING_FAILED
+
+    job = await _job_for(db_session, processed_id)
+    assert job.attempt_count == 1
+    assert job.completed_at is not None
+    assert job.locked_by is None and job.lease_expires_at is None
+
+    audit_actors = (
+        (
+            await db_session.execute(
+                select(AuditLog.actor_user_id).where(
+                    AuditLog.action == ACTION_SAMPLE_PROCESS, AuditLog.entity_id == processed_id
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert audit_actors == [scope["admin"].id]
+
+    # Nothing left to queue or claim.
+    assert await service.run_once(worker_id="worker-a") == []
+
+
+async def test_transient_failure_is_retried_with_backoff_until_attempts_run_out(
+    client_db, db_session: AsyncSession
+) -> None:
+    _, (sample_id,) = await _seed_samples(client_db, db_session, suffix="jobs2", with_files=[True])
+    settings = get_settings().model_copy(
+        update={"FACE_PROCESSING_JOB_MAX_ATTEMPTS": 2, "FACE_PROCESSING_JOB_RETRY_BASE_SECONDS": 30}
+    )
+    service = ProcessingJobService(db_session, settings=settings)
+    unavailable = FakeFaceEmbedder(raise_error=FaceProviderUnavailableError())
+
+    before = datetime.now(UTC)
+    with patch_providers(FakeFaceDetector(), unavailable):
+        first = await service.run_once(worker_id="worker-a")
+        assert [(result.status, result.attempt) for result in first] == [
+            (ProcessingJobStatus.QUEUED, 1)
+        ]
+        job = await _job_for(db_session, sample_id)
+        assert job.last_reason_code == REASON_PROVIDER_UNAVAILABLE
+        assert job.available_at >= before + timedelta(seconds=30)
+        sample = await BiometricSampleRepository(db_session).get_by_id(sample_id)
+        assert sample is not None
+        assert sample.processing_state is RecognitionProcessingState.PENDING_PROCESSING
+
+        # Backing off: not due yet, and not queued a second time either.
+        assert await service.run_once(worker_id="worker-a") == []
+
+        await db_session.execute(
+            update(BiometricProcessingJob).values(available_at=datetime.now(UTC))
+        )
+        await db_session.commit()
+        second = await service.run_once(worker_id="worker-a")
+
+    assert [(result.status, result.attempt, result.reason_code) for result in second] == [
+        (ProcessingJobStatus.FAILED, 2, REASON_PROVIDER_UNAVAILABLE)
+    ]
+    sample = await BiometricSampleRepository(db_session).get_by_id(sample_id)
+    assert sample is not None
+    assert sample.processing_state is RecognitionProcessingState.PROCESSING_FAILED
+    assert sample.processing_failure_reason_code == REASON_PROVIDER_UNAVAILABLE
+
+
+async def test_concurrent_claims_skip_locked_jobs(client_db, db_session: AsyncSession) -> None:
+    _, sample_ids = await _seed_samples(
+        client_db, db_session, suffix="jobs3", with_files=[True, True]
+    )
+    await ProcessingJobService(db_session).enqueue_unqueued_pending()
+    now = datetime.now(UTC)
+
+    async with AsyncSession(bind=db_session.bind, expire_on_commit=False) as other_session:
+        # Worker A holds its claim's row lock (transaction still open)...
+        first = await BiometricProcessingJobRepository(db_session).claim(
+            worker_id="worker-a", now=now, lease=_LEASE, limit=1
+        )
+        # ...so worker B neither waits for it nor takes it.
+        second = await BiometricProcessingJobRepository(other_session).claim(
+            worker_id="worker-b", now=now, lease=_LEASE, limit=10
+        )
+        await other_session.commit()
+    await db_session.commit()
+
+    assert len(first) == 1 and len(second) == 1
+    assert {first[0].biometric_sample_id, second[0].biometric_sample_id} == set(sample_ids)
+    assert first[0].locked_by == "worker-a" and second[0].locked_by == "worker-b"
+
+
+async def test_expired_lease_is_reclaimed_by_another_worker(
+    client_db, db_session: AsyncSession
+) -> None:
+    _, (sample_id,) = await _seed_samples(client_db, db_session, suffix="jobs4", with_files=[True])
+    service = ProcessingJobService(db_session)
+    await service.enqueue_unqueued_pending()
+    await BiometricProcessingJobRepository(db_session).claim(
+        worker_id="crashed-worker", now=datetime.now(UTC), lease=_LEASE, limit=10
+    )
+    await db_session.commit()
+
+    with patch_providers(FakeFaceDetector(), FakeFaceEmbedder()):
+        # Still leased: nobody else may take it.
+        assert await service.run_once(worker_id="worker-b") == []
+        await _expire_leases(db_session)
+        results = await service.run_once(worker_id="worker-b")
+
+    assert [(result.sample_id, result.status, result.attempt) for result in results] == [
+        (sample_id, ProcessingJobStatus.SUCCEEDED, 2)
+    ]
+
+
+async def test_lease_expiring_on_the_final_attempt_fails_the_sample(
+    client_db, db_session: AsyncSession
+) -> None:
+    _, (sample_id,) = await _seed_samples(client_db, db_session, suffix="jobs5", with_files=[True])
+    settings = get_settings().model_copy(update={"FACE_PROCESSING_JOB_MAX_ATTEMPTS": 1})
+    service = ProcessingJobService(db_session, settings=settings)
+    await service.enqueue_unqueued_pending()
+    await BiometricProcessingJobRepository(db_session).claim(
+        worker_id="crashed-worker", now=datetime.now(UTC), lease=_LEASE, limit=10
+    )
+    await db_session.commit()
+    await _expire_leases(db_session)
+
+    embedder = FakeFaceEmbedder()
+    with patch_providers(FakeFaceDetector(), embedder):
+        results = await service.run_once(worker_id="worker-b")
+
+    assert [(result.status, result.reason_code) for result in results] == [
+        (ProcessingJobStatus.FAILED, JOB_REASON_LEASE_EXPIRED)
+    ]
+    assert embedder.embed_many_batch_sizes == []
+    sample = await BiometricSampleRepository(db_session).get_by_id(sample_id)
+    assert sample is not None
+    assert sample.processing_state is RecognitionProcessingState.PROCESSING_FAILED
+    assert sample.processing_failure_reason_code == REASON_UNEXPECTED
+
+
+async def test_job_for_a_sample_that_is_no_longer_eligible_is_cancelled(
+    client_db, db_session: AsyncSession
+) -> None:
+    _, (sample_id,) = await _seed_samples(client_db, db_session, suffix="jobs6", with_files=[True])
+    service = ProcessingJobService(db_session)
+    await service.enqueue_unqueued_pending()
+    samples = BiometricSampleRepository(db_session)
+    sample = await samples.get_by_id(sample_id)
+    assert sample is not None
+    await samples.mark_deletion_pending(sample)
+    await db_session.commit()
+
+    results = await service.run_once(worker_id="worker-a")
+
+    assert [(result.status, result.reason_code) for result in results] == [
+        (ProcessingJobStatus.CANCELLED, JOB_REASON_SAMPLE_NOT_ELIGIBLE)
+    ]
+    sample = await samples.get_by_id(sample_id)
+    assert sample is not None
+    assert sample.status is SampleStatus.DELETION_PENDING
+    assert sample.processing_state is RecognitionProcessingState.PENDING_PROCESSING
+
+
+async def test_process_pending_skips_queued_samples_and_yields_to_a_job_that_settled_first(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, (queued_id, raced_id) = await _seed_samples(
+        client_db, db_session, suffix="jobs9", with_files=[True, True]
+    )
+    await BiometricProcessingJobRepository(db_session).enqueue(
+        [(queued_id, scope["admin"].id)], max_attempts=3
+    )
+    await db_session.commit()
+
+    async def worker_cycle() -> None:
+        async with AsyncSession(bind=db_session.bind, expire_on_commit=False) as other_session:
+            await ProcessingJobService(other_session).run_once(worker_id="worker-b")
+
+    with (
+        patch_providers(FakeFaceDetector(), FakeFaceEmbedder()),
+        _while_embedding(worker_cycle),
+    ):
+        results = await SampleProcessingService(db_session).process_pending_batch(
+            actor=scope["admin"]
+        )
+
+    assert results == []
+    for sample_id in (queued_id, raced_id):
+        assert (await _job_for(db_session, sample_id)).status is ProcessingJobStatus.SUCCEEDED
+        assert await _active_embedding_count(db_session, sample_id) == 1
+        assert await _process_audit_count(db_session, sample_id) == 1
+
+
+async def test_job_yields_to_a_sample_processed_through_the_admin_route_meanwhile(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, (sample_id,) = await _seed_samples(
+        client_db, db_session, suffix="jobs10", with_files=[True]
+    )
+
+    async def admin_process() -> None:
+        async with AsyncSession(bind=db_session.bind, expire_on_commit=False) as other_session:
+            admin = await other_session.get(User, scope["admin"].id)
+            assert admin is not None
+            await SampleProcessingService(other_session).process_sample(
+                sample_id=sample_id, actor=admin
+            )
+
+    with (
+        patch_providers(FakeFaceDetector(), FakeFaceEmbedder()),
+        _while_embedding(admin_process),
+    ):
+        results = await ProcessingJobService(db_session).run_once(worker_id="worker-a")
+
+    assert [(result.status, result.reason_code) for result in results] == [
+        (ProcessingJobStatus.CANCELLED, JOB_REASON_SAMPLE_NOT_ELIGIBLE)
+    ]
+    assert await _active_embedding_count(db_session, sample_id) == 1
+    assert await _process_audit_count(db_session, sample_id) == 1
+
+
+async def test_enqueue_is_idempotent_while_a_job_is_open(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, (sample_id,) = await _seed_samples(
+        client_db, db_session, suffix="jobs7", with_files=[True]
+    )
+    jobs = BiometricProcessingJobRepository(db_session)
+    entries = [(sample_id, scope["admin"].id)]
+
+    assert await jobs.enqueue(entries, max_attempts=3) == [sample_id]
+    assert await jobs.enqueue(entries, max_attempts=3) == []
+    await db_session.commit()
+    assert await ProcessingJobService(db_session).enqueue_unqueued_pending() == 0
+
+
+async def test_summary_endpoint_reports_batch_progress_to_admins_only(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, sample_ids = await _seed_samples(
+        client_db, db_session, suffix="jobs8", with_files=[True, True]
+    )
+    batch_id = uuid.uuid4()
+    await BiometricProcessingJobRepository(db_session).enqueue(
+        [(sample_id, scope["admin"].id) for sample_id in sample_ids],
+        max_attempts=3,
+        batch_id=batch_id,
+    )
+    await db_session.commit()
+
+    response = await client_db.get(
+        "/api/v1/face-recognition/processing-jobs/summary",
+        params={"batch_id": str(batch_id)},
+        headers=auth_headers(scope["admin"]),
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "batch_id": str(batch_id),
+        "total": 2,
+        "queued": 2,
+        "running": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "cancelled": 0,
+        "finished": 0,
+    }
+
+    other_batch = await client_db.get(
+        "/api/v1/face-recognition/processing-jobs/summary",
+        params={"batch_id": str(uuid.uuid4())},
+        headers=auth_headers(scope["admin"]),
+    )
+    assert other_batch.json()["total"] == 0
+
+    forbidden = await client_db.get(
+        "/api/v1/face-recognition/processing-jobs/summary", headers=auth_headers(scope["teacher"])
+    )
+    assert forbidden.status_code == 403
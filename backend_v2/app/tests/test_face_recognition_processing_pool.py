@@ -0,0 +1,125 @@
+"""Tests for ``app.modules.face_recognition.processing_pool``.
+
+The in-process path runs against ``FakeFaceDetector``/``FakeFaceEmbedder``
+(see ``app.tests.phase5_stage3_helpers``). Patches do not reach a
+``spawn``-started worker, so the pool tests use a real one-worker pool
+with the test suite's settings, which configure no model files: every
+image that decodes therefore fails in the worker with
+``FaceProviderUnavailableError``. That is enough to show the work really
+ran in the worker and came back in input order.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.modules.face_recognition.domain import EmbeddingVector
+from app.modules.face_recognition.errors import (
+    EnrollmentSampleNoFaceDetectedError,
+    FaceProviderUnavailableError,
+    SampleImageDecodeFailedError,
+    SampleStorageFileMissingError,
+)
+from app.modules.face_recognition.processing_pool import (
+    SampleFailure,
+    create_processing_pool,
+    embed_sample_files,
+    embed_sample_files_in_pool,
+    get_processing_pool,
+    shutdown_processing_pool,
+)
+from app.tests.phase5_stage3_helpers import (
+    FakeFaceDetector,
+    FakeFaceEmbedder,
+    make_detected_face,
+    make_real_jpeg_bytes,
+    patch_providers,
+)
+
+
+def _jpeg(tmp_path: Path, name: str) -> Path:
+    path = tmp_path / name
+    path.write_bytes(make_real_jpeg_bytes(size=(400, 400)))
+    return path
+
+
+def test_embed_sample_files_keeps_input_order_and_embeds_in_one_batch(tmp_path) -> None:
+    not_an_image = tmp_path / "not_an_image.jpg"
+    not_an_image.write_bytes(b"definitely not a jpeg")
+    paths = [
+        _jpeg(tmp_path, "a.jpg"),
+        None,
+        not_an_image,
+        _jpeg(tmp_path, "no_face.jpg"),
+        _jpeg(tmp_path, "b.jpg"),
+    ]
+    detector = FakeFaceDetector(results=[[make_detected_face()], [], [make_detected_face()]])
+    embedder = FakeFaceEmbedder()
+
+    with patch_providers(detector, embedder):
+        outcomes = embed_sample_files(paths, settings=get_settings())
+
+    assert isinstance(outcomes[0], EmbeddingVector)
+    assert outcomes[1:4] == [
+        SampleFailure(SampleStorageFileMissingError),
+        SampleFailure(SampleImageDecodeFailedError),
+        SampleFailure(EnrollmentSampleNoFaceDetectedError),
+    ]
+    assert isinstance(outcomes[4], EmbeddingVector)
+    assert embedder.embed_many_batch_sizes == [2]
+
+
+def test_embed_sample_files_fails_every_aligned_sample_when_the_embedder_is_unavailable(
+    tmp_path,
+) -> None:
+    paths = [_jpeg(tmp_path, "a.jpg"), None, _jpeg(tmp_path, "b.jpg")]
+    embedder = FakeFaceEmbedder(raise_error=FaceProviderUnavailableError())
+
+    with patch_providers(FakeFaceDetector(), embedder):
+        outcomes = embed_sample_files(paths, settings=get_settings())
+
+    assert outcomes == [
+        SampleFailure(FaceProviderUnavailableError),
+        SampleFailure(SampleStorageFileMissingError),
+        SampleFailure(FaceProviderUnavailableError),
+    ]
+
+
+async def test_pool_runs_the_pipeline_in_a_worker_and_preserves_order(tmp_path) -> None:
+    settings = get_settings()
+    paths: list[Path | None] = []
+    for index in range(9):
+        paths.append(None if index % 3 == 1 else _jpeg(tmp_path, f"{index}.jpg"))
+
+    pool = create_processing_pool(settings, workers=1)
+    try:
+        outcomes = await embed_sample_files_in_pool(pool, paths, workers=1)
+    finally:
+        pool.shutdown(wait=True)
+
+    assert outcomes == [
+        SampleFailure(
+            SampleStorageFileMissingError if path is None else FaceProviderUnavailableError
+        )
+        for path in paths
+    ]
+
+
+async def test_pool_of_nothing_submits_no_work() -> None:
+    pool = create_processing_pool(get_settings(), workers=1)
+    try:
+        assert await embed_sample_files_in_pool(pool, [], workers=1) == []
+    finally:
+        pool.shutdown(wait=True)
+
+
+def test_shared_pool_is_reused_per_settings_and_replaced_when_they_change() -> None:
+    settings = get_settings().model_copy(update={"FACE_PROCESSING_WORKERS": 2})
+    other_settings = settings.model_copy()
+    try:
+        first = get_processing_pool(settings)
+        assert get_processing_pool(settings) is first
+        assert get_processing_pool(other_settings) is not first
+    finally:
+        shutdown_processing_pool()
@@ -0,0 +1,230 @@
+"""Tests for ``app.modules.face_recognition.provider_pool``.
+
+The pool is exercised with a stand-in instance that records how many
+threads are inside it at once, so the "one thread per instance" and "up
+to ``size`` in parallel" guarantees are checked directly, without a
+model file. The admin stats route is checked over HTTP.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.modules.face_recognition.provider_factory import (
+    get_detector,
+    get_embedder,
+    install_providers,
+    reset_provider_cache,
+)
+from app.modules.face_recognition.provider_pool import (
+    InstancePool,
+    PooledFaceDetector,
+    PooledFaceEmbedder,
+)
+from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+from app.tests.phase3_http_helpers import auth_headers
+from app.tests.phase5_stage2_http_helpers import seed_enrollment_scope
+
+
+class _Instance:
+    """Counts concurrent users, globally and of this one instance."""
+
+    active_total = 0
+    peak_total = 0
+    guard = threading.Lock()
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+
+    def work(self, seconds: float) -> None:
+        with _Instance.guard:
+            self.active += 1
+            _Instance.active_total += 1
+            self.peak = max(self.peak, self.active)
+            _Instance.peak_total = max(_Instance.peak_total, _Instance.active_total)
+        time.sleep(seconds)
+        with _Instance.guard:
+            self.active -= 1
+            _Instance.active_total -= 1
+
+
+def _run_concurrently(pool: InstancePool[_Instance], *, calls: int, seconds: float) -> None:
+    def call() -> None:
+        with pool.checkout() as instance:
+            instance.work(seconds)
+
+    with ThreadPoolExecutor(max_workers=calls) as executor:
+        for future in [executor.submit(call) for _ in range(calls)]:
+            future.result()
+
+
+@pytest.fixture(autouse=True)
+def _reset_instance_counters() -> None:
+    _Instance.active_total = 0
+    _Instance.peak_total = 0
+
+
+def test_pool_runs_up_to_size_calls_at_once_and_never_shares_an_instance() -> None:
+    created: list[_Instance] = []
+
+    def factory() -> _Instance:
+        instance = _Instance()
+        created.append(instance)
+        return instance
+
+    pool = InstancePool(factory, size=3)
+    _run_concurrently(pool, calls=9, seconds=0.05)
+
+    assert len(created) == 3
+    assert all(instance.peak == 1 for instance in created)
+    assert _Instance.peak_total == 3
+    stats = pool.stats()
+    assert (stats.created, stats.in_use, stats.checkouts) == (3, 0, 9)
+
+
+def test_pool_grows_only_under_concurrency() -> None:
+    pool = InstancePool(_Instance, size=4)
+    for _ in range(5):
+        with pool.checkout() as instance:
+            instance.work(0)
+
+    stats = pool.stats()
+    assert stats.created == 1
+    assert stats.waited_checkouts == 0
+
+
+def test_pool_records_wait_time_when_every_instance_is_busy() -> None:
+    pool = InstancePool(_Instance, size=1)
+    _run_concurrently(pool, calls=3, seconds=0.05)
+
+    stats = pool.stats()
+    assert stats.created == 1
+    assert stats.checkouts == 3
+    assert stats.waited_checkouts == 2
+    assert stats.max_wait_seconds >= 0.04
+    assert stats.total_wait_seconds >= stats.max_wait_seconds
+
+
+def test_failed_construction_does_not_use_up_a_pool_slot() -> None:
+    attempts = 0
+
+    def flaky_factory() -> _Instance:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("construction failed")
+        return _Instance()
+
+    pool = InstancePool(flaky_factory, size=1)
+    with pytest.raises(RuntimeError), pool.checkout():
+        pass
+    with pool.checkout() as instance:
+        assert isinstance(instance, _Instance)
+    assert pool.stats().created == 1
+
+
+def test_checkout_waiting_on_a_failing_prefill_creates_its_own_instance() -> None:
+    pool = InstancePool(_Instance, size=1)
+    preparing = threading.Event()
+
+    def failing_prepare(_instance: _Instance) -> None:
+        preparing.set()
+        time.sleep(0.1)
+        raise RuntimeError("model failed to load")
+
+    def checkout_during_prefill() -> _Instance:
+        assert preparing.wait(timeout=5)
+        with pool.checkout() as instance:
+            return instance
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        checkout = executor.submit(checkout_during_prefill)
+        with pytest.raises(RuntimeError):
+            pool.prefill(failing_prepare)
+        assert isinstance(checkout.result(timeout=5), _Instance)
+
+    stats = pool.stats()
+    assert (stats.created, stats.in_use, stats.waited_checkouts) == (1, 0, 1)
+
+
+def test_instance_is_returned_when_the_call_raises() -> None:
+    pool = InstancePool(_Instance, size=1)
+    with pytest.raises(ValueError), pool.checkout():
+        raise ValueError("inference failed")
+
+    with pool.checkout():
+        pass
+    stats = pool.stats()
+    assert (stats.created, stats.in_use, stats.waited_checkouts) == (1, 0, 0)
+
+
+def test_provider_factory_pools_sized_from_settings() -> None:
+    reset_provider_cache()
+    settings = get_settings().model_copy(update={"FACE_PROVIDER_POOL_SIZE": 4})
+
+    detector = get_detector(settings)
+    embedder = get_embedder(settings)
+
+    assert isinstance(detector, PooledFaceDetector)
+    assert isinstance(embedder, PooledFaceEmbedder)
+    assert detector is get_detector(settings)
+    assert detector.pool.stats().size == 4
+    assert embedder.pool.stats().size == 4
+    # Constructing the facades loads nothing and creates no instance yet.
+    assert detector.pool.stats().created == 0
+    with detector.pool.checkout() as instance:
+        assert isinstance(instance, YuNetFaceDetector)
+    reset_provider_cache()
+
+
+def test_installed_providers_are_served_for_their_settings_only() -> None:
+    reset_provider_cache()
+    settings = get_settings().model_copy()
+    other_settings = get_settings().model_copy()
+    detector = PooledFaceDetector(InstancePool(lambda: YuNetFaceDetector(settings), size=1))
+    embedder = PooledFaceEmbedder(InstancePool(lambda: DlibResnetFaceEmbedder(settings), size=1))
+
+    install_providers(settings, detector=detector, embedder=embedder)
+
+    assert get_detector(settings) is detector
+    assert get_embedder(settings) is embedder
+    assert get_detector(other_settings) is not detector
+    reset_provider_cache()
+    assert get_detector(settings) is not detector
+    reset_provider_cache()
+
+
+async def test_provider_pools_route_is_admin_only(client_db, db_session: AsyncSession) -> None:
+    client: AsyncClient = client_db
+    scope = await seed_enrollment_scope(client, db_session, suffix="pools")
+
+    response = await client.get(
+        "/api/v1/face-recognition/provider-pools", headers=auth_headers(scope["admin"])
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert set(body) == {"detector", "embedder"}
+    assert body["detector"]["size"] == get_settings().FACE_PROVIDER_POOL_SIZE
+    assert set(body["embedder"]) == {
+        "size",
+        "created",
+        "in_use",
+        "checkouts",
+        "waited_checkouts",
+        "total_wait_seconds",
+        "max_wait_seconds",
+    }
+
+    forbidden = await client.get(
+        "/api/v1/face-recognition/provider-pools", headers=auth_headers(scope["teacher"])
+    )
+    assert forbidden.status_code == 403
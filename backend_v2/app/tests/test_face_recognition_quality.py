@@ -0,0 +1,143 @@
+"""Tests for ``app.modules.face_recognition.quality`` — the pre-embedding gate.
+
+Chips are synthetic 150x150 arrays: seeded noise stands in for a sharp,
+textured face, a box-blurred copy of it for a defocused one. The
+pipeline tests run ``detect_align_embed`` with the fake detector and a
+counting fake embedder, so "rejected before embedding" is observed
+directly.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.core.config import Settings, get_settings
+from app.modules.face_recognition.alignment import ALIGNED_FACE_SIZE_PX
+from app.modules.face_recognition.errors import FaceImageQualityTooLowError
+from app.modules.face_recognition.image_codec import ImageFrame, ndarray_to_normalized_face_input
+from app.modules.face_recognition.pipeline import detect_align_embed
+from app.modules.face_recognition.processing_jobs import TRANSIENT_REASON_CODES
+from app.modules.face_recognition.processing_service import (
+    REASON_IMAGE_QUALITY_TOO_LOW,
+    reason_code_for_error,
+)
+from app.modules.face_recognition.quality import (
+    REASON_BLURRY,
+    REASON_FACE_TOO_SMALL,
+    REASON_LOW_CONTRAST,
+    REASON_TOO_DARK,
+    assess_face_quality,
+    check_face_quality,
+    quality_gate_enabled,
+)
+from app.tests.phase5_stage3_helpers import FakeFaceDetector, FakeFaceEmbedder, patch_providers
+
+# make_detected_face's eyes are 40 px apart.
+_FACE = FakeFaceDetector().detect(None)[0]  # type: ignore[arg-type]
+
+
+class _CountingEmbedder(FakeFaceEmbedder):
+    def __init__(self) -> None:
+        super().__init__()
+        self.embed_calls = 0
+
+    def embed(self, face):  # type: ignore[no-untyped-def]
+        self.embed_calls += 1
+        return super().embed(face)
+
+
+def _noise(size: int = ALIGNED_FACE_SIZE_PX, *, scale: float = 1.0) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (rng.integers(0, 256, size=(size, size, 3)) * scale).astype(np.uint8)
+
+
+def _box_blur(pixels: np.ndarray, radius: int = 4) -> np.ndarray:
+    padded = np.pad(pixels.astype(np.float32), ((radius, radius), (radius, radius), (0, 0)), "edge")
+    width = 2 * radius + 1
+    out = np.zeros(pixels.shape, dtype=np.float32)
+    for dy in range(width):
+        for dx in range(width):
+            out += padded[dy : dy + pixels.shape[0], dx : dx + pixels.shape[1]]
+    return (out / width**2).astype(np.uint8)
+
+
+def _floors(**floors: float) -> Settings:
+    return get_settings().model_copy(
+        update={f"FACE_QUALITY_MIN_{name.upper()}": value for name, value in floors.items()}
+    )
+
+
+def test_measurements_separate_sharp_blurred_dark_and_flat_chips() -> None:
+    sharp = assess_face_quality(ndarray_to_normalized_face_input(_noise()), _FACE)
+    blurred = assess_face_quality(ndarray_to_normalized_face_input(_box_blur(_noise())), _FACE)
+    dark = assess_face_quality(ndarray_to_normalized_face_input(_noise(scale=0.1)), _FACE)
+    flat = assess_face_quality(
+        ndarray_to_normalized_face_input(np.full((150, 150, 3), 128, dtype=np.uint8)), _FACE
+    )
+
+    assert sharp.sharpness > 100 * blurred.sharpness
+    assert 100 < sharp.brightness < 155 and dark.brightness < 26
+    assert sharp.contrast > 30 and flat.contrast == 0.0
+    assert flat.sharpness == 0.0
+    assert sharp.inter_ocular_px == pytest.approx(40.0)
+
+
+def test_bgr_chip_uses_the_same_luma_weights() -> None:
+    pixels = _noise()
+    rgb = assess_face_quality(ndarray_to_normalized_face_input(pixels), _FACE)
+    bgr = assess_face_quality(
+        ndarray_to_normalized_face_input(
+            np.ascontiguousarray(pixels[..., ::-1]), color_format="bgr"
+        ),
+        _FACE,
+    )
+
+    assert bgr.brightness == pytest.approx(rgb.brightness)
+    assert bgr.sharpness == pytest.approx(rgb.sharpness)
+
+
+def test_gate_is_off_by_default() -> None:
+    flat = ndarray_to_normalized_face_input(np.zeros((150, 150, 3), dtype=np.uint8))
+
+    assert not quality_gate_enabled(get_settings())
+    check_face_quality(flat, _FACE, settings=get_settings())
+
+
+def test_every_failed_floor_is_reported_without_measured_values() -> None:
+    settings = _floors(sharpness=50, brightness=60, contrast=20, inter_ocular_px=48)
+    dark_flat = ndarray_to_normalized_face_input(np.full((150, 150, 3), 10, dtype=np.uint8))
+
+    with pytest.raises(FaceImageQualityTooLowError) as raised:
+        check_face_quality(dark_flat, _FACE, settings=settings)
+
+    assert raised.value.code == "FACE_IMAGE_QUALITY_TOO_LOW"
+    assert raised.value.status_code == 422
+    assert raised.value.details == {
+        "reasons": [REASON_BLURRY, REASON_TOO_DARK, REASON_LOW_CONTRAST, REASON_FACE_TOO_SMALL]
+    }
+    check_face_quality(
+        ndarray_to_normalized_face_input(_noise()), _FACE, settings=_floors(sharpness=50)
+    )
+
+
+def test_pipeline_rejects_before_the_embedder_runs() -> None:
+    embedder = _CountingEmbedder()
+    settings = _floors(sharpness=50, brightness=60)
+    blank = ImageFrame(np.zeros((400, 400, 3), dtype=np.uint8))
+    textured = ImageFrame(_noise(400))
+
+    with patch_providers(FakeFaceDetector(), embedder):
+        with pytest.raises(FaceImageQualityTooLowError):
+            detect_align_embed(blank, settings=settings)
+        assert embedder.embed_calls == 0
+        detect_align_embed(textured, settings=settings)
+
+    assert embedder.embed_calls == 1
+
+
+def test_rejected_enrollment_sample_is_a_permanent_failure() -> None:
+    reason = reason_code_for_error(FaceImageQualityTooLowError)
+
+    assert reason == REASON_IMAGE_QUALITY_TOO_LOW
+    assert reason not in TRANSIENT_REASON_CODES
@@ -0,0 +1,258 @@
+"""Tests for ``app.modules.face_recognition.reembedding`` and the
+model-scoped candidate read.
+
+Samples are seeded ``PROCESSED`` with an embedding from the default
+model version ("v1"); the job then runs under a copy of the settings
+with ``FACE_EMBEDDING_MODEL_VERSION="v2"`` and the fake providers.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings, get_settings
+from app.modules.attendance.models import AuditLog
+from app.modules.biometric_enrollment.models import RecognitionProcessingState
+from app.modules.biometric_enrollment.repository import BiometricSampleRepository
+from app.modules.face_recognition.errors import FaceProviderUnavailableError
+from app.modules.face_recognition.models import BiometricEmbedding
+from app.modules.face_recognition.processing_service import REASON_ZERO_FACES
+from app.modules.face_recognition.provider_factory import current_embedding_model
+from app.modules.face_recognition.reembedding import (
+    ACTION_SAMPLE_REEMBED,
+    ReembeddingService,
+    resolve_acting_admin,
+)
+from app.modules.face_recognition.repository import BiometricEmbeddingRepository
+from app.modules.users.models import UserRole
+from app.tests.phase3_http_helpers import auth_headers, seed_user
+from app.tests.phase5_stage2_http_helpers import seed_enrollment_scope
+from app.tests.phase5_stage3_helpers import FakeFaceDetector, FakeFaceEmbedder, patch_providers
+from app.tests.phase5_stage4_helpers import seed_processed_embedding_direct
+
+
+def _v2() -> Settings:
+    return get_settings().model_copy(update={"FACE_EMBEDDING_MODEL_VERSION": "v2"})
+
+
+async def _seed(
+    client_db, db_session: AsyncSession, *, suffix: str
+) -> tuple[dict, list[uuid.UUID]]:
+    scope = await seed_enrollment_scope(client_db, db_session, suffix=suffix)
+    sample_ids = [
+        await seed_processed_embedding_direct(
+            db_session,
+            student_profile_id=uuid.UUID(scope[key]["id"]),
+            created_by_user_id=scope["admin"].id,
+            embedding_values=[1.0] + [0.0] * 127,
+        )
+        for key in ("student_profile_1", "student_profile_2")
+    ]
+    return scope, sample_ids
+
+
+async def _embeddings_of(
+    db_session: AsyncSession, sample_id: uuid.UUID
+) -> list[BiometricEmbedding]:
+    result = await db_session.execute(
+        select(BiometricEmbedding)
+        .where(BiometricEmbedding.biometric_sample_id == sample_id)
+        .order_by(BiometricEmbedding.created_at)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+async def test_candidates_are_scoped_to_one_model(client_db, db_session: AsyncSession) -> None:
+    scope, _ = await _seed(client_db, db_session, suffix="reemb1")
+    students = [uuid.UUID(scope[key]["id"]) for key in ("student_profile_1", "student_profile_2")]
+    embeddings = BiometricEmbeddingRepository(db_session)
+
+    current = await embeddings.list_active_for_students(
+        students, model=current_embedding_model(get_settings())
+    )
+    other = await embeddings.list_active_for_students(
+        students, model=current_embedding_model(_v2())
+    )
+
+    assert len(current) == 2
+    assert other == []
+
+
+async def test_batch_flips_every_stale_sample_to_the_new_model(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, sample_ids = await _seed(client_db, db_session, suffix="reemb2")
+    service = ReembeddingService(db_session, actor_user_id=scope["admin"].id, settings=_v2())
+    assert (await service.progress()).stale == 2
+
+    with patch_providers(FakeFaceDetector(), FakeFaceEmbedder(seed=2.0)):
+        result = await service.run_batch()
+
+    assert (result.scanned, result.flipped, result.failed, result.deferred) == (2, 2, 0, 0)
+    assert result.last_sample_id == max(sample_ids)
+    progress = await service.progress()
+    assert (progress.current, progress.stale, progress.total) == (2, 0, 2)
+    for sample_id in sample_ids:
+        old, new = await _embeddings_of(db_session, sample_id)
+        assert old.is_active is False and old.superseded_at is not None
+        assert old.model_version == "v1"
+        assert new.is_active is True and new.superseded_at is None
+        assert new.model_version == "v2"
+    audits = (
+        (await db_session.execute(select(AuditLog).where(AuditLog.action == ACTION_SAMPLE_REEMBED)))
+        .scalars()
+        .all()
+    )
+    assert sorted(audit.entity_id for audit in audits) == sorted(sample_ids)
+    assert (await service.run_batch(after=result.last_sample_id)).last_sample_id is None
+
+
+async def test_walk_is_keyset_ordered_and_shards_are_disjoint(
+    client_db, db_session: AsyncSession
+) -> None:
+    _, sample_ids = await _seed(client_db, db_session, suffix="reemb3")
+    embeddings = BiometricEmbeddingRepository(db_session)
+    model = current_embedding_model(_v2())
+
+    first = await embeddings.list_stale_samples(model=model, after=None, limit=1)
+    second = await embeddings.list_stale_samples(model=model, after=first[0][0].id, limit=1)
+    shards = [
+        await embeddings.list_stale_samples(model=model, after=None, limit=10, shard=(index, 3))
+        for index in range(3)
+    ]
+
+    assert [first[0][0].id, second[0][0].id] == sorted(sample_ids)
+    assert sorted(sample.id for shard in shards for sample, _ in shard) == sorted(sample_ids)
+
+
+async def test_existing_shadow_is_reused_without_inference(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, sample_ids = await _seed(client_db, db_session, suffix="reemb4")
+    embeddings = BiometricEmbeddingRepository(db_session)
+    for sample_id in sample_ids:
+        await embeddings.create_shadow(
+            biometric_sample_id=sample_id,
+            model=current_embedding_model(_v2()),
+            embedding_values=[0.0, 1.0] + [0.0] * 126,
+            model_artifact_checksum=None,
+        )
+    await db_session.commit()
+    unavailable = FakeFaceEmbedder(raise_error=FaceProviderUnavailableError())
+
+    with patch_providers(FakeFaceDetector(), unavailable):
+        result = await ReembeddingService(
+            db_session, actor_user_id=scope["admin"].id, settings=_v2()
+        ).run_batch()
+
+    assert result.flipped == 2
+    assert unavailable.embed_many_batch_sizes == []
+
+
+async def test_permanent_failure_fails_the_sample_and_transient_one_defers_it(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, sample_ids = await _seed(client_db, db_session, suffix="reemb5")
+    service = ReembeddingService(db_session, actor_user_id=scope["admin"].id, settings=_v2())
+
+    with patch_providers(
+        FakeFaceDetector(), FakeFaceEmbedder(raise_error=FaceProviderUnavailableError())
+    ):
+        deferred = await service.run_batch()
+    assert (deferred.deferred, deferred.flipped) == (2, 0)
+    assert (await service.progress()).stale == 2
+
+    with patch_providers(FakeFaceDetector(results=[[]]), FakeFaceEmbedder()):
+        failed = await service.run_batch()
+    assert failed.failed == 2
+    samples = BiometricSampleRepository(db_session)
+    for sample_id in sample_ids:
+        sample = await samples.get_by_id(sample_id, for_update=True)
+        assert sample is not None
+        assert sample.processing_state is RecognitionProcessingState.PROCESSING_FAILED
+        assert sample.processing_failure_reason_code == REASON_ZERO_FACES
+    await db_session.commit()
+    progress = await service.progress()
+    assert (progress.current, progress.stale) == (0, 0)
+
+
+async def test_audits_name_the_acting_admin_not_the_uploader(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope, sample_ids = await _seed(client_db, db_session, suffix="reemb8")
+    operator = await seed_user(db_session, email="reemb8-operator@example.com", role=UserRole.ADMIN)
+    actor_user_id = await resolve_acting_admin(db_session, " REEMB8-Operator@example.com ")
+    assert actor_user_id == operator.id
+    service = ReembeddingService(db_session, actor_user_id=actor_user_id, settings=_v2())
+
+    with patch_providers(FakeFaceDetector(results=[[]]), FakeFaceEmbedder()):
+        await service.run_batch(limit=1)
+    with patch_providers(FakeFaceDetector(), FakeFaceEmbedder(seed=2.0)):
+        await service.run_batch(after=min(sample_ids))
+
+    audits = (
+        (await db_session.execute(select(AuditLog).where(AuditLog.action == ACTION_SAMPLE_REEMBED)))
+        .scalars()
+        .all()
+    )
+    assert sorted(audit.entity_id for audit in audits) == sorted(sample_ids)
+    assert {audit.actor_user_id for audit in audits} == {operator.id}
+    assert scope["admin"].id != operator.id
+
+
+async def test_acting_admin_must_be_an_active_admin(client_db, db_session: AsyncSession) -> None:
+    scope, _ = await _seed(client_db, db_session, suffix="reemb9")
+    await seed_user(
+        db_session, email="reemb9-former@example.com", role=UserRole.ADMIN, is_active=False
+    )
+
+    for email in (
+        scope["teacher"].email,
+        "reemb9-former@example.com",
+        "reemb9-nobody@example.com",
+    ):
+        with pytest.raises(ValueError):
+            await resolve_acting_admin(db_session, email)
+    with pytest.raises(RuntimeError):
+        await ReembeddingService(db_session, settings=_v2()).run_batch()
+
+
+async def test_shadow_is_not_activated_over_a_replaced_row(
+    client_db, db_session: AsyncSession
+) -> None:
+    _, sample_ids = await _seed(client_db, db_session, suffix="reemb6")
+    embeddings = BiometricEmbeddingRepository(db_session)
+    shadow = await embeddings.create_shadow(
+        biometric_sample_id=sample_ids[0],
+        model=current_embedding_model(_v2()),
+        embedding_values=[0.0, 1.0] + [0.0] * 126,
+        model_artifact_checksum=None,
+    )
+
+    activated = await embeddings.activate_shadow(
+        shadow, stale_embedding_id=uuid.uuid4(), superseded_at=shadow.created_at
+    )
+
+    assert activated is False
+    assert shadow.is_active is False
+    await db_session.rollback()
+
+
+async def test_progress_route_is_admin_only(client_db, db_session: AsyncSession) -> None:
+    scope, _ = await _seed(client_db, db_session, suffix="reemb7")
+
+    response = await client_db.get(
+        "/api/v1/face-recognition/reembedding/progress", headers=auth_headers(scope["admin"])
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"model_version": "v1", "total": 2, "current": 2, "stale": 0}
+
+    forbidden = await client_db.get(
+        "/api/v1/face-recognition/reembedding/progress", headers=auth_headers(scope["teacher"])
+    )
+    assert forbidden.status_code == 403
@@ -0,0 +1,154 @@
+"""Tests for ``app.modules.face_recognition.tiling``.
+
+Pure-logic tests: faces are painted as bright squares and found by a
+small connected-components fake detector that — like a real detector
+run over a downscaled whole image — ignores faces narrower than a fixed
+fraction of whatever image it is given. Only the tiled passes can find
+the small faces, which is exactly what the tiling exists for.
+"""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DetectedFace,
+    FacialLandmark,
+    ImageDimensions,
+)
+from app.modules.face_recognition.image_codec import ImageFrame
+from app.modules.face_recognition.tiling import (
+    detect_faces_tiled,
+    merge_duplicate_detections,
+    tile_origins,
+)
+
+_TILE = 960
+
+
+class _BrightSquareDetector:
+    """Reports every bright connected region at least ``1 / min_width_divisor``
+    of the image's width across, with five landmarks inside its box."""
+
+    provider_name = "bright_square_detector"
+
+    def __init__(self, *, min_width_divisor: int = 40) -> None:
+        self._min_width_divisor = min_width_divisor
+        self.call_count = 0
+
+    def detect(self, image: ImageFrame) -> list[DetectedFace]:
+        self.call_count += 1
+        mask = (image.pixels[:, :, 0] > 200).astype(np.uint8)
+        count, _labels, stats, _centroids = cv2.connectedComponentsWithStats(mask)
+        minimum_width = image.dimensions.width_px / self._min_width_divisor
+        faces = []
+        for x, y, width, height, _area in stats[1:count]:
+            if width < minimum_width:
+                continue
+            faces.append(
+                DetectedFace(
+                    bounding_box=BoundingBox(
+                        x_px=int(x), y_px=int(y), width_px=int(width), height_px=int(height)
+                    ),
+                    source_image_dimensions=image.dimensions,
+                    confidence=0.9,
+                    landmarks=tuple(
+                        FacialLandmark(x_px=x + fx * width, y_px=y + fy * height)
+                        for fx, fy in ((0.3, 0.4), (0.7, 0.4), (0.5, 0.6), (0.35, 0.8), (0.65, 0.8))
+                    ),
+                )
+            )
+        return faces
+
+
+def _photo(width: int, height: int, squares: list[tuple[int, int, int]]) -> ImageFrame:
+    array = np.zeros((height, width, 3), dtype=np.uint8)
+    for x, y, size in squares:
+        array[y : y + size, x : x + size] = 255
+    return ImageFrame(array)
+
+
+def _box(face: DetectedFace) -> tuple[int, int, int, int]:
+    box = face.bounding_box
+    return (box.x_px, box.y_px, box.width_px, box.height_px)
+
+
+def test_tile_origins_cover_the_image_and_pin_the_last_tile_to_the_edge() -> None:
+    assert tile_origins(800, tile_size_px=_TILE) == [0]
+    assert tile_origins(960, tile_size_px=_TILE) == [0]
+    assert tile_origins(2400, tile_size_px=_TILE) == [0, 720, 1440]
+    assert tile_origins(1000, tile_size_px=_TILE) == [0, 40]
+
+
+def test_small_image_is_detected_in_a_single_pass() -> None:
+    detector = _BrightSquareDetector()
+    image = _photo(640, 480, [(100, 100, 60), (400, 200, 60)])
+
+    faces = detect_faces_tiled(detector, image, tile_size_px=_TILE)
+
+    assert detector.call_count == 1
+    assert [_box(face) for face in faces] == [(100, 100, 60, 60), (400, 200, 60, 60)]
+
+
+def test_small_faces_in_a_large_photo_are_found_by_tiles_in_full_image_coordinates() -> None:
+    detector = _BrightSquareDetector()
+    squares = [
+        (50, 60, 40),  # back row, only visible to a tile
+        (730, 70, 40),  # straddles the first vertical seam
+        (2300, 1500, 40),  # bottom-right corner tile
+        (1000, 700, 400),  # a large front-row face, wider than the overlap
+    ]
+    image = _photo(2400, 1920, squares)
+
+    faces = detect_faces_tiled(detector, image, tile_size_px=_TILE)
+
+    assert detector.call_count == 1 + 3 * 3
+    assert [_box(face) for face in faces] == [
+        (50, 60, 40, 40),
+        (730, 70, 40, 40),
+        (1000, 700, 400, 400),
+        (2300, 1500, 40, 40),
+    ]
+    for face in faces:
+        assert face.source_image_dimensions == image.dimensions
+        box = face.bounding_box
+        assert face.landmarks is not None
+        for point in face.landmarks:
+            assert box.x_px <= point.x_px <= box.right_px
+            assert box.y_px <= point.y_px <= box.bottom_px
+
+
+def _face(x: int, y: int, width: int, height: int, confidence: float) -> DetectedFace:
+    return DetectedFace(
+        bounding_box=BoundingBox(x_px=x, y_px=y, width_px=width, height_px=height),
+        source_image_dimensions=ImageDimensions(width_px=1000, height_px=1000),
+        confidence=confidence,
+    )
+
+
+def test_merge_drops_overlapping_duplicates_keeping_the_most_confident() -> None:
+    best = _face(100, 100, 100, 100, 0.95)
+    shifted = _face(110, 105, 100, 100, 0.9)
+    neighbour = _face(205, 100, 100, 100, 0.8)
+
+    assert merge_duplicate_detections([shifted, neighbour, best]) == [best, neighbour]
+
+
+def test_merge_prefers_the_larger_box_when_confidences_tie() -> None:
+    whole = _face(10, 10, 80, 80, 0.9)
+    tighter = _face(15, 15, 70, 70, 0.9)
+
+    assert merge_duplicate_detections([tighter, whole]) == [whole]
+
+
+def test_faces_cut_by_a_tile_seam_are_not_reported_as_extra_faces() -> None:
+    # The first tile sees only a 10px sliver of this face — too little
+    # overlap with the whole face for duplicate merging to catch it.
+    detector = _BrightSquareDetector(min_width_divisor=100)
+    image = _photo(2400, 960, [(950, 300, 80)])
+
+    faces = detect_faces_tiled(detector, image, tile_size_px=_TILE)
+
+    assert [_box(face) for face in faces] == [(950, 300, 80, 80)]
@@ -0,0 +1,174 @@
+"""Tests for ``app.modules.face_recognition.warmup`` and its readiness gate.
+
+Preloading runs against fake provider instances in real
+``InstancePool``s, so pool filling, timing and failure handling are real
+while no model file is needed. The readiness tests drive GET
+/health/ready through the shared app with the database check overridden
+(``database_ready``), as in ``test_health_ready``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import FaceRecognitionProvider, Settings, get_settings
+from app.modules.face_recognition import warmup as warmup_module
+from app.modules.face_recognition.provider_pool import (
+    InstancePool,
+    PooledFaceDetector,
+    PooledFaceEmbedder,
+)
+from app.modules.face_recognition.warmup import (
+    ModelWarmup,
+    ModelWarmupStatus,
+    preload_models,
+    run_model_warmup,
+)
+from app.tests.phase5_stage3_helpers import FakeFaceDetector, FakeFaceEmbedder
+
+
+class _CountingEmbedder(FakeFaceEmbedder):
+    def __init__(self) -> None:
+        super().__init__()
+        self.embed_calls = 0
+
+    def embed(self, face):  # type: ignore[no-untyped-def]
+        self.embed_calls += 1
+        return super().embed(face)
+
+
+@pytest.fixture
+def pools(
+    monkeypatch: pytest.MonkeyPatch,
+) -> tuple[list[FakeFaceDetector], list[_CountingEmbedder]]:
+    detectors: list[FakeFaceDetector] = []
+    embedders: list[_CountingEmbedder] = []
+
+    def new_detector() -> FakeFaceDetector:
+        detectors.append(FakeFaceDetector(results=[[]]))
+        return detectors[-1]
+
+    def new_embedder() -> _CountingEmbedder:
+        embedders.append(_CountingEmbedder())
+        return embedders[-1]
+
+    detector = PooledFaceDetector(InstancePool(new_detector, size=3))  # type: ignore[arg-type]
+    embedder = PooledFaceEmbedder(InstancePool(new_embedder, size=2))  # type: ignore[arg-type]
+    monkeypatch.setattr(warmup_module, "get_detector", lambda settings: detector)
+    monkeypatch.setattr(warmup_module, "get_embedder", lambda settings: embedder)
+    return detectors, embedders
+
+
+def test_preload_loads_and_warms_every_pool_instance_once(pools) -> None:
+    detectors, embedders = pools
+    warmup = ModelWarmup()
+
+    preload_models(get_settings(), warmup)
+
+    assert warmup.instances == {"detector": 3, "embedder": 2}
+    assert [detector._call_count for detector in detectors] == [1, 1, 1]
+    assert [embedder.embed_calls for embedder in embedders] == [1, 1]
+    assert set(warmup.load_seconds) == set(warmup.warmup_seconds) == {"detector", "embedder"}
+    assert all(seconds >= 0.0 for seconds in warmup.warmup_seconds.values())
+
+
+def test_prefilled_instances_are_idle_and_never_rebuilt(pools) -> None:
+    detectors, _ = pools
+    preload_models(get_settings(), ModelWarmup())
+    pool = warmup_module.get_detector(get_settings()).pool
+
+    with pool.checkout(), pool.checkout(), pool.checkout():
+        pass
+
+    stats = pool.stats()
+    assert (stats.created, stats.in_use, stats.waited_checkouts) == (3, 0, 0)
+    assert len(detectors) == 3
+
+
+async def test_unloadable_model_fails_the_warmup(pools) -> None:
+    _, embedders = pools
+    original = _CountingEmbedder.is_available
+    _CountingEmbedder.is_available = lambda self: False  # type: ignore[method-assign]
+    try:
+        warmup = ModelWarmup()
+        await run_model_warmup(get_settings(), warmup)
+    finally:
+        _CountingEmbedder.is_available = original  # type: ignore[method-assign]
+
+    assert warmup.status is ModelWarmupStatus.FAILED
+    assert embedders and all(embedder.embed_calls == 0 for embedder in embedders)
+    # The failed instance was discarded, so the slot can be filled later.
+    assert warmup_module.get_embedder(get_settings()).pool.stats().created == 0
+
+
+async def test_successful_warmup_is_ready(pools) -> None:
+    warmup = ModelWarmup()
+
+    await run_model_warmup(get_settings(), warmup)
+
+    assert warmup.status is ModelWarmupStatus.READY
+
+
+# --- readiness ----------------------------------------------------------------
+
+
+@pytest.fixture
+def warming_client(app: FastAPI, database_ready: None) -> Iterator[TestClient]:
+    with TestClient(app) as client:
+        yield client
+        app.state.face_model_warmup = None
+
+
+def test_readiness_is_503_until_warmup_finishes(warming_client: TestClient, app: FastAPI) -> None:
+    app.state.face_model_warmup = ModelWarmup()
+
+    pending = warming_client.get("/health/ready")
+    app.state.face_model_warmup.status = ModelWarmupStatus.FAILED
+    failed = warming_client.get("/health/ready")
+    app.state.face_model_warmup.status = ModelWarmupStatus.READY
+    ready = warming_client.get("/health/ready")
+
+    assert pending.status_code == failed.status_code == 503
+    assert pending.json()["error"]["code"] == "FACE_MODELS_NOT_READY"
+    assert failed.json()["error"] == pending.json()["error"]
+    assert ready.status_code == 200
+    assert ready.json()["checks"] == {"database": "ready", "face_models": "ready"}
+
+
+def test_lifespan_starts_warmup_only_when_opted_in(
+    app: FastAPI, database_ready: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    release = asyncio.Event()
+    started: list[Settings] = []
+
+    async def fake_warmup(settings: Settings, warmup: ModelWarmup) -> None:
+        started.append(settings)
+        await release.wait()
+        warmup.status = ModelWarmupStatus.READY
+
+    preloading = get_settings().model_copy(
+        update={
+            "FACE_PRELOAD_MODELS": True,
+            "FACE_RECOGNITION_PROVIDER": FaceRecognitionProvider.SERVER_SIDE_LOCAL,
+        }
+    )
+    monkeypatch.setattr("app.main.run_model_warmup", fake_warmup)
+
+    with TestClient(app) as client:
+        assert app.state.face_model_warmup is None
+        assert client.get("/health/ready").json()["checks"] == {"database": "ready"}
+    assert started == []
+
+    monkeypatch.setattr("app.main.get_settings", lambda: preloading)
+    with TestClient(app) as client:
+        assert client.get("/health/ready").status_code == 503
+        client.portal.call(release.set)  # type: ignore[union-attr]
+        statuses = [client.get("/health/ready").status_code for _ in range(20)]
+        assert statuses[-1] == 200
+    assert started == [preloading]
+    app.state.face_model_warmup = None
@@ -160,6 +160,19 @@ def test_detect_returns_one_detected_face_with_landmarks(tmp_path) -> None:
     assert face.bounding_box.y_px == 60
 
 
+def test_detect_resizes_the_network_input_only_when_the_image_size_changes(tmp_path) -> None:
+    model_path = _make_model_file(tmp_path)
+    detector = YuNetFaceDetector(_SettingsLike(model_path=model_path))
+    fake = _FakeCvDetector(np.zeros((0, 15)))
+    small = ImageDimensions(width_px=64, height_px=48)
+    large = ImageDimensions(width_px=96, height_px=64)
+    with patch("cv2.FaceDetectorYN.create", return_value=fake):
+        for dimensions in (small, small, large, large, small):
+            detector.detect(make_decoded_image(dimensions=dimensions))
+
+    assert fake.set_input_size_calls == [(64, 48), (96, 64), (64, 48)]
+
+
 def test_detect_returns_multiple_distinguishable_faces(tmp_path) -> None:
     model_path = _make_model_file(tmp_path)
     detector = YuNetFaceDetector(_SettingsLike(model_path=model_path))
@@ -0,0 +1,102 @@
+"""Round-trip verification for the attendance monthly rollup migration."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+
+_BACKEND_V2_ROOT = Path(__file__).resolve().parents[2]
+PROCESSING_JOBS_HEAD = "b7d3e95a0c21"
+ROLLUPS_HEAD = "e4a9c2f71b38"
+_TABLE = "attendance_monthly_rollups"
+
+
+def _config() -> Config:
+    cfg = Config(str(_BACKEND_V2_ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(_BACKEND_V2_ROOT / "alembic"))
+    return cfg
+
+
+def _scalar(sql: str, params: dict[str, object] | None = None):
+    async def _read():
+        engine = create_async_engine(get_settings().DATABASE_URL, poolclass=NullPool)
+        try:
+            async with engine.connect() as connection:
+                return (await connection.execute(text(sql), params or {})).scalar()
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_read())
+
+
+def _revision() -> str | None:
+    return _scalar("SELECT version_num FROM alembic_version")
+
+
+def _table_exists() -> bool:
+    return _scalar("SELECT to_regclass(:name)", {"name": _TABLE}) is not None
+
+
+def _rollup_trigger_count() -> int:
+    return int(
+        _scalar(
+            """
+            SELECT count(*) FROM pg_trigger
+            WHERE tgrelid = to_regclass('attendance_records')
+              AND tgname LIKE 'trg_attendance_records_rollups_%'
+            """
+        )
+    )
+
+
+def _rollup_function_count() -> int:
+    return int(
+        _scalar(
+            """
+            SELECT count(*) FROM pg_proc
+            WHERE proname IN (
+                'attendance_monthly_rollups_apply', 'attendance_records_maintain_rollups'
+            )
+            """
+        )
+    )
+
+
+def test_attendance_rollups_migration_round_trip() -> None:
+    cfg = _config()
+    try:
+        command.upgrade(cfg, "head")
+    except (ModuleNotFoundError, SQLAlchemyError, OSError) as exc:
+        pytest.skip(f"PostgreSQL migration environment unavailable: {type(exc).__name__}")
+        return
+
+    try:
+        command.downgrade(cfg, ROLLUPS_HEAD)
+        assert _revision() == ROLLUPS_HEAD
+        assert _table_exists() is True
+        assert _rollup_trigger_count() == 4
+        assert _rollup_function_count() == 2
+
+        command.downgrade(cfg, PROCESSING_JOBS_HEAD)
+        assert _revision() == PROCESSING_JOBS_HEAD
+        assert _table_exists() is False
+        assert _rollup_trigger_count() == 0
+        assert _rollup_function_count() == 0
+        assert _scalar("SELECT to_regclass('attendance_records')") is not None
+
+        command.upgrade(cfg, ROLLUPS_HEAD)
+        assert _revision() == ROLLUPS_HEAD
+        assert _table_exists() is True
+        assert _rollup_trigger_count() == 4
+    finally:
+        command.upgrade(cfg, "head")
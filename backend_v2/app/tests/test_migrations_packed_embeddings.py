@@ -0,0 +1,192 @@
+"""Round-trip verification for the packed-float32 embedding migration.
+
+Seeds one embedding in the Stage 4 ``DOUBLE PRECISION[]`` format with
+plain SQL (the ORM models already describe the packed format), then
+checks the upgrade backfill produces exactly the little-endian float32
+bytes ``embedding_codec.pack_embedding`` would, that the new length
+check constraint is enforced, and that the downgrade restores the
+float32-rounded values into the array column.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+from app.modules.face_recognition.embedding_codec import pack_embedding
+
+_BACKEND_V2_ROOT = Path(__file__).resolve().parents[2]
+STAGE4_HEAD = "4f8c1a6e92b7"
+PACKED_EMBEDDINGS_HEAD = "6c6fc14b8e4c"
+_DIMENSION = 128
+
+
+def _config() -> Config:
+    cfg = Config(str(_BACKEND_V2_ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(_BACKEND_V2_ROOT / "alembic"))
+    return cfg
+
+
+def _run(statements: list[tuple[str, dict[str, object]]]) -> list[object]:
+    """Execute ``statements`` in one committed transaction; return each
+    statement's scalar (``None`` for statements returning no rows)."""
+
+    async def _execute():
+        engine = create_async_engine(get_settings().DATABASE_URL, poolclass=NullPool)
+        try:
+            async with engine.begin() as connection:
+                scalars = []
+                for sql, params in statements:
+                    result = await connection.execute(text(sql), params)
+                    scalars.append(result.scalar() if result.returns_rows else None)
+                return scalars
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_execute())
+
+
+def _scalar(sql: str, params: dict[str, object] | None = None) -> object:
+    return _run([(sql, params or {})])[0]
+
+
+def _revision() -> object:
+    return _scalar("SELECT version_num FROM alembic_version")
+
+
+def _column_exists(column_name: str) -> bool:
+    return bool(
+        _scalar(
+            "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'biometric_embeddings' AND column_name = :column_name)",
+            {"column_name": column_name},
+        )
+    )
+
+
+def _seed_array_embedding(values: list[float]) -> dict[str, uuid.UUID]:
+    ids = {name: uuid.uuid4() for name in ("user", "profile", "enrollment", "sample", "embedding")}
+    suffix = ids["user"].hex[:12]
+    _run(
+        [
+            (
+                "INSERT INTO users (id, email, password_hash, full_name, role) "
+                "VALUES (:id, :email, 'x', 'Migration Seed', 'student')",
+                {"id": ids["user"], "email": f"migration-seed-{suffix}@example.com"},
+            ),
+            (
+                "INSERT INTO student_profiles (id, user_id) VALUES (:id, :user_id)",
+                {"id": ids["profile"], "user_id": ids["user"]},
+            ),
+            (
+                "INSERT INTO biometric_enrollments "
+                "(id, student_profile_id, status, created_by_user_id) "
+                "VALUES (:id, :profile_id, 'active', :user_id)",
+                {"id": ids["enrollment"], "profile_id": ids["profile"], "user_id": ids["user"]},
+            ),
+            (
+                "INSERT INTO biometric_samples (id, enrollment_id, storage_key, content_type, "
+                "file_size_bytes, width_px, height_px, sha256_hash, status, processing_state, "
+                "created_by_user_id) VALUES (:id, :enrollment_id, :storage_key, 'image/jpeg', "
+                "1, 1, 1, :sha256, 'active', 'processed', :user_id)",
+                {
+                    "id": ids["sample"],
+                    "enrollment_id": ids["enrollment"],
+                    "storage_key": ids["sample"].hex,
+                    "sha256": "0" * 64,
+                    "user_id": ids["user"],
+                },
+            ),
+            (
+                "INSERT INTO biometric_embeddings (id, biometric_sample_id, provider_name, "
+                "model_identifier, model_version, embedding_dimension, embedding_values, "
+                "is_active) VALUES (:id, :sample_id, 'seed', 'seed', 'v1', :dimension, "
+                "CAST(:embedding_values AS double precision[]), true)",
+                {
+                    "id": ids["embedding"],
+                    "sample_id": ids["sample"],
+                    "dimension": len(values),
+                    "embedding_values": values,
+                },
+            ),
+        ]
+    )
+    return ids
+
+
+def _delete_seed(ids: dict[str, uuid.UUID]) -> None:
+    _run(
+        [
+            ("DELETE FROM biometric_embeddings WHERE id = :id", {"id": ids["embedding"]}),
+            ("DELETE FROM biometric_samples WHERE id = :id", {"id": ids["sample"]}),
+            ("DELETE FROM biometric_enrollments WHERE id = :id", {"id": ids["enrollment"]}),
+            ("DELETE FROM student_profiles WHERE id = :id", {"id": ids["profile"]}),
+            ("DELETE FROM users WHERE id = :id", {"id": ids["user"]}),
+        ]
+    )
+
+
+def test_packed_embeddings_migration_backfills_both_directions() -> None:
+    cfg = _config()
+    try:
+        command.upgrade(cfg, "head")
+    except (ModuleNotFoundError, SQLAlchemyError, OSError) as exc:
+        pytest.skip(f"PostgreSQL migration environment unavailable: {type(exc).__name__}")
+        return
+
+    ids: dict[str, uuid.UUID] | None = None
+    try:
+        command.downgrade(cfg, STAGE4_HEAD)
+        assert _revision() == STAGE4_HEAD
+        assert _column_exists("embedding_values") is True
+        assert _column_exists("embedding_packed") is False
+
+        rng = np.random.default_rng(7)
+        values = [float(value) for value in rng.standard_normal(_DIMENSION) / 11.3]
+        values[0] = -0.0  # the sign of zero survives the byte reversal too
+        ids = _seed_array_embedding(values)
+
+        command.upgrade(cfg, PACKED_EMBEDDINGS_HEAD)
+        assert _revision() == PACKED_EMBEDDINGS_HEAD
+        assert _column_exists("embedding_values") is False
+        packed = _scalar(
+            "SELECT embedding_packed FROM biometric_embeddings WHERE id = :id",
+            {"id": ids["embedding"]},
+        )
+        assert packed == pack_embedding(values)
+
+        with pytest.raises(IntegrityError):
+            _scalar(
+                "UPDATE biometric_embeddings SET embedding_packed = :packed WHERE id = :id",
+                {"packed": pack_embedding(values[:-1]), "id": ids["embedding"]},
+            )
+
+        command.downgrade(cfg, STAGE4_HEAD)
+        restored = _scalar(
+            "SELECT embedding_values FROM biometric_embeddings WHERE id = :id",
+            {"id": ids["embedding"]},
+        )
+        assert restored == list(struct.unpack(f"<{_DIMENSION}f", pack_embedding(values)))
+        assert (
+            _scalar(
+                "SELECT count(*) FROM pg_constraint "
+                "WHERE conrelid = to_regclass('biometric_embeddings') AND contype = 'c'"
+            )
+            == 2
+        )
+    finally:
+        if ids is not None:
+            _delete_seed(ids)
+        command.upgrade(cfg, "head")
@@ -24,6 +24,7 @@ In both cases, the required regression is the same: zero
 from __future__ import annotations
 
 import io
+import uuid
 import zipfile
 from typing import Any
 
@@ -34,6 +35,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.attendance.models import AuditLog, AuditOutcome
 from app.modules.biometric_enrollment.models import BiometricEnrollment, BiometricSample
+from app.modules.face_recognition.models import BiometricProcessingJob, ProcessingJobStatus
 from app.tests.phase3_http_helpers import auth_headers
 from app.tests.phase5_stage2_http_helpers import make_jpeg_bytes, seed_enrollment_scope
 
@@ -360,3 +362,56 @@ async def test_bulk_audit_log_written_on_success(
     )
     assert len(completed_logs) == 1
     assert completed_logs[0].event_metadata.get("enrolled_count") == 1
+
+
+async def test_bulk_success_queues_every_enrolled_sample_for_processing(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_enrollment_scope(client_db, db_session, suffix="bulk-queue")
+    student_1_id = scope["student_profile_1"]["id"]
+    student_2_id = scope["student_profile_2"]["id"]
+    zip_bytes = _build_zip(
+        [
+            ("manifest.csv", _manifest_csv([(student_1_id, "one.jpg"), (student_2_id, "two.jpg")])),
+            ("one.jpg", make_jpeg_bytes()),
+            ("two.jpg", make_jpeg_bytes(color=(80, 90, 100))),
+        ]
+    )
+    response = await _post_zip(client_db, content=zip_bytes, user=scope["admin"])
+    body = response.json()
+    assert body["success"] is True
+    batch_id = uuid.UUID(body["processing_batch_id"])
+
+    jobs = (
+        (
+            await db_session.execute(
+                select(BiometricProcessingJob).where(BiometricProcessingJob.batch_id == batch_id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert {job.biometric_sample_id for job in jobs} == {
+        uuid.UUID(row["sample_id"]) for row in body["rows"]
+    }
+    assert {job.status for job in jobs} == {ProcessingJobStatus.QUEUED}
+    assert {job.requested_by_user_id for job in jobs} == {scope["admin"].id}
+
+
+async def test_bulk_rejected_batch_queues_nothing(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_enrollment_scope(client_db, db_session, suffix="bulk-queue-none")
+    zip_bytes = _build_zip(
+        [
+            ("manifest.csv", _manifest_csv([(str(uuid.uuid4()), "a.jpg")])),
+            ("a.jpg", make_jpeg_bytes()),
+        ]
+    )
+    response = await _post_zip(client_db, content=zip_bytes, user=scope["admin"])
+    assert response.json()["success"] is False
+    assert response.json()["processing_batch_id"] is None
+    job_count = (
+        await db_session.execute(select(func.count()).select_from(BiometricProcessingJob))
+    ).scalar_one()
+    assert job_count == 0
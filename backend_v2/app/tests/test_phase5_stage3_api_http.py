@@ -181,6 +181,10 @@ async def test_health_response_never_leaks_a_configured_missing_model_path(
         FACE_EMBEDDER_MODEL_PATH = "/etc/very-secret-directory/dlib_model.dat"
         FACE_EMBEDDER_MODEL_SHA256 = None
         FACE_DETECTOR_INPUT_SIZE_PX = 320
+        FACE_PROVIDER_POOL_SIZE = 1
+        FACE_DETECTION_MODEL_IDENTIFIER = None
+        FACE_EMBEDDING_MODEL_IDENTIFIER = None
+        FACE_EMBEDDING_MODEL_VERSION = "v1"
 
     settings = _SettingsWithBogusPaths()
 
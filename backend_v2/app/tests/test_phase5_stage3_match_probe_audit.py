@@ -46,6 +46,11 @@ class _SettingsLike:
         self.FACE_MATCH_THRESHOLD = threshold
         self.FACE_MATCH_AMBIGUOUS_MARGIN = ambiguous_margin
         self.FACE_EMBEDDING_DIMENSION = dimension
+        self.FACE_MATCHER_ENGINE = "vectorized"
+        self.FACE_GALLERY_CACHE_MAX_ENTRIES = 64
+        self.FACE_GALLERY_CACHE_TTL_SECONDS = 60
+        self.FACE_EMBEDDING_MODEL_IDENTIFIER = None
+        self.FACE_EMBEDDING_MODEL_VERSION = "v1"
 
 
 async def _seed_one_processed_student(client_db, db_session: AsyncSession, *, suffix: str):
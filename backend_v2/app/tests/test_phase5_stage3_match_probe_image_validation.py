@@ -18,6 +18,7 @@ import threading
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+import numpy as np
 import pytest
 from PIL import Image
 
@@ -30,7 +31,10 @@ from app.modules.face_recognition.errors import (
     MatchProbeImageFormatNotAllowedError,
     MatchProbeImageMimeMismatchError,
 )
-from app.modules.face_recognition.match_probe_validation import validate_probe_image_bytes
+from app.modules.face_recognition.match_probe_validation import (
+    decode_validated_probe_image,
+    validate_probe_image_bytes,
+)
 
 _VALID_SECRET = "a" * 40
 
@@ -301,3 +305,104 @@ def test_concurrent_probe_validation_uses_request_local_limits_without_global_mu
     assert observed_globals
     assert all(value == original_max_image_pixels for value in observed_globals)
     assert original_max_image_pixels == Image.MAX_IMAGE_PIXELS
+
+
+def _noisy_png_bytes(*, mode: str) -> bytes:
+    pixels = np.random.default_rng(7).integers(0, 256, size=(48, 64, 4), dtype=np.uint8)
+    buffer = io.BytesIO()
+    image = Image.fromarray(pixels, mode="RGBA")
+    if mode != "RGBA":
+        image = image.convert("RGB").convert(mode)
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(_jpeg_bytes(size=(200, 150)), id="jpeg-rgb"),
+        pytest.param(_noisy_png_bytes(mode="RGB"), id="png-rgb"),
+        pytest.param(_noisy_png_bytes(mode="RGBA"), id="png-rgba"),
+        pytest.param(_noisy_png_bytes(mode="P"), id="png-palette"),
+        pytest.param(_noisy_png_bytes(mode="L"), id="png-grayscale"),
+    ],
+)
+def test_decode_validated_probe_image_matches_a_separate_rgb_decode(data: bytes) -> None:
+    """The fused path's pixels are exactly what the old validate-then-
+    ``Image.open(...).convert("RGB")`` path produced, whatever the mode —
+    packed in BGR order, the order the detector reads."""
+    decoded = decode_validated_probe_image(data, settings=_settings())
+
+    with Image.open(io.BytesIO(data)) as image:
+        expected = np.asarray(image.convert("RGB"), dtype=np.uint8)
+    assert decoded.color_format == "bgr"
+    assert (decoded.dimensions.width_px, decoded.dimensions.height_px) == (
+        expected.shape[1],
+        expected.shape[0],
+    )
+    np.testing.assert_array_equal(decoded.pixels, expected[:, :, ::-1])
+    np.testing.assert_array_equal(decoded.rgb_pixels(), expected)
+
+
+def test_decode_validated_probe_image_decodes_the_pixel_plane_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Every full decode goes through ``Image._getdecoder``; header parsing
+    and ``verify()`` do not."""
+    original = Image._getdecoder
+    calls: list[str] = []
+
+    def counting_getdecoder(*args: Any, **kwargs: Any) -> Any:
+        calls.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(Image, "_getdecoder", counting_getdecoder)
+    decode_validated_probe_image(_jpeg_bytes(size=(640, 480)), settings=_settings())
+
+    assert calls == ["jpeg"]
+
+
+@pytest.mark.parametrize(
+    ("data", "declared_content_type", "settings_overrides", "error_type"),
+    [
+        (b"", None, {}, MatchProbeImageEmptyError),
+        (_jpeg_bytes()[:300], None, {}, MatchProbeImageDecodeError),
+        (b"not an image" * 10, None, {}, MatchProbeImageDecodeError),
+        (_animated_webp_bytes(), None, {}, MatchProbeImageAnimatedNotAllowedError),
+        (
+            _jpeg_bytes(size=(700, 100)),
+            None,
+            {"MAX_ENROLLMENT_IMAGE_DIMENSION_PX": 500},
+            MatchProbeImageDimensionsTooLargeError,
+        ),
+        (
+            _jpeg_bytes(size=(1100, 1000)),
+            None,
+            {"MAX_ENROLLMENT_IMAGE_PIXELS": 1_000_000},
+            MatchProbeImageDimensionsTooLargeError,
+        ),
+        (_jpeg_bytes(), "image/png", {}, MatchProbeImageMimeMismatchError),
+    ],
+)
+def test_decode_validated_probe_image_rejects_exactly_what_validation_rejects(
+    data: bytes,
+    declared_content_type: str | None,
+    settings_overrides: dict[str, Any],
+    error_type: type[Exception],
+) -> None:
+    settings = _settings(**settings_overrides)
+    with pytest.raises(error_type):
+        validate_probe_image_bytes(
+            data, settings=settings, declared_content_type=declared_content_type
+        )
+    with pytest.raises(error_type):
+        decode_validated_probe_image(
+            data, settings=settings, declared_content_type=declared_content_type
+        )
+
+
+def test_decode_validated_probe_image_rejects_unsupported_format() -> None:
+    buffer = io.BytesIO()
+    Image.new("RGB", (50, 50)).save(buffer, format="BMP")
+    with pytest.raises(MatchProbeImageFormatNotAllowedError):
+        decode_validated_probe_image(buffer.getvalue(), settings=_settings())
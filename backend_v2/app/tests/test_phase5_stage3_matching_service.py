@@ -22,6 +22,7 @@ from app.modules.face_recognition.domain import MatchStatus
 from app.modules.face_recognition.errors import CandidateScopeRequiredError
 from app.modules.face_recognition.matching_service import MatchingService
 from app.modules.face_recognition.processing_service import SampleProcessingService
+from app.modules.face_recognition.repository import BiometricEmbeddingRepository
 from app.tests.phase5_stage2_http_helpers import (
     make_jpeg_bytes,
     seed_enrollment_scope,
@@ -38,11 +39,21 @@ from app.tests.phase5_stage3_helpers import (
 
 class _SettingsLike:
     def __init__(
-        self, *, threshold: float = 0.5, ambiguous_margin: float = 0.05, dimension: int = 128
+        self,
+        *,
+        threshold: float = 0.5,
+        ambiguous_margin: float = 0.05,
+        dimension: int = 128,
+        engine: str = "vectorized",
     ) -> None:
         self.FACE_MATCH_THRESHOLD = threshold
         self.FACE_MATCH_AMBIGUOUS_MARGIN = ambiguous_margin
         self.FACE_EMBEDDING_DIMENSION = dimension
+        self.FACE_MATCHER_ENGINE = engine
+        self.FACE_GALLERY_CACHE_MAX_ENTRIES = 64
+        self.FACE_GALLERY_CACHE_TTL_SECONDS = 60
+        self.FACE_EMBEDDING_MODEL_IDENTIFIER = None
+        self.FACE_EMBEDDING_MODEL_VERSION = "v1"
 
 
 async def _seed_two_processed_students(client_db, db_session: AsyncSession, *, suffix: str):
@@ -82,6 +93,19 @@ async def _seed_two_processed_students(client_db, db_session: AsyncSession, *, s
     return scope, sample_1_id, sample_2_id
 
 
+def _count_candidate_queries(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Count ``list_active_for_students`` calls (one list entry per call)."""
+    calls: list[int] = []
+    original = BiometricEmbeddingRepository.list_active_for_students
+
+    async def _counting(self, student_profile_ids, *, model):
+        calls.append(len(student_profile_ids))
+        return await original(self, student_profile_ids, model=model)
+
+    monkeypatch.setattr(BiometricEmbeddingRepository, "list_active_for_students", _counting)
+    return calls
+
+
 async def test_match_probe_requires_non_empty_candidate_scope(
     client_db, db_session: AsyncSession
 ) -> None:
@@ -243,3 +267,140 @@ async def test_match_probe_reports_ambiguous_between_two_in_scope_close_students
     assert outcome.matched_student_profile_id is None
     assert outcome.best_similarity is not None
     assert outcome.runner_up_similarity is not None
+
+
+async def test_match_probe_serves_repeated_scope_from_gallery_cache(
+    client_db, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scope, _sample_1_id, _sample_2_id = await _seed_two_processed_students(
+        client_db, db_session, suffix="match7"
+    )
+    queries = _count_candidate_queries(monkeypatch)
+    service = MatchingService(db_session, settings=_SettingsLike(threshold=0.5))
+    probe = make_unit_embedding_vector(seed=1.0)
+    roster = [
+        uuid.UUID(scope["student_profile_1"]["id"]),
+        uuid.UUID(scope["student_profile_2"]["id"]),
+    ]
+
+    first = await service.match_probe(
+        probe_embedding=probe, candidate_student_profile_ids=roster, actor=scope["admin"]
+    )
+    second = await service.match_probe(
+        probe_embedding=probe,
+        candidate_student_profile_ids=list(reversed(roster)),
+        actor=scope["admin"],
+    )
+
+    assert queries == [2]
+    assert first == second
+    assert first.status is MatchStatus.FOUND
+
+
+async def test_gallery_cache_never_serves_another_embedding_models_gallery(
+    client_db, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scope, _sample_1_id, _sample_2_id = await _seed_two_processed_students(
+        client_db, db_session, suffix="match9"
+    )
+    queries = _count_candidate_queries(monkeypatch)
+    probe = make_unit_embedding_vector(seed=1.0)
+    roster = [uuid.UUID(scope["student_profile_1"]["id"])]
+    new_model_settings = _SettingsLike(threshold=0.5)
+    new_model_settings.FACE_EMBEDDING_MODEL_VERSION = "v2"
+
+    before = await MatchingService(db_session, settings=_SettingsLike(threshold=0.5)).match_probe(
+        probe_embedding=probe, candidate_student_profile_ids=roster, actor=scope["admin"]
+    )
+    after = await MatchingService(db_session, settings=new_model_settings).match_probe(
+        probe_embedding=probe, candidate_student_profile_ids=roster, actor=scope["admin"]
+    )
+
+    assert queries == [1, 1]
+    assert before.status is MatchStatus.FOUND
+    assert after.status is MatchStatus.UNKNOWN
+    assert after.best_similarity is None
+
+
+async def test_committed_quarantine_invalidates_cached_gallery(
+    client_db, db_session: AsyncSession
+) -> None:
+    """A retired sample must stop matching as soon as its change commits,
+    even though its scope was cached while it was still active."""
+    scope, sample_1_id, _sample_2_id = await _seed_two_processed_students(
+        client_db, db_session, suffix="match8"
+    )
+    service = MatchingService(db_session, settings=_SettingsLike(threshold=0.5))
+    probe = make_unit_embedding_vector(seed=1.0)
+    roster = [uuid.UUID(scope["student_profile_1"]["id"])]
+
+    before = await service.match_probe(
+        probe_embedding=probe, candidate_student_profile_ids=roster, actor=scope["admin"]
+    )
+    assert before.status is MatchStatus.FOUND
+
+    samples = BiometricSampleRepository(db_session)
+    sample_1 = await samples.get_by_id(sample_1_id)
+    assert sample_1 is not None
+    await samples.mark_quarantined(sample_1, quarantined_at=sample_1.created_at)
+    await db_session.commit()
+
+    after = await service.match_probe(
+        probe_embedding=probe, candidate_student_profile_ids=roster, actor=scope["admin"]
+    )
+    assert after.status is MatchStatus.UNKNOWN
+    assert after.best_similarity is None
+
+
+async def test_uncommitted_lifecycle_change_bypasses_gallery_cache(
+    client_db, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scope, sample_1_id, _sample_2_id = await _seed_two_processed_students(
+        client_db, db_session, suffix="match9"
+    )
+    service = MatchingService(db_session, settings=_SettingsLike(threshold=0.5))
+    probe = make_unit_embedding_vector(seed=1.0)
+    roster = [uuid.UUID(scope["student_profile_1"]["id"])]
+    await service.match_probe(
+        probe_embedding=probe, candidate_student_profile_ids=roster, actor=scope["admin"]
+    )
+    queries = _count_candidate_queries(monkeypatch)
+
+    samples = BiometricSampleRepository(db_session)
+    sample_1 = await samples.get_by_id(sample_1_id)
+    assert sample_1 is not None
+    await samples.mark_quarantined(sample_1, quarantined_at=sample_1.created_at)
+    await db_session.flush()
+    # The session sees its own uncommitted quarantine, so it must query
+    # rather than serve the cached (still-active) gallery...
+    in_transaction = await service._load_gallery(roster)
+    assert in_transaction is None
+    await db_session.rollback()
+    await db_session.refresh(scope["admin"])
+
+    # ...and the rollback leaves the cached gallery valid and in use.
+    restored = await service.match_probe(
+        probe_embedding=probe, candidate_student_profile_ids=roster, actor=scope["admin"]
+    )
+    assert restored.status is MatchStatus.FOUND
+    assert queries == [1]
+
+
+async def test_python_engine_always_queries_candidates(
+    client_db, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scope, _sample_1_id, _sample_2_id = await _seed_two_processed_students(
+        client_db, db_session, suffix="match10"
+    )
+    queries = _count_candidate_queries(monkeypatch)
+    service = MatchingService(db_session, settings=_SettingsLike(engine="python"))
+    probe = make_unit_embedding_vector(seed=1.0)
+    roster = [uuid.UUID(scope["student_profile_1"]["id"])]
+
+    for _ in range(2):
+        outcome = await service.match_probe(
+            probe_embedding=probe, candidate_student_profile_ids=roster, actor=scope["admin"]
+        )
+        assert outcome.status is MatchStatus.FOUND
+
+    assert queries == [1, 1]
@@ -71,7 +71,7 @@ def test_biometric_embeddings_has_positive_dimension_and_length_check_constraint
     }
     assert {
         "ck_biometric_embeddings_embedding_dimension_positive",
-        "ck_biometric_embeddings_embedding_values_length_matches_dimension",
+        "ck_biometric_embeddings_embedding_packed_length_matches_dim",
     }.issubset(check_names)
 
 
@@ -101,7 +101,7 @@ def test_biometric_embeddings_required_columns_are_not_nullable() -> None:
         "model_identifier",
         "model_version",
         "embedding_dimension",
-        "embedding_values",
+        "embedding_packed",
         "is_active",
         "created_at",
     ):
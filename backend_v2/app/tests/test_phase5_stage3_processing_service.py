@@ -20,13 +20,18 @@ from unittest.mock import patch
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.modules.biometric_enrollment.models import RecognitionProcessingState, SampleStatus
 from app.modules.biometric_enrollment.repository import BiometricSampleRepository
+from app.modules.face_recognition.embedding_codec import unpack_embedding
 from app.modules.face_recognition.errors import SampleNotEligibleForProcessingError
+from app.modules.face_recognition.processing_pool import shutdown_processing_pool
 from app.modules.face_recognition.processing_service import (
+    REASON_PROVIDER_UNAVAILABLE,
     REASON_ZERO_FACES,
     SampleProcessingService,
 )
+from app.modules.face_recognition.provider_factory import current_embedding_model
 from app.modules.face_recognition.repository import BiometricEmbeddingRepository
 from app.tests.phase5_stage2_http_helpers import (
     make_jpeg_bytes,
@@ -77,7 +82,8 @@ async def test_process_sample_transitions_pending_to_processed(
     assert embedding is not None
     assert embedding.is_active is True
     assert embedding.embedding_dimension == 128
-    assert len(embedding.embedding_values) == 128
+    assert len(embedding.embedding_packed) == 4 * 128
+    assert unpack_embedding(embedding.embedding_packed).shape == (128,)
     assert embedding.provider_name == "dlib_resnet_v1_local"
     assert embedding.model_identifier == "dlib_face_recognition_resnet_model_v1"
     assert embedding.model_version == "v1"
@@ -273,7 +279,7 @@ async def test_replacement_sample_does_not_inherit_old_embedding(
     embeddings = BiometricEmbeddingRepository(db_session)
     old_embedding = await embeddings.get_active_for_sample(first_sample_id)
     assert old_embedding is not None
-    old_values = list(old_embedding.embedding_values)
+    old_values = old_embedding.embedding_packed
 
     replace_response = await upload_sample(
         client_db,
@@ -300,7 +306,7 @@ async def test_replacement_sample_does_not_inherit_old_embedding(
 
     new_embedding = await embeddings.get_active_for_sample(new_sample_id)
     assert new_embedding is not None
-    assert list(new_embedding.embedding_values) != old_values
+    assert new_embedding.embedding_packed != old_values
 
     # The old sample's own embedding row is untouched (still is_active on
     # ITS row) — but it is no longer reachable through the
@@ -309,11 +315,12 @@ async def test_replacement_sample_does_not_inherit_old_embedding(
     # returns the live sample's own, freshly-computed embedding for this
     # student, never the retired one.
     candidates = await embeddings.list_active_for_students(
-        [uuid.UUID(scope["student_profile_1"]["id"])]
+        [uuid.UUID(scope["student_profile_1"]["id"])],
+        model=current_embedding_model(get_settings()),
     )
     assert len(candidates) == 1
-    assert list(candidates[0].embedding_values) == list(new_embedding.embedding_values)
-    assert list(candidates[0].embedding_values) != old_values
+    assert candidates[0].embedding_packed == new_embedding.embedding_packed
+    assert candidates[0].embedding_packed != old_values
 
 
 async def test_process_pending_batch_is_bounded(client_db, db_session: AsyncSession) -> None:
@@ -340,6 +347,73 @@ async def test_process_pending_batch_is_bounded(client_db, db_session: AsyncSess
     assert results[0].succeeded is True
 
 
+async def test_process_pending_batch_embeds_all_aligned_faces_in_one_call(
+    client_db, db_session: AsyncSession
+) -> None:
+    scope = await seed_enrollment_scope(client_db, db_session, suffix="proc9b")
+    sample_ids = []
+    for profile_key in ("student_profile_1", "student_profile_2"):
+        sample_ids.append(
+            await seed_active_sample_direct(
+                db_session,
+                student_profile_id=uuid.UUID(scope[profile_key]["id"]),
+                created_by_user_id=scope["admin"].id,
+            )
+        )
+
+    # Samples are processed in list order; whichever comes second has no face.
+    detector = FakeFaceDetector(results=[[make_detected_face()], []])
+    embedder = FakeFaceEmbedder()
+    service = SampleProcessingService(db_session)
+
+    with patch_providers(detector, embedder):
+        results = await service.process_pending_batch(actor=scope["admin"])
+
+    assert embedder.embed_many_batch_sizes == [1]
+    assert sorted(result.sample_id for result in results) == sorted(sample_ids)
+    assert [result.succeeded for result in results] == [True, False]
+    assert results[1].reason_code == REASON_ZERO_FACES
+
+    samples = BiometricSampleRepository(db_session)
+    embeddings = BiometricEmbeddingRepository(db_session)
+    succeeded = await samples.get_by_id(results[0].sample_id)
+    failed = await samples.get_by_id(results[1].sample_id)
+    assert succeeded is not None and failed is not None
+    assert succeeded.processing_state is RecognitionProcessingState.PROCESSED
+    assert failed.processing_state is RecognitionProcessingState.PROCESSING_FAILED
+    assert await embeddings.get_active_for_sample(results[0].sample_id) is not None
+    assert await embeddings.get_active_for_sample(results[1].sample_id) is None
+
+
+async def test_process_pending_batch_in_pool_mode_persists_worker_outcomes_in_the_parent(
+    client_db, db_session: AsyncSession
+) -> None:
+    """Pool workers see the suite's real settings (no model files), so the
+    sample fails in the worker with ``provider_unavailable`` — and the
+    parent process records that failure exactly as the in-process path would."""
+    scope = await seed_enrollment_scope(client_db, db_session, suffix="proc9c")
+    sample_id = await seed_active_sample_direct(
+        db_session,
+        student_profile_id=uuid.UUID(scope["student_profile_1"]["id"]),
+        created_by_user_id=scope["admin"].id,
+    )
+    settings = get_settings().model_copy(update={"FACE_PROCESSING_WORKERS": 1})
+    service = SampleProcessingService(db_session, settings=settings)
+
+    try:
+        results = await service.process_pending_batch(actor=scope["admin"])
+    finally:
+        shutdown_processing_pool()
+
+    assert [(result.sample_id, result.reason_code) for result in results] == [
+        (sample_id, REASON_PROVIDER_UNAVAILABLE)
+    ]
+    sample = await BiometricSampleRepository(db_session).get_by_id(sample_id)
+    assert sample is not None
+    assert sample.processing_state is RecognitionProcessingState.PROCESSING_FAILED
+    assert sample.processing_failure_reason_code == REASON_PROVIDER_UNAVAILABLE
+
+
 async def test_process_sample_rejects_failed_sample_and_only_retry_sample_accepts_it(
     client_db, db_session: AsyncSession
 ) -> None:
@@ -12,10 +12,18 @@ from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.core.config import get_settings
 from app.modules.attendance.models import AttendanceRecord, AttendanceStatus, AuditOutcome
 from app.modules.attendance.repository import AuditLogRepository
-from app.modules.attendance.service import AttendanceService
-from app.modules.face_recognition.domain import MatchStatus
+from app.modules.attendance.service import ACTION_ATTENDANCE_BULK_MARK, AttendanceService
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DetectedFace,
+    EmbeddingVector,
+    MatchStatus,
+    NormalizedFaceInput,
+)
+from app.modules.face_recognition.matching_service import ACTION_MATCH_BATCH
 from app.modules.face_recognition.models import RecognitionAttendanceAttempt
 from app.modules.face_recognition.recognition_attendance_service import (
     ACTION_RECOGNITION_ATTENDANCE_ATTEMPT,
@@ -30,15 +38,18 @@ from app.tests.attendance_http_helpers import seed_attendance_scope
 from app.tests.phase3_http_helpers import auth_headers, create_resource, seed_user
 from app.tests.phase5_stage2_http_helpers import make_jpeg_bytes
 from app.tests.phase5_stage3_helpers import (
+    DEFAULT_DIMENSIONS,
     FakeFaceDetector,
     FakeFaceEmbedder,
     make_detected_face,
+    make_landmarks,
     make_unit_embedding_vector,
     patch_providers,
 )
 from app.tests.phase5_stage4_helpers import seed_processed_embedding_direct
 
 _BASE = "/api/v1/face-recognition/attendance/attempts"
+_GROUP = "/api/v1/face-recognition/attendance/group-attempts"
 _ATTENDANCE_DATE = date(2026, 8, 16)
 
 
@@ -478,3 +489,257 @@ async def test_concurrent_same_confirmation_is_serialized_by_attempt_row_lock(
         limit=10,
     )
     assert len(confirmation_audits) == 1
+
+
+class _SequencedEmbedder(FakeFaceEmbedder):
+    """Returns the unit vector for ``seeds[i]`` on the ``i``-th ``embed`` call."""
+
+    def __init__(self, seeds: list[float]) -> None:
+        super().__init__()
+        self._seeds = list(seeds)
+
+    def embed(self, face: NormalizedFaceInput) -> EmbeddingVector:
+        return make_unit_embedding_vector(seed=self._seeds.pop(0))
+
+
+def _group_face(x: int, y: int) -> DetectedFace:
+    return DetectedFace(
+        bounding_box=BoundingBox(x_px=x, y_px=y, width_px=80, height_px=80),
+        source_image_dimensions=DEFAULT_DIMENSIONS,
+        confidence=0.9,
+        landmarks=make_landmarks(),
+    )
+
+
+async def test_group_photo_marks_each_recognized_student_once_in_one_attendance_batch(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="s4-group")
+    student_1 = uuid.UUID(scope["student_profile_1"]["id"])
+    student_2 = uuid.UUID(scope["student_profile_2"]["id"])
+    for student_id, seed in ((student_1, 1.0), (student_2, 30.0)):
+        await seed_processed_embedding_direct(
+            db_session,
+            student_profile_id=student_id,
+            created_by_user_id=scope["admin"].id,
+            embedding_values=list(make_unit_embedding_vector(seed=seed).values),
+        )
+    # Reading order: student 1, student 2, student 1 again, a stranger.
+    detector = FakeFaceDetector(
+        results=[
+            [_group_face(20, 200), _group_face(20, 20), _group_face(200, 20), _group_face(200, 200)]
+        ]
+    )
+    embedder = _SequencedEmbedder([1.0, 30.0, 1.0, 77.0])
+
+    with patch_providers(detector, embedder):
+        response = await client_db.post(
+            _GROUP,
+            data={
+                "classroom_id": scope["classroom"]["id"],
+                "subject_id": scope["subject"]["id"],
+                "attendance_date": _ATTENDANCE_DATE.isoformat(),
+            },
+            files={"file": ("class.jpg", make_jpeg_bytes(), "image/jpeg")},
+            headers=auth_headers(scope["teacher"]),
+        )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["face_count"] == 4
+    assert body["found_count"] == 2
+    # Student 1's second face is ambiguous: it matches a student already
+    # claimed in this photo.
+    assert [attempt["decision"] for attempt in body["attempts"]] == [
+        MatchStatus.FOUND.value,
+        MatchStatus.FOUND.value,
+        MatchStatus.AMBIGUOUS.value,
+        MatchStatus.UNKNOWN.value,
+    ]
+    assert [attempt["matched_student_profile_id"] for attempt in body["attempts"][:2]] == [
+        str(student_1),
+        str(student_2),
+    ]
+    assert [attempt["requires_confirmation"] for attempt in body["attempts"]] == [
+        False,
+        False,
+        True,
+        True,
+    ]
+    assert "embedding" not in response.text.lower()
+
+    rows = await _attendance_rows(db_session)
+    assert {row.student_profile_id for row in rows} == {student_1, student_2}
+    assert all(row.status is AttendanceStatus.PRESENT for row in rows)
+    for attempt in body["attempts"][:2]:
+        persisted = await _attempt(db_session, attempt["attempt_id"])
+        assert persisted.attendance_record_id == uuid.UUID(attempt["attendance_record_id"])
+    for attempt in body["attempts"][2:]:
+        assert attempt["attendance_record_id"] is None
+
+    bulk_audits = await AuditLogRepository(db_session).list(
+        action=ACTION_ATTENDANCE_BULK_MARK, limit=10
+    )
+    assert len(bulk_audits) == 1
+    decision_audits = await AuditLogRepository(db_session).list(
+        action=ACTION_RECOGNITION_ATTENDANCE_DECISION,
+        outcome=AuditOutcome.SUCCESS,
+        limit=10,
+    )
+    assert len(decision_audits) == 4
+
+
+async def test_group_photo_authorizes_before_reading_the_upload(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="s4-group-block")
+    with patch("app.modules.face_recognition.router._validate_and_embed_group_sync") as inference:
+        response = await client_db.post(
+            _GROUP,
+            data={
+                "classroom_id": scope["classroom"]["id"],
+                "subject_id": scope["subject"]["id"],
+                "attendance_date": _ATTENDANCE_DATE.isoformat(),
+            },
+            files={"file": ("class.jpg", b"not-even-an-image", "image/jpeg")},
+            headers=auth_headers(scope["other_teacher"]),
+        )
+
+    assert response.status_code == 404
+    inference.assert_not_called()
+    assert await _attendance_rows(db_session) == []
+
+
+_BATCH = "/api/v1/face-recognition/attendance/batch-attempts"
+
+
+async def _post_batch(client: AsyncClient, *, user, scope, images: list[bytes]):
+    return await client.post(
+        _BATCH,
+        data={
+            "classroom_id": scope["classroom"]["id"],
+            "subject_id": scope["subject"]["id"],
+            "attendance_date": _ATTENDANCE_DATE.isoformat(),
+        },
+        files=[
+            ("files", (f"probe-{index}.jpg", image, "image/jpeg"))
+            for index, image in enumerate(images)
+        ],
+        headers=auth_headers(user),
+    )
+
+
+async def test_batch_attempts_persist_every_image_in_one_attendance_batch(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="s4-batch")
+    student_1 = uuid.UUID(scope["student_profile_1"]["id"])
+    student_2 = uuid.UUID(scope["student_profile_2"]["id"])
+    for student_id, seed in ((student_1, 1.0), (student_2, 30.0)):
+        await seed_processed_embedding_direct(
+            db_session,
+            student_profile_id=student_id,
+            created_by_user_id=scope["admin"].id,
+            embedding_values=list(make_unit_embedding_vector(seed=seed).values),
+        )
+    # Student 1, student 2, student 1 again (a retake), a stranger, no face.
+    detector = FakeFaceDetector(results=[[make_detected_face()]] * 4 + [[]])
+    embedder = _SequencedEmbedder([1.0, 30.0, 1.0, 77.0])
+
+    with patch_providers(detector, embedder):
+        response = await _post_batch(
+            client_db, user=scope["teacher"], scope=scope, images=[make_jpeg_bytes()] * 5
+        )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["image_count"], body["found_count"], body["rejected_count"]) == (5, 3, 1)
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3, 4]
+    attempts = [result["attempt"] for result in body["results"][:4]]
+    assert [attempt["decision"] for attempt in attempts] == [
+        MatchStatus.FOUND.value,
+        MatchStatus.FOUND.value,
+        MatchStatus.FOUND.value,
+        MatchStatus.UNKNOWN.value,
+    ]
+    assert [attempt["matched_student_profile_id"] for attempt in attempts[:3]] == [
+        str(student_1),
+        str(student_2),
+        str(student_1),
+    ]
+    assert attempts[0]["attendance_record_id"] == attempts[2]["attendance_record_id"]
+    assert attempts[3]["attendance_record_id"] is None
+    assert attempts[3]["requires_confirmation"] is True
+    assert body["results"][4]["attempt"] is None
+    assert body["results"][4]["error"]["code"] == "ENROLLMENT_SAMPLE_NO_FACE_DETECTED"
+    assert "embedding" not in response.text.lower()
+
+    rows = await _attendance_rows(db_session)
+    assert sorted(row.student_profile_id for row in rows) == sorted([student_1, student_2])
+    for attempt in attempts:
+        persisted = await _attempt(db_session, attempt["attempt_id"])
+        expected = attempt["attendance_record_id"]
+        assert persisted.attendance_record_id == (uuid.UUID(expected) if expected else None)
+
+    audits = AuditLogRepository(db_session)
+    assert len(await audits.list(action=ACTION_ATTENDANCE_BULK_MARK, limit=10)) == 1
+    assert len(await audits.list(action=ACTION_MATCH_BATCH, limit=10)) == 1
+    decision_audits = await audits.list(
+        action=ACTION_RECOGNITION_ATTENDANCE_DECISION, outcome=AuditOutcome.SUCCESS, limit=10
+    )
+    assert len(decision_audits) == 4
+
+
+async def test_batch_attempts_roll_back_together_when_attendance_fails(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="s4-batch-fail")
+    student_id = uuid.UUID(scope["student_profile_1"]["id"])
+    await seed_processed_embedding_direct(
+        db_session,
+        student_profile_id=student_id,
+        created_by_user_id=scope["admin"].id,
+        embedding_values=list(make_unit_embedding_vector(seed=1.0).values),
+    )
+
+    async def _fail_attendance(*args: object, **kwargs: object) -> None:
+        raise RuntimeError("simulated attendance failure")
+
+    with (
+        patch_providers(FakeFaceDetector(), _SequencedEmbedder([1.0, 55.0])),
+        patch.object(AttendanceService, "bulk_save_in_transaction", new=_fail_attendance),
+        pytest.raises(RuntimeError, match="simulated attendance failure"),
+    ):
+        await _post_batch(
+            client_db, user=scope["teacher"], scope=scope, images=[make_jpeg_bytes()] * 2
+        )
+
+    attempts = (await db_session.execute(select(RecognitionAttendanceAttempt))).scalars().all()
+    assert list(attempts) == []
+    assert await _attendance_rows(db_session) == []
+    decision_audits = await AuditLogRepository(db_session).list(
+        action=ACTION_RECOGNITION_ATTENDANCE_DECISION, limit=10
+    )
+    assert decision_audits == []
+
+
+async def test_batch_attempts_authorize_then_cap_the_image_count_before_inference(
+    client_db: AsyncClient, db_session: AsyncSession
+) -> None:
+    scope = await seed_attendance_scope(client_db, db_session, suffix="s4-batch-cap")
+    with patch("app.modules.face_recognition.router._validate_and_embed_probe_sync") as inference:
+        blocked = await _post_batch(
+            client_db, user=scope["other_teacher"], scope=scope, images=[b"not-an-image"]
+        )
+        too_many = await _post_batch(
+            client_db,
+            user=scope["teacher"],
+            scope=scope,
+            images=[b"not-an-image"] * (get_settings().FACE_ATTENDANCE_BATCH_MAX_IMAGES + 1),
+        )
+
+    assert blocked.status_code == 404
+    assert too_many.status_code == 422
+    assert too_many.json()["error"]["code"] == "RECOGNITION_ATTENDANCE_BATCH_TOO_MANY_IMAGES"
+    inference.assert_not_called()
+    assert await _attendance_rows(db_session) == []
@@ -0,0 +1,8 @@
+"""Offline performance benchmarks for backend_v2.
+
+Every module here is a standalone ``python -m scripts.benchmarks.<name>``
+command. None of them touch a database, a real model file, or real
+biometric data: inputs are deterministic synthetic data generated in
+process, and results are printed, never asserted — the pytest suite
+stays the only place correctness is checked.
+"""
@@ -0,0 +1,294 @@
+"""Latency benchmark: per-row vs set-based attendance bulk save.
+
+Times ``AttendanceService.bulk_save_in_transaction`` for an admin saving
+one classroom's marks, at several batch sizes, in two modes:
+
+- ``per-row``: the earlier implementation — one ``get_by_id`` per
+  student to validate, then one unique-key lookup plus one INSERT or
+  UPDATE (each followed by a refresh) per record.
+- ``set-based``: the current one — one ``IN`` query to validate and one
+  ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` to write.
+
+Each size is timed twice: saving a day that has no rows yet
+(``create``) and re-saving a day whose rows all exist (``update``).
+
+Unlike the other benchmarks this one needs a reachable, migrated
+PostgreSQL (``DATABASE_URL``, as for the API). Everything it writes —
+the classroom, subject, users, students and marks — happens inside one
+transaction that is rolled back at the end, so it leaves nothing behind.
+Usage (from ``backend_v2``):
+
+    python -m scripts.benchmarks.attendance_bulk_save
+    python -m scripts.benchmarks.attendance_bulk_save --sizes 10 60 200 --repeat 20
+
+Each cell is the median of ``--repeat`` runs, after one warm-up run; the
+statement counts are per run. Network round-trip time to the database
+dominates the per-row path, so run it against a database on the same
+network as the API for representative numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+# Allows `python scripts/benchmarks/attendance_bulk_save.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.session import dispose_all_engines, get_engine
+from app.modules.academics.models import Classroom, Subject
+from app.modules.academics.repository import ClassroomRepository, SubjectRepository
+from app.modules.attendance.errors import (
+    AttendanceInactiveStudentError,
+    AttendanceStudentNotFoundError,
+    AttendanceStudentNotInClassroomError,
+)
+from app.modules.attendance.models import AttendanceStatus
+from app.modules.attendance.schemas import BulkAttendanceRecordIn, BulkAttendanceRequest
+from app.modules.attendance.service import AttendanceService, BlockedAuditWriter
+from app.modules.profiles.repository import StudentProfileRepository
+from app.modules.users.models import User, UserRole
+from app.modules.users.repository import UserRepository
+
+_SIZES = (10, 60, 200)
+_STATUSES = (AttendanceStatus.PRESENT, AttendanceStatus.ABSENT)
+
+
+class _PerRowAttendanceService(AttendanceService):
+    """``AttendanceService`` with the earlier per-record validate and write loops."""
+
+    async def _validate_students(
+        self, *, classroom_id: uuid.UUID, records: list[BulkAttendanceRecordIn]
+    ) -> None:
+        for record in records:
+            profile = await self._students.get_by_id(record.student_profile_id)
+            if profile is None:
+                raise AttendanceStudentNotFoundError()
+            if not profile.is_active:
+                raise AttendanceInactiveStudentError()
+            if profile.classroom_id != classroom_id:
+                raise AttendanceStudentNotInClassroomError()
+
+    async def _write_attendance_records(
+        self,
+        *,
+        classroom: Classroom,
+        subject: Subject,
+        attendance_date: date,
+        records: list[BulkAttendanceRecordIn],
+        marked_by_user_id: uuid.UUID,
+    ) -> tuple[int, int, list[uuid.UUID]]:
+        created_count = 0
+        record_ids: list[uuid.UUID] = []
+        for record in records:
+            existing = await self._attendance.get_by_unique_key(
+                student_profile_id=record.student_profile_id,
+                classroom_id=classroom.id,
+                subject_id=subject.id,
+                attendance_date=attendance_date,
+            )
+            if existing is None:
+                saved = await self._attendance.create(
+                    student_profile_id=record.student_profile_id,
+                    classroom_id=classroom.id,
+                    subject_id=subject.id,
+                    attendance_date=attendance_date,
+                    status=record.status,
+                    remarks=record.remarks,
+                    marked_by_user_id=marked_by_user_id,
+                )
+                created_count += 1
+            else:
+                saved = await self._attendance.update(
+                    existing,
+                    status=record.status,
+                    remarks=record.remarks,
+                    marked_by_user_id=marked_by_user_id,
+                )
+            record_ids.append(saved.id)
+        return created_count, len(records) - created_count, record_ids
+
+
+class _StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *_args: object) -> None:
+        self.count += 1
+
+
+async def _seed(
+    session: AsyncSession, *, students: int
+) -> tuple[uuid.UUID, uuid.UUID, uuid.UUID, list[uuid.UUID]]:
+    suffix = uuid.uuid4().hex[:8]
+    users = UserRepository(session)
+    admin = await users.create(
+        email=f"bench-admin-{suffix}@example.com",
+        password_hash="benchmark-not-a-login",
+        full_name="Benchmark Admin",
+        role=UserRole.ADMIN,
+        is_active=True,
+    )
+    classroom = await ClassroomRepository(session).create(
+        name="Benchmark", code=f"bench-room-{suffix}"
+    )
+    subject = await SubjectRepository(session).create(name="Benchmark", code=f"bench-{suffix}")
+    profiles = StudentProfileRepository(session)
+    student_ids = []
+    for index in range(students):
+        user = await users.create(
+            email=f"bench-student-{suffix}-{index}@example.com",
+            password_hash="benchmark-not-a-login",
+            full_name=f"Benchmark Student {index}",
+            role=UserRole.STUDENT,
+            is_active=True,
+        )
+        profile = await profiles.create(
+            user_id=user.id, classroom_id=classroom.id, roll_number=f"{index:03d}"
+        )
+        student_ids.append(profile.id)
+    return admin.id, classroom.id, subject.id, student_ids
+
+
+def _payload(
+    classroom_id: uuid.UUID,
+    subject_id: uuid.UUID,
+    student_ids: list[uuid.UUID],
+    *,
+    on: date,
+    flip: int,
+) -> BulkAttendanceRequest:
+    return BulkAttendanceRequest(
+        classroom_id=classroom_id,
+        subject_id=subject_id,
+        attendance_date=on,
+        records=[
+            BulkAttendanceRecordIn(
+                student_profile_id=student_id, status=_STATUSES[(index + flip) % 2]
+            )
+            for index, student_id in enumerate(student_ids)
+        ],
+    )
+
+
+async def _time_save(
+    session: AsyncSession,
+    service_type: type[AttendanceService],
+    *,
+    admin_id: uuid.UUID,
+    existing: BulkAttendanceRequest | None,
+    payload: BulkAttendanceRequest,
+    blocked_audit_writer: BlockedAuditWriter,
+    counter: _StatementCounter,
+) -> tuple[float, int]:
+    """One save inside a savepoint that is rolled back afterwards; returns
+    its milliseconds and statement count."""
+    savepoint = await session.begin_nested()
+    try:
+        admin = await session.get(User, admin_id)
+        if admin is None:  # pragma: no cover - seeded above
+            raise RuntimeError("benchmark admin user disappeared")
+        if existing is not None:
+            await AttendanceService(
+                session, blocked_audit_writer=blocked_audit_writer
+            ).bulk_save_in_transaction(current_user=admin, payload=existing)
+        # A request starts with an empty identity map (apart from its user).
+        session.expunge_all()
+        session.add(admin)
+        counter.count = 0
+        started = time.perf_counter()
+        await service_type(
+            session, blocked_audit_writer=blocked_audit_writer
+        ).bulk_save_in_transaction(current_user=admin, payload=payload)
+        return (time.perf_counter() - started) * 1000.0, counter.count
+    finally:
+        await savepoint.rollback()
+
+
+async def _run(sizes: list[int], repeat: int) -> None:
+    engine = get_engine(get_settings())
+    # The benchmark session is bound to a connection, not the engine, so
+    # the service cannot derive this itself; an admin never needs it.
+    blocked_audit_writer = BlockedAuditWriter(async_sessionmaker(bind=engine))
+    counter = _StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(bind=connection, expire_on_commit=False, autoflush=False)
+            try:
+                admin_id, classroom_id, subject_id, student_ids = await _seed(
+                    session, students=max(sizes)
+                )
+
+                header = (
+                    f"{'batch':>6} {'run':>7} {'per-row':>10} {'stmts':>6} "
+                    f"{'set-based':>10} {'stmts':>6} {'speedup':>8}"
+                )
+                print(header)
+                print("-" * len(header))
+                day = date(2026, 1, 1)
+                for size in sizes:
+                    for run in ("create", "update"):
+                        cells: list[tuple[float, int]] = []
+                        for service_type in (_PerRowAttendanceService, AttendanceService):
+                            timings, statements = [], 0
+                            for attempt in range(repeat + 1):
+                                day += timedelta(days=1)
+                                existing = (
+                                    _payload(
+                                        classroom_id, subject_id, student_ids[:size], on=day, flip=0
+                                    )
+                                    if run == "update"
+                                    else None
+                                )
+                                milliseconds, statements = await _time_save(
+                                    session,
+                                    service_type,
+                                    admin_id=admin_id,
+                                    existing=existing,
+                                    payload=_payload(
+                                        classroom_id, subject_id, student_ids[:size], on=day, flip=1
+                                    ),
+                                    blocked_audit_writer=blocked_audit_writer,
+                                    counter=counter,
+                                )
+                                if attempt:
+                                    timings.append(milliseconds)
+                            cells.append((statistics.median(timings), statements))
+                        (per_row_ms, per_row_stmts), (set_ms, set_stmts) = cells
+                        print(
+                            f"{size:>6} {run:>7} {per_row_ms:>8.1f}ms {per_row_stmts:>6} "
+                            f"{set_ms:>8.1f}ms {set_stmts:>6} {per_row_ms / set_ms:>7.1f}x"
+                        )
+            finally:
+                await session.close()
+                await transaction.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        await dispose_all_engines()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(_SIZES))
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+    if not all(1 <= size <= 200 for size in args.sizes):
+        parser.error("--sizes must be between 1 and 200 (the bulk-save cap)")
+    asyncio.run(_run(args.sizes, args.repeat))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+"""Latency benchmark: full-resolution vs reduced-resolution single-face detection.
+
+For each input size, encodes a synthetic JPEG and times what a match probe
+or enrollment sample costs before alignment, in two modes:
+
+- ``full``: decode, then detect on the full-resolution image
+  (``FACE_DETECTOR_WORKING_SIZE_FACTOR=0``).
+- ``reduced``: decode, build the detection image
+  (``detection_scaling.build_detection_image`` — a downsample of the
+  decoded buffer), detect on it, and map the result back.
+
+Usage (from ``backend_v2``):
+
+    python -m scripts.benchmarks.detection_resolution
+    python -m scripts.benchmarks.detection_resolution --factor 2 --repeat 10
+    python -m scripts.benchmarks.detection_resolution --yunet-model /path/to/yunet.onnx
+
+With ``--yunet-model`` the real ``YuNetFaceDetector`` runs. Without it,
+no model file is needed: a stand-in detector burns CPU in proportion to
+the pixels it is given (``--stub-ns-per-px``, default in the range of
+YuNet on one core) and reports one centred face. Decoding, resampling
+and coordinate mapping are real in both cases. Each cell is the median
+of ``--repeat`` runs, after one warm-up run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Allows `python scripts/benchmarks/detection_resolution.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.modules.face_recognition.detection_scaling import build_detection_image, detect_faces
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DetectedFace,
+    FacialLandmark,
+)
+from app.modules.face_recognition.image_codec import ImageFrame, pil_image_to_frame
+from app.modules.face_recognition.protocols import FaceDetector
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+
+_SIZES = ((640, 480), (1280, 960), (1920, 1440), (4000, 3000), (6000, 4000))
+
+
+def _spin(milliseconds: float) -> None:
+    deadline = time.process_time() + milliseconds / 1000.0
+    while time.process_time() < deadline:
+        pass
+
+
+class _StubDetector:
+    """One centred face per image, after CPU time proportional to its pixel count."""
+
+    provider_name = "benchmark_stub_detector"
+
+    def __init__(self, ns_per_px: float) -> None:
+        self._ns_per_px = ns_per_px
+
+    def detect(self, image: ImageFrame) -> list[DetectedFace]:
+        width, height = image.dimensions.width_px, image.dimensions.height_px
+        _spin(width * height * self._ns_per_px / 1e6)
+        cx, cy, side = width / 2, height / 2, min(width, height) / 3
+        return [
+            DetectedFace(
+                bounding_box=BoundingBox(
+                    x_px=int(cx - side / 2),
+                    y_px=int(cy - side / 2),
+                    width_px=int(side),
+                    height_px=int(side),
+                ),
+                source_image_dimensions=image.dimensions,
+                confidence=0.99,
+                landmarks=(
+                    FacialLandmark(x_px=cx - side / 5, y_px=cy - side / 8),
+                    FacialLandmark(x_px=cx + side / 5, y_px=cy - side / 8),
+                    FacialLandmark(x_px=cx, y_px=cy),
+                    FacialLandmark(x_px=cx - side / 6, y_px=cy + side / 5),
+                    FacialLandmark(x_px=cx + side / 6, y_px=cy + side / 5),
+                ),
+            )
+        ]
+
+
+def _jpeg(width: int, height: int, *, seed: int) -> bytes:
+    # Smooth noise: compresses and decodes like a photo, not like flat colour.
+    small = np.random.default_rng(seed).integers(0, 256, size=(height // 40, width // 40, 3))
+    image = Image.fromarray(small.astype(np.uint8)).resize(
+        (width, height), Image.Resampling.BILINEAR
+    )
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _decode(data: bytes) -> ImageFrame:
+    with Image.open(BytesIO(data)) as image:
+        return pil_image_to_frame(image)
+
+
+def _median_ms(run: Callable[[], object], *, repeat: int) -> float:
+    run()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(timings)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--factor", type=int, default=2)
+    parser.add_argument("--input-size", type=int, default=320)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stub-ns-per-px", type=float, default=40.0)
+    parser.add_argument("--yunet-model", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    factor: int = args.factor
+    input_size: int = args.input_size
+    repeat: int = args.repeat
+    stub_ns_per_px: float = args.stub_ns_per_px
+    yunet_model: Path | None = args.yunet_model
+    seed: int = args.seed
+
+    reduced_settings = Settings.model_construct(
+        FACE_DETECTOR_INPUT_SIZE_PX=input_size,
+        FACE_DETECTOR_WORKING_SIZE_FACTOR=factor,
+        FACE_DETECTOR_MODEL_PATH=str(yunet_model) if yunet_model else None,
+        FACE_DETECTOR_MODEL_SHA256=None,
+    )
+    detector: FaceDetector
+    if yunet_model is not None:
+        detector = YuNetFaceDetector(reduced_settings)
+        label = f"YuNet ({yunet_model.name})"
+    else:
+        detector = _StubDetector(stub_ns_per_px)
+        label = f"stub detector, {stub_ns_per_px:g} ns/px"
+    max_side = factor * input_size
+    print(f"{label}; reduced mode bounds the longer side to {max_side} px")
+
+    header = (
+        f"{'input':>11} {'full decode':>12} {'full detect':>12} {'full total':>11} "
+        f"{'resize':>7} {'reduced detect':>15} {'reduced total':>14} {'speedup':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for width, height in _SIZES:
+        data = _jpeg(width, height, seed=seed)
+        image = _decode(data)
+        detection_image = build_detection_image(image, settings=reduced_settings)
+
+        decode_ms = _median_ms(partial(_decode, data), repeat=repeat)
+        full_detect_ms = _median_ms(
+            partial(detect_faces, detector, image, detection_image=None), repeat=repeat
+        )
+        resize_ms = _median_ms(
+            partial(build_detection_image, image, settings=reduced_settings), repeat=repeat
+        )
+        reduced_detect_ms = _median_ms(
+            partial(detect_faces, detector, image, detection_image=detection_image),
+            repeat=repeat,
+        )
+        full_total = decode_ms + full_detect_ms
+        reduced_total = decode_ms + resize_ms + reduced_detect_ms
+        print(
+            f"{f'{width}x{height}':>11} {decode_ms:>10.1f}ms {full_detect_ms:>10.1f}ms "
+            f"{full_total:>9.1f}ms {resize_ms:>5.1f}ms {reduced_detect_ms:>13.1f}ms "
+            f"{reduced_total:>12.1f}ms {full_total / reduced_total:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
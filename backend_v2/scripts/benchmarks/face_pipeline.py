@@ -0,0 +1,545 @@
+"""Benchmark suite: per-stage latency and throughput of the face pipeline.
+
+Times each stage of recognition on its own, and the whole chain, across
+image sizes, roster sizes and concurrency levels:
+
+- ``decode``: ``Image.open`` + ``image_codec.pil_image_to_frame`` of a JPEG.
+- ``detect``: ``YuNetFaceDetector.detect`` on the decoded frame.
+- ``align``: ``alignment.align_face`` for the detected face.
+- ``embed``: ``DlibResnetFaceEmbedder.embed`` of the aligned chip.
+- ``match``: ``CosineSimilarityFaceMatcher.match`` against a roster, or
+  ``VectorizedCosineSimilarityFaceMatcher.match_gallery`` against the
+  packed gallery (what a gallery-cache hit costs).
+- ``pipeline``: all of the above for one probe, back to back.
+
+``decode``/``detect``/``align``/``pipeline`` run per image size,
+``match`` per roster size, ``embed`` once; every cell at every
+``--concurrency`` level. At concurrency N, N threads share detector and
+embedder ``InstancePool``s of size N (``FACE_PROVIDER_POOL_SIZE=N``) and
+together make ``--iterations`` calls, after one warm-up call. Each cell
+reports p50/p95/p99 call latency and calls per second of wall time.
+
+Usage (from ``backend_v2``):
+
+    python -m scripts.benchmarks.face_pipeline
+    python -m scripts.benchmarks.face_pipeline --concurrency 1 4 --output before.json
+    python -m scripts.benchmarks.face_pipeline --output after.json --compare before.json
+    python -m scripts.benchmarks.face_pipeline --yunet-model yunet.onnx --dlib-model resnet.dat \
+        --image photo.jpg
+
+Images are deterministic synthetic JPEGs (``--seed``), or ``--image``
+resized to each size. No model file is needed: the real YuNet and dlib
+adapters run with stand-in native models that spend thread CPU time in
+OpenCV, releasing the GIL as the real models do — in proportion to the
+pixels detected on (``--stub-detect-ns-per-px``) and per chip embedded
+(``--stub-embed-ms``). ``--yunet-model``/``--dlib-model`` switch either
+to the real model (dlib must then be installed). When the real detector
+finds no face in an image, a centred synthetic face stands in for the
+stages after it, and the JSON says so.
+
+``--output`` writes every cell as JSON, with the host and commit it ran
+on. ``--compare`` prints each cell's p50/p95 against an earlier run's
+file, so a regression between commits is one command.
+"""
+
+from __future__ import annotations
+
+import os
+
+# One OpenCV/BLAS thread per call, so the --concurrency threads are the
+# only source of parallelism. Set before numpy/cv2 load.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Allows `python scripts/benchmarks/face_pipeline.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.modules.face_recognition.alignment import align_face
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    CandidateEmbedding,
+    DetectedFace,
+    EmbeddingVector,
+    FacialLandmark,
+    NormalizedFaceInput,
+)
+from app.modules.face_recognition.image_codec import ImageFrame, pil_image_to_frame
+from app.modules.face_recognition.provider_pool import (
+    InstancePool,
+    PooledFaceDetector,
+    PooledFaceEmbedder,
+)
+from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
+from app.modules.face_recognition.providers.similarity_matcher import (
+    CandidateGallery,
+    CosineSimilarityFaceMatcher,
+    VectorizedCosineSimilarityFaceMatcher,
+)
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+
+SCHEMA_VERSION = 1
+
+_SIZES = ("640x480", "1280x960", "1920x1440")
+_ROSTERS = (40, 200, 1000, 5000)
+_CONCURRENCY = (1, 2, 4)
+_ENGINES = ("python", "vectorized")
+_DIMENSION = 128
+_SCRATCH = np.random.default_rng(0).integers(0, 256, size=(256, 256), dtype=np.uint8)
+
+
+def _native_work(milliseconds: float) -> None:
+    """Burn ``milliseconds`` of this thread's CPU inside OpenCV (GIL released)."""
+    deadline = time.thread_time() + milliseconds / 1000.0
+    while time.thread_time() < deadline:
+        cv2.GaussianBlur(_SCRATCH, (9, 9), 0)
+
+
+def _centred_face_row(width: int, height: int) -> list[float]:
+    cx, cy, side = width / 2, height / 2, min(width, height) / 3
+    row = [cx - side / 2, cy - side / 2, side, side]
+    row += [cx - side / 5, cy - side / 8, cx + side / 5, cy - side / 8, cx, cy]
+    row += [cx - side / 6, cy + side / 5, cx + side / 6, cy + side / 5, 0.99]
+    return row
+
+
+class _StandInYuNetModel:
+    """Costs ``ns_per_px`` per input pixel; reports one centred face."""
+
+    def __init__(self, ns_per_px: float) -> None:
+        self._ns_per_px = ns_per_px
+        self._size = (320, 320)
+
+    def setInputSize(self, size: tuple[int, int]) -> None:
+        self._size = size
+
+    def detect(self, bgr: np.ndarray) -> tuple[int, np.ndarray]:
+        width, height = self._size
+        _native_work(width * height * self._ns_per_px / 1e6)
+        return 1, np.array([_centred_face_row(width, height)], dtype=np.float32)
+
+
+class _StandInDlibModel:
+    """Costs ``cost_ms`` per chip; a descriptor derived from the chip's pixels."""
+
+    def __init__(self, cost_ms: float) -> None:
+        self._cost_ms = cost_ms
+
+    def compute_face_descriptor(self, image: object, *, num_jitters: int) -> object:
+        if isinstance(image, list):
+            return [self.compute_face_descriptor(chip, num_jitters=num_jitters) for chip in image]
+        _native_work(self._cost_ms)
+        chip = np.asarray(image, dtype=np.float64)
+        seed = int(chip[::16, ::16].sum()) % (2**32)
+        return np.random.default_rng(seed).standard_normal(_DIMENSION)
+
+
+class _StubDetector(YuNetFaceDetector):
+    """The real adapter around ``_StandInYuNetModel``."""
+
+    stub_ns_per_px = 40.0
+
+    def _ensure_loaded(self) -> cv2.FaceDetectorYN:
+        if self._detector is None:
+            self._detector = _StandInYuNetModel(self.stub_ns_per_px)  # type: ignore[assignment]
+            self._loaded_input_size = (320, 320)
+        return self._detector  # type: ignore[return-value]
+
+
+class _StubEmbedder(DlibResnetFaceEmbedder):
+    """The real adapter around ``_StandInDlibModel``."""
+
+    stub_cost_ms = 25.0
+
+    def _ensure_loaded(self) -> _StandInDlibModel:  # type: ignore[override]
+        if self._model is None:
+            self._model = _StandInDlibModel(self.stub_cost_ms)  # type: ignore[assignment]
+        return self._model  # type: ignore[return-value]
+
+
+@dataclass(frozen=True)
+class CellResult:
+    stage: str
+    image_size: str | None
+    roster_size: int | None
+    engine: str | None
+    concurrency: int
+    calls: int
+    wall_seconds: float
+    throughput_per_s: float
+    latency_ms: dict[str, float]
+    synthetic_face: bool = False
+
+    def cell_key(self) -> tuple[object, ...]:
+        return (self.stage, self.image_size, self.roster_size, self.engine, self.concurrency)
+
+
+def _measure(
+    call: Callable[[], object], *, iterations: int, concurrency: int
+) -> tuple[float, list[float]]:
+    """Run ``call`` ``iterations`` times on ``concurrency`` threads; wall
+    seconds and every call's latency in milliseconds."""
+    call()
+    latencies: list[float] = []
+    guard = threading.Lock()
+    counts = [
+        iterations // concurrency + (1 if i < iterations % concurrency else 0)
+        for i in range(concurrency)
+    ]
+
+    def worker(count: int) -> None:
+        local = []
+        for _ in range(count):
+            started = time.perf_counter()
+            call()
+            local.append((time.perf_counter() - started) * 1000.0)
+        with guard:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker, count) for count in counts if count]:
+            future.result()
+    return time.perf_counter() - started, latencies
+
+
+def _summarize(latencies: list[float]) -> dict[str, float]:
+    values = np.asarray(latencies)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+
+def _jpeg(width: int, height: int, *, seed: int, source: Path | None) -> bytes:
+    if source is not None:
+        with Image.open(source) as photo:
+            image = photo.convert("RGB").resize((width, height), Image.Resampling.LANCZOS)
+    else:
+        # Smooth noise: compresses and decodes like a photo, not like flat colour.
+        small = np.random.default_rng(seed).integers(0, 256, size=(height // 40, width // 40, 3))
+        image = Image.fromarray(small.astype(np.uint8)).resize(
+            (width, height), Image.Resampling.BILINEAR
+        )
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _decode(data: bytes) -> ImageFrame:
+    with Image.open(BytesIO(data)) as image:
+        return pil_image_to_frame(image)
+
+
+def _synthetic_face(frame: ImageFrame) -> DetectedFace:
+    row = _centred_face_row(frame.dimensions.width_px, frame.dimensions.height_px)
+    return DetectedFace(
+        bounding_box=BoundingBox(
+            x_px=int(row[0]), y_px=int(row[1]), width_px=int(row[2]), height_px=int(row[3])
+        ),
+        source_image_dimensions=frame.dimensions,
+        confidence=row[14],
+        landmarks=tuple(FacialLandmark(x_px=row[i], y_px=row[i + 1]) for i in range(4, 14, 2)),
+    )
+
+
+def _unit(rng: np.random.Generator) -> EmbeddingVector:
+    vector = rng.standard_normal(_DIMENSION)
+    return EmbeddingVector(values=tuple(float(v) for v in vector / np.linalg.norm(vector)))
+
+
+def _roster(size: int, *, seed: int) -> list[CandidateEmbedding]:
+    rng = np.random.default_rng(seed)
+    return [
+        CandidateEmbedding(student_profile_id=uuid.uuid4(), embedding=_unit(rng))
+        for _ in range(size)
+    ]
+
+
+class _Suite:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.settings = Settings.model_construct(
+            FACE_EMBEDDING_DIMENSION=_DIMENSION,
+            FACE_DETECTOR_INPUT_SIZE_PX=320,
+            FACE_DETECTOR_MODEL_PATH=str(args.yunet_model) if args.yunet_model else None,
+            FACE_DETECTOR_MODEL_SHA256=None,
+            FACE_EMBEDDER_MODEL_PATH=str(args.dlib_model) if args.dlib_model else None,
+            FACE_EMBEDDER_MODEL_SHA256=None,
+            FACE_MATCH_THRESHOLD=0.82,
+            FACE_MATCH_AMBIGUOUS_MARGIN=0.05,
+        )
+        _StubDetector.stub_ns_per_px = args.stub_detect_ns_per_px
+        _StubEmbedder.stub_cost_ms = args.stub_embed_ms
+        self.detector_class = YuNetFaceDetector if args.yunet_model else _StubDetector
+        self.embedder_class = DlibResnetFaceEmbedder if args.dlib_model else _StubEmbedder
+        self.results: list[CellResult] = []
+
+    def providers(self, concurrency: int) -> tuple[PooledFaceDetector, PooledFaceEmbedder]:
+        detector_class, embedder_class, settings = (
+            self.detector_class,
+            self.embedder_class,
+            self.settings,
+        )
+        return (
+            PooledFaceDetector(InstancePool(lambda: detector_class(settings), size=concurrency)),
+            PooledFaceEmbedder(InstancePool(lambda: embedder_class(settings), size=concurrency)),
+        )
+
+    def record(
+        self,
+        stage: str,
+        call: Callable[[], object],
+        *,
+        concurrency: int,
+        image_size: str | None = None,
+        roster_size: int | None = None,
+        engine: str | None = None,
+        synthetic_face: bool = False,
+    ) -> None:
+        wall, latencies = _measure(call, iterations=self.args.iterations, concurrency=concurrency)
+        result = CellResult(
+            stage=stage,
+            image_size=image_size,
+            roster_size=roster_size,
+            engine=engine,
+            concurrency=concurrency,
+            calls=len(latencies),
+            wall_seconds=wall,
+            throughput_per_s=len(latencies) / wall,
+            latency_ms=_summarize(latencies),
+            synthetic_face=synthetic_face,
+        )
+        self.results.append(result)
+        _print_row(result)
+
+    def run(self) -> None:
+        args = self.args
+        python_matcher = CosineSimilarityFaceMatcher(self.settings)
+        vectorized = VectorizedCosineSimilarityFaceMatcher(self.settings)
+        rosters = {size: _roster(size, seed=args.seed + size) for size in args.rosters}
+        galleries = {size: CandidateGallery.from_candidates(r) for size, r in rosters.items()}
+        pipeline_roster_size = min(rosters)
+
+        for concurrency in args.concurrency:
+            detector, embedder = self.providers(concurrency)
+            chip: NormalizedFaceInput | None = None
+            for size in args.sizes:
+                width, height = (int(part) for part in size.split("x"))
+                data = _jpeg(width, height, seed=args.seed, source=args.image)
+                frame = _decode(data)
+                faces = detector.detect(frame)
+                synthetic = not faces
+                face = faces[0] if faces else _synthetic_face(frame)
+                chip = align_face(frame, face)
+                labels: dict[str, Any] = {"concurrency": concurrency, "image_size": size}
+
+                self.record("decode", partial(_decode, data), **labels)
+                self.record("detect", partial(detector.detect, frame), **labels)
+                self.record(
+                    "align", partial(align_face, frame, face), synthetic_face=synthetic, **labels
+                )
+                self.record(
+                    "pipeline",
+                    partial(
+                        _probe,
+                        data,
+                        detector=detector,
+                        embedder=embedder,
+                        matcher=vectorized,
+                        gallery=galleries[pipeline_roster_size],
+                    ),
+                    synthetic_face=synthetic,
+                    roster_size=pipeline_roster_size,
+                    engine="vectorized",
+                    **labels,
+                )
+
+            assert chip is not None
+            self.record("embed", partial(embedder.embed, chip), concurrency=concurrency)
+            probe_embedding = embedder.embed(chip)
+            for roster_size in args.rosters:
+                for engine in args.engines:
+                    call: Callable[[], object] = (
+                        partial(python_matcher.match, probe_embedding, rosters[roster_size])
+                        if engine == "python"
+                        else partial(
+                            vectorized.match_gallery, probe_embedding, galleries[roster_size]
+                        )
+                    )
+                    self.record(
+                        "match",
+                        call,
+                        concurrency=concurrency,
+                        roster_size=roster_size,
+                        engine=engine,
+                    )
+
+
+def _probe(
+    data: bytes,
+    *,
+    detector: PooledFaceDetector,
+    embedder: PooledFaceEmbedder,
+    matcher: VectorizedCosineSimilarityFaceMatcher,
+    gallery: CandidateGallery,
+) -> object:
+    """One match probe end to end: decode, detect, align, embed, match."""
+    frame = _decode(data)
+    faces = detector.detect(frame)
+    chip = align_face(frame, faces[0] if faces else _synthetic_face(frame))
+    return matcher.match_gallery(embedder.embed(chip), gallery)
+
+
+def _label(result: CellResult) -> str:
+    parts = [result.image_size or "", f"n={result.roster_size}" if result.roster_size else ""]
+    if result.engine and result.stage == "match":
+        parts.append(result.engine)
+    return " ".join(part for part in parts if part)
+
+
+_HEADER = (
+    f"{'stage':>9} {'cell':>24} {'conc':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+    f"{'calls/s':>9}"
+)
+
+
+def _print_row(result: CellResult) -> None:
+    latency = result.latency_ms
+    note = "  (synthetic face)" if result.synthetic_face else ""
+    print(
+        f"{result.stage:>9} {_label(result):>24} {result.concurrency:>5} "
+        f"{latency['p50']:>9.2f} {latency['p95']:>9.2f} {latency['p99']:>9.2f} "
+        f"{result.throughput_per_s:>9.1f}{note}",
+        flush=True,
+    )
+
+
+def _git_commit() -> str | None:
+    completed = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return completed.stdout.strip() or None
+
+
+def _report(suite: _Suite) -> dict[str, Any]:
+    args = suite.args
+    return {
+        "benchmark": "face_pipeline",
+        "schema_version": SCHEMA_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": {
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+        },
+        "config": {
+            "detector": f"yunet:{args.yunet_model.name}" if args.yunet_model else "stub",
+            "embedder": f"dlib:{args.dlib_model.name}" if args.dlib_model else "stub",
+            "stub_detect_ns_per_px": args.stub_detect_ns_per_px,
+            "stub_embed_ms": args.stub_embed_ms,
+            "image": args.image.name if args.image else None,
+            "sizes": args.sizes,
+            "rosters": args.rosters,
+            "engines": args.engines,
+            "concurrency": args.concurrency,
+            "iterations": args.iterations,
+            "seed": args.seed,
+        },
+        "results": [asdict(result) for result in suite.results],
+    }
+
+
+def _compare(results: list[CellResult], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    earlier: dict[tuple[object, ...], dict[str, Any]] = {
+        (r["stage"], r["image_size"], r["roster_size"], r["engine"], r["concurrency"]): r
+        for r in baseline["results"]
+    }
+    print(f"\nvs {baseline_path} (commit {baseline['environment'].get('git_commit')}):")
+    header = (
+        f"{'stage':>9} {'cell':>24} {'conc':>5} {'p50 was':>9} {'p50 now':>9} {'p50 x':>7} "
+        f"{'p95 x':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        before = earlier.get(result.cell_key())
+        if before is None:
+            continue
+        was, now = before["latency_ms"], result.latency_ms
+        print(
+            f"{result.stage:>9} {_label(result):>24} {result.concurrency:>5} "
+            f"{was['p50']:>9.2f} {now['p50']:>9.2f} {now['p50'] / was['p50']:>6.2f}x "
+            f"{now['p95'] / was['p95']:>6.2f}x"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=list(_SIZES))
+    parser.add_argument("--rosters", type=int, nargs="+", default=list(_ROSTERS))
+    parser.add_argument("--engines", nargs="+", choices=_ENGINES, default=list(_ENGINES))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(_CONCURRENCY))
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--image", type=Path, default=None)
+    parser.add_argument("--yunet-model", type=Path, default=None)
+    parser.add_argument("--dlib-model", type=Path, default=None)
+    parser.add_argument("--stub-detect-ns-per-px", type=float, default=40.0)
+    parser.add_argument("--stub-embed-ms", type=float, default=25.0)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    suite = _Suite(args)
+    print(
+        f"detector {'YuNet' if args.yunet_model else 'stub'}, "
+        f"embedder {'dlib' if args.dlib_model else 'stub'}; "
+        f"{args.iterations} calls per cell, {os.cpu_count()} CPUs"
+    )
+    print(_HEADER)
+    print("-" * len(_HEADER))
+    suite.run()
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(_report(suite), indent=2) + "\n")
+        print(f"\nwrote {args.output}")
+    if args.compare is not None:
+        _compare(suite.results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+"""Memory/latency benchmark: peak RSS and time per image through the face pipeline.
+
+For each mode and input size, runs ``--repeat`` images through one real
+entry point in a fresh child process and reports the median latency and
+the peak resident set size the pipeline added on top of the process's
+baseline (interpreter, imports and the encoded input):
+
+- ``probe``: ``decode_validated_probe_image`` then
+  ``pipeline.detect_align_embed`` — the ``/match-probe`` path.
+- ``sample``: ``processing_pool.decode_sample_file`` then
+  ``pipeline.detect_align_embed`` — enrollment sample processing.
+- ``group``: ``decode_validated_probe_image`` then
+  ``pipeline.detect_align_embed_all`` — tiled group-photo detection.
+
+Usage (from ``backend_v2``):
+
+    python -m scripts.benchmarks.frame_memory
+    python -m scripts.benchmarks.frame_memory --modes probe --sizes 4000x3000 --repeat 10
+
+No model files are needed. The real ``YuNetFaceDetector`` and
+``DlibResnetFaceEmbedder`` adapters run, so every pixel conversion and
+copy they make is measured; only their native models are replaced by
+stand-ins that read every pixel they are given (YuNet) or each chip
+(dlib) and return one centred face / a fixed descriptor.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterable
+from io import BytesIO
+from pathlib import Path
+from typing import cast
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Allows `python scripts/benchmarks/frame_memory.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.modules.face_recognition import pipeline
+from app.modules.face_recognition.match_probe_validation import decode_validated_probe_image
+from app.modules.face_recognition.processing_pool import decode_sample_file
+from app.modules.face_recognition.provider_factory import install_providers
+from app.modules.face_recognition.provider_pool import (
+    InstancePool,
+    PooledFaceDetector,
+    PooledFaceEmbedder,
+)
+from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+
+_MODES = ("probe", "sample", "group")
+_SIZES = ("640x480", "1920x1440", "4000x3000")
+
+
+class _StandInYuNetModel:
+    """Reads every pixel of the BGR array it is given; reports one centred face."""
+
+    def __init__(self) -> None:
+        self._size = (320, 320)
+
+    def setInputSize(self, size: tuple[int, int]) -> None:
+        self._size = size
+
+    def detect(self, bgr: np.ndarray) -> tuple[int, np.ndarray]:
+        if bgr.shape[1::-1] != self._size:
+            raise cv2.error("input size mismatch")
+        cv2.mean(bgr)
+        width, height = self._size
+        cx, cy, side = width / 2, height / 2, min(width, height) / 3
+        row = [cx - side / 2, cy - side / 2, side, side]
+        row += [cx - side / 5, cy - side / 8, cx + side / 5, cy - side / 8, cx, cy]
+        row += [cx - side / 6, cy + side / 5, cx + side / 6, cy + side / 5, 0.99]
+        return 1, np.array([row], dtype=np.float32)
+
+
+class _StandInDlibModel:
+    """One fixed 128-d descriptor per chip, after reading the chip."""
+
+    _DESCRIPTOR = np.linspace(0.1, 1.0, 128)
+
+    def compute_face_descriptor(self, image: object, *, num_jitters: int) -> Iterable[object]:
+        if isinstance(image, list):
+            return [self.compute_face_descriptor(chip, num_jitters=num_jitters) for chip in image]
+        cv2.mean(np.asarray(image))
+        return self._DESCRIPTOR
+
+
+class _Detector(YuNetFaceDetector):
+    def _ensure_loaded(self) -> cv2.FaceDetectorYN:
+        if self._detector is None:
+            # The adapter only calls ``setInputSize`` and ``detect``.
+            self._detector = cast(cv2.FaceDetectorYN, _StandInYuNetModel())
+            self._loaded_input_size = (320, 320)
+        return self._detector
+
+
+class _Embedder(DlibResnetFaceEmbedder):
+    _stand_in = _StandInDlibModel()
+
+    def _ensure_loaded(self) -> _StandInDlibModel:
+        return self._stand_in
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    # Smooth noise: compresses and decodes like a photo, not like flat colour.
+    small = np.random.default_rng(0).integers(0, 256, size=(height // 40, width // 40, 3))
+    image = Image.fromarray(small.astype(np.uint8)).resize(
+        (width, height), Image.Resampling.BILINEAR
+    )
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _child(mode: str, size: str, repeat: int) -> dict[str, float]:
+    width, height = (int(part) for part in size.split("x"))
+    settings = Settings.model_construct(
+        FACE_EMBEDDING_DIMENSION=128,
+        FACE_DETECTOR_INPUT_SIZE_PX=320,
+        FACE_DETECTOR_WORKING_SIZE_FACTOR=0,
+        FACE_GROUP_TILE_SIZE_PX=1280,
+        FACE_GROUP_MAX_FACES=200,
+        MAX_ENROLLMENT_IMAGE_PIXELS=40_000_000,
+        MAX_ENROLLMENT_IMAGE_DIMENSION_PX=10_000,
+    )
+    install_providers(
+        settings,
+        detector=PooledFaceDetector(InstancePool(lambda: _Detector(settings), size=1)),
+        embedder=PooledFaceEmbedder(InstancePool(lambda: _Embedder(settings), size=1)),
+    )
+
+    data = _jpeg(width, height)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "sample.jpg"
+        path.write_bytes(data)
+
+        def run() -> None:
+            if mode == "sample":
+                pipeline.detect_align_embed(decode_sample_file(path), settings=settings)
+                return
+            image = decode_validated_probe_image(
+                data, settings=settings, declared_content_type="image/jpeg"
+            )
+            if mode == "probe":
+                pipeline.detect_align_embed(image, settings=settings)
+            else:
+                pipeline.detect_align_embed_all(image, settings=settings)
+
+        baseline = _peak_rss_mib()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000.0)
+        return {
+            "latency_ms": statistics.median(timings),
+            "peak_rss_mib": _peak_rss_mib(),
+            "added_rss_mib": _peak_rss_mib() - baseline,
+        }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", choices=_MODES, default=list(_MODES))
+    parser.add_argument("--sizes", nargs="+", default=list(_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    modes: list[str] = args.modes
+    sizes: list[str] = args.sizes
+    repeat: int = args.repeat
+    child: list[str] | None = args.child
+
+    if child is not None:
+        child_mode, child_size = child
+        print(json.dumps(_child(child_mode, child_size, repeat=repeat)))
+        return 0
+
+    header = f"{'mode':>7} {'input':>11} {'median ms':>10} {'peak RSS MiB':>13} {'added MiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for mode in modes:
+        for size in sizes:
+            # A fresh process per cell: ru_maxrss only ever grows.
+            completed = subprocess.run(
+                [sys.executable, __file__, "--child", mode, size, "--repeat", str(repeat)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(
+                f"{mode:>7} {size:>11} {result['latency_ms']:>10.1f} "
+                f"{result['peak_rss_mib']:>13.1f} {result['added_rss_mib']:>10.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,228 @@
+"""Concurrency benchmark: match-probe inference throughput by provider pool size.
+
+Fires ``--requests`` probes, ``--concurrency`` at a time, through
+``router._validate_and_embed_probe_sync`` — exactly what ``/match-probe``
+offloads with ``asyncio.to_thread`` — once per pool size in ``--pool-sizes``
+(``FACE_PROVIDER_POOL_SIZE``). For each size it prints throughput,
+p50/p95 request latency, and the detector pool's wait statistics. Pool
+size 1 is the old one-instance-per-process behavior.
+
+Usage (from ``backend_v2``):
+
+    python -m scripts.benchmarks.match_probe_concurrency
+    python -m scripts.benchmarks.match_probe_concurrency --concurrency 16 --pool-sizes 1 4 8
+
+No model files, database, or HTTP server are needed. Upload validation
+and decoding are real. Stand-in providers replace YuNet and dlib; like
+the real adapters, each instance holds a lock while it works and does
+its work in native OpenCV code that releases the GIL, for ``--detect-ms``
+/ ``--embed-ms`` of thread CPU time. Speedup over pool size 1 is
+therefore bounded by the host's free cores, as it would be in production.
+"""
+
+from __future__ import annotations
+
+import os
+
+# One OpenCV/BLAS thread per call, so pool size is the only source of
+# parallelism being measured. Set before numpy/cv2 load.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+import argparse
+import asyncio
+import hashlib
+import statistics
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Allows `python scripts/benchmarks/match_probe_concurrency.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DecodedImage,
+    DetectedFace,
+    EmbeddingVector,
+    FacialLandmark,
+    NormalizedFaceInput,
+)
+from app.modules.face_recognition.errors import FaceRecognitionError
+from app.modules.face_recognition.image_codec import ImageFrame
+from app.modules.face_recognition.provider_factory import get_detector, install_providers
+from app.modules.face_recognition.provider_pool import (
+    InstancePool,
+    PooledFaceDetector,
+    PooledFaceEmbedder,
+)
+from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+from app.modules.face_recognition.router import _validate_and_embed_probe_sync
+
+_DIMENSION = 128
+_SCRATCH = np.random.default_rng(0).integers(0, 256, size=(256, 256), dtype=np.uint8)
+
+
+def _native_work(milliseconds: float) -> None:
+    """Burn ``milliseconds`` of this thread's CPU inside OpenCV (GIL released)."""
+    deadline = time.thread_time() + milliseconds / 1000.0
+    while time.thread_time() < deadline:
+        cv2.GaussianBlur(_SCRATCH, (9, 9), 0)
+
+
+class _StubDetector(YuNetFaceDetector):
+    """One upright face in the middle of every image."""
+
+    provider_name = "benchmark_stub_detector"
+
+    def __init__(self, settings: Settings, cost_ms: float) -> None:
+        super().__init__(settings)
+        self._cost_ms = cost_ms
+
+    def detect(self, image: ImageFrame | DecodedImage) -> list[DetectedFace]:
+        with self._lock:
+            _native_work(self._cost_ms)
+        width, height = image.dimensions.width_px, image.dimensions.height_px
+        cx, cy = width / 2, height / 2
+        return [
+            DetectedFace(
+                bounding_box=BoundingBox(
+                    x_px=int(cx - 80), y_px=int(cy - 100), width_px=160, height_px=200
+                ),
+                source_image_dimensions=image.dimensions,
+                confidence=0.99,
+                landmarks=(
+                    FacialLandmark(x_px=cx - 35, y_px=cy - 20),
+                    FacialLandmark(x_px=cx + 35, y_px=cy - 20),
+                    FacialLandmark(x_px=cx, y_px=cy + 10),
+                    FacialLandmark(x_px=cx - 28, y_px=cy + 50),
+                    FacialLandmark(x_px=cx + 28, y_px=cy + 50),
+                ),
+            )
+        ]
+
+
+class _StubEmbedder(DlibResnetFaceEmbedder):
+    """A deterministic unit vector per chip, seeded by its pixels."""
+
+    provider_name = "benchmark_stub_embedder"
+    model_identifier = "benchmark_stub_embedder"
+
+    def __init__(self, settings: Settings, cost_ms: float) -> None:
+        super().__init__(settings)
+        self._cost_ms = cost_ms
+
+    def embed(self, face: NormalizedFaceInput) -> EmbeddingVector:
+        with self._lock:
+            _native_work(self._cost_ms)
+        seed = int.from_bytes(hashlib.sha256(face.pixel_data).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(_DIMENSION)
+        return EmbeddingVector(values=tuple(float(v) for v in vector / np.linalg.norm(vector)))
+
+    def embed_many(
+        self, faces: Sequence[NormalizedFaceInput]
+    ) -> list[EmbeddingVector | FaceRecognitionError]:
+        return [self.embed(face) for face in faces]
+
+
+def _probe_jpeg(*, seed: int) -> bytes:
+    small = np.random.default_rng(seed).integers(0, 256, size=(60, 80, 3), dtype=np.uint8)
+    image = Image.fromarray(small).resize((640, 480), Image.Resampling.BILINEAR)
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+async def _fire(
+    data: bytes, *, settings: Settings, requests: int, concurrency: int
+) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    # ``asyncio.to_thread``'s default executor has only ``cpu_count + 4``
+    # threads, which would cap concurrency on a small host.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await asyncio.to_thread(
+                _validate_and_embed_probe_sync,
+                data,
+                settings=settings,
+                declared_content_type="image/jpeg",
+            )
+            latencies.append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started, latencies
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--pool-sizes", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1})
+    )
+    parser.add_argument("--detect-ms", type=float, default=15.0)
+    parser.add_argument("--embed-ms", type=float, default=35.0)
+    args = parser.parse_args(argv)
+    requests: int = args.requests
+    concurrency: int = args.concurrency
+    pool_sizes: list[int] = args.pool_sizes
+    detect_ms: float = args.detect_ms
+    embed_ms: float = args.embed_ms
+
+    settings = Settings.model_construct(FACE_EMBEDDING_DIMENSION=_DIMENSION)
+    data = _probe_jpeg(seed=0)
+    print(
+        f"{requests} probes, {concurrency} concurrent, {os.cpu_count()} CPUs; "
+        f"stub cost {detect_ms:g} ms detect + {embed_ms:g} ms embed"
+    )
+    header = (
+        f"{'pool':>5} {'total s':>8} {'probes/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'waited':>7} {'max wait ms':>12} {'speedup':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    baseline: float | None = None
+    for size in pool_sizes:
+        install_providers(
+            settings,
+            detector=PooledFaceDetector(
+                InstancePool(lambda: _StubDetector(settings, detect_ms), size=size)
+            ),
+            embedder=PooledFaceEmbedder(
+                InstancePool(lambda: _StubEmbedder(settings, embed_ms), size=size)
+            ),
+        )
+
+        seconds, latencies = asyncio.run(
+            _fire(data, settings=settings, requests=requests, concurrency=concurrency)
+        )
+        throughput = requests / seconds
+        baseline = baseline or throughput
+        quantiles = statistics.quantiles(latencies, n=20)
+        stats = get_detector(settings).pool.stats()
+        print(
+            f"{size:>5} {seconds:>8.2f} {throughput:>9.1f} {statistics.median(latencies):>8.1f} "
+            f"{quantiles[18]:>8.1f} {stats.waited_checkouts:>7} "
+            f"{stats.max_wait_seconds * 1000.0:>12.1f} {throughput / baseline:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+"""Micro-benchmark: reference vs vectorized ``FaceMatcher`` engines.
+
+Scores one probe against a synthetic roster with both
+``CosineSimilarityFaceMatcher`` (per-candidate Python loop) and
+``VectorizedCosineSimilarityFaceMatcher`` (packed float32 gallery), for
+roster sizes from one classroom up to a whole school, and checks that
+both engines returned the same decision for every probe.
+
+Usage (from ``backend_v2``):
+
+    python -m scripts.benchmarks.matcher
+    python -m scripts.benchmarks.matcher --rosters 40 5000 --samples-per-student 5
+
+"vectorized (prebuilt)" times ``match_gallery`` against an already-packed
+``CandidateGallery``, i.e. the cost once a caller reuses the packed roster
+across probes; "vectorized" includes packing the candidates on every call.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+# Allows `python scripts/benchmarks/matcher.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.modules.face_recognition.domain import CandidateEmbedding, EmbeddingVector, MatchResult
+from app.modules.face_recognition.providers.similarity_matcher import (
+    CandidateGallery,
+    CosineSimilarityFaceMatcher,
+    VectorizedCosineSimilarityFaceMatcher,
+)
+
+_DEFAULT_ROSTERS = (40, 60, 200, 1000, 5000)
+_DIMENSION = 128
+
+
+def _unit(rng: np.random.Generator) -> np.ndarray:
+    vector = rng.standard_normal(_DIMENSION)
+    return vector / np.linalg.norm(vector)
+
+
+def _roster(
+    rng: np.random.Generator, *, students: int, samples_per_student: int
+) -> tuple[list[EmbeddingVector], list[CandidateEmbedding]]:
+    candidates: list[CandidateEmbedding] = []
+    probes: list[EmbeddingVector] = []
+    for index in range(students):
+        student_id = uuid.uuid4()
+        identity = _unit(rng)
+        for _ in range(samples_per_student):
+            sample = identity + rng.normal(scale=0.05, size=_DIMENSION)
+            candidates.append(
+                CandidateEmbedding(
+                    student_profile_id=student_id,
+                    embedding=EmbeddingVector(values=tuple(float(v) for v in sample)),
+                )
+            )
+        if index < 8:
+            probe = identity + rng.normal(scale=0.05, size=_DIMENSION)
+            probes.append(EmbeddingVector(values=tuple(float(v) for v in probe)))
+    return probes, candidates
+
+
+def _time_ms(call: Callable[[], MatchResult], *, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def _same_decision(left: MatchResult, right: MatchResult) -> bool:
+    def ids(result: MatchResult) -> tuple[object, ...]:
+        return (
+            result.status,
+            result.matched_student_profile_id,
+            result.best_candidate.student_profile_id if result.best_candidate else None,
+            result.runner_up_candidate.student_profile_id if result.runner_up_candidate else None,
+        )
+
+    return ids(left) == ids(right)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rosters", type=int, nargs="+", default=list(_DEFAULT_ROSTERS))
+    parser.add_argument("--samples-per-student", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    settings = Settings.model_construct(FACE_MATCH_THRESHOLD=0.82, FACE_MATCH_AMBIGUOUS_MARGIN=0.05)
+    reference = CosineSimilarityFaceMatcher(settings)
+    vectorized = VectorizedCosineSimilarityFaceMatcher(settings)
+    rng = np.random.default_rng(args.seed)
+
+    header = (
+        f"{'students':>8} {'rows':>7} {'python ms':>10} {'vectorized ms':>14} "
+        f"{'prebuilt ms':>12} {'speedup':>8} {'decisions':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    mismatches = 0
+    for students in args.rosters:
+        probes, candidates = _roster(
+            rng, students=students, samples_per_student=args.samples_per_student
+        )
+        gallery = CandidateGallery.from_candidates(candidates)
+        agree = all(
+            _same_decision(reference.match(probe, candidates), vectorized.match(probe, candidates))
+            for probe in probes
+        )
+        mismatches += 0 if agree else 1
+        probe = probes[0]
+        python_ms = _time_ms(partial(reference.match, probe, candidates), repeats=args.repeats)
+        vectorized_ms = _time_ms(partial(vectorized.match, probe, candidates), repeats=args.repeats)
+        prebuilt_ms = _time_ms(
+            partial(vectorized.match_gallery, probe, gallery), repeats=args.repeats
+        )
+        print(
+            f"{students:>8} {len(candidates):>7} {python_ms:>10.3f} {vectorized_ms:>14.3f} "
+            f"{prebuilt_ms:>12.3f} {python_ms / prebuilt_ms:>7.1f}x "
+            f"{'same' if agree else 'DIFFER':>10}"
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+r"""Cold-start benchmark: model-artifact checksum verification per worker boot.
+
+Each "boot" verifies every model file once, as a freshly started API or
+processing worker does when its providers first load. Three modes:
+
+- ``read-loop``: the original chunked ``read()`` loop, hashing on every boot.
+- ``mmap``: ``model_artifacts.compute_sha256`` (memory-mapped), every boot.
+- ``cached``: ``model_artifacts.verify_model_artifact`` with the in-process
+  cache cleared before each boot, as in a new process: the first boot
+  hashes and writes the sidecar, later ones read it.
+
+Usage (from ``backend_v2``):
+
+    python -m scripts.benchmarks.model_verification
+    python -m scripts.benchmarks.model_verification --boots 16 --embedder-mb 22
+    python -m scripts.benchmarks.model_verification --model /path/to/yunet.onnx \
+        --model /path/to/dlib.dat
+
+Without ``--model``, synthetic files the size of the YuNet and dlib models
+are written to a temporary directory (and removed afterwards). With it,
+the sidecars written next to the real models are left in place, as the
+API would leave them. Newly written files are too fresh to cache (see
+``model_artifacts``' "racily clean" note), so the benchmark waits that
+window out before the first boot. The page cache is warm throughout, so
+the hashing numbers are the CPU cost; a cold disk adds read time to
+every mode except a cached boot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# Allows `python scripts/benchmarks/model_verification.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.modules.face_recognition import model_artifacts
+
+_CHUNK = 1024 * 1024
+
+
+def _read_loop_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _boots(
+    verify: Callable[[Path, str], None], models: dict[Path, str], *, boots: int
+) -> list[float]:
+    timings = []
+    for _ in range(boots):
+        model_artifacts.reset_checksum_cache()
+        started = time.perf_counter()
+        for path, expected in models.items():
+            verify(path, expected)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return timings
+
+
+def _check(actual: str, expected: str) -> None:
+    if actual != expected:
+        raise SystemExit("checksum mismatch — benchmark files changed underneath it")
+
+
+def _write_models(directory: Path, sizes_mb: list[float]) -> list[Path]:
+    paths = []
+    for index, size_mb in enumerate(sizes_mb):
+        path = directory / f"model-{index}.bin"
+        with path.open("wb") as handle:
+            remaining = int(size_mb * 1024 * 1024)
+            block = hashlib.sha256(str(index).encode()).digest() * (_CHUNK // 32)
+            while remaining > 0:
+                handle.write(block[:remaining])
+                remaining -= len(block)
+        paths.append(path)
+    return paths
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boots", type=int, default=8)
+    parser.add_argument("--model", type=Path, action="append", default=[])
+    parser.add_argument("--detector-mb", type=float, default=0.23)
+    parser.add_argument("--embedder-mb", type=float, default=21.4)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = args.model or _write_models(Path(scratch), [args.detector_mb, args.embedder_mb])
+        if not args.model:
+            time.sleep(model_artifacts._RACY_WINDOW_NS / 1e9 + 0.1)
+        models = {path: _read_loop_sha256(path) for path in paths}
+        total_mb = sum(path.stat().st_size for path in paths) / (1024 * 1024)
+
+        modes: dict[str, Callable[[Path, str], None]] = {
+            "read-loop": lambda path, expected: _check(_read_loop_sha256(path), expected),
+            "mmap": lambda path, expected: _check(model_artifacts.compute_sha256(path), expected),
+            "cached": lambda path, expected: model_artifacts.verify_model_artifact(
+                path, expected_sha256=expected
+            ),
+        }
+        print(f"{len(models)} model files, {total_mb:.1f} MB, {args.boots} boots per mode")
+        header = f"{'mode':>10} {'first ms':>9} {'later p50 ms':>13} {'total ms':>9}"
+        print(header)
+        print("-" * len(header))
+        for name, verify in modes.items():
+            timings = _boots(verify, models, boots=args.boots)
+            later = statistics.median(timings[1:]) if len(timings) > 1 else float("nan")
+            print(f"{name:>10} {timings[0]:>9.2f} {later:>13.3f} {sum(timings):>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""Throughput benchmark: in-process vs process-pool enrollment-sample processing.
+
+Runs ``processing_pool.embed_sample_files`` (what
+``process_pending_batch`` does with ``FACE_PROCESSING_WORKERS=0``)
+and ``embed_sample_files_in_pool`` at several pool sizes over the same
+batch of synthetic JPEGs. It prints samples per second for each run and
+checks that every run produced the same embeddings.
+
+Usage (from ``backend_v2``):
+
+    python -m scripts.benchmarks.processing_pool
+    python -m scripts.benchmarks.processing_pool --samples 400 --workers 2 4 8 16
+
+No model files are needed. Stand-in providers replace YuNet and dlib and
+burn a fixed amount of CPU per call (``--detect-ms``, ``--embed-ms``,
+defaults in the range of the real models on one core). Like the real
+adapters, they hold the GIL while they work. Decoding, alignment,
+chunking and pickling are all real, so the numbers show how the
+orchestration scales with cores, not how fast either model is. Pool
+start-up (spawning workers, first provider construction) is timed
+separately from steady-state throughput, because the service keeps one
+pool alive across batches.
+"""
+
+from __future__ import annotations
+
+import os
+
+# One BLAS/OpenCV thread per process, so the pool sizes below are the
+# only source of parallelism being measured. Set before numpy loads;
+# spawned workers inherit the environment.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+import argparse
+import asyncio
+import hashlib
+import multiprocessing
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Allows `python scripts/benchmarks/processing_pool.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from app.core.config import Settings
+from app.modules.face_recognition import processing_pool
+from app.modules.face_recognition.domain import (
+    BoundingBox,
+    DecodedImage,
+    DetectedFace,
+    EmbeddingVector,
+    FacialLandmark,
+    NormalizedFaceInput,
+)
+from app.modules.face_recognition.errors import FaceRecognitionError
+from app.modules.face_recognition.image_codec import ImageFrame
+from app.modules.face_recognition.processing_pool import SampleOutcome
+from app.modules.face_recognition.provider_factory import install_providers
+from app.modules.face_recognition.provider_pool import (
+    InstancePool,
+    PooledFaceDetector,
+    PooledFaceEmbedder,
+)
+from app.modules.face_recognition.providers.dlib_embedder import DlibResnetFaceEmbedder
+from app.modules.face_recognition.providers.yunet_detector import YuNetFaceDetector
+
+_DIMENSION = 128
+_IMAGE_SIZE = (640, 480)
+
+
+def _spin(milliseconds: float) -> None:
+    deadline = time.process_time() + milliseconds / 1000.0
+    while time.process_time() < deadline:
+        pass
+
+
+class _StubDetector(YuNetFaceDetector):
+    """One upright face in the middle of every image, after ``cost_ms`` of CPU."""
+
+    provider_name = "benchmark_stub_detector"
+
+    def __init__(self, settings: Settings, cost_ms: float) -> None:
+        super().__init__(settings)
+        self._cost_ms = cost_ms
+
+    def detect(self, image: ImageFrame | DecodedImage) -> list[DetectedFace]:
+        _spin(self._cost_ms)
+        width, height = image.dimensions.width_px, image.dimensions.height_px
+        cx, cy = width / 2, height / 2
+        return [
+            DetectedFace(
+                bounding_box=BoundingBox(
+                    x_px=int(cx - 80), y_px=int(cy - 100), width_px=160, height_px=200
+                ),
+                source_image_dimensions=image.dimensions,
+                confidence=0.99,
+                landmarks=(
+                    FacialLandmark(x_px=cx - 35, y_px=cy - 20),
+                    FacialLandmark(x_px=cx + 35, y_px=cy - 20),
+                    FacialLandmark(x_px=cx, y_px=cy + 10),
+                    FacialLandmark(x_px=cx - 28, y_px=cy + 50),
+                    FacialLandmark(x_px=cx + 28, y_px=cy + 50),
+                ),
+            )
+        ]
+
+
+class _StubEmbedder(DlibResnetFaceEmbedder):
+    """A deterministic unit vector per chip (seeded by its pixels), ``cost_ms`` per chip."""
+
+    provider_name = "benchmark_stub_embedder"
+    model_identifier = "benchmark_stub_embedder"
+
+    def __init__(self, settings: Settings, cost_ms: float) -> None:
+        super().__init__(settings)
+        self._cost_ms = cost_ms
+
+    def embed(self, face: NormalizedFaceInput) -> EmbeddingVector:
+        _spin(self._cost_ms)
+        seed = int.from_bytes(hashlib.sha256(face.pixel_data).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(_DIMENSION)
+        return EmbeddingVector(values=tuple(float(v) for v in vector / np.linalg.norm(vector)))
+
+    def embed_many(
+        self, faces: Sequence[NormalizedFaceInput]
+    ) -> list[EmbeddingVector | FaceRecognitionError]:
+        return [self.embed(face) for face in faces]
+
+
+def _install_stub_providers(settings: Settings, *, detect_ms: float, embed_ms: float) -> None:
+    detector, embedder = _StubDetector(settings, detect_ms), _StubEmbedder(settings, embed_ms)
+    install_providers(
+        settings,
+        detector=PooledFaceDetector(InstancePool(lambda: detector, size=1)),
+        embedder=PooledFaceEmbedder(InstancePool(lambda: embedder, size=1)),
+    )
+
+
+def _initialize_stub_worker(settings: Settings, detect_ms: float, embed_ms: float) -> None:
+    _install_stub_providers(settings, detect_ms=detect_ms, embed_ms=embed_ms)
+    processing_pool.initialize_worker(settings)
+
+
+def _write_samples(directory: Path, count: int, *, seed: int) -> list[Path | None]:
+    rng = np.random.default_rng(seed)
+    paths: list[Path | None] = []
+    for index in range(count):
+        # Smooth noise: compresses and decodes like a photo, not like flat colour.
+        small = rng.integers(0, 256, size=(60, 80, 3), dtype=np.uint8)
+        image = Image.fromarray(small).resize(_IMAGE_SIZE, Image.Resampling.BILINEAR)
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        path = directory / f"sample_{index:05d}.jpg"
+        path.write_bytes(buffer.getvalue())
+        paths.append(path)
+    return paths
+
+
+def _fingerprint(outcomes: list[SampleOutcome]) -> str:
+    digest = hashlib.sha256()
+    for outcome in outcomes:
+        digest.update(repr(outcome).encode())
+    return digest.hexdigest()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=120)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({2, 4, os.cpu_count() or 1})
+    )
+    parser.add_argument("--detect-ms", type=float, default=15.0)
+    parser.add_argument("--embed-ms", type=float, default=35.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    samples: int = args.samples
+    worker_counts: list[int] = args.workers
+    detect_ms: float = args.detect_ms
+    embed_ms: float = args.embed_ms
+    seed: int = args.seed
+
+    settings = Settings.model_construct(FACE_EMBEDDING_DIMENSION=_DIMENSION)
+    _install_stub_providers(settings, detect_ms=detect_ms, embed_ms=embed_ms)
+
+    with tempfile.TemporaryDirectory(prefix="shikshasathi-bench-") as directory:
+        paths = _write_samples(Path(directory), samples, seed=seed)
+        print(f"{samples} samples, {os.cpu_count()} CPUs")
+
+        header = (
+            f"{'mode':>12} {'startup s':>10} {'total s':>9} {'samples/s':>10} "
+            f"{'speedup':>8} {'same':>5}"
+        )
+        print(header)
+        print("-" * len(header))
+
+        started = time.perf_counter()
+        serial_outcomes = processing_pool.embed_sample_files(paths, settings=settings)
+        serial_seconds = time.perf_counter() - started
+        reference = _fingerprint(serial_outcomes)
+        print(
+            f"{'in-process':>12} {'-':>10} {serial_seconds:>9.2f} "
+            f"{samples / serial_seconds:>10.1f} {1.0:>7.1f}x {'yes':>5}"
+        )
+
+        mismatches = 0
+        for workers in worker_counts:
+            startup_started = time.perf_counter()
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_stub_worker,
+                initargs=(settings, detect_ms, embed_ms),
+            )
+            try:
+                # Start every worker (one tiny chunk each) before timing.
+                asyncio.run(
+                    processing_pool.embed_sample_files_in_pool(
+                        pool, [None] * workers, workers=workers
+                    )
+                )
+                startup_seconds = time.perf_counter() - startup_started
+
+                started = time.perf_counter()
+                outcomes = asyncio.run(
+                    processing_pool.embed_sample_files_in_pool(pool, paths, workers=workers)
+                )
+                seconds = time.perf_counter() - started
+            finally:
+                pool.shutdown(wait=True)
+            same = _fingerprint(outcomes) == reference
+            mismatches += 0 if same else 1
+            print(
+                f"{f'pool x{workers}':>12} {startup_seconds:>10.2f} {seconds:>9.2f} "
+                f"{samples / seconds:>10.1f} {serial_seconds / seconds:>7.1f}x "
+                f"{'yes' if same else 'NO':>5}"
+            )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
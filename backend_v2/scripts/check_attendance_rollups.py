@@ -0,0 +1,107 @@
+"""Verify, and optionally rebuild, the monthly attendance rollups.
+
+``attendance_monthly_rollups`` is maintained by triggers on
+``attendance_records`` — see ``app/modules/attendance/rollups.py``. This
+command recounts every month from raw rows and reports any
+student/classroom/subject/month whose rollup disagrees. With
+``--rebuild`` it first replaces the whole rollup from raw rows, which
+makes attendance writes wait until it commits.
+
+Usage (from ``backend_v2``, with the same environment/``.env`` as the
+API):
+
+    python -m scripts.check_attendance_rollups             # verify only
+    python -m scripts.check_attendance_rollups --rebuild   # rebuild, then verify
+    python -m scripts.check_attendance_rollups --samples 100
+
+Prints one JSON object and exits 0 when the rollup matches, 1 when it
+does not. A mismatch after the triggers have been in place means some
+write bypassed them (for example, a restore that disabled triggers);
+run ``--rebuild`` and then find out which.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Allows `python scripts/check_attendance_rollups.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import app.db.models  # noqa: F401  - registers the tables the rollup's foreign keys name
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.db.session import dispose_all_engines, get_engine
+from app.modules.attendance.rollups import (
+    DEFAULT_DRIFT_SAMPLE_LIMIT,
+    AttendanceRollupService,
+    RollupCheckResult,
+)
+
+
+def _report(check: RollupCheckResult, *, rows_written: int | None) -> dict[str, object]:
+    report: dict[str, object] = {
+        "drifted": check.drifted,
+        "samples": [
+            {
+                "student_profile_id": str(drift.student_profile_id),
+                "classroom_id": str(drift.classroom_id),
+                "subject_id": str(drift.subject_id),
+                "month": drift.month.isoformat(),
+                "expected": {"present": drift.expected_present, "absent": drift.expected_absent},
+                "stored": {"present": drift.stored_present, "absent": drift.stored_absent},
+            }
+            for drift in check.samples
+        ],
+    }
+    if rows_written is not None:
+        report["rows_written"] = rows_written
+    return report
+
+
+async def _run(*, rebuild: bool, samples: int) -> int:
+    settings = get_settings()
+    configure_logging(settings)
+    session_factory = async_sessionmaker(
+        bind=get_engine(settings), expire_on_commit=False, autoflush=False
+    )
+    try:
+        async with session_factory() as session:
+            service = AttendanceRollupService(session)
+            if rebuild:
+                result = await service.rebuild(sample_limit=samples)
+                check, rows_written = result.check, result.rows_written
+            else:
+                check, rows_written = await service.check(sample_limit=samples), None
+    finally:
+        await dispose_all_engines()
+    print(json.dumps(_report(check, rows_written=rows_written)))
+    return 0 if check.drifted == 0 else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Replace every rollup row from raw attendance rows before verifying.",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=DEFAULT_DRIFT_SAMPLE_LIMIT,
+        help=f"Mismatched keys to print (default: {DEFAULT_DRIFT_SAMPLE_LIMIT}).",
+    )
+    args = parser.parse_args(argv)
+    if not (1 <= args.samples <= 1000):
+        parser.error("--samples must be between 1 and 1000")
+    return asyncio.run(_run(rebuild=args.rebuild, samples=args.samples))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,380 @@
+"""Score the enrolled population for tuning the match threshold and margin.
+
+Reads the active embeddings of every active classroom — one classroom's
+roster at a time, through the same scoped
+``BiometricEmbeddingRepository.list_active_for_students`` read matching
+uses, so only the configured model's embeddings — and scores them with
+``app.modules.face_recognition.evaluation``'s blocked matrix products:
+
+- **Enrolled pairs**: every pair of active embeddings within a classroom.
+  Two students' embeddings are an impostor pair; two rows of the same
+  student would be a genuine pair, but each student normally has exactly
+  one active embedding (one ACTIVE sample per enrollment), so this part
+  is almost entirely impostor scores — the population a wrong classroom
+  match would come from.
+- **Probe pairs** (``--probes DIR``): genuine scores need a second,
+  independent photo of the same student. ``DIR`` holds one sub-directory
+  per student, named by student profile ID, of consented calibration
+  photos. Each photo goes through ``/match-probe``'s own validation and
+  detect -> align -> embed, and is scored against its classroom's gallery:
+  one genuine score against the student's own embedding, impostor scores
+  against classmates, and its best/runner-up student scores for the
+  ambiguity margin. Photos that fail validation or detection are counted
+  by error code and skipped.
+
+Prints FAR/FRR at ``--thresholds``, the lowest threshold meeting each
+``--target-far``, the equal error rate (when there are genuine scores),
+and ambiguity rates at ``--margins``. ``--output`` also writes all of it,
+plus a downsampled ROC curve, as JSON. Only aggregate numbers are ever
+printed or written — no embedding, student ID, or photo name. Nothing is
+written to the database or to biometric storage.
+
+Usage (from ``backend_v2``, with the same environment/``.env`` as the
+API — ``DATABASE_URL`` and, for ``--probes``, the recognition provider
+settings must match):
+
+    python -m scripts.evaluate_thresholds
+    python -m scripts.evaluate_thresholds --classroom 8a --classroom 8b
+    python -m scripts.evaluate_thresholds --probes /secure/calibration --output report.json
+
+The calibration photos are real biometric data: keep them outside this
+repository and delete them when done (``docs/BIOMETRIC_DATA_POLICY.md``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import mimetypes
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Allows `python scripts/evaluate_thresholds.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import Settings, get_settings
+from app.core.exceptions import AppError
+from app.core.logging import configure_logging
+from app.db.session import dispose_all_engines, get_engine
+from app.modules.academics.models import Classroom
+from app.modules.face_recognition.evaluation import (
+    DEFAULT_BLOCK_SIZE,
+    SimilarityScores,
+    ambiguity_rates,
+    score_gallery_pairs,
+    score_probe_pairs,
+    top_two_by_identity,
+)
+from app.modules.face_recognition.provider_factory import current_embedding_model
+from app.modules.face_recognition.repository import BiometricEmbeddingRepository
+from app.modules.face_recognition.router import _validate_and_embed_probe_sync
+from app.modules.profiles.models import StudentProfile
+
+_REPORT_SCHEMA_VERSION = 1
+_PROBE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+@dataclass
+class _Gallery:
+    """One classroom's active embeddings, row ``i`` owned by ``student_ids[i]``."""
+
+    embeddings: np.ndarray
+    student_ids: list[uuid.UUID]
+
+
+@dataclass
+class _Population:
+    galleries: dict[uuid.UUID, _Gallery] = field(default_factory=dict)
+    classroom_by_student: dict[uuid.UUID, uuid.UUID] = field(default_factory=dict)
+    skipped_dimension_mismatch: int = 0
+
+
+async def _load_population(
+    session: AsyncSession, *, settings: Settings, classroom_codes: list[str]
+) -> _Population:
+    classroom_query = select(Classroom.id).where(Classroom.is_active.is_(True))
+    if classroom_codes:
+        classroom_query = classroom_query.where(
+            Classroom.code.in_([code.lower() for code in classroom_codes])
+        )
+    classroom_ids = list(
+        (await session.execute(classroom_query.order_by(Classroom.code))).scalars()
+    )
+
+    repository = BiometricEmbeddingRepository(session)
+    population = _Population()
+    for classroom_id in classroom_ids:
+        roster = list(
+            (
+                await session.execute(
+                    select(StudentProfile.id).where(
+                        StudentProfile.classroom_id == classroom_id,
+                        StudentProfile.is_active.is_(True),
+                    )
+                )
+            ).scalars()
+        )
+        rows = await repository.list_active_for_students(
+            roster, model=current_embedding_model(settings)
+        )
+        usable = [
+            row for row in rows if row.embedding_dimension == settings.FACE_EMBEDDING_DIMENSION
+        ]
+        population.skipped_dimension_mismatch += len(rows) - len(usable)
+        if not usable:
+            continue
+        population.galleries[classroom_id] = _Gallery(
+            embeddings=np.stack([row.embedding for row in usable]),
+            student_ids=[row.student_profile_id for row in usable],
+        )
+        for row in usable:
+            population.classroom_by_student[row.student_profile_id] = classroom_id
+    return population
+
+
+def _embed_probes(
+    probes_root: Path, *, population: _Population, settings: Settings
+) -> tuple[dict[uuid.UUID, list[tuple[uuid.UUID, list[float]]]], Counter[str]]:
+    """Calibration-photo embeddings grouped by classroom, plus skip counts
+    keyed by reason (an ``AppError`` code, or why the photo was not used)."""
+    by_classroom: dict[uuid.UUID, list[tuple[uuid.UUID, list[float]]]] = {}
+    skipped: Counter[str] = Counter()
+    for student_dir in sorted(path for path in probes_root.iterdir() if path.is_dir()):
+        try:
+            student_id = uuid.UUID(student_dir.name)
+        except ValueError:
+            skipped["directory_not_a_student_id"] += 1
+            continue
+        classroom_id = population.classroom_by_student.get(student_id)
+        for photo in sorted(student_dir.iterdir()):
+            if photo.suffix.lower() not in _PROBE_SUFFIXES:
+                continue
+            if classroom_id is None:
+                skipped["student_without_active_embedding"] += 1
+                continue
+            try:
+                embedding = _validate_and_embed_probe_sync(
+                    photo.read_bytes(),
+                    settings=settings,
+                    declared_content_type=mimetypes.guess_type(photo.name)[0],
+                )
+            except AppError as exc:
+                skipped[exc.code] += 1
+                continue
+            by_classroom.setdefault(classroom_id, []).append((student_id, list(embedding.values)))
+    return by_classroom, skipped
+
+
+def _quantiles(values: np.ndarray) -> dict[str, float] | None:
+    if values.shape[0] == 0:
+        return None
+    points = {"p50": 50.0, "p90": 90.0, "p99": 99.0, "p99.9": 99.9, "max": 100.0}
+    return {name: float(np.percentile(values, q)) for name, q in points.items()}
+
+
+def _downsampled_roc(scores: SimilarityScores, *, points: int) -> dict[str, list[float]]:
+    curve = scores.roc_curve()
+    keep = np.unique(np.linspace(0, curve.thresholds.shape[0] - 1, num=points).round().astype(int))
+    return {
+        "thresholds": curve.thresholds[keep].tolist(),
+        "false_accept_rates": curve.false_accept_rates[keep].tolist(),
+        "false_reject_rates": curve.false_reject_rates[keep].tolist(),
+    }
+
+
+def _build_report(
+    args: argparse.Namespace, *, settings: Settings, population: _Population
+) -> dict[str, Any]:
+    enrolled_parts = [
+        score_gallery_pairs(gallery.embeddings, gallery.student_ids, block_size=args.block_size)
+        for gallery in population.galleries.values()
+    ]
+    probe_parts: list[SimilarityScores] = []
+    top_two_parts: list[np.ndarray] = []
+    probe_skips: Counter[str] = Counter()
+    probe_count = 0
+    if args.probes is not None:
+        probes_by_classroom, probe_skips = _embed_probes(
+            args.probes, population=population, settings=settings
+        )
+        for classroom_id, probes in probes_by_classroom.items():
+            gallery = population.galleries[classroom_id]
+            matrix = np.asarray([values for _, values in probes], dtype=np.float64)
+            probe_count += matrix.shape[0]
+            probe_parts.append(
+                score_probe_pairs(
+                    matrix,
+                    [student_id for student_id, _ in probes],
+                    gallery.embeddings,
+                    gallery.student_ids,
+                    block_size=args.block_size,
+                )
+            )
+            top_two_parts.append(
+                top_two_by_identity(
+                    matrix, gallery.embeddings, gallery.student_ids, block_size=args.block_size
+                )
+            )
+
+    scores = SimilarityScores.concatenate([*enrolled_parts, *probe_parts])
+    thresholds = sorted({*args.thresholds, settings.FACE_MATCH_THRESHOLD})
+    report: dict[str, Any] = {
+        "schema_version": _REPORT_SCHEMA_VERSION,
+        "configured": {
+            "FACE_MATCH_THRESHOLD": settings.FACE_MATCH_THRESHOLD,
+            "FACE_MATCH_AMBIGUOUS_MARGIN": settings.FACE_MATCH_AMBIGUOUS_MARGIN,
+        },
+        "population": {
+            "classrooms": len(population.galleries),
+            "enrolled_embeddings": len(population.classroom_by_student),
+            "skipped_dimension_mismatch": population.skipped_dimension_mismatch,
+            "probes_scored": probe_count,
+            "probes_skipped": dict(sorted(probe_skips.items())),
+        },
+        "pairs": {
+            "genuine": scores.genuine_pair_count,
+            "impostor": scores.impostor_pair_count,
+        },
+        "genuine_quantiles": _quantiles(scores.genuine),
+        "impostor_quantiles": _quantiles(scores.impostor),
+        "sweep": [
+            {
+                "threshold": result.threshold,
+                "false_accept_rate": result.false_accept_rate,
+                "false_reject_rate": (
+                    result.false_reject_rate if scores.genuine_pair_count else None
+                ),
+            }
+            for result in scores.evaluate(thresholds)
+        ],
+        "thresholds_for_far": {
+            str(target): scores.threshold_for_far(target) for target in args.target_far
+        },
+        "equal_error_rate": None,
+        "ambiguity": None,
+        "roc": None,
+    }
+    if scores.genuine_pair_count and scores.impostor_pair_count:
+        rate, threshold = scores.equal_error_rate()
+        report["equal_error_rate"] = {"rate": rate, "threshold": threshold}
+    if scores.genuine_pair_count or scores.impostor_pair_count:
+        report["roc"] = _downsampled_roc(scores, points=args.roc_points)
+    if top_two_parts:
+        top_two = np.concatenate(top_two_parts)
+        # Only probes that clear the threshold reach the margin check.
+        decided = top_two[top_two[:, 0] >= settings.FACE_MATCH_THRESHOLD]
+        margins = sorted({*args.margins, settings.FACE_MATCH_AMBIGUOUS_MARGIN})
+        report["ambiguity"] = {
+            "probes_above_threshold": int(decided.shape[0]),
+            "rates": dict(
+                zip(
+                    (str(margin) for margin in margins),
+                    ambiguity_rates(decided, ambiguous_margins=margins),
+                    strict=True,
+                )
+            ),
+        }
+    return report
+
+
+def _print_report(report: dict[str, Any], *, seconds: float) -> None:
+    population, pairs = report["population"], report["pairs"]
+    print(
+        f"{population['classrooms']} classrooms, {population['enrolled_embeddings']} enrolled "
+        f"embeddings, {population['probes_scored']} probes; {pairs['genuine']} genuine / "
+        f"{pairs['impostor']} impostor pairs scored in {seconds:.2f} s"
+    )
+    if population["skipped_dimension_mismatch"]:
+        print(f"skipped {population['skipped_dimension_mismatch']} embeddings of another dimension")
+    for reason, count in population["probes_skipped"].items():
+        print(f"skipped {count} probes: {reason}")
+    configured = report["configured"]["FACE_MATCH_THRESHOLD"]
+    print(f"\n{'threshold':>10} {'FAR':>10} {'FRR':>10}")
+    for row in report["sweep"]:
+        frr = "-" if row["false_reject_rate"] is None else f"{row['false_reject_rate']:.4f}"
+        marker = "  <- configured" if row["threshold"] == configured else ""
+        print(f"{row['threshold']:>10.3f} {row['false_accept_rate']:>10.6f} {frr:>10}{marker}")
+    print()
+    for target, threshold in report["thresholds_for_far"].items():
+        print(f"lowest threshold with FAR <= {target}: {threshold:.4f}")
+    if report["equal_error_rate"] is not None:
+        eer = report["equal_error_rate"]
+        print(f"equal error rate: {eer['rate']:.4f} at threshold {eer['threshold']:.4f}")
+    else:
+        print("equal error rate: n/a (no genuine pairs — pass --probes)")
+    if report["ambiguity"] is not None:
+        ambiguity = report["ambiguity"]
+        print(
+            f"\nambiguity among {ambiguity['probes_above_threshold']} probes above the threshold:"
+        )
+        for margin, rate in ambiguity["rates"].items():
+            print(f"  margin {float(margin):.3f}: {rate:.4f}")
+
+
+async def _run(args: argparse.Namespace) -> int:
+    settings = get_settings()
+    configure_logging(settings)
+    session_factory = async_sessionmaker(
+        bind=get_engine(settings), expire_on_commit=False, autoflush=False
+    )
+    started = time.perf_counter()
+    try:
+        async with session_factory() as session:
+            population = await _load_population(
+                session, settings=settings, classroom_codes=args.classroom
+            )
+    finally:
+        await dispose_all_engines()
+    # The scoring below is pure CPU over already-loaded arrays.
+    report = _build_report(args, settings=settings, population=population)
+    _print_report(report, seconds=time.perf_counter() - started)
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nwrote {args.output}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--classroom",
+        action="append",
+        default=[],
+        metavar="CODE",
+        help="Only this classroom (repeatable); default: every active classroom.",
+    )
+    parser.add_argument(
+        "--probes",
+        type=Path,
+        default=None,
+        help="Directory of <student_profile_id>/<photo> calibration photos (genuine pairs).",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=[round(0.50 + 0.05 * step, 2) for step in range(10)],
+    )
+    parser.add_argument("--target-far", type=float, nargs="+", default=[1e-3, 1e-4])
+    parser.add_argument("--margins", type=float, nargs="+", default=[0.02, 0.05, 0.08, 0.1])
+    parser.add_argument("--roc-points", type=int, default=200)
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--output", type=Path, default=None, help="Also write the report as JSON.")
+    args = parser.parse_args(argv)
+    if args.probes is not None and not args.probes.is_dir():
+        parser.error(f"--probes {args.probes} is not a directory")
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
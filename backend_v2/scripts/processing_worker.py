@@ -0,0 +1,115 @@
+"""Drain the biometric-sample processing queue. Runs until stopped.
+
+Claims due jobs from ``biometric_processing_jobs``, runs detect -> align
+-> embed on their samples, and settles each job — see
+``app/modules/face_recognition/processing_jobs.py`` for the queue's
+claiming, lease, and retry rules. Any number of these may run at once,
+on one host or several, against the same database.
+
+Usage (from ``backend_v2``, with the same environment/``.env`` as the
+API — ``DATABASE_URL``, ``BIOMETRIC_STORAGE_ROOT`` and the recognition
+provider settings must all match):
+
+    python -m scripts.processing_worker
+    python -m scripts.processing_worker --once        # one cycle, then exit
+    python -m scripts.processing_worker --worker-id node-a-1
+
+A cycle that finds work is followed immediately by the next one; an
+idle cycle sleeps ``FACE_PROCESSING_WORKER_POLL_SECONDS``. A cycle that
+fails (database unavailable, say) is logged and retried after the same
+sleep; whatever it had claimed is picked up again once its lease expires.
+SIGINT/SIGTERM finish the current cycle and exit.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+# Allows `python scripts/processing_worker.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import structlog
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.db.session import dispose_all_engines, get_engine
+from app.modules.face_recognition.processing_jobs import ProcessingJobService
+from app.modules.face_recognition.processing_pool import shutdown_processing_pool
+
+logger = structlog.get_logger("scripts.processing_worker")
+
+
+def _default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def _run(*, worker_id: str, once: bool) -> None:
+    settings = get_settings()
+    configure_logging(settings)
+    session_factory = async_sessionmaker(
+        bind=get_engine(settings), expire_on_commit=False, autoflush=False
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    logger.info("processing_worker_started", worker_id=worker_id)
+    try:
+        while not stop.is_set():
+            processed = 0
+            try:
+                # A fresh session per cycle: nothing from a failed cycle
+                # (an aborted transaction, stale objects) leaks into the next.
+                async with session_factory() as session:
+                    results = await ProcessingJobService(session, settings=settings).run_once(
+                        worker_id=worker_id
+                    )
+                processed = len(results)
+                if processed:
+                    logger.info(
+                        "processing_worker_cycle_finished",
+                        worker_id=worker_id,
+                        job_count=processed,
+                    )
+            except Exception as exc:
+                logger.error(
+                    "processing_worker_cycle_failed",
+                    worker_id=worker_id,
+                    exc_type=type(exc).__name__,
+                )
+            if once:
+                break
+            if not processed:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        stop.wait(), timeout=settings.FACE_PROCESSING_WORKER_POLL_SECONDS
+                    )
+    finally:
+        logger.info("processing_worker_stopped", worker_id=worker_id)
+        await dispose_all_engines()
+        await asyncio.to_thread(shutdown_processing_pool)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--worker-id",
+        default=_default_worker_id(),
+        help="Lease owner recorded on claimed jobs (default: hostname:pid). Must be unique.",
+    )
+    parser.add_argument("--once", action="store_true", help="Run one cycle, then exit.")
+    args = parser.parse_args()
+    asyncio.run(_run(worker_id=args.worker_id, once=args.once))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Re-embed processed samples after the embedding model changed.
+
+Walks every live, processed sample whose active embedding is not from
+the configured model (``FACE_EMBEDDING_MODEL_VERSION``), embeds it into
+a shadow row and flips it active — see
+``app/modules/face_recognition/reembedding.py``. Until a sample is
+flipped its student cannot be matched, so run this right after
+deploying a new model.
+
+Usage (from ``backend_v2``, with the same environment/``.env`` as the
+API — ``DATABASE_URL``, ``BIOMETRIC_STORAGE_ROOT`` and the recognition
+provider settings must all match):
+
+    python -m scripts.reembed_samples --actor-email admin@example.com
+    python -m scripts.reembed_samples --status         # counts only, then exit
+    python -m scripts.reembed_samples --actor-email admin@example.com --shard 0/4
+    python -m scripts.reembed_samples --actor-email admin@example.com \
+        --batch-size 20 --pause-seconds 5
+
+``--actor-email`` names the admin running the job: it must be an active
+admin account, is checked once at start-up, and is recorded as the actor
+on every audit row the job writes.
+
+Each batch is logged with running totals; ``FACE_REEMBED_PAUSE_SECONDS``
+(or ``--pause-seconds``) is slept between batches, and ``--nice`` lowers
+this process's CPU priority, so online recognition on the same host
+keeps its share. The job exits when the walk is done; samples left stale
+by a transient failure are picked up by the next run. It is safe to
+stop (SIGINT/SIGTERM finish the current batch) and to restart at any
+time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import sys
+import uuid
+from pathlib import Path
+
+# Allows `python scripts/reembed_samples.py` as well as `python -m`.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import structlog
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.db.session import dispose_all_engines, get_engine
+from app.modules.face_recognition.processing_pool import shutdown_processing_pool
+from app.modules.face_recognition.reembedding import (
+    ReembeddingService,
+    resolve_acting_admin,
+)
+
+logger = structlog.get_logger("scripts.reembed_samples")
+
+
+def _shard(value: str) -> tuple[int, int]:
+    index, _, count = value.partition("/")
+    try:
+        shard = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected K/N, e.g. 0/4") from None
+    if not (shard[1] >= 1 and 0 <= shard[0] < shard[1] and shard[1] <= 256):
+        raise argparse.ArgumentTypeError("expected 0 <= K < N <= 256")
+    return shard
+
+
+async def _run(
+    *,
+    status_only: bool,
+    actor_email: str | None,
+    batch_size: int | None,
+    pause_seconds: float | None,
+    shard: tuple[int, int] | None,
+) -> None:
+    settings = get_settings()
+    configure_logging(settings)
+    session_factory = async_sessionmaker(
+        bind=get_engine(settings), expire_on_commit=False, autoflush=False
+    )
+    try:
+        if status_only:
+            async with session_factory() as session:
+                progress = await ReembeddingService(session, settings=settings).progress()
+            print(
+                json.dumps(
+                    {
+                        "model_version": progress.model.model_version,
+                        "total": progress.total,
+                        "current": progress.current,
+                        "stale": progress.stale,
+                    }
+                )
+            )
+            return
+
+        assert actor_email is not None
+        async with session_factory() as session:
+            try:
+                actor_user_id = await resolve_acting_admin(session, actor_email)
+            except ValueError:
+                raise SystemExit(f"--actor-email {actor_email!r} is not an active admin") from None
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        pause = settings.FACE_REEMBED_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+        shard_label = f"{shard[0]}/{shard[1]}" if shard is not None else None
+
+        logger.info("reembedding_started", shard=shard_label)
+        after: uuid.UUID | None = None
+        totals = {"scanned": 0, "flipped": 0, "failed": 0, "deferred": 0, "skipped": 0}
+        while not stop.is_set():
+            async with session_factory() as session:
+                service = ReembeddingService(
+                    session, actor_user_id=actor_user_id, settings=settings
+                )
+                result = await service.run_batch(after=after, limit=batch_size, shard=shard)
+                if result.last_sample_id is None:
+                    break
+                after = result.last_sample_id
+                for key in totals:
+                    totals[key] += getattr(result, key)
+                progress = await service.progress()
+            logger.info(
+                "reembedding_batch_finished",
+                shard=shard_label,
+                **totals,
+                remaining_stale=progress.stale,
+                total=progress.total,
+            )
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=pause)
+        logger.info(
+            "reembedding_stopped",
+            shard=shard_label,
+            finished=not stop.is_set(),
+            **totals,
+        )
+    finally:
+        await dispose_all_engines()
+        await asyncio.to_thread(shutdown_processing_pool)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--status", action="store_true", help="Print current/stale sample counts and exit."
+    )
+    parser.add_argument(
+        "--actor-email",
+        default=None,
+        help="Email of the active admin running the job, recorded on its audit rows.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Samples per batch (default: FACE_REEMBED_BATCH_SIZE).",
+    )
+    parser.add_argument(
+        "--pause-seconds",
+        type=float,
+        default=None,
+        help="Sleep between batches (default: FACE_REEMBED_PAUSE_SECONDS).",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard,
+        default=None,
+        help="K/N: handle only the K-th of N disjoint slices of the samples.",
+    )
+    parser.add_argument(
+        "--nice",
+        type=int,
+        default=10,
+        help="Increment to this process's CPU niceness (default: 10; 0 to keep it).",
+    )
+    args = parser.parse_args()
+    if not args.status and not args.actor_email:
+        parser.error("--actor-email is required unless --status is given")
+    if args.batch_size is not None and not (1 <= args.batch_size <= 1000):
+        parser.error("--batch-size must be between 1 and 1000")
+    if args.pause_seconds is not None and args.pause_seconds < 0:
+        parser.error("--pause-seconds must not be negative")
+    if args.nice and hasattr(os, "nice"):
+        os.nice(args.nice)
+    asyncio.run(
+        _run(
+            status_only=args.status,
+            actor_email=args.actor_email,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause_seconds,
+            shard=args.shard,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()